@@ -0,0 +1,205 @@
+"""partition spans by start_time
+
+Revision ID: 9b4d2e7c1a3f
+Revises: 5e84b8d7aa1f
+Create Date: 2026-10-16 09:00:00.000000
+
+Converts `spans` into a table range partitioned by `start_time`, so trace
+retention can drop whole expired partitions instead of deleting spans row by
+row, and queries bounded on `spans.start_time` only scan the partitions in
+range.
+
+Partitioning is opt-in per deployment. The migration only changes the schema
+when `GENAI_ENGINE_SPAN_PARTITION_INTERVAL` is set to `daily` or `weekly`
+while it runs on PostgreSQL; otherwise it is a no-op and can be re-run later
+by downgrading to 5e84b8d7aa1f and upgrading again with the variable set.
+
+  - spans is rebuilt as `PARTITION BY RANGE (start_time)` with partitions
+    `spans_pYYYYMMDD` from the oldest span (at most a year back) to
+    `GENAI_ENGINE_SPAN_PARTITION_PREMAKE` partitions ahead, and a
+    `spans_default` partition for rows outside them. All rows are copied, so
+    plan for the time and disk space of rewriting the table.
+  - The primary key becomes (id, start_time), since a partitioned table can
+    only enforce uniqueness over its partition key. Indexes and foreign keys
+    of spans are recreated under their existing names.
+  - Foreign keys referencing spans (metric_results.span_id) are dropped for
+    the same reason. Retention deletes the metric results of a partition
+    before dropping it.
+
+trace_metadata stays unpartitioned: ingestion upserts it on trace_id and moves
+start_time back as earlier spans of a trace arrive, which a table partitioned
+by start_time cannot enforce or route.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+
+from alembic import op
+from utils.constants import (
+    DEFAULT_SPAN_PARTITION_PREMAKE,
+    GENAI_ENGINE_SPAN_PARTITION_INTERVAL_ENV_VAR,
+    GENAI_ENGINE_SPAN_PARTITION_PREMAKE_ENV_VAR,
+    SPAN_PARTITION_INTERVALS,
+)
+
+# revision identifiers, used by Alembic.
+revision = "9b4d2e7c1a3f"
+down_revision = "5e84b8d7aa1f"
+branch_labels = None
+depends_on = None
+
+# older spans go to the default partition, retention removes them row by row
+MAX_HISTORY_DAYS = 366
+
+
+def _partition_interval_from_env() -> str | None:
+    raw = os.environ.get(GENAI_ENGINE_SPAN_PARTITION_INTERVAL_ENV_VAR)
+    if not raw or raw.lower() not in SPAN_PARTITION_INTERVALS:
+        return None
+    return raw.lower()
+
+
+def _premake_from_env() -> int:
+    raw = os.environ.get(GENAI_ENGINE_SPAN_PARTITION_PREMAKE_ENV_VAR)
+    try:
+        return max(int(raw), 1) if raw else DEFAULT_SPAN_PARTITION_PREMAKE
+    except ValueError:
+        return DEFAULT_SPAN_PARTITION_PREMAKE
+
+
+# Inlined from repositories.span_partition_repository so the migration keeps
+# working if the runtime helpers change.
+def _partition_start(timestamp: datetime, interval: str) -> datetime:
+    start = datetime(timestamp.year, timestamp.month, timestamp.day)
+    if interval == "weekly":
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def _partition_end(lower: datetime, interval: str) -> datetime:
+    period = timedelta(days=7 if interval == "weekly" else 1)
+    return _partition_start(lower, interval) + period
+
+
+def _spans_partitioned(connection: sa.Connection) -> bool:
+    return bool(
+        connection.execute(
+            sa.text("SELECT relkind = 'p' FROM pg_class WHERE oid = 'spans'::regclass"),
+        ).scalar(),
+    )
+
+
+def _spans_indexes_and_foreign_keys(
+    connection: sa.Connection,
+) -> tuple[list[str], list[tuple[str, str]]]:
+    """CREATE INDEX statements and (name, definition) foreign keys of spans."""
+    index_definitions = connection.execute(
+        sa.text(
+            "SELECT i.indexdef FROM pg_indexes i "
+            "WHERE i.schemaname = current_schema() AND i.tablename = 'spans' "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint c "
+            "WHERE c.conrelid = 'spans'::regclass AND c.conname = i.indexname)",
+        ),
+    ).scalars()
+    foreign_keys = connection.execute(
+        sa.text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = 'spans'::regclass AND contype = 'f'",
+        ),
+    ).all()
+    return list(index_definitions), [
+        (name, definition) for name, definition in foreign_keys
+    ]
+
+
+def _restore_indexes_and_foreign_keys(
+    index_definitions: list[str],
+    foreign_keys: list[tuple[str, str]],
+) -> None:
+    for index_definition in index_definitions:
+        op.execute(index_definition)
+    for name, definition in foreign_keys:
+        op.execute(f'ALTER TABLE spans ADD CONSTRAINT "{name}" {definition}')
+
+
+def upgrade() -> None:
+    interval = _partition_interval_from_env()
+    connection = op.get_bind()
+    if (
+        interval is None
+        or connection.dialect.name != "postgresql"
+        or _spans_partitioned(connection)
+    ):
+        return
+
+    index_definitions, foreign_keys = _spans_indexes_and_foreign_keys(connection)
+    referencing_foreign_keys = connection.execute(
+        sa.text(
+            "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+            "WHERE confrelid = 'spans'::regclass AND contype = 'f'",
+        ),
+    ).all()
+    for table, name in referencing_foreign_keys:
+        op.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"')
+
+    op.execute(
+        "CREATE TABLE spans_partitioned (LIKE spans INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (start_time)",
+    )
+    op.execute("CREATE TABLE spans_default PARTITION OF spans_partitioned DEFAULT")
+
+    now = datetime.utcnow()
+    oldest = connection.execute(sa.text("SELECT min(start_time) FROM spans")).scalar()
+    lower = _partition_start(
+        max(oldest or now, now - timedelta(days=MAX_HISTORY_DAYS)),
+        interval,
+    )
+    horizon = _partition_start(now, interval)
+    for _ in range(_premake_from_env() + 1):
+        horizon = _partition_end(horizon, interval)
+    while lower < horizon:
+        upper = _partition_end(lower, interval)
+        op.execute(
+            f"CREATE TABLE spans_p{lower:%Y%m%d} PARTITION OF spans_partitioned "
+            f"FOR VALUES FROM ('{lower.isoformat(sep=' ')}') "
+            f"TO ('{upper.isoformat(sep=' ')}')",
+        )
+        lower = upper
+
+    op.execute("INSERT INTO spans_partitioned SELECT * FROM spans")
+    op.execute("DROP TABLE spans")
+    op.execute("ALTER TABLE spans_partitioned RENAME TO spans")
+    op.execute(
+        "ALTER TABLE spans ADD CONSTRAINT spans_pkey PRIMARY KEY (id, start_time)",
+    )
+    _restore_indexes_and_foreign_keys(index_definitions, foreign_keys)
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    if connection.dialect.name != "postgresql" or not _spans_partitioned(connection):
+        return
+
+    index_definitions, foreign_keys = _spans_indexes_and_foreign_keys(connection)
+
+    op.execute("CREATE TABLE spans_unpartitioned (LIKE spans INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO spans_unpartitioned SELECT * FROM spans")
+    op.execute("DROP TABLE spans")
+    op.execute("ALTER TABLE spans_unpartitioned RENAME TO spans")
+    op.execute("ALTER TABLE spans ADD CONSTRAINT spans_pkey PRIMARY KEY (id)")
+    _restore_indexes_and_foreign_keys(index_definitions, foreign_keys)
+
+    # metric results of spans removed while the foreign key was gone
+    op.execute(
+        "DELETE FROM metric_results m "
+        "WHERE NOT EXISTS (SELECT 1 FROM spans s WHERE s.id = m.span_id)",
+    )
+    op.create_foreign_key(
+        "metric_results_span_id_fkey",
+        "metric_results",
+        "spans",
+        ["span_id"],
+        ["id"],
+    )
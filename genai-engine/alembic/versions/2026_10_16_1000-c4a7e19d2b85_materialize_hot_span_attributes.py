@@ -0,0 +1,89 @@
+"""materialize hot span attributes
+
+Revision ID: c4a7e19d2b85
+Revises: 9b4d2e7c1a3f
+Create Date: 2026-10-16 10:00:00.000000
+
+Adds typed, indexed columns for span and metric result attributes that trace
+filters used to extract from JSON:
+
+  spans.model_name                  VARCHAR NULL  -- raw_data attributes.llm.model_name
+  metric_results.relevance_score    FLOAT NULL    -- details.<query|response>_relevance.llm_relevance_score
+  metric_results.tool_selection     INTEGER NULL  -- details.tool_selection.tool_selection
+  metric_results.tool_usage         INTEGER NULL  -- details.tool_selection.tool_usage
+
+The columns start out NULL for existing rows. Instead of rewriting both tables
+here, the materialized attribute backfill fills them in batches after startup
+and records its completion in the configurations table; until then filters
+fall back to the JSON values.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c4a7e19d2b85"
+down_revision = "9b4d2e7c1a3f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("spans", sa.Column("model_name", sa.String(), nullable=True))
+    op.add_column(
+        "metric_results",
+        sa.Column("relevance_score", sa.Float(), nullable=True),
+    )
+    op.add_column(
+        "metric_results",
+        sa.Column("tool_selection", sa.Integer(), nullable=True),
+    )
+    op.add_column(
+        "metric_results",
+        sa.Column("tool_usage", sa.Integer(), nullable=True),
+    )
+
+    op.create_index(
+        "idx_spans_task_model_time",
+        "spans",
+        ["task_id", "model_name", "start_time"],
+        unique=False,
+        postgresql_where=sa.text("model_name IS NOT NULL"),
+    )
+    op.create_index(
+        "idx_metric_results_type_relevance_score",
+        "metric_results",
+        ["metric_type", "relevance_score"],
+        unique=False,
+        postgresql_where=sa.text("relevance_score IS NOT NULL"),
+    )
+    op.create_index(
+        "idx_metric_results_type_tool_classification",
+        "metric_results",
+        ["metric_type", "tool_selection", "tool_usage"],
+        unique=False,
+        postgresql_where=sa.text("tool_selection IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "idx_metric_results_type_tool_classification",
+        table_name="metric_results",
+    )
+    op.drop_index(
+        "idx_metric_results_type_relevance_score",
+        table_name="metric_results",
+    )
+    op.drop_index("idx_spans_task_model_time", table_name="spans")
+    op.drop_column("metric_results", "tool_usage")
+    op.drop_column("metric_results", "tool_selection")
+    op.drop_column("metric_results", "relevance_score")
+    op.drop_column("spans", "model_name")
+
+    # so the backfill runs again after a later upgrade
+    op.execute(
+        "DELETE FROM configurations "
+        "WHERE name = 'materialized_attributes_backfill_version'",
+    )
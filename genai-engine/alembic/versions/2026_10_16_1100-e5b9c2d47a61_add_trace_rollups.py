@@ -0,0 +1,48 @@
+"""add trace rollups
+
+Revision ID: e5b9c2d47a61
+Revises: c4a7e19d2b85
+Create Date: 2026-10-16 11:00:00.000000
+
+Adds trace_rollups, per-task totals of the traces that started in one minute,
+hour or day: trace count, token count, token cost, continuous eval count,
+passed continuous eval count and latest trace end time. They are kept up to
+date by trace ingestion and annotation updates when
+GENAI_ENGINE_TRACE_ROLLUPS_ENABLED is set, and backfilled by the trace rollup
+reconciliation, which records its completion in the configurations table.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e5b9c2d47a61"
+down_revision = "c4a7e19d2b85"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "trace_rollups",
+        sa.Column("task_id", sa.String(), nullable=False),
+        sa.Column("granularity", sa.String(), nullable=False),
+        sa.Column("bucket_start", sa.TIMESTAMP(), nullable=False),
+        sa.Column("trace_count", sa.Integer(), nullable=False),
+        sa.Column("token_count", sa.BigInteger(), nullable=False),
+        sa.Column("token_cost", sa.Float(), nullable=False),
+        sa.Column("eval_count", sa.Integer(), nullable=False),
+        sa.Column("eval_passed_count", sa.Integer(), nullable=False),
+        sa.Column("last_active", sa.TIMESTAMP(), nullable=True),
+        sa.PrimaryKeyConstraint("task_id", "granularity", "bucket_start"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("trace_rollups")
+
+    # so the backfill runs again after a later upgrade
+    op.execute(
+        "DELETE FROM configurations WHERE name = 'trace_rollups_backfill_version'",
+    )
@@ -0,0 +1,47 @@
+"""add queue jobs
+
+Revision ID: f1c8a3d69e20
+Revises: e5b9c2d47a61
+Create Date: 2026-10-16 12:00:00.000000
+
+Adds queue_jobs, the jobs of the durable queue backend that the continuous eval
+and agent polling services use when GENAI_ENGINE_DURABLE_JOB_QUEUE_ENABLED is set.
+Workers of every replica claim them with FOR UPDATE SKIP LOCKED.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f1c8a3d69e20"
+down_revision = "e5b9c2d47a61"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "queue_jobs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("queue_name", sa.String(), nullable=False),
+        sa.Column("job_key", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("visible_at", sa.TIMESTAMP(), nullable=False),
+        sa.Column("lease_id", sa.UUID(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("queue_name", "job_key", name="uq_queue_jobs_queue_key"),
+    )
+    op.create_index(
+        "ix_queue_jobs_queue_visible_at",
+        "queue_jobs",
+        ["queue_name", "visible_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_queue_jobs_queue_visible_at", table_name="queue_jobs")
+    op.drop_table("queue_jobs")
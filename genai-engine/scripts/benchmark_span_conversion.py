@@ -0,0 +1,203 @@
+"""Compares the dict based and protobuf based span conversion of trace ingestion.
+
+Builds a large synthetic ExportTraceServiceRequest of LLM, tool and chain spans and
+converts it to DatabaseSpan rows both ways: MessageToDict followed by
+_process_span_data, and _process_proto_span straight from the protobuf messages.
+Only the conversion is timed, nothing is written to the database. Run from the
+genai-engine directory:
+
+    uv run python scripts/benchmark_span_conversion.py --spans 20000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from google.protobuf.json_format import MessageToDict
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+    ExportTraceServiceRequest,
+)
+from opentelemetry.proto.common.v1.common_pb2 import AnyValue, KeyValue
+from opentelemetry.proto.resource.v1.resource_pb2 import Resource
+from opentelemetry.proto.trace.v1.trace_pb2 import (
+    ResourceSpans,
+    ScopeSpans,
+    Span,
+    Status,
+)
+
+from services.trace.otlp_span_converter import OtlpSpanConverter
+from services.trace.span_normalization_service import SpanNormalizationService
+from services.trace.trace_ingestion_service import TraceIngestionService
+
+TASK_ID = "benchmark-task"
+
+
+def _attribute(key: str, value: Any) -> KeyValue:
+    if isinstance(value, bool):
+        return KeyValue(key=key, value=AnyValue(bool_value=value))
+    if isinstance(value, int):
+        return KeyValue(key=key, value=AnyValue(int_value=value))
+    if isinstance(value, float):
+        return KeyValue(key=key, value=AnyValue(double_value=value))
+    return KeyValue(key=key, value=AnyValue(string_value=str(value)))
+
+
+def _span_attributes(index: int) -> dict[str, Any]:
+    kind = ("LLM", "TOOL", "CHAIN")[index % 3]
+    attributes: dict[str, Any] = {
+        "openinference.span.kind": kind,
+        "session.id": f"session-{index % 50}",
+        "user.id": f"user-{index % 20}",
+        "input.value": json.dumps({"question": f"question {index}"}),
+        "input.mime_type": "application/json",
+        "output.value": f"answer {index}",
+        "metadata": json.dumps({"run": index, "tags": ["benchmark"]}),
+    }
+    if kind == "LLM":
+        attributes.update(
+            {
+                "llm.model_name": "gpt-4o",
+                "llm.provider": "openai",
+                "llm.invocation_parameters": json.dumps({"temperature": 0.2}),
+                "llm.input_messages.0.message.role": "system",
+                "llm.input_messages.0.message.content": "You are a helpful assistant.",
+                "llm.input_messages.1.message.role": "user",
+                "llm.input_messages.1.message.content": f"question {index}",
+                "llm.output_messages.0.message.role": "assistant",
+                "llm.output_messages.0.message.content": f"answer {index}",
+                "llm.token_count.prompt": 120,
+                "llm.token_count.completion": 40,
+                "llm.token_count.total": 160,
+            },
+        )
+    elif kind == "TOOL":
+        attributes.update(
+            {
+                "tool.name": "search",
+                "tool.parameters": json.dumps({"query": f"query {index}"}),
+            },
+        )
+    return attributes
+
+
+def build_request(num_spans: int, spans_per_trace: int) -> ExportTraceServiceRequest:
+    spans = []
+    start_ns = time.time_ns()
+    for index in range(num_spans):
+        trace_index, position = divmod(index, spans_per_trace)
+        spans.append(
+            Span(
+                trace_id=trace_index.to_bytes(16, "big"),
+                span_id=(index + 1).to_bytes(8, "big"),
+                parent_span_id=(
+                    (trace_index * spans_per_trace + 1).to_bytes(8, "big")
+                    if position
+                    else b""
+                ),
+                name=f"span-{index}",
+                kind=Span.SPAN_KIND_INTERNAL,
+                start_time_unix_nano=start_ns + index * 1000,
+                end_time_unix_nano=start_ns + index * 1000 + 500,
+                attributes=[
+                    _attribute(key, value)
+                    for key, value in _span_attributes(index).items()
+                ],
+                status=Status(code=Status.STATUS_CODE_OK),
+            ),
+        )
+    return ExportTraceServiceRequest(
+        resource_spans=[
+            ResourceSpans(
+                resource=Resource(
+                    attributes=[_attribute("service.name", "benchmark-service")],
+                ),
+                scope_spans=[ScopeSpans(spans=spans)],
+            ),
+        ],
+    )
+
+
+def _ingestion_service() -> TraceIngestionService:
+    # only the database free conversion methods are used
+    service = TraceIngestionService.__new__(TraceIngestionService)
+    service.span_normalizer = SpanNormalizationService()
+    service.span_converter = OtlpSpanConverter(service.span_normalizer)
+    return service
+
+
+def convert_with_dicts(
+    service: TraceIngestionService,
+    request: ExportTraceServiceRequest,
+) -> int:
+    json_traces = MessageToDict(request)
+    count = 0
+    for resource_span in json_traces["resourceSpans"]:
+        for scope_span in resource_span["scopeSpans"]:
+            for span_data in scope_span["spans"]:
+                service._process_span_data(span_data, TASK_ID)
+                count += 1
+    return count
+
+
+def convert_with_protobuf(
+    service: TraceIngestionService,
+    request: ExportTraceServiceRequest,
+) -> int:
+    count = 0
+    for resource_span in request.resource_spans:
+        for scope_span in resource_span.scope_spans:
+            for span in scope_span.spans:
+                service._process_proto_span(span, TASK_ID)
+                count += 1
+    return count
+
+
+def _time(
+    convert: Callable[[TraceIngestionService, ExportTraceServiceRequest], int],
+    service: TraceIngestionService,
+    request: ExportTraceServiceRequest,
+    iterations: int,
+) -> dict[str, float]:
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        count = convert(service, request)
+        durations.append(time.perf_counter() - start)
+    best = min(durations)
+    return {
+        "best_seconds": round(best, 3),
+        "spans_per_second": round(count / best),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spans", type=int, default=10000)
+    parser.add_argument("--spans-per-trace", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+
+    request = build_request(args.spans, args.spans_per_trace)
+    service = _ingestion_service()
+
+    report = {
+        "spans": args.spans,
+        "payload_bytes": request.ByteSize(),
+        "dict": _time(convert_with_dicts, service, request, args.iterations),
+        "protobuf": _time(convert_with_protobuf, service, request, args.iterations),
+    }
+    report["speedup"] = round(
+        report["dict"]["best_seconds"] / report["protobuf"]["best_seconds"],  # type: ignore[index]
+        2,
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
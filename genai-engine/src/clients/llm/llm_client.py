@@ -2,7 +2,7 @@ import logging
 import threading
 import time
 import uuid
-from typing import Any, List, Optional, Union
+from typing import Any, Awaitable, Callable, List, Optional, Union
 
 import httpx
 import litellm
@@ -24,6 +24,9 @@ from repositories.organizations_repository import (
 
 logger = logging.getLogger(__name__)
 
+# Runs a blocking function off the event loop, e.g. ExperimentRunner.run_sync
+RunSync = Callable[..., Awaitable[Any]]
+
 
 class LLMModelResponse(BaseModel):
     # NOTE: We use arbitrary_types_allowed=True here to allow the response parameter to be the non-pydantic types ModelResponse/CustomStreamWrapper
@@ -339,6 +342,7 @@ class LLMClient:
         self,
         *args: Any,
         org_id: uuid.UUID,
+        run_sync: Optional[RunSync] = None,
         **kwargs: Any,
     ) -> ModelResponse | CustomStreamWrapper:
         # `org_id` is required (kw-only): every LLM call bills the org that
@@ -347,7 +351,12 @@ class LLMClient:
         # consumer must call `record_token_usage` after
         # `litellm.stream_chunk_builder` produces the final response —
         # token usage isn't known at return-time. UP-4390.
-        enforce_token_quota(org_id)
+        # The quota check and the usage write use blocking DB sessions; callers
+        # on a shared event loop pass `run_sync` to run them off the loop.
+        if run_sync is None:
+            enforce_token_quota(org_id)
+        else:
+            await run_sync(enforce_token_quota, org_id)
         kwargs = self._add_provider_credentials(kwargs)
 
         try:
@@ -356,7 +365,10 @@ class LLMClient:
                 **kwargs,
             )
             if isinstance(response, ModelResponse):
-                self.record_token_usage(org_id, response)
+                if run_sync is None:
+                    self.record_token_usage(org_id, response)
+                else:
+                    await run_sync(self.record_token_usage, org_id, response)
             return response
         except litellm.BadRequestError as e:
             if "requires at least one non-system message" in str(e):
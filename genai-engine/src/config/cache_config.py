@@ -10,6 +10,21 @@ class CacheConfig(BaseSettings):
     TASK_METRICS_CACHE_ENABLED: bool = "PYTEST_CURRENT_TEST" not in os.environ
     TASK_METRICS_CACHE_TTL: int = 60 * 1
 
+    COMPILED_RULES_CACHE_SIZE: int = 1024
+
+    RULE_RESULTS_CACHE_ENABLED: bool = False
+    RULE_RESULTS_CACHE_TTL: int = 60 * 5
+    RULE_RESULTS_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    INGESTION_LOOKUP_CACHE_ENABLED: bool = "PYTEST_CURRENT_TEST" not in os.environ
+    INGESTION_LOOKUP_CACHE_TTL: int = 60 * 1
+    INGESTION_LOOKUP_CACHE_MAX_SIZE: int = 10000
+
+    APPLICATION_CONFIGURATION_CACHE_ENABLED: bool = (
+        "PYTEST_CURRENT_TEST" not in os.environ
+    )
+    APPLICATION_CONFIGURATION_CACHE_TTL: int = 60 * 1
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
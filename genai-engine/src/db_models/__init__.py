@@ -44,6 +44,7 @@ from db_models.rule_result_models import (
 from db_models.task_models import DatabaseTask, DatabaseTaskToRules
 from db_models.agentic_annotation_models import DatabaseAgenticAnnotation
 from db_models.agent_polling_models import DatabaseTaskPollingState
+from db_models.queue_job_models import DatabaseQueueJob
 from db_models.telemetry_models import (
     DatabaseMetric,
     DatabaseMetricResult,
@@ -52,6 +53,7 @@ from db_models.telemetry_models import (
     DatabaseSpan,
     DatabaseTaskToMetrics,
     DatabaseTraceMetadata,
+    DatabaseTraceRollup,
 )
 from db_models.agentic_prompt_models import (
     DatabaseAgenticPrompt,
@@ -134,6 +136,7 @@ __all__ = [
     "DatabaseApplicationConfiguration",
     # Telemetry models
     "DatabaseTraceMetadata",
+    "DatabaseTraceRollup",
     "DatabaseSpan",
     "DatabaseMetric",
     "DatabaseTaskToMetrics",
@@ -186,6 +189,8 @@ __all__ = [
     "DatabaseTraceTransformVersion",
     # Agent Polling models
     "DatabaseTaskPollingState",
+    # Queue models
+    "DatabaseQueueJob",
     # Onboarding models
     "DatabaseOnboardingSubmission",
     # Demo certificate models
@@ -0,0 +1,57 @@
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import (
+    JSON,
+    TIMESTAMP,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    Uuid,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db_models.base import Base
+
+
+class DatabaseQueueJob(Base):
+    """A job of a durable queue, shared by every worker of every replica.
+
+    Workers claim visible jobs with FOR UPDATE SKIP LOCKED and lease them by moving
+    visible_at into the future; heartbeats extend the lease while the job runs. Jobs
+    are deleted once they ran, so a job whose worker died becomes visible again when
+    its lease expires.
+    """
+
+    __tablename__ = "queue_jobs"
+    __table_args__ = (
+        # one job per key and queue while it is waiting or running
+        UniqueConstraint("queue_name", "job_key", name="uq_queue_jobs_queue_key"),
+        Index("ix_queue_jobs_queue_visible_at", "queue_name", "visible_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    queue_name: Mapped[str] = mapped_column(String, nullable=False)
+    job_key: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    # higher priorities are claimed first
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # when the job can next be claimed: its due time, or its lease expiry once claimed
+    visible_at: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=False)
+    # set on every claim, so only the current lease holder can extend or finish it
+    lease_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        Uuid(as_uuid=True),
+        nullable=True,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP,
+        nullable=False,
+        default=datetime.now,
+    )
@@ -8,6 +8,7 @@ from arthur_common.models.enums import MetricType
 from sqlalchemy import (
     JSON,
     TIMESTAMP,
+    BigInteger,
     Boolean,
     Float,
     ForeignKey,
@@ -46,7 +47,8 @@ class DatabaseTraceMetadata(Base):
     root_span_resource_id: Mapped[str | None] = mapped_column(
         String,
         ForeignKey(
-            "resource_metadata.id", name="fk_trace_metadata_root_span_resource_id"
+            "resource_metadata.id",
+            name="fk_trace_metadata_root_span_resource_id",
         ),
         nullable=True,
         index=True,
@@ -119,6 +121,29 @@ class DatabaseTraceMetadata(Base):
     )
 
 
+class DatabaseTraceRollup(Base):
+    """Per-task trace totals of one minute, hour or day of trace start times.
+
+    Maintained from trace_metadata and continuous eval annotations by
+    repositories.trace_rollup_repository; the trace overview endpoints read them
+    instead of aggregating trace_metadata.
+    """
+
+    __tablename__ = "trace_rollups"
+
+    task_id: Mapped[str] = mapped_column(String, primary_key=True)
+    # "minute", "hour" or "day"
+    granularity: Mapped[str] = mapped_column(String, primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(TIMESTAMP, primary_key=True)
+    trace_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    token_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    token_cost: Mapped[float] = mapped_column(Float, nullable=False)
+    eval_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    eval_passed_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # latest end_time of the bucket's traces
+    last_active: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
+
+
 class DatabaseResourceMetadata(Base):
     """Stores OpenTelemetry resource attributes for traces.
 
@@ -162,7 +187,9 @@ class DatabaseServiceNameTaskMapping(Base):
     task_id: Mapped[str] = mapped_column(
         String,
         ForeignKey(
-            "tasks.id", name="fk_service_name_task_mappings_task_id", ondelete="CASCADE"
+            "tasks.id",
+            name="fk_service_name_task_mappings_task_id",
+            ondelete="CASCADE",
         ),
         nullable=False,
         index=True,
@@ -236,6 +263,8 @@ class DatabaseSpan(Base):
     prompt_token_cost: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     completion_token_cost: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     total_token_cost: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    # materialized from raw_data, see utils.materialized_attributes
+    model_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP,
@@ -268,6 +297,13 @@ class DatabaseSpan(Base):
         ),
         Index("idx_spans_total_token_count", "total_token_count"),
         Index("idx_spans_total_token_cost", "total_token_cost"),
+        Index(
+            "idx_spans_task_model_time",
+            "task_id",
+            "model_name",
+            "start_time",
+            postgresql_where=text("model_name IS NOT NULL"),
+        ),
     )
 
     metric_results: Mapped[List["DatabaseMetricResult"]] = relationship(
@@ -320,6 +356,10 @@ class DatabaseMetricResult(Base):
     prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
     completion_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
     latency_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    # materialized from details, see utils.materialized_attributes
+    relevance_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    tool_selection: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    tool_usage: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     span_id: Mapped[str] = mapped_column(
         String,
         ForeignKey("spans.id"),
@@ -336,4 +376,17 @@ class DatabaseMetricResult(Base):
 
     __table_args__ = (
         Index("idx_metric_results_span_id_metric_type", "span_id", "metric_type"),
+        Index(
+            "idx_metric_results_type_relevance_score",
+            "metric_type",
+            "relevance_score",
+            postgresql_where=text("relevance_score IS NOT NULL"),
+        ),
+        Index(
+            "idx_metric_results_type_tool_classification",
+            "metric_type",
+            "tool_selection",
+            "tool_usage",
+            postgresql_where=text("tool_selection IS NOT NULL"),
+        ),
     )
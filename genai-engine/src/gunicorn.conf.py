@@ -3,6 +3,8 @@ from os import environ
 from gunicorn.arbiter import Arbiter
 from gunicorn.workers.base import Worker
 
+from utils.utils import preload_models_enabled
+
 bind = "0.0.0.0:" + environ.get("PORT", "3030")
 workers = environ.get("WORKERS", 1)
 loglevel = environ.get("LOG_LEVEL", "info")
@@ -20,10 +22,18 @@ max_requests = int(environ.get("MAX_REQUESTS", 0))  # 0 = disabled
 # The maximum jitter to add to the max_requests setting.
 max_requests_jitter = int(environ.get("MAX_REQUESTS_JITTER", 0))
 
+# Load models once in the master so workers share them copy-on-write
+PRELOAD_MODELS = preload_models_enabled()
+
 
 def on_starting(server: Arbiter) -> None:
     """Called just before the master process is initialized."""
     server.log.info("Gunicorn master process starting")
+    if PRELOAD_MODELS:
+        from utils.model_preload import preload_models
+
+        server.log.info("Preloading models in the master process")
+        preload_models()
 
 
 def when_ready(server: Arbiter) -> None:
@@ -48,3 +58,7 @@ def pre_fork(server: Arbiter, worker: Worker) -> None:
 def post_fork(server: Arbiter, worker: Worker) -> None:
     """Called just after a worker has been forked."""
     server.log.info(f"Worker spawned (pid: {worker.pid})")
+    if PRELOAD_MODELS:
+        from utils.model_preload import init_worker
+
+        init_worker()
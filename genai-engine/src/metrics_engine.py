@@ -10,9 +10,12 @@ from opentelemetry import trace
 
 from schemas.internal_schemas import Metric, MetricResult
 from scorer.score import ScorerClient
-from utils import constants
 from utils.metric_counters import METRIC_FAILURE_COUNTER
-from utils.utils import TracedThreadPoolExecutor, get_env_var
+from utils.rule_executor import (
+    METRIC_TYPE_LANES,
+    ExecutorLane,
+    get_rule_executor_pool,
+)
 
 tracer = trace.get_tracer(__name__)
 
@@ -45,16 +48,11 @@ class MetricsEngine:
         thread_futures: list[tuple[Metric, concurrent.futures.Future[MetricResult]]] = (
             []
         )
-        num_threads = int(
-            get_env_var(
-                constants.GENAI_ENGINE_THREAD_POOL_MAX_WORKERS_ENV_VAR,
-                default=str(constants.DEFAULT_THREAD_POOL_MAX_WORKERS),
-            )
-        )
-        with TracedThreadPoolExecutor(tracer, max_workers=num_threads) as executor:
-            for metric in metrics:
-                future = executor.submit(self.run_metric, request, metric)
-                thread_futures.append((metric, future))
+        executor_pool = get_rule_executor_pool()
+        for metric in metrics:
+            lane = METRIC_TYPE_LANES.get(metric.type, ExecutorLane.LLM)
+            future = executor_pool.submit(lane, self.run_metric, request, metric)
+            thread_futures.append((metric, future))
         metric_results: list[MetricResult] = []
         for metric, future in thread_futures:
             exc = future.exception()
@@ -8,6 +8,7 @@ from repositories.configuration_repository import ConfigurationRepository
 from repositories.metrics_repository import MetricRepository
 from repositories.rules_repository import RuleRepository
 from repositories.tasks_repository import TaskRepository
+from services.base_queue_service import USER_REQUESTED_JOB_PRIORITY
 from services.task.global_agent_polling_service import (
     AgentPollingJob,
     get_global_agent_polling_service,
@@ -77,7 +78,7 @@ class AgentPollingRepository:
                 detail=f"Task {task_id} is not a GCP agent. Only GCP agents support polling.",
             )
 
-        job = AgentPollingJob(task_id=task.id)
+        job = AgentPollingJob(task_id=task.id, priority=USER_REQUESTED_JOB_PRIORITY)
         enqueued, _ = polling_service.enqueue(job)
         if enqueued:
             logger.info(f"Enqueued manual polling job for task {task_id}")
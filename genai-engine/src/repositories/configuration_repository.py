@@ -1,10 +1,17 @@
+from cachetools import TTLCache
 from sqlalchemy.orm import Session
 
+from config.cache_config import cache_config
 from db_models import DatabaseApplicationConfiguration
 from schemas.enums import ApplicationConfigurations
 from schemas.internal_schemas import ApplicationConfiguration
 from schemas.request_schemas import ApplicationConfigurationUpdateRequest
 
+CACHED_CONFIGURATION: TTLCache[str, ApplicationConfiguration] = TTLCache(
+    maxsize=1,
+    ttl=cache_config.APPLICATION_CONFIGURATION_CACHE_TTL,
+)
+
 
 class ConfigurationRepository:
     def __init__(self, db_session: Session) -> None:
@@ -93,6 +100,7 @@ class ConfigurationRepository:
             self.db_session.add(trace_retention)
 
         self.db_session.commit()
+        self.clear_cache()
         return self.get_configurations()
 
     def get_database_configurations(self) -> list[DatabaseApplicationConfiguration]:
@@ -104,6 +112,19 @@ class ConfigurationRepository:
         config = ApplicationConfiguration._from_database_model(configs)
         return config
 
+    def get_configurations_cached(self) -> ApplicationConfiguration:
+        """get_configurations for hot paths, re-read once the cached copy expires."""
+        if not cache_config.APPLICATION_CONFIGURATION_CACHE_ENABLED:
+            return self.get_configurations()
+        config = CACHED_CONFIGURATION.get("configurations")
+        if config is None:
+            config = self.get_configurations()
+            CACHED_CONFIGURATION["configurations"] = config
+        return config
+
+    def clear_cache(self) -> None:
+        CACHED_CONFIGURATION.clear()
+
 
 def update_or_create_config(
     key: str,
@@ -19,8 +19,14 @@ from db_models.llm_eval_models import DatabaseContinuousEval
 from db_models.task_models import DatabaseTask
 from db_models.telemetry_models import DatabaseTraceMetadata
 from repositories.organizations_repository import lookup_org_id
+from repositories.trace_rollup_repository import (
+    refresh_trace_rollups,
+    trace_rollup_keys,
+    trace_rollup_keys_for_annotations,
+)
 from schemas.enums import TestRunStatus
 from schemas.internal_schemas import AgenticAnnotation, ContinuousEvalTestRun
+from services.base_queue_service import USER_REQUESTED_JOB_PRIORITY
 from services.continuous_eval import (
     ContinuousEvalJob,
     get_continuous_eval_queue_service,
@@ -128,6 +134,12 @@ class ContinuousEvalTestRunRepository:
             self.db_session.add(annotation)
             annotations.append(annotation)
 
+        self.db_session.flush()
+        refresh_trace_rollups(
+            self.db_session,
+            trace_rollup_keys(self.db_session, existing_trace_ids),
+        )
+
         # Commit all annotations so worker threads can see them
         self.db_session.commit()
 
@@ -140,6 +152,7 @@ class ContinuousEvalTestRunRepository:
                 continuous_eval_id=continuous_eval_id,
                 task_id=task_id,
                 delay_seconds=0,
+                priority=USER_REQUESTED_JOB_PRIORITY,
             )
             queue_service.enqueue(job)
 
@@ -275,11 +288,16 @@ class ContinuousEvalTestRunRepository:
                 status_code=404,
                 detail=f"Test run {test_run_id} not found.",
             )
+        rollup_keys = trace_rollup_keys_for_annotations(
+            self.db_session,
+            DatabaseAgenticAnnotation.test_run_id == test_run_id,
+        )
         # Delete annotations explicitly (CASCADE may not be enforced in all DB engines)
         self.db_session.query(DatabaseAgenticAnnotation).filter(
             DatabaseAgenticAnnotation.test_run_id == test_run_id,
         ).delete()
         self.db_session.delete(db_test_run)
+        refresh_trace_rollups(self.db_session, rollup_keys)
         self.db_session.commit()
 
     def count_test_run_results(self, test_run_id: uuid.UUID) -> int:
@@ -11,7 +11,7 @@ from arthur_common.models.enums import (
 )
 from arthur_common.models.task_eval_schemas import TraceTransformDefinition
 from fastapi import HTTPException
-from sqlalchemy import asc, case, desc, func, select
+from sqlalchemy import asc, case, desc, func, insert, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Query, Session
 
@@ -20,7 +20,11 @@ from db_models.agentic_annotation_models import DatabaseAgenticAnnotation
 from db_models.continuous_eval_test_run_models import DatabaseContinuousEvalTestRun
 from db_models.llm_eval_models import DatabaseContinuousEval
 from db_models.task_models import DatabaseTask
-from repositories.organizations_repository import lookup_org_id
+from repositories.trace_rollup_repository import (
+    refresh_trace_rollups,
+    trace_rollup_keys,
+    trace_rollup_keys_for_annotations,
+)
 from schemas.internal_schemas import AgenticAnnotation, ContinuousEval
 from schemas.llm_eval_schemas import Eval
 from schemas.request_schemas import (
@@ -34,6 +38,7 @@ from schemas.response_schemas import (
     ContinuousEvalRerunResponse,
     DailyAgenticAnnotationStats,
 )
+from services.base_queue_service import USER_REQUESTED_JOB_PRIORITY
 from services.continuous_eval import (
     ContinuousEvalJob,
     get_continuous_eval_queue_service,
@@ -465,106 +470,137 @@ class ContinuousEvalsRepository:
                 headers={"full_stacktrace": "false"},
             )
 
+        # its annotations go with it, so the eval counts of their traces change
+        rollup_keys = trace_rollup_keys_for_annotations(
+            self.db_session,
+            DatabaseAgenticAnnotation.continuous_eval_id == eval_id,
+        )
+
         self.db_session.delete(db_continuous_eval)
+        self.db_session.flush()
+        refresh_trace_rollups(self.db_session, rollup_keys)
         self.db_session.commit()
 
-    def _enqueue_continuous_evals_for_trace(
+    def enqueue_continuous_evals_for_root_spans(
         self,
-        trace_id: str,
-        task_id: str,
+        root_spans: list[DatabaseSpan],
         delay_seconds: int = 10,
         commit: bool = True,
     ) -> None:
-        """Enqueue continuous eval jobs for a specific trace."""
+        """Find root spans and enqueue continuous eval jobs for them.
+
+        Set based for whole ingest batches: the enabled continuous evals and the org
+        of every task in the batch are read once, the pending annotations of all traces
+        are inserted in one statement and the jobs are submitted together.
+        """
+
+        # Unique traces for continuous eval execution, in order of arrival
+        trace_task_ids: dict[str, str] = {}
+        for root_span in root_spans:
+            if root_span.parent_span_id is not None:
+                continue
+
+            # if trace comes from an agent experiment, do not run evals
+            if root_span.session_id is not None and root_span.session_id.startswith(
+                AGENT_EXPERIMENT_SESSION_PREFIX,
+            ):
+                continue
+
+            if root_span.task_id and root_span.trace_id not in trace_task_ids:
+                trace_task_ids[root_span.trace_id] = root_span.task_id
+
+        if not trace_task_ids:
+            return
+
         try:
             queue_service = get_continuous_eval_queue_service()
             if not queue_service:
                 logger.debug("Continuous eval queue service not available, skipping")
                 return
 
-            # Get all continuous evals for this task
-            continuous_evals = (
+            task_ids = set(trace_task_ids.values())
+            continuous_evals_by_task: dict[str, list[DatabaseContinuousEval]] = {}
+            for continuous_eval in (
                 self.db_session.query(DatabaseContinuousEval)
-                .filter(DatabaseContinuousEval.task_id == task_id)
+                .filter(DatabaseContinuousEval.task_id.in_(task_ids))
                 .filter(DatabaseContinuousEval.enabled == True)
                 .all()
+            ):
+                continuous_evals_by_task.setdefault(continuous_eval.task_id, []).append(
+                    continuous_eval,
+                )
+
+            if not continuous_evals_by_task:
+                return
+
+            org_ids_by_task = dict(
+                self.db_session.execute(
+                    select(DatabaseTask.id, DatabaseTask.org_id).where(
+                        DatabaseTask.id.in_(continuous_evals_by_task.keys()),
+                    ),
+                ).all(),
             )
 
-            if not continuous_evals:
+            # Pending annotations and their jobs
+            now = datetime.now()
+            annotations = []
+            jobs = []
+            for trace_id, task_id in trace_task_ids.items():
+                for continuous_eval in continuous_evals_by_task.get(task_id, []):
+                    annotation_id = uuid.uuid4()
+                    annotations.append(
+                        {
+                            "id": annotation_id,
+                            "annotation_type": AgenticAnnotationType.CONTINUOUS_EVAL.value,
+                            "trace_id": trace_id,
+                            "continuous_eval_id": continuous_eval.id,
+                            "run_status": ContinuousEvalRunStatus.PENDING.value,
+                            "created_at": now,
+                            "updated_at": now,
+                            "org_id": org_ids_by_task.get(task_id),
+                        },
+                    )
+                    jobs.append(
+                        ContinuousEvalJob(
+                            annotation_id=annotation_id,
+                            trace_id=trace_id,
+                            continuous_eval_id=continuous_eval.id,
+                            task_id=task_id,
+                            delay_seconds=delay_seconds,
+                        ),
+                    )
+
+            if not annotations:
                 return
 
-            task_org_id = lookup_org_id(
+            self.db_session.execute(insert(DatabaseAgenticAnnotation), annotations)
+            refresh_trace_rollups(
                 self.db_session,
-                select(DatabaseTask.org_id).where(DatabaseTask.id == task_id),
+                trace_rollup_keys(
+                    self.db_session,
+                    {annotation["trace_id"] for annotation in annotations},
+                ),
             )
-
-            # Create pending annotations and enqueue jobs
-            for continuous_eval in continuous_evals:
-                annotation = DatabaseAgenticAnnotation(
-                    id=uuid.uuid4(),
-                    annotation_type=AgenticAnnotationType.CONTINUOUS_EVAL,
-                    trace_id=trace_id,
-                    continuous_eval_id=continuous_eval.id,
-                    run_status=ContinuousEvalRunStatus.PENDING,
-                    created_at=datetime.now(),
-                    updated_at=datetime.now(),
-                    org_id=task_org_id,
-                )
-                self.db_session.add(annotation)
-                if commit:
-                    self.db_session.commit()
-                    self.db_session.refresh(annotation)
-                else:
-                    self.db_session.flush()
-
-                # Enqueue job with 10s delay
-                job = ContinuousEvalJob(
-                    annotation_id=annotation.id,
-                    trace_id=trace_id,
-                    continuous_eval_id=continuous_eval.id,
-                    task_id=task_id,
-                    delay_seconds=delay_seconds,
-                )
-                queue_service.enqueue(job)  # Ignore return value
+            if commit:
+                # annotations must be visible to the workers before jobs run
+                self.db_session.commit()
+                queue_service.enqueue_many(jobs)
+            else:
+                self.db_session.flush()
+                # durable jobs are queued in the caller's transaction, so a rollback
+                # can't leave jobs behind for annotations that don't exist
+                queue_service.enqueue_many(jobs, db_session=self.db_session)
 
             logger.info(
-                f"Enqueued {len(continuous_evals)} continuous eval jobs for trace {trace_id}",
+                f"Enqueued {len(jobs)} continuous eval jobs for "
+                f"{len(trace_task_ids)} traces",
             )
         except Exception as e:
             logger.error(
-                f"Error enqueueing continuous evals for trace {trace_id}: {e}",
+                f"Error enqueueing continuous evals for {len(trace_task_ids)} traces: {e}",
                 exc_info=True,
             )
 
-    def enqueue_continuous_evals_for_root_spans(
-        self,
-        root_spans: list[DatabaseSpan],
-        delay_seconds: int = 10,
-        commit: bool = True,
-    ) -> None:
-        """Find root spans and enqueue continuous eval jobs for them."""
-
-        # Enqueue unique traces for continuous eval execution
-        seen_trace_ids = set()
-        for root_span in root_spans:
-            if root_span.parent_span_id is not None:
-                continue
-
-            # if trace comes from an agent experiment, do not run evals
-            if root_span.session_id is not None and root_span.session_id.startswith(
-                AGENT_EXPERIMENT_SESSION_PREFIX,
-            ):
-                continue
-
-            if root_span.task_id and root_span.trace_id not in seen_trace_ids:
-                seen_trace_ids.add(root_span.trace_id)
-                self._enqueue_continuous_evals_for_trace(
-                    root_span.trace_id,
-                    root_span.task_id,
-                    delay_seconds=delay_seconds,
-                    commit=commit,
-                )
-
     def rerun_continuous_eval_by_annotation_id(
         self,
         run_id: uuid.UUID,
@@ -670,6 +706,7 @@ class ContinuousEvalsRepository:
             continuous_eval_id=annotation.continuous_eval_id,
             task_id=continuous_eval.task_id,
             delay_seconds=delay_seconds,
+            priority=USER_REQUESTED_JOB_PRIORITY,
         )
         queue_service.enqueue(job)  # Ignore return value
 
@@ -12,7 +12,7 @@ from fastapi import HTTPException
 from fastapi_pagination import Page, Params
 from fastapi_pagination.ext.sqlalchemy import paginate
 from opentelemetry import trace
-from sqlalchemy import and_, asc, desc, func, or_, select
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, aliased, selectinload
 
@@ -39,6 +39,7 @@ from schemas.internal_schemas import (
     RuleEngineResult,
 )
 from utils.constants import DEFAULT_ORG_ID, SYSTEM_ORG_ID
+from utils.keyset_pagination import keyset_after, keyset_order_by
 from utils.token_count import TokenCounter
 
 logger = logging.getLogger()
@@ -134,6 +135,7 @@ class InferenceRepository:
         response_statuses: list[RuleResultEnum] = [],
         include_count: bool = True,
         org_scope: uuid.UUID | None = None,
+        cursor: str | None = None,
     ) -> tuple[list[Inference], int]:
         stmt = self.db_session.query(DatabaseInference.id, DatabaseInference.created_at)
 
@@ -172,10 +174,10 @@ class InferenceRepository:
                 )
             )
 
-        if sort == PaginationSortMethod.DESCENDING or sort is None:
-            stmt = stmt.order_by(desc(DatabaseInference.created_at))
-        elif sort == PaginationSortMethod.ASCENDING:
-            stmt = stmt.order_by(asc(DatabaseInference.created_at))
+        # id breaks created_at ties, so that cursors can continue after any row
+        descending = sort != PaginationSortMethod.ASCENDING
+        inference_key = [DatabaseInference.created_at, DatabaseInference.id]
+        stmt = stmt.order_by(*keyset_order_by(inference_key, descending))
         if task_ids:
             stmt = stmt.where(DatabaseInference.task_id.in_(task_ids))
         if task_name:
@@ -236,7 +238,9 @@ class InferenceRepository:
         if count == 0:
             return [], 0
 
-        if page is not None:
+        if cursor is not None:
+            stmt = stmt.filter(keyset_after(inference_key, cursor, descending))
+        elif page is not None:
             stmt = stmt.offset(page * page_size)
         stmt = stmt.limit(page_size)
         inference_id_timestamps = stmt.all()
@@ -342,10 +346,9 @@ class InferenceRepository:
             .where(DatabaseInference.id.in_(inference_ids))
         )
 
-        if sort == PaginationSortMethod.DESCENDING or sort is None:
-            inference_stmt = inference_stmt.order_by(desc(DatabaseInference.created_at))
-        elif sort == PaginationSortMethod.ASCENDING:
-            inference_stmt = inference_stmt.order_by(asc(DatabaseInference.created_at))
+        inference_stmt = inference_stmt.order_by(
+            *keyset_order_by(inference_key, descending),
+        )
         results: list[DatabaseInference] = inference_stmt.all()
 
         inferences = [Inference._from_database_model(di) for di in results]
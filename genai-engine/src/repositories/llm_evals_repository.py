@@ -12,6 +12,7 @@ from litellm import supports_response_schema
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from clients.llm.llm_client import LLMClient
 from db_models.llm_eval_models import DatabaseLLMEval, DatabaseLLMEvalVersionTag
 from repositories.base_llm_repository import BaseLLMRepository
 from repositories.model_provider_repository import ModelProviderRepository
@@ -182,7 +183,23 @@ class LLMEvalsRepository(
 
         # get the llm eval
         llm_eval = self.get_llm_item(task_id, eval_name, version)
+        model_provider = self._check_llm_eval_runnable(llm_eval)
 
+        # get the llm client
+        llm_client = self.model_provider_repo.get_model_provider_client(
+            provider=model_provider,
+        )
+
+        return self.run_resolved_llm_eval(
+            llm_eval,
+            llm_client,
+            org_id=org_id,
+            completion_request=completion_request,
+        )
+
+    @staticmethod
+    def _check_llm_eval_runnable(llm_eval: Eval) -> ModelProvider:
+        """Raise if the llm eval can't be run. Returns its model provider."""
         if llm_eval.deleted_at is not None:
             raise ValueError(
                 f"Cannot run this llm eval because it was deleted on: {llm_eval.deleted_at}",
@@ -196,11 +213,17 @@ class LLMEvalsRepository(
             raise ValueError(
                 f"LLM eval '{llm_eval.name}' has no model_name configured.",
             )
+        return llm_eval.model_provider
 
-        # get the llm client
-        llm_client = self.model_provider_repo.get_model_provider_client(
-            provider=llm_eval.model_provider,
-        )
+    def run_resolved_llm_eval(
+        self,
+        llm_eval: Eval,
+        llm_client: LLMClient,
+        org_id: uuid.UUID,
+        completion_request: Optional[BaseCompletionRequest] = None,
+    ) -> EvalRunResponse:
+        """Run an llm eval that was already looked up, with a client for its model provider."""
+        self._check_llm_eval_runnable(llm_eval)
 
         # NOTE: We currently don't set litellm.enable_json_schema_validation=True, which has litellm validate schemas for models that support structured outputs
         # Some vertex ai models return true for the function below, but don't do any schema validations: https://docs.litellm.ai/docs/completion/json_mode?#validate-json-schema
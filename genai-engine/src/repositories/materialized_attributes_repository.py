@@ -0,0 +1,173 @@
+"""Repository for backfilling materialized span and metric result attribute columns."""
+
+from __future__ import annotations
+
+import logging
+
+from arthur_common.models.enums import MetricType
+from sqlalchemy import case, select, update
+from sqlalchemy.orm import Session
+
+from db_models import (
+    DatabaseApplicationConfiguration,
+    DatabaseMetricResult,
+    DatabaseSpan,
+)
+from schemas.enums import ApplicationConfigurations
+from utils.constants import SPAN_KIND_LLM
+from utils.materialized_attributes import (
+    MATERIALIZED_ATTRIBUTES_VERSION,
+    RELEVANCE_SCORE_PATHS,
+    SPAN_MODEL_NAME_PATH,
+    TOOL_CLASSIFICATION_PATHS,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MATERIALIZED_ATTRIBUTES_BATCH_SIZE = 1000
+
+# The backfill version only ever goes up, so once this process has seen it complete
+# it doesn't need to check again.
+_backfill_complete = False
+
+
+def materialized_attributes_ready(db_session: Session) -> bool:
+    """Whether the materialized attribute columns are filled for every stored row."""
+    global _backfill_complete
+    if _backfill_complete:
+        return True
+
+    row = (
+        db_session.query(DatabaseApplicationConfiguration)
+        .filter_by(
+            name=ApplicationConfigurations.MATERIALIZED_ATTRIBUTES_BACKFILL_VERSION,
+        )
+        .first()
+    )
+    try:
+        complete = row is not None and int(row.value) >= MATERIALIZED_ATTRIBUTES_VERSION
+    except ValueError:
+        complete = False
+    _backfill_complete = complete
+    return complete
+
+
+def mark_materialized_attributes_ready(db_session: Session) -> None:
+    """Records that the backfill of the current attribute version completed."""
+    row = (
+        db_session.query(DatabaseApplicationConfiguration)
+        .filter_by(
+            name=ApplicationConfigurations.MATERIALIZED_ATTRIBUTES_BACKFILL_VERSION,
+        )
+        .first()
+    )
+    value = str(MATERIALIZED_ATTRIBUTES_VERSION)
+    if row is None:
+        db_session.add(
+            DatabaseApplicationConfiguration(
+                name=ApplicationConfigurations.MATERIALIZED_ATTRIBUTES_BACKFILL_VERSION,
+                value=value,
+            ),
+        )
+    else:
+        row.value = value
+
+
+def backfill_span_model_names(
+    db_session: Session,
+    after_id: str | None,
+    batch_size: int = DEFAULT_MATERIALIZED_ATTRIBUTES_BATCH_SIZE,
+) -> str | None:
+    """Fills model_name for the next batch of LLM spans by id.
+
+    Returns:
+        The last span id of the batch to continue after, or None when done
+    """
+    model_name = DatabaseSpan.raw_data[SPAN_MODEL_NAME_PATH].as_string()
+    stmt = (
+        select(DatabaseSpan.id)
+        .where(
+            DatabaseSpan.span_kind == SPAN_KIND_LLM,
+            DatabaseSpan.model_name.is_(None),
+            model_name.is_not(None),
+        )
+        .order_by(DatabaseSpan.id)
+        .limit(batch_size)
+    )
+    if after_id is not None:
+        stmt = stmt.where(DatabaseSpan.id > after_id)
+    span_ids = list(db_session.execute(stmt).scalars())
+    if not span_ids:
+        return None
+
+    db_session.execute(
+        update(DatabaseSpan)
+        .where(DatabaseSpan.id.in_(span_ids))
+        .values(model_name=model_name)
+        .execution_options(synchronize_session=False),
+    )
+    logger.debug("Backfilled model_name of %d spans", len(span_ids))
+    return span_ids[-1]
+
+
+def backfill_metric_result_columns(
+    db_session: Session,
+    after_id: str | None,
+    batch_size: int = DEFAULT_MATERIALIZED_ATTRIBUTES_BATCH_SIZE,
+) -> str | None:
+    """Fills relevance_score, tool_selection and tool_usage for the next batch by id.
+
+    Returns:
+        The last metric result id of the batch to continue after, or None when done
+    """
+    details = DatabaseMetricResult.details
+    relevance_score = case(
+        *[
+            (
+                DatabaseMetricResult.metric_type == metric_type.value,
+                details[path].as_float(),
+            )
+            for metric_type, path in RELEVANCE_SCORE_PATHS.items()
+        ],
+    )
+    tool_columns = {
+        column: case(
+            (
+                DatabaseMetricResult.metric_type == MetricType.TOOL_SELECTION.value,
+                details[path].as_integer(),
+            ),
+        )
+        for column, path in TOOL_CLASSIFICATION_PATHS.items()
+    }
+
+    stmt = (
+        select(DatabaseMetricResult.id)
+        .where(
+            DatabaseMetricResult.metric_type.in_(
+                [
+                    *[metric_type.value for metric_type in RELEVANCE_SCORE_PATHS],
+                    MetricType.TOOL_SELECTION.value,
+                ],
+            ),
+            DatabaseMetricResult.details.is_not(None),
+            DatabaseMetricResult.relevance_score.is_(None),
+            DatabaseMetricResult.tool_selection.is_(None),
+            DatabaseMetricResult.tool_usage.is_(None),
+        )
+        .order_by(DatabaseMetricResult.id)
+        .limit(batch_size)
+    )
+    if after_id is not None:
+        stmt = stmt.where(DatabaseMetricResult.id > after_id)
+    metric_result_ids = list(db_session.execute(stmt).scalars())
+    if not metric_result_ids:
+        return None
+
+    db_session.execute(
+        update(DatabaseMetricResult)
+        .where(DatabaseMetricResult.id.in_(metric_result_ids))
+        .values(relevance_score=relevance_score, **tool_columns)
+        .execution_options(synchronize_session=False),
+    )
+    logger.debug("Backfilled columns of %d metric results", len(metric_result_ids))
+    return metric_result_ids[-1]
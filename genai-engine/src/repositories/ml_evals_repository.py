@@ -138,10 +138,17 @@ class MLEvaluator(BaseEvaluator):
         # `org_id` is part of the BaseEvaluator contract for LLM billing
         # (UP-4390). Model-based ML evals don't call the LLM, so it's unused.
         ml_eval = self._repo.get_llm_item(task_id, eval_name, eval_version)
+        return self.run_resolved(ml_eval, resolved_variables)
 
+    def run_resolved(
+        self,
+        ml_eval: Eval,
+        resolved_variables: dict[str, str],
+    ) -> EvalRunResponse:
+        """Run an ML eval that was already looked up."""
         if ml_eval.deleted_at is not None:
             raise ValueError(
-                f"Cannot run eval '{eval_name}' version {ml_eval.version}: it has been deleted.",
+                f"Cannot run eval '{ml_eval.name}' version {ml_eval.version}: it has been deleted.",
             )
 
         text = resolved_variables.get(ML_EVAL_INPUT_VARIABLE, "")
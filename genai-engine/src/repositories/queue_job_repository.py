@@ -0,0 +1,194 @@
+"""Repository for the jobs of the durable queue backend.
+
+A queue job is visible once visible_at has passed. claim_queue_jobs locks visible jobs
+with FOR UPDATE SKIP LOCKED, so concurrent claimers on any replica each get different
+jobs, and leases them by moving visible_at lease_seconds ahead under a new lease_id.
+The lease holder extends it with heartbeats while the job runs and deletes the job
+once it ran. If the holder dies, the lease expires and the job is claimed again, up
+to max_attempts claims.
+
+SQLite ignores SKIP LOCKED; it's only used by unit tests with a single claimer.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from db_models import DatabaseQueueJob
+
+logger = logging.getLogger(__name__)
+
+QUEUE_JOB_INSERT_BATCH_SIZE = 1000
+
+
+@dataclass
+class NewQueueJob:
+    job_key: str
+    payload: dict[str, Any]
+    visible_at: datetime
+    priority: int = 0
+
+
+@dataclass
+class ClaimedQueueJob:
+    id: uuid.UUID
+    job_key: str
+    payload: dict[str, Any]
+    attempts: int
+    lease_id: uuid.UUID
+
+
+def insert_queue_jobs(
+    db_session: Session,
+    queue_name: str,
+    jobs: list[NewQueueJob],
+) -> int:
+    """Insert jobs, skipping those whose key is already queued. Returns the number inserted."""
+    is_postgres = db_session.get_bind().dialect.name == "postgresql"
+    now = datetime.now()
+    inserted = 0
+    for start in range(0, len(jobs), QUEUE_JOB_INSERT_BATCH_SIZE):
+        values = [
+            {
+                "id": uuid.uuid4(),
+                "queue_name": queue_name,
+                "job_key": job.job_key,
+                "payload": job.payload,
+                "priority": job.priority,
+                "visible_at": job.visible_at,
+                "lease_id": None,
+                "attempts": 0,
+                "created_at": now,
+            }
+            for job in jobs[start : start + QUEUE_JOB_INSERT_BATCH_SIZE]
+        ]
+        insert = pg_insert if is_postgres else sqlite_insert
+        stmt = (
+            insert(DatabaseQueueJob)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=["queue_name", "job_key"])
+        )
+        inserted += db_session.execute(stmt).rowcount
+    return inserted
+
+
+def claim_queue_jobs(
+    db_session: Session,
+    queue_name: str,
+    limit: int,
+    lease_seconds: float,
+    max_attempts: int,
+) -> list[ClaimedQueueJob]:
+    """Lease up to limit visible jobs, highest priority first, then earliest visible.
+
+    Visible jobs that were already claimed max_attempts times are dropped: their
+    workers died max_attempts times in a row.
+    """
+    now = datetime.now()
+    exhausted = db_session.execute(
+        delete(DatabaseQueueJob).where(
+            DatabaseQueueJob.queue_name == queue_name,
+            DatabaseQueueJob.visible_at <= now,
+            DatabaseQueueJob.attempts >= max_attempts,
+        ),
+    ).rowcount
+    if exhausted:
+        logger.warning(
+            f"Dropped {exhausted} {queue_name} jobs that were claimed {max_attempts} "
+            f"times without finishing",
+        )
+
+    rows = db_session.execute(
+        select(
+            DatabaseQueueJob.id,
+            DatabaseQueueJob.job_key,
+            DatabaseQueueJob.payload,
+            DatabaseQueueJob.attempts,
+        )
+        .where(
+            DatabaseQueueJob.queue_name == queue_name,
+            DatabaseQueueJob.visible_at <= now,
+        )
+        .order_by(DatabaseQueueJob.priority.desc(), DatabaseQueueJob.visible_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True),
+    ).all()
+    if not rows:
+        return []
+
+    lease_id = uuid.uuid4()
+    db_session.execute(
+        update(DatabaseQueueJob)
+        .where(DatabaseQueueJob.id.in_([row.id for row in rows]))
+        .values(
+            lease_id=lease_id,
+            visible_at=now + timedelta(seconds=lease_seconds),
+            attempts=DatabaseQueueJob.attempts + 1,
+        ),
+    )
+    return [
+        ClaimedQueueJob(
+            id=row.id,
+            job_key=row.job_key,
+            payload=row.payload,
+            attempts=row.attempts + 1,
+            lease_id=lease_id,
+        )
+        for row in rows
+    ]
+
+
+def extend_queue_job_leases(
+    db_session: Session,
+    lease_ids: Iterable[uuid.UUID],
+    lease_seconds: float,
+) -> int:
+    """Extend the leases of jobs still held under lease_ids. Returns the jobs extended."""
+    lease_ids = list(lease_ids)
+    if not lease_ids:
+        return 0
+    return db_session.execute(
+        update(DatabaseQueueJob)
+        .where(DatabaseQueueJob.lease_id.in_(lease_ids))
+        .values(visible_at=datetime.now() + timedelta(seconds=lease_seconds)),
+    ).rowcount
+
+
+def finish_queue_job(db_session: Session, job: ClaimedQueueJob) -> bool:
+    """Delete a job that ran. Returns False if its lease was lost to another claim."""
+    deleted = db_session.execute(
+        delete(DatabaseQueueJob).where(
+            DatabaseQueueJob.id == job.id,
+            DatabaseQueueJob.lease_id == job.lease_id,
+        ),
+    ).rowcount
+    return deleted > 0
+
+
+def release_queue_jobs(db_session: Session, jobs: list[ClaimedQueueJob]) -> int:
+    """Make claimed jobs that never started visible again without using an attempt."""
+    released = 0
+    now = datetime.now()
+    for job in jobs:
+        released += db_session.execute(
+            update(DatabaseQueueJob)
+            .where(
+                DatabaseQueueJob.id == job.id,
+                DatabaseQueueJob.lease_id == job.lease_id,
+            )
+            .values(
+                lease_id=None,
+                visible_at=now,
+                attempts=DatabaseQueueJob.attempts - 1,
+            ),
+        ).rowcount
+    return released
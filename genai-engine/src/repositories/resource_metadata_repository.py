@@ -7,6 +7,7 @@ from typing import Any, Optional
 from sqlalchemy.orm import Session
 
 from db_models import DatabaseResourceMetadata
+from utils.ingestion_lookup_cache import INGESTION_LOOKUP_CACHE
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,10 @@ class ResourceMetadataRepository:
         # Generate deterministic ID based on resource attributes content
         resource_id = self._generate_resource_id(resource_attributes)
 
+        # Rows are never updated or deleted, so a known id needs no round trip
+        if INGESTION_LOOKUP_CACHE.has_resource(resource_id):
+            return resource_id
+
         # Check if resource already exists
         existing = self.get_by_id(resource_id)
         if existing:
@@ -49,6 +54,7 @@ class ResourceMetadataRepository:
                 f"Resource metadata already exists with id={resource_id}, "
                 f"service_name={service_name}"
             )
+            INGESTION_LOOKUP_CACHE.add_resource(resource_id)
             return resource_id
 
         # Create new resource
@@ -59,6 +65,7 @@ class ResourceMetadataRepository:
         )
         self.db_session.add(resource)
         self.db_session.commit()
+        INGESTION_LOOKUP_CACHE.add_resource(resource_id)
 
         logger.debug(
             f"Created resource metadata with id={resource_id}, "
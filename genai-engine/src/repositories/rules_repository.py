@@ -10,6 +10,7 @@ from db_models import DatabaseRule
 from db_models.task_models import DatabaseTask, DatabaseTaskToRules
 from schemas.internal_schemas import Rule
 from utils import constants
+from utils.rule_result_cache import RULE_RESULT_CACHE
 
 
 class RuleRepository:
@@ -99,6 +100,7 @@ class RuleRepository:
         rule.archived = True
         if commit:
             self.db_session.commit()
+        RULE_RESULT_CACHE.invalidate_rule(rule_id)
 
     def unarchive_rule(self, rule_id: str, commit: bool = True) -> None:
         rule = self.db_session.get(DatabaseRule, rule_id)
@@ -110,7 +112,9 @@ class RuleRepository:
         rule.archived = False
         if commit:
             self.db_session.commit()
+        RULE_RESULT_CACHE.invalidate_rule(rule_id)
 
     def delete_rule(self, rule_id: str) -> None:
         self.db_session.query(DatabaseRule).filter(DatabaseRule.id == rule_id).delete()
         self.db_session.commit()
+        RULE_RESULT_CACHE.invalidate_rule(rule_id)
@@ -5,6 +5,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from db_models import DatabaseServiceNameTaskMapping
+from utils.ingestion_lookup_cache import INGESTION_LOOKUP_CACHE
 
 logger = logging.getLogger(__name__)
 
@@ -155,6 +156,7 @@ class ServiceNameMappingRepository:
 
         self.db_session.delete(mapping)
         self.db_session.commit()
+        INGESTION_LOOKUP_CACHE.invalidate_service_name(service_name)
 
         logger.warning(f"Deleted service name mapping: {service_name}")
         return True
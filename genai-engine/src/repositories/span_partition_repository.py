@@ -0,0 +1,200 @@
+"""Repository for the time partitions of the spans table.
+
+After the opt-in migration 9b4d2e7c1a3f, spans is range partitioned by start_time in
+daily or weekly partitions named spans_pYYYYMMDD after their lower bound, plus a
+spans_default partition for rows no range partition covers. Partitions are contiguous:
+each new one starts where the latest one ends.
+
+New partitions are built as plain tables, filled with the matching rows of the
+default partition and then attached, because creating a partition while the default
+partition holds rows in its range fails, and ATTACH PARTITION does not block writes to
+the other partitions the way CREATE TABLE ... PARTITION OF does.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from utils import constants
+
+logger = logging.getLogger(__name__)
+
+SPANS_TABLE = "spans"
+SPANS_DEFAULT_PARTITION = "spans_default"
+
+_RANGE_BOUND_PATTERN = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+class SpanPartition(NamedTuple):
+    name: str
+    lower: datetime
+    upper: datetime
+
+
+def partition_start(timestamp: datetime, interval: str) -> datetime:
+    """Lower bound of the partition of the given interval that holds timestamp."""
+    start = datetime(timestamp.year, timestamp.month, timestamp.day)
+    if interval == "weekly":
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def partition_end(lower: datetime, interval: str) -> datetime:
+    """Upper bound of the partition of the given interval that starts at lower."""
+    period = timedelta(days=7 if interval == "weekly" else 1)
+    return partition_start(lower, interval) + period
+
+
+def partition_name(lower: datetime) -> str:
+    return f"{SPANS_TABLE}_p{lower:%Y%m%d}"
+
+
+def spans_partitioned(db_session: Session) -> bool:
+    """Whether the spans table is range partitioned."""
+    if db_session.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(
+        db_session.execute(
+            text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:name)"),
+            {"name": SPANS_TABLE},
+        ).scalar(),
+    )
+
+
+def list_span_partitions(db_session: Session) -> list[SpanPartition]:
+    """Range partitions of spans ordered by lower bound, without the default one."""
+    rows = db_session.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:name)",
+        ),
+        {"name": SPANS_TABLE},
+    ).all()
+
+    partitions = []
+    for name, bound in rows:
+        match = _RANGE_BOUND_PATTERN.search(bound or "")
+        if match is None:
+            continue
+        partitions.append(
+            SpanPartition(
+                name=name,
+                lower=datetime.fromisoformat(match.group(1)),
+                upper=datetime.fromisoformat(match.group(2)),
+            ),
+        )
+    return sorted(partitions, key=lambda partition: partition.lower)
+
+
+def _quote(db_session: Session, name: str) -> str:
+    return db_session.get_bind().dialect.identifier_preparer.quote(name)
+
+
+def create_span_partition(
+    db_session: Session,
+    lower: datetime,
+    upper: datetime,
+) -> SpanPartition:
+    """Creates and attaches the partition for [lower, upper)."""
+    partition = SpanPartition(partition_name(lower), lower, upper)
+    name = _quote(db_session, partition.name)
+    db_session.execute(
+        text(
+            f"CREATE TABLE {name} (LIKE {SPANS_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        ),
+    )
+    # spans that arrived before their partition existed
+    db_session.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {SPANS_DEFAULT_PARTITION} "
+            "WHERE start_time >= :lower AND start_time < :upper RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved",
+        ),
+        {"lower": lower, "upper": upper},
+    )
+    db_session.execute(
+        text(
+            f"ALTER TABLE {SPANS_TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lower.isoformat(sep=' ')}') "
+            f"TO ('{upper.isoformat(sep=' ')}')",
+        ),
+    )
+    logger.info(
+        "Created span partition %s for [%s, %s)",
+        partition.name,
+        lower.isoformat(),
+        upper.isoformat(),
+    )
+    return partition
+
+
+def ensure_future_span_partitions(
+    db_session: Session,
+    now: datetime,
+    interval: str = constants.DEFAULT_SPAN_PARTITION_INTERVAL,
+    premake: int = constants.DEFAULT_SPAN_PARTITION_PREMAKE,
+) -> list[SpanPartition]:
+    """Creates partitions until premake partitions after the current one exist.
+
+    Commits after every partition so each ATTACH holds its locks only briefly.
+    """
+    partitions = list_span_partitions(db_session)
+    lower = partitions[-1].upper if partitions else partition_start(now, interval)
+
+    # the partition holding now, then premake more
+    horizon = partition_start(now, interval)
+    for _ in range(premake + 1):
+        horizon = partition_end(horizon, interval)
+
+    created = []
+    while lower < horizon:
+        upper = partition_end(lower, interval)
+        created.append(create_span_partition(db_session, lower, upper))
+        db_session.commit()
+        lower = upper
+    return created
+
+
+def drop_span_partition(db_session: Session, partition: SpanPartition) -> None:
+    """Detaches and drops a partition together with the metric results of its spans.
+
+    metric_results.span_id can not reference the partitioned spans table, so its rows
+    are removed here rather than by a foreign key.
+    """
+    name = _quote(db_session, partition.name)
+    db_session.execute(
+        text(
+            f"DELETE FROM metric_results WHERE span_id IN (SELECT id FROM {name})",
+        ),
+    )
+    db_session.execute(text(f"ALTER TABLE {SPANS_TABLE} DETACH PARTITION {name}"))
+    db_session.execute(text(f"DROP TABLE {name}"))
+    logger.info(
+        "Dropped span partition %s for [%s, %s)",
+        partition.name,
+        partition.lower.isoformat(),
+        partition.upper.isoformat(),
+    )
+
+
+def delete_default_partition_spans(db_session: Session, before: datetime) -> int:
+    """Deletes the spans of the default partition that start before a cutoff."""
+    db_session.execute(
+        text(
+            "DELETE FROM metric_results WHERE span_id IN "
+            f"(SELECT id FROM {SPANS_DEFAULT_PARTITION} WHERE start_time < :before)",
+        ),
+        {"before": before},
+    )
+    result = db_session.execute(
+        text(f"DELETE FROM {SPANS_DEFAULT_PARTITION} WHERE start_time < :before"),
+        {"before": before},
+    )
+    return int(result.rowcount or 0)  # type: ignore[attr-defined]
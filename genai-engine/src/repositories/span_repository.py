@@ -1,14 +1,12 @@
 import logging
 import math
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any, List, Optional, Tuple
 from uuid import UUID
 
 from arthur_common.models.common_schemas import PaginationParameters
 from arthur_common.models.enums import (
-    AgenticAnnotationType,
-    ContinuousEvalRunStatus,
     PaginationSortMethod,
     RegisteredAgentProvider,
 )
@@ -17,16 +15,24 @@ from arthur_common.models.response_schemas import TraceResponse
 from google.protobuf.message import DecodeError
 from openinference.semconv.trace import SpanAttributes
 from opentelemetry import trace
-from sqlalchemy import func, insert, literal, select
+from sqlalchemy import ColumnElement, and_, func, insert, literal, or_, select
 from sqlalchemy.orm import Session
 
 from db_models import DatabaseSpan
-from db_models.agentic_annotation_models import DatabaseAgenticAnnotation
 from db_models.task_models import DatabaseTask
 from db_models.telemetry_models import DatabaseTraceMetadata
 from repositories.metrics_repository import MetricRepository
 from repositories.organizations_repository import lookup_org_id
 from repositories.tasks_metrics_repository import TasksMetricsRepository
+from repositories.trace_rollup_repository import (
+    TimeRange,
+    TraceRollupTotals,
+    aggregate_trace_totals,
+    get_trace_rollup_totals,
+    merge_trace_totals,
+    plan_rollup_ranges,
+    trace_rollups_ready,
+)
 from schemas.enums import TaskAnalyticsBucketSize
 from schemas.internal_schemas import (
     AgenticAnnotation,
@@ -46,9 +52,15 @@ from schemas.response_schemas import (
     TraceTimeSeriesPoint,
     TraceTimeSeriesResponse,
 )
+from services.base_queue_service import USER_REQUESTED_JOB_PRIORITY
 from services.trace.gcp_conversion_service import GcpConversionService
 from services.trace.metrics_integration_service import MetricsIntegrationService
 from services.trace.otel_conversion_service import OtelConversionService
+from services.trace.span_metrics_queue_service import (
+    background_span_metrics_enabled,
+    enqueue_span_metrics,
+    get_span_ids_awaiting_metrics,
+)
 from services.trace.span_query_service import SpanQueryService
 from services.trace.trace_annotation_service import TraceAnnotationService
 from services.trace.trace_ingestion_service import TraceIngestionService
@@ -59,6 +71,7 @@ from utils.constants import (
     EXPECTED_SPAN_VERSION,
     SPAN_VERSION_KEY,
 )
+from utils.materialized_attributes import span_model_name
 from utils.trace import validate_span_version
 
 logger = logging.getLogger(__name__)
@@ -75,6 +88,23 @@ BUCKET_SIZE_SECONDS = {
 }
 
 
+def _naive_utc(timestamp: datetime) -> datetime:
+    # trace timestamps are stored as naive UTC
+    if timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _start_time_in_ranges(ranges: list[TimeRange]) -> list[ColumnElement[bool]]:
+    return [
+        and_(
+            DatabaseTraceMetadata.start_time >= lo,
+            DatabaseTraceMetadata.start_time < hi,
+        )
+        for lo, hi in ranges
+    ]
+
+
 class SpanRepository:
     def __init__(
         self,
@@ -99,6 +129,9 @@ class SpanRepository:
         self.otel_conversion_service = OtelConversionService()
         self.gcp_conversion_service = GcpConversionService()
 
+        # Spans of the returned results whose metrics are computed in the background
+        self.pending_metric_span_ids: set[str] = set()
+
     # ============================================================================
     # Public API Methods - Used by Optimized Trace Endpoints
     # ============================================================================
@@ -110,11 +143,15 @@ class SpanRepository:
         user_ids: Optional[list[str]] = None,
         include_spans: bool = False,
         sort_by: str = "start_time",
+        cursor: Optional[str] = None,
+        include_count: bool = True,
     ) -> tuple[int, list[TraceMetadata]]:
         """Get lightweight trace metadata for browsing/filtering operations.
 
         Returns metadata only without spans or metrics for fast performance.
         When include_spans=True, also fetches and attaches all spans for each trace as a flat list.
+        With a cursor, returns the page after it rather than the page number's.
+        The count is -1 when include_count=False.
         """
         # Convert to internal schema format
         internal_filters: TraceQuerySchema = TraceQuerySchema._from_request_model(
@@ -134,11 +171,13 @@ class SpanRepository:
                 filters=internal_filters,
                 pagination_parameters=pagination_parameters,
                 sort_by=sort_by,
+                cursor=cursor,
+                include_count=include_count,
             )
         )
 
-        if total_count == 0:
-            return 0, []
+        if not paginated_trace_ids:
+            return total_count, []
 
         # Get trace metadata objects directly (order matches paginated_trace_ids)
         trace_metadata_list = self.span_query_service.get_trace_metadata_by_ids(
@@ -157,7 +196,7 @@ class SpanRepository:
 
             # Add metrics to spans (existing metrics only, no computation)
             if valid_spans:
-                valid_spans = self.metrics_integration_service.add_metrics_to_spans(
+                valid_spans = self._add_metrics_to_spans(
                     valid_spans,
                     compute_new_metrics=False,
                 )
@@ -223,7 +262,7 @@ class SpanRepository:
 
         # Add existing metrics if requested
         if include_metrics and valid_spans:
-            valid_spans = self.metrics_integration_service.add_metrics_to_spans(
+            valid_spans = self._add_metrics_to_spans(
                 valid_spans,
                 compute_new_metrics,
             )
@@ -260,61 +299,34 @@ class SpanRepository:
         if not task_ids:
             return TraceOverviewListResponse(overviews=[], count=0)
 
-        # Trace count and token totals come straight from trace_metadata.
-        trace_rows = (
-            self.db_session.query(
-                DatabaseTraceMetadata.task_id.label("task_id"),
-                func.count().label("trace_count"),
-                func.coalesce(
-                    func.sum(DatabaseTraceMetadata.total_token_count),
-                    0,
-                ).label("trace_token_count"),
-                func.coalesce(
-                    func.sum(DatabaseTraceMetadata.total_token_cost),
-                    0.0,
-                ).label("trace_token_cost"),
-                func.max(DatabaseTraceMetadata.end_time).label("last_active"),
-            )
-            .filter(
-                DatabaseTraceMetadata.task_id.in_(task_ids),
-                DatabaseTraceMetadata.start_time >= start_time,
-                DatabaseTraceMetadata.start_time <= end_time,
-            )
-            .group_by(DatabaseTraceMetadata.task_id)
-            .all()
-        )
-
-        # Success rate is the fraction of continuous-eval annotations that passed,
-        # over the task's traces in the window. Kept as a separate query so the
-        # annotation join doesn't inflate the per-trace token sum above.
-        eval_rows = (
-            self.db_session.query(
-                DatabaseTraceMetadata.task_id.label("task_id"),
-                func.count().label("eval_count"),
-                func.count(DatabaseAgenticAnnotation.id)
-                .filter(
-                    DatabaseAgenticAnnotation.run_status
-                    == ContinuousEvalRunStatus.PASSED.value,
-                )
-                .label("passed_count"),
-            )
-            .join(
-                DatabaseAgenticAnnotation,
-                DatabaseAgenticAnnotation.trace_id == DatabaseTraceMetadata.trace_id,
+        window = [
+            DatabaseTraceMetadata.task_id.in_(task_ids),
+            DatabaseTraceMetadata.start_time >= start_time,
+            DatabaseTraceMetadata.start_time <= end_time,
+        ]
+        if trace_rollups_ready(self.db_session):
+            # whole minutes, hours and days from the rollups, the partial minutes at
+            # either end (and traces starting exactly at end_time) from trace_metadata
+            start_time, end_time = _naive_utc(start_time), _naive_utc(end_time)
+            plan = plan_rollup_ranges([start_time, end_time])
+            totals = merge_trace_totals(
+                get_trace_rollup_totals(self.db_session, task_ids, plan.rollup_ranges),
+                aggregate_trace_totals(
+                    self.db_session,
+                    [DatabaseTraceMetadata.task_id],
+                    *window,
+                    or_(
+                        DatabaseTraceMetadata.start_time == end_time,
+                        *_start_time_in_ranges(plan.raw_ranges),
+                    ),
+                ),
             )
-            .filter(
-                DatabaseTraceMetadata.task_id.in_(task_ids),
-                DatabaseTraceMetadata.start_time >= start_time,
-                DatabaseTraceMetadata.start_time <= end_time,
-                DatabaseAgenticAnnotation.annotation_type
-                == AgenticAnnotationType.CONTINUOUS_EVAL.value,
+        else:
+            totals = aggregate_trace_totals(
+                self.db_session,
+                [DatabaseTraceMetadata.task_id],
+                *window,
             )
-            .group_by(DatabaseTraceMetadata.task_id)
-            .all()
-        )
-        eval_by_task = {
-            row.task_id: (row.passed_count, row.eval_count) for row in eval_rows
-        }
 
         # Default every requested task to zeroed metrics so tasks with no traces
         # in the window still appear in the response.
@@ -330,22 +342,24 @@ class SpanRepository:
             for task_id in task_ids
         }
 
-        for row in trace_rows:
-            passed_count, eval_count = eval_by_task.get(row.task_id, (0, 0))
-
+        # Success rate is the fraction of continuous-eval annotations that passed,
+        # over the task's traces in the window.
+        for (task_id,), task_totals in totals.items():
             # No continuous evals run (i.e. nothing failed) will be 100%
             continuous_eval_success_rate = (
-                passed_count / eval_count if eval_count else 1.0
+                task_totals.eval_passed_count / task_totals.eval_count
+                if task_totals.eval_count
+                else 1.0
             )
 
-            overviews_by_task[row.task_id] = TraceOverviewResponse(
-                task_id=row.task_id,
-                trace_count=row.trace_count,
-                trace_token_count=int(row.trace_token_count),
-                trace_token_cost=float(row.trace_token_cost),
-                eval_count=eval_count,
+            overviews_by_task[task_id] = TraceOverviewResponse(
+                task_id=task_id,
+                trace_count=task_totals.trace_count,
+                trace_token_count=task_totals.token_count,
+                trace_token_cost=task_totals.token_cost,
+                eval_count=task_totals.eval_count,
                 continuous_eval_success_rate=continuous_eval_success_rate,
-                last_active=row.last_active,
+                last_active=task_totals.last_active,
             )
 
         overviews = list(overviews_by_task.values())
@@ -382,78 +396,65 @@ class SpanRepository:
                 - func.extract("epoch", literal(start_time))
             )
             / bucket_seconds,
-        )
+        ).label("bucket_index")
+        window = [
+            DatabaseTraceMetadata.task_id == task_id,
+            DatabaseTraceMetadata.start_time >= start_time,
+            DatabaseTraceMetadata.start_time < end_time,
+        ]
 
-        trace_rows = (
-            self.db_session.query(
-                bucket_index.label("bucket_index"),
-                func.count().label("trace_count"),
-                func.coalesce(
-                    func.sum(DatabaseTraceMetadata.total_token_count),
-                    0,
-                ).label("trace_token_count"),
-                func.coalesce(
-                    func.sum(DatabaseTraceMetadata.total_token_cost),
-                    0.0,
-                ).label("trace_token_cost"),
-            )
-            .filter(
-                DatabaseTraceMetadata.task_id == task_id,
-                DatabaseTraceMetadata.start_time >= start_time,
-                DatabaseTraceMetadata.start_time < end_time,
+        if trace_rollups_ready(self.db_session):
+            # rollup rows that fit inside a bucket, partial minutes at bucket
+            # boundaries from trace_metadata
+            plan = plan_rollup_ranges(
+                [
+                    start_time + timedelta(seconds=index * bucket_seconds)
+                    for index in range(num_buckets)
+                ]
+                + [end_time],
             )
-            .group_by(bucket_index)
-            .all()
-        )
-        trace_by_bucket = {int(row.bucket_index): row for row in trace_rows}
-
-        eval_rows = (
-            self.db_session.query(
-                bucket_index.label("bucket_index"),
-                func.count().label("eval_count"),
-                func.count(DatabaseAgenticAnnotation.id)
-                .filter(
-                    DatabaseAgenticAnnotation.run_status
-                    == ContinuousEvalRunStatus.PASSED.value,
-                )
-                .label("passed_count"),
-            )
-            .join(
-                DatabaseAgenticAnnotation,
-                DatabaseAgenticAnnotation.trace_id == DatabaseTraceMetadata.trace_id,
+            totals = merge_trace_totals(
+                get_trace_rollup_totals(
+                    self.db_session,
+                    [task_id],
+                    plan.rollup_ranges,
+                    bucket_origin=start_time,
+                    bucket_seconds=bucket_seconds,
+                ),
+                (
+                    aggregate_trace_totals(
+                        self.db_session,
+                        [DatabaseTraceMetadata.task_id, bucket_index],
+                        *window,
+                        or_(*_start_time_in_ranges(plan.raw_ranges)),
+                    )
+                    if plan.raw_ranges
+                    else {}
+                ),
             )
-            .filter(
-                DatabaseTraceMetadata.task_id == task_id,
-                DatabaseTraceMetadata.start_time >= start_time,
-                DatabaseTraceMetadata.start_time < end_time,
-                DatabaseAgenticAnnotation.annotation_type
-                == AgenticAnnotationType.CONTINUOUS_EVAL.value,
+        else:
+            totals = aggregate_trace_totals(
+                self.db_session,
+                [DatabaseTraceMetadata.task_id, bucket_index],
+                *window,
             )
-            .group_by(bucket_index)
-            .all()
-        )
-        eval_by_bucket = {
-            int(row.bucket_index): (row.passed_count, row.eval_count)
-            for row in eval_rows
-        }
 
         points = []
         for index in range(num_buckets):
             timestamp = start_time + timedelta(seconds=index * bucket_seconds)
-            trace_row = trace_by_bucket.get(index)
-            passed_count, eval_count = eval_by_bucket.get(index, (0, 0))
-            success_rate = passed_count / eval_count if eval_count else 1.0
+            bucket_totals = totals.get((task_id, index), TraceRollupTotals())
+            success_rate = (
+                bucket_totals.eval_passed_count / bucket_totals.eval_count
+                if bucket_totals.eval_count
+                else 1.0
+            )
 
             points.append(
                 TraceTimeSeriesPoint(
                     timestamp=timestamp,
-                    trace_count=trace_row.trace_count if trace_row else 0,
-                    trace_token_count=(
-                        int(trace_row.trace_token_count) if trace_row else 0
-                    ),
-                    trace_token_cost=(
-                        float(trace_row.trace_token_cost) if trace_row else 0.0
-                    ),
+                    trace_count=bucket_totals.trace_count,
+                    trace_token_count=bucket_totals.token_count,
+                    trace_token_cost=bucket_totals.token_cost,
                     continuous_eval_success_rate=success_rate,
                 ),
             )
@@ -503,6 +504,40 @@ class SpanRepository:
         ).first()
         return row is not None
 
+    def _add_metrics_to_spans(
+        self,
+        spans: list[Span],
+        compute_new_metrics: bool = True,
+    ) -> list[Span]:
+        """Embed metric results into spans, computing missing ones if requested.
+
+        In background span metrics mode missing metrics are never computed here: the
+        spans are queued for the span metrics workers and added to
+        pending_metric_span_ids instead. Spans whose job already ran without storing
+        any results are neither queued nor reported as pending.
+        """
+        if not compute_new_metrics or not background_span_metrics_enabled():
+            return self.metrics_integration_service.add_metrics_to_spans(
+                spans,
+                compute_new_metrics,
+            )
+
+        spans = self.metrics_integration_service.add_metrics_to_spans(
+            spans,
+            compute_new_metrics=False,
+        )
+        awaiting_spans = self.metrics_integration_service.get_spans_awaiting_metrics(
+            spans,
+        )
+        pending_span_ids = get_span_ids_awaiting_metrics(
+            [span.id for span in awaiting_spans],
+        )
+        if pending_span_ids:
+            # someone is waiting on these, ahead of freshly ingested spans
+            enqueue_span_metrics(pending_span_ids, priority=USER_REQUESTED_JOB_PRIORITY)
+            self.pending_metric_span_ids.update(pending_span_ids)
+        return spans
+
     def get_span_by_id(
         self,
         span_id: str,
@@ -530,7 +565,7 @@ class SpanRepository:
 
         # Add existing metrics if requested
         if include_metrics:
-            spans_with_metrics = self.metrics_integration_service.add_metrics_to_spans(
+            spans_with_metrics = self._add_metrics_to_spans(
                 [span],
                 compute_new_metrics,
             )
@@ -564,7 +599,7 @@ class SpanRepository:
         self.span_query_service.validate_span_for_metrics(span, span_id)
 
         # Compute metrics for this span
-        spans_with_metrics = self.metrics_integration_service.add_metrics_to_spans(
+        spans_with_metrics = self._add_metrics_to_spans(
             [span],
             compute_new_metrics=True,
         )
@@ -580,10 +615,13 @@ class SpanRepository:
         trace_ids: Optional[list[str]] = None,
         session_ids: Optional[list[str]] = None,
         include_experiment_sessions: Optional[bool] = False,
+        cursor: Optional[str] = None,
+        include_count: bool = True,
     ) -> tuple[int, list[SessionMetadata]]:
         """Return session aggregation data.
 
-        Returns aggregated session information with pagination.
+        Returns aggregated session information with pagination, from the page after
+        the cursor if one is given. The count is -1 when include_count=False.
         """
         if not task_ids:
             raise ValueError("task_ids are required for session queries")
@@ -598,6 +636,8 @@ class SpanRepository:
             trace_ids=trace_ids,
             session_ids=session_ids,
             include_experiment_sessions=include_experiment_sessions,
+            cursor=cursor,
+            include_count=include_count,
         )
 
         return count, session_metadata_list
@@ -634,7 +674,7 @@ class SpanRepository:
         # Validate spans and add existing metrics
         valid_spans = self.span_query_service.validate_spans(spans)
         if valid_spans:
-            valid_spans = self.metrics_integration_service.add_metrics_to_spans(
+            valid_spans = self._add_metrics_to_spans(
                 valid_spans,
                 compute_new_metrics=False,  # Only include existing metrics
             )
@@ -684,7 +724,7 @@ class SpanRepository:
         # Validate spans and compute metrics
         valid_spans = self.span_query_service.validate_spans(spans)
         if valid_spans:
-            valid_spans = self.metrics_integration_service.add_metrics_to_spans(
+            valid_spans = self._add_metrics_to_spans(
                 valid_spans,
                 compute_new_metrics=True,  # Compute missing metrics
             )
@@ -893,6 +933,7 @@ class SpanRepository:
                     prompt_token_cost=token_data.prompt_token_cost,
                     completion_token_cost=token_data.completion_token_cost,
                     total_token_cost=token_data.total_token_cost,
+                    model_name=span_model_name(raw_data, span_kind),
                 )
 
                 database_spans.append(db_span)
@@ -944,10 +985,13 @@ class SpanRepository:
         compute_new_metrics: bool = True,
         filters: Optional[TraceQueryRequest] = None,
         sort_by: str = "start_time",
+        cursor: Optional[str] = None,
+        include_count: bool = True,
     ) -> tuple[list[Span], int]:
         """Query spans with optional metrics computation.
 
         Uses comprehensive filtering if filters parameter provided, otherwise uses basic filtering.
+        Cursors and include_count=False are only supported with filters.
 
         Returns:
             tuple[list[Span], int]: (spans, total_count) where total_count is all items matching filters
@@ -971,6 +1015,8 @@ class SpanRepository:
                         page_size=page_size,
                     ),
                     sort_by=sort_by,
+                    cursor=cursor,
+                    include_count=include_count,
                 )
             )
 
@@ -981,6 +1027,9 @@ class SpanRepository:
             if not task_ids:
                 raise ValueError("task_ids are required for span queries")
 
+            if cursor is not None:
+                raise ValueError("Cursor pagination requires span filters")
+
             if include_metrics and compute_new_metrics and not task_ids:
                 raise ValueError(
                     "task_ids are required when include_metrics=True and compute_new_metrics=True",
@@ -1001,7 +1050,7 @@ class SpanRepository:
         # Validate spans and add metrics if requested
         valid_spans = self.span_query_service.validate_spans(spans)
         if include_metrics and valid_spans:
-            valid_spans = self.metrics_integration_service.add_metrics_to_spans(
+            valid_spans = self._add_metrics_to_spans(
                 valid_spans,
                 compute_new_metrics,
             )
@@ -1030,7 +1079,7 @@ class SpanRepository:
         self.span_query_service.validate_span_for_metrics(span, span_id)
 
         # Compute metrics for this span
-        spans_with_metrics = self.metrics_integration_service.add_metrics_to_spans(
+        spans_with_metrics = self._add_metrics_to_spans(
             [span],
         )
         return spans_with_metrics[0]  # Return the single span
@@ -1074,7 +1123,7 @@ class SpanRepository:
         # Validate spans and add metrics if requested
         valid_spans = self.span_query_service.validate_spans(spans)
         if include_metrics and valid_spans:
-            valid_spans = self.metrics_integration_service.add_metrics_to_spans(
+            valid_spans = self._add_metrics_to_spans(
                 valid_spans,
                 compute_new_metrics,
             )
@@ -44,6 +44,7 @@ from schemas.internal_schemas import (
 )
 from utils import constants
 from utils.constants import DEFAULT_ORG_ID
+from utils.ingestion_lookup_cache import INGESTION_LOOKUP_CACHE
 from utils.trace import get_nested_value
 
 tracer = trace.get_tracer(__name__)
@@ -212,7 +213,10 @@ class TaskRepository:
                     sub_agents_set.add(agent_name)
 
             elif span.span_kind == OpenInferenceSpanKindValues.LLM.value:
-                model_name = get_nested_value(attributes, "llm.model_name")
+                model_name = span.model_name or get_nested_value(
+                    attributes,
+                    "llm.model_name",
+                )
                 if model_name:
                     models_set.add(model_name)
 
@@ -325,6 +329,7 @@ class TaskRepository:
 
         db_task.archived = True
         self.db_session.commit()
+        INGESTION_LOOKUP_CACHE.invalidate_task(task_id)
 
     def unarchive_task(self, task_id: str) -> None:
         db_task = (
@@ -351,6 +356,7 @@ class TaskRepository:
 
         db_task.archived = False
         self.db_session.commit()
+        INGESTION_LOOKUP_CACHE.invalidate_task(task_id)
 
     def create_task(
         self,
@@ -533,6 +539,8 @@ class TaskRepository:
 
         self.db_session.query(DatabaseTask).filter(DatabaseTask.id == task_id).delete()
         self.db_session.commit()
+        # service name mappings of the task are deleted with it
+        INGESTION_LOOKUP_CACHE.invalidate_task(task_id)
 
     def update_all_tasks_add_default_rule(self, default_rule: Rule) -> None:
         tasks = self.get_all_tasks()
@@ -14,6 +14,10 @@ from db_models import (
     DatabaseSpan,
     DatabaseTraceMetadata,
 )
+from repositories.trace_rollup_repository import (
+    refresh_trace_rollups,
+    trace_rollup_keys,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -54,11 +58,13 @@ def delete_trace_batch(db_session: Session, trace_ids: list[str]) -> None:
     if not trace_ids:
         return
 
+    rollup_keys = trace_rollup_keys(db_session, trace_ids)
+
     # 1. Agentic annotations for these traces
     db_session.execute(
         delete(DatabaseAgenticAnnotation).where(
-            DatabaseAgenticAnnotation.trace_id.in_(trace_ids)
-        )
+            DatabaseAgenticAnnotation.trace_id.in_(trace_ids),
+        ),
     )
 
     # 2. Lock span rows (prevents concurrent metric_result inserts via FK check
@@ -73,8 +79,8 @@ def delete_trace_batch(db_session: Session, trace_ids: list[str]) -> None:
     if span_ids:
         db_session.execute(
             delete(DatabaseMetricResult).where(
-                DatabaseMetricResult.span_id.in_(span_ids)
-            )
+                DatabaseMetricResult.span_id.in_(span_ids),
+            ),
         )
 
     # 3. Spans for these traces
@@ -83,12 +89,38 @@ def delete_trace_batch(db_session: Session, trace_ids: list[str]) -> None:
     # 4. Trace metadata
     db_session.execute(
         delete(DatabaseTraceMetadata).where(
-            DatabaseTraceMetadata.trace_id.in_(trace_ids)
-        )
+            DatabaseTraceMetadata.trace_id.in_(trace_ids),
+        ),
     )
 
+    refresh_trace_rollups(db_session, rollup_keys)
+
     logger.info(
         "Trace retention: deleted batch of %d traces (%d spans)",
         len(trace_ids),
         len(span_ids),
     )
+
+
+def delete_trace_metadata_batch(db_session: Session, trace_ids: list[str]) -> None:
+    """
+    Delete the annotations and trace metadata of one batch of traces.
+
+    Used when spans are partitioned: their spans and metric results went with the
+    dropped span partitions, so only the per-trace rows are left.
+    """
+    if not trace_ids:
+        return
+
+    rollup_keys = trace_rollup_keys(db_session, trace_ids)
+    db_session.execute(
+        delete(DatabaseAgenticAnnotation).where(
+            DatabaseAgenticAnnotation.trace_id.in_(trace_ids),
+        ),
+    )
+    db_session.execute(
+        delete(DatabaseTraceMetadata).where(
+            DatabaseTraceMetadata.trace_id.in_(trace_ids),
+        ),
+    )
+    refresh_trace_rollups(db_session, rollup_keys)
@@ -0,0 +1,687 @@
+"""Repository for the per-task trace rollups behind the trace overview endpoints.
+
+trace_rollups holds, per task and per minute, hour and day of trace start time, the
+totals the overview and time series endpoints report. When a write changes traces or
+their continuous eval annotations, refresh_trace_rollups recomputes the minute rows it
+touched from trace_metadata and agentic_annotations in the writer's transaction, then
+re-sums their hour rows from minute rows and their day rows from hour rows.
+Recomputing rather than adding deltas keeps the rows exact however writes interleave:
+on PostgreSQL the writers of a task and day serialize on a transaction-level advisory
+lock and only read after taking it.
+
+Reads use the coarsest rows that lie entirely inside a requested bucket and aggregate
+trace_metadata only for the partial minutes at bucket edges (see plan_rollup_ranges),
+so they return the totals aggregating trace_metadata over the whole range would.
+
+Rollups are opt-in through GENAI_ENGINE_TRACE_ROLLUPS_ENABLED and only read once the
+trace rollup reconciliation has backfilled them for existing traces. Startups with
+rollups disabled clear that marker, since writes aren't tracked while disabled.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Iterable, NamedTuple
+
+from arthur_common.models.enums import AgenticAnnotationType, ContinuousEvalRunStatus
+from sqlalchemy import ColumnElement, and_, delete, func, insert, or_, select, text
+from sqlalchemy.orm import Session
+
+from db_models import (
+    DatabaseAgenticAnnotation,
+    DatabaseApplicationConfiguration,
+    DatabaseTraceMetadata,
+    DatabaseTraceRollup,
+)
+from schemas.enums import ApplicationConfigurations
+from utils import constants
+from utils.utils import get_env_var
+
+logger = logging.getLogger(__name__)
+
+TRACE_ROLLUPS_VERSION = 1
+
+MINUTE = "minute"
+HOUR = "hour"
+DAY = "day"
+GRANULARITY_STEPS = {
+    MINUTE: timedelta(minutes=1),
+    HOUR: timedelta(hours=1),
+    DAY: timedelta(days=1),
+}
+
+# Above this many changed minutes of one task and day, the whole day is recomputed
+# with a single range scan instead of one range per minute.
+DAY_REFRESH_MINUTE_THRESHOLD = 60
+TRACE_ID_LOOKUP_BATCH_SIZE = 1000
+
+# trace timestamps are stored as naive UTC
+_EPOCH = datetime(1970, 1, 1)
+
+# Rollup rows are read as plain rows rather than entities, since they are replaced
+# with bulk statements the identity map doesn't see.
+_ROLLUP_COLUMNS = tuple(DatabaseTraceRollup.__table__.columns)
+
+# (task_id, minute of trace start_time)
+TraceRollupKey = tuple[str, datetime]
+TimeRange = tuple[datetime, datetime]
+
+# The backfill version only ever goes up, so once this process has seen it complete
+# it doesn't need to check again.
+_backfill_complete = False
+
+
+@dataclass
+class TraceRollupTotals:
+    trace_count: int = 0
+    token_count: int = 0
+    token_cost: float = 0.0
+    eval_count: int = 0
+    eval_passed_count: int = 0
+    last_active: datetime | None = None
+
+    def add(self, other: TraceRollupTotals) -> None:
+        self.trace_count += other.trace_count
+        self.token_count += other.token_count
+        self.token_cost += other.token_cost
+        self.eval_count += other.eval_count
+        self.eval_passed_count += other.eval_passed_count
+        if other.last_active is not None and (
+            self.last_active is None or other.last_active > self.last_active
+        ):
+            self.last_active = other.last_active
+
+    def matches(self, other: TraceRollupTotals) -> bool:
+        """Equal up to the rounding of summing token costs in another order."""
+        return (
+            self.trace_count == other.trace_count
+            and self.token_count == other.token_count
+            and math.isclose(self.token_cost, other.token_cost, abs_tol=1e-9)
+            and self.eval_count == other.eval_count
+            and self.eval_passed_count == other.eval_passed_count
+            and self.last_active == other.last_active
+        )
+
+
+class RollupPlan(NamedTuple):
+    # bucket_start ranges of rollup rows, per granularity
+    rollup_ranges: dict[str, list[TimeRange]]
+    # trace start_time ranges to aggregate from trace_metadata
+    raw_ranges: list[TimeRange]
+
+
+def floor_time(timestamp: datetime, step: timedelta) -> datetime:
+    return _EPOCH + (timestamp - _EPOCH) // step * step
+
+
+def ceil_time(timestamp: datetime, step: timedelta) -> datetime:
+    floor = floor_time(timestamp, step)
+    return floor if floor == timestamp else floor + step
+
+
+def trace_rollups_enabled() -> bool:
+    enabled = get_env_var(
+        constants.GENAI_ENGINE_TRACE_ROLLUPS_ENABLED_ENV_VAR,
+        default="false",
+    )
+    return enabled.lower() == "true"
+
+
+def _backfill_version_row(
+    db_session: Session,
+) -> DatabaseApplicationConfiguration | None:
+    return (
+        db_session.query(DatabaseApplicationConfiguration)
+        .filter_by(name=ApplicationConfigurations.TRACE_ROLLUPS_BACKFILL_VERSION)
+        .first()
+    )
+
+
+def trace_rollups_ready(db_session: Session) -> bool:
+    """Whether rollups are enabled and backfilled, so reads can use them."""
+    global _backfill_complete
+    if not trace_rollups_enabled():
+        return False
+    if _backfill_complete:
+        return True
+
+    row = _backfill_version_row(db_session)
+    try:
+        complete = row is not None and int(row.value) >= TRACE_ROLLUPS_VERSION
+    except ValueError:
+        complete = False
+    _backfill_complete = complete
+    return complete
+
+
+def mark_trace_rollups_ready(db_session: Session) -> None:
+    """Records that the rollups of every stored trace were backfilled."""
+    row = _backfill_version_row(db_session)
+    value = str(TRACE_ROLLUPS_VERSION)
+    if row is None:
+        db_session.add(
+            DatabaseApplicationConfiguration(
+                name=ApplicationConfigurations.TRACE_ROLLUPS_BACKFILL_VERSION,
+                value=value,
+            ),
+        )
+    else:
+        row.value = value
+
+
+def clear_trace_rollups_ready(db_session: Session) -> None:
+    """Forgets the backfill, so rollups are rebuilt before they are read again."""
+    global _backfill_complete
+    _backfill_complete = False
+    db_session.execute(
+        delete(DatabaseApplicationConfiguration).where(
+            DatabaseApplicationConfiguration.name
+            == ApplicationConfigurations.TRACE_ROLLUPS_BACKFILL_VERSION,
+        ),
+    )
+
+
+def _group_key(row: Any, size: int) -> tuple[Any, ...]:
+    # bucket indexes come back as float or Decimal depending on the database
+    return tuple(
+        int(value) if isinstance(value, (float, Decimal)) else value
+        for value in row[:size]
+    )
+
+
+def aggregate_trace_totals(
+    db_session: Session,
+    group_by: list[ColumnElement[Any]],
+    *conditions: ColumnElement[bool],
+) -> dict[tuple[Any, ...], TraceRollupTotals]:
+    """Totals of the traces matching conditions, from trace_metadata and annotations.
+
+    Conditions and group_by apply to DatabaseTraceMetadata. Results are keyed by the
+    group_by values, with numbers converted to int.
+    """
+    totals: dict[tuple[Any, ...], TraceRollupTotals] = {}
+
+    trace_rows = db_session.execute(
+        select(
+            *group_by,
+            func.count().label("trace_count"),
+            func.coalesce(func.sum(DatabaseTraceMetadata.total_token_count), 0).label(
+                "token_count",
+            ),
+            func.coalesce(
+                func.sum(DatabaseTraceMetadata.total_token_cost),
+                0.0,
+            ).label("token_cost"),
+            func.max(DatabaseTraceMetadata.end_time).label("last_active"),
+        )
+        .where(*conditions)
+        .group_by(*group_by),
+    ).all()
+    for row in trace_rows:
+        totals[_group_key(row, len(group_by))] = TraceRollupTotals(
+            trace_count=row.trace_count,
+            token_count=int(row.token_count),
+            token_cost=float(row.token_cost),
+            last_active=row.last_active,
+        )
+
+    # Kept as a separate query so the annotation join doesn't inflate the token sums
+    eval_rows = db_session.execute(
+        select(
+            *group_by,
+            func.count().label("eval_count"),
+            func.count(DatabaseAgenticAnnotation.id)
+            .filter(
+                DatabaseAgenticAnnotation.run_status
+                == ContinuousEvalRunStatus.PASSED.value,
+            )
+            .label("passed_count"),
+        )
+        .select_from(DatabaseTraceMetadata)
+        .join(
+            DatabaseAgenticAnnotation,
+            DatabaseAgenticAnnotation.trace_id == DatabaseTraceMetadata.trace_id,
+        )
+        .where(
+            *conditions,
+            DatabaseAgenticAnnotation.annotation_type
+            == AgenticAnnotationType.CONTINUOUS_EVAL.value,
+        )
+        .group_by(*group_by),
+    ).all()
+    for row in eval_rows:
+        bucket = totals.setdefault(_group_key(row, len(group_by)), TraceRollupTotals())
+        bucket.eval_count = row.eval_count
+        bucket.eval_passed_count = row.passed_count
+
+    return totals
+
+
+def merge_trace_totals(
+    *totals: dict[tuple[Any, ...], TraceRollupTotals],
+) -> dict[tuple[Any, ...], TraceRollupTotals]:
+    merged: dict[tuple[Any, ...], TraceRollupTotals] = {}
+    for part in totals:
+        for key, value in part.items():
+            merged.setdefault(key, TraceRollupTotals()).add(value)
+    return merged
+
+
+def _merge_ranges(ranges: list[TimeRange]) -> list[TimeRange]:
+    merged: list[TimeRange] = []
+    for lo, hi in sorted(r for r in ranges if r[0] < r[1]):
+        if merged and lo <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(hi, merged[-1][1]))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def plan_rollup_ranges(boundaries: list[datetime]) -> RollupPlan:
+    """Splits the buckets between consecutive boundaries into rollup rows and raw edges.
+
+    Each bucket [lo, hi) is covered by the partial minutes at its edges, read from
+    trace_metadata, then whole minutes up to the first and from the last whole hour,
+    whole hours up to the first and from the last whole day, and whole days. Every
+    rollup row planned lies inside a single bucket.
+    """
+    rollup_ranges: dict[str, list[TimeRange]] = {
+        granularity: [] for granularity in GRANULARITY_STEPS
+    }
+    raw_ranges: list[TimeRange] = []
+
+    for lo, hi in zip(boundaries, boundaries[1:]):
+        target = raw_ranges
+        for granularity, step in GRANULARITY_STEPS.items():
+            aligned_lo, aligned_hi = ceil_time(lo, step), floor_time(hi, step)
+            if aligned_lo >= aligned_hi:
+                break
+            target.extend([(lo, aligned_lo), (aligned_hi, hi)])
+            lo, hi = aligned_lo, aligned_hi
+            target = rollup_ranges[granularity]
+        target.append((lo, hi))
+
+    return RollupPlan(
+        rollup_ranges={
+            granularity: _merge_ranges(ranges)
+            for granularity, ranges in rollup_ranges.items()
+        },
+        raw_ranges=_merge_ranges(raw_ranges),
+    )
+
+
+def get_trace_rollup_totals(
+    db_session: Session,
+    task_ids: list[str],
+    rollup_ranges: dict[str, list[TimeRange]],
+    bucket_origin: datetime | None = None,
+    bucket_seconds: int | None = None,
+) -> dict[tuple[Any, ...], TraceRollupTotals]:
+    """Sums the rollup rows in rollup_ranges per task.
+
+    With bucket_seconds, sums per task and index of the bucket_seconds wide bucket
+    since bucket_origin instead, which takes rows lying inside a single bucket.
+    """
+    range_conditions = [
+        and_(
+            DatabaseTraceRollup.granularity == granularity,
+            DatabaseTraceRollup.bucket_start >= lo,
+            DatabaseTraceRollup.bucket_start < hi,
+        )
+        for granularity, ranges in rollup_ranges.items()
+        for lo, hi in ranges
+    ]
+    if not task_ids or not range_conditions:
+        return {}
+
+    group_by: list[ColumnElement[Any]] = [DatabaseTraceRollup.task_id]
+    if bucket_seconds is not None and bucket_origin is not None:
+        group_by.append(
+            func.floor(
+                (
+                    func.extract("epoch", DatabaseTraceRollup.bucket_start)
+                    - (bucket_origin - _EPOCH).total_seconds()
+                )
+                / bucket_seconds,
+            ).label("bucket_index"),
+        )
+
+    rows = db_session.execute(
+        select(
+            *group_by,
+            func.sum(DatabaseTraceRollup.trace_count).label("trace_count"),
+            func.sum(DatabaseTraceRollup.token_count).label("token_count"),
+            func.sum(DatabaseTraceRollup.token_cost).label("token_cost"),
+            func.sum(DatabaseTraceRollup.eval_count).label("eval_count"),
+            func.sum(DatabaseTraceRollup.eval_passed_count).label("eval_passed_count"),
+            func.max(DatabaseTraceRollup.last_active).label("last_active"),
+        )
+        .where(DatabaseTraceRollup.task_id.in_(task_ids), or_(*range_conditions))
+        .group_by(*group_by),
+    ).all()
+    return {
+        _group_key(row, len(group_by)): TraceRollupTotals(
+            trace_count=int(row.trace_count),
+            token_count=int(row.token_count),
+            token_cost=float(row.token_cost),
+            eval_count=int(row.eval_count),
+            eval_passed_count=int(row.eval_passed_count),
+            last_active=row.last_active,
+        )
+        for row in rows
+    }
+
+
+def trace_rollup_keys(
+    db_session: Session,
+    trace_ids: Iterable[str],
+) -> set[TraceRollupKey]:
+    """Task and start minute of the stored traces among trace_ids.
+
+    Empty when rollups are disabled, so writers can collect the minutes of the traces
+    they change unconditionally.
+    """
+    if not trace_rollups_enabled():
+        return set()
+
+    trace_ids = list(trace_ids)
+    keys: set[TraceRollupKey] = set()
+    for offset in range(0, len(trace_ids), TRACE_ID_LOOKUP_BATCH_SIZE):
+        rows = db_session.execute(
+            select(
+                DatabaseTraceMetadata.task_id,
+                DatabaseTraceMetadata.start_time,
+            ).where(
+                DatabaseTraceMetadata.trace_id.in_(
+                    trace_ids[offset : offset + TRACE_ID_LOOKUP_BATCH_SIZE],
+                ),
+            ),
+        ).all()
+        keys.update(
+            (task_id, floor_time(start_time, GRANULARITY_STEPS[MINUTE]))
+            for task_id, start_time in rows
+        )
+    return keys
+
+
+def trace_rollup_keys_for_annotations(
+    db_session: Session,
+    *conditions: ColumnElement[bool],
+) -> set[TraceRollupKey]:
+    """Task and start minute of the traces of the annotations matching conditions.
+
+    Empty when rollups are disabled.
+    """
+    if not trace_rollups_enabled():
+        return set()
+
+    rows = db_session.execute(
+        select(DatabaseTraceMetadata.task_id, DatabaseTraceMetadata.start_time)
+        .join(
+            DatabaseAgenticAnnotation,
+            DatabaseAgenticAnnotation.trace_id == DatabaseTraceMetadata.trace_id,
+        )
+        .where(*conditions)
+        .distinct(),
+    ).all()
+    return {
+        (task_id, floor_time(start_time, GRANULARITY_STEPS[MINUTE]))
+        for task_id, start_time in rows
+    }
+
+
+def _lock_task_day(db_session: Session, task_id: str, day: datetime) -> None:
+    """Serializes rollup writes of one task and day until the transaction ends."""
+    if db_session.get_bind().dialect.name != "postgresql":
+        return
+    db_session.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:task_id), :day)"),
+        {"task_id": task_id, "day": (day - _EPOCH).days},
+    )
+
+
+def refresh_trace_rollups(
+    db_session: Session,
+    keys: Iterable[TraceRollupKey],
+) -> None:
+    """Recomputes the rollups of the given task minutes and of their hours and days.
+
+    Call in the transaction that changed traces or continuous eval annotations, after
+    the change, with the minutes the changed traces started in before and after it.
+    """
+    if not trace_rollups_enabled():
+        return
+
+    minutes_by_day: dict[tuple[str, datetime], set[datetime]] = {}
+    for task_id, minute in keys:
+        day = floor_time(minute, GRANULARITY_STEPS[DAY])
+        minutes_by_day.setdefault((task_id, day), set()).add(minute)
+
+    # always in the same order, so concurrent writers can't deadlock
+    task_days = sorted(minutes_by_day)
+    for task_id, day in task_days:
+        _lock_task_day(db_session, task_id, day)
+
+    ranges: list[tuple[str, datetime, datetime]] = []
+    for task_id, day in task_days:
+        minutes = minutes_by_day[(task_id, day)]
+        if len(minutes) > DAY_REFRESH_MINUTE_THRESHOLD:
+            ranges.append((task_id, day, day + GRANULARITY_STEPS[DAY]))
+            continue
+        ranges.extend(
+            (task_id, lo, hi)
+            for lo, hi in _merge_ranges(
+                [(minute, minute + GRANULARITY_STEPS[MINUTE]) for minute in minutes],
+            )
+        )
+    _write_minute_rollups(db_session, ranges)
+
+
+def _minute_totals(
+    db_session: Session,
+    ranges: list[tuple[str, datetime, datetime]],
+) -> dict[tuple[str, datetime], TraceRollupTotals]:
+    minute_index = func.floor(
+        func.extract("epoch", DatabaseTraceMetadata.start_time) / 60,
+    ).label("minute_index")
+    totals = aggregate_trace_totals(
+        db_session,
+        [DatabaseTraceMetadata.task_id, minute_index],
+        or_(
+            *[
+                and_(
+                    DatabaseTraceMetadata.task_id == task_id,
+                    DatabaseTraceMetadata.start_time >= lo,
+                    DatabaseTraceMetadata.start_time < hi,
+                )
+                for task_id, lo, hi in ranges
+            ],
+        ),
+    )
+    return {
+        (task_id, _EPOCH + index * GRANULARITY_STEPS[MINUTE]): value
+        for (task_id, index), value in totals.items()
+    }
+
+
+def _replace_rollups(
+    db_session: Session,
+    granularity: str,
+    ranges: list[tuple[str, datetime, datetime]],
+    totals: dict[tuple[str, datetime], TraceRollupTotals],
+) -> None:
+    """Replaces the rows of granularity in ranges with totals."""
+    db_session.execute(
+        delete(DatabaseTraceRollup).where(
+            DatabaseTraceRollup.granularity == granularity,
+            or_(
+                *[
+                    and_(
+                        DatabaseTraceRollup.task_id == task_id,
+                        DatabaseTraceRollup.bucket_start >= lo,
+                        DatabaseTraceRollup.bucket_start < hi,
+                    )
+                    for task_id, lo, hi in ranges
+                ],
+            ),
+        ),
+    )
+    rows = [
+        {
+            "task_id": task_id,
+            "granularity": granularity,
+            "bucket_start": bucket_start,
+            "trace_count": value.trace_count,
+            "token_count": value.token_count,
+            "token_cost": value.token_cost,
+            "eval_count": value.eval_count,
+            "eval_passed_count": value.eval_passed_count,
+            "last_active": value.last_active,
+        }
+        for (task_id, bucket_start), value in totals.items()
+        if value.trace_count
+    ]
+    if rows:
+        db_session.execute(insert(DatabaseTraceRollup), rows)
+
+
+def _resum_rollups(
+    db_session: Session,
+    granularity: str,
+    source_granularity: str,
+    buckets: set[tuple[str, datetime]],
+) -> None:
+    """Recomputes rows of granularity from the rows of the next finer granularity."""
+    step = GRANULARITY_STEPS[granularity]
+    ranges = [
+        (task_id, bucket_start, bucket_start + step)
+        for task_id, bucket_start in sorted(buckets)
+    ]
+    source_rows = db_session.execute(
+        select(*_ROLLUP_COLUMNS).where(
+            DatabaseTraceRollup.granularity == source_granularity,
+            or_(
+                *[
+                    and_(
+                        DatabaseTraceRollup.task_id == task_id,
+                        DatabaseTraceRollup.bucket_start >= lo,
+                        DatabaseTraceRollup.bucket_start < hi,
+                    )
+                    for task_id, lo, hi in ranges
+                ],
+            ),
+        ),
+    ).all()
+
+    totals: dict[tuple[str, datetime], TraceRollupTotals] = {}
+    for row in source_rows:
+        key = (row.task_id, floor_time(row.bucket_start, step))
+        totals.setdefault(key, TraceRollupTotals()).add(_row_totals(row))
+    _replace_rollups(db_session, granularity, ranges, totals)
+
+
+def _row_totals(row: Any) -> TraceRollupTotals:
+    return TraceRollupTotals(
+        trace_count=row.trace_count,
+        token_count=row.token_count,
+        token_cost=row.token_cost,
+        eval_count=row.eval_count,
+        eval_passed_count=row.eval_passed_count,
+        last_active=row.last_active,
+    )
+
+
+def _write_minute_rollups(
+    db_session: Session,
+    ranges: list[tuple[str, datetime, datetime]],
+) -> None:
+    """Recomputes the minute rows in ranges, then their hour and day rows."""
+    if not ranges:
+        return
+
+    _replace_rollups(db_session, MINUTE, ranges, _minute_totals(db_session, ranges))
+
+    hours: set[tuple[str, datetime]] = set()
+    for task_id, lo, hi in ranges:
+        hour = floor_time(lo, GRANULARITY_STEPS[HOUR])
+        while hour < hi:
+            hours.add((task_id, hour))
+            hour += GRANULARITY_STEPS[HOUR]
+    _resum_rollups(db_session, HOUR, MINUTE, hours)
+
+    days = {
+        (task_id, floor_time(hour, GRANULARITY_STEPS[DAY])) for task_id, hour in hours
+    }
+    _resum_rollups(db_session, DAY, HOUR, days)
+
+
+def get_trace_rollup_days(
+    db_session: Session,
+    since: datetime | None = None,
+) -> list[tuple[str, datetime]]:
+    """Task and day pairs with traces or rollups, optionally from the day of since on."""
+    day_index = func.floor(
+        func.extract("epoch", DatabaseTraceMetadata.start_time) / 86400,
+    )
+    trace_days = select(DatabaseTraceMetadata.task_id, day_index).distinct()
+    rollup_days = select(
+        DatabaseTraceRollup.task_id,
+        DatabaseTraceRollup.bucket_start,
+    ).where(DatabaseTraceRollup.granularity == DAY)
+    if since is not None:
+        since = floor_time(since, GRANULARITY_STEPS[DAY])
+        trace_days = trace_days.where(DatabaseTraceMetadata.start_time >= since)
+        rollup_days = rollup_days.where(DatabaseTraceRollup.bucket_start >= since)
+
+    days = {
+        (task_id, _EPOCH + int(index) * GRANULARITY_STEPS[DAY])
+        for task_id, index in db_session.execute(trace_days).all()
+    }
+    days.update(db_session.execute(rollup_days).tuples().all())
+    return sorted(days)
+
+
+def reconcile_trace_rollups(db_session: Session, task_id: str, day: datetime) -> int:
+    """Checks the rollups of one task and day against trace_metadata, fixing drift.
+
+    Returns:
+        The number of minute, hour and day rows that were missing, stale or extra
+    """
+    _lock_task_day(db_session, task_id, day)
+    day_range = (task_id, day, day + GRANULARITY_STEPS[DAY])
+
+    expected: dict[tuple[str, datetime], TraceRollupTotals] = {}
+    for (_, minute), value in _minute_totals(db_session, [day_range]).items():
+        expected[(MINUTE, minute)] = value
+        for granularity in (HOUR, DAY):
+            bucket_start = floor_time(minute, GRANULARITY_STEPS[granularity])
+            expected.setdefault(
+                (granularity, bucket_start),
+                TraceRollupTotals(),
+            ).add(value)
+
+    stored = {
+        (row.granularity, row.bucket_start): _row_totals(row)
+        for row in db_session.execute(
+            select(*_ROLLUP_COLUMNS).where(
+                DatabaseTraceRollup.task_id == task_id,
+                DatabaseTraceRollup.bucket_start >= day_range[1],
+                DatabaseTraceRollup.bucket_start < day_range[2],
+            ),
+        ).all()
+    }
+
+    drift = sum(
+        1
+        for key in expected.keys() | stored.keys()
+        if key not in expected
+        or key not in stored
+        or not expected[key].matches(stored[key])
+    )
+    if drift:
+        _write_minute_rollups(db_session, [day_range])
+    return drift
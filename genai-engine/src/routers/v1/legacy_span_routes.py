@@ -2,7 +2,7 @@ import json
 import logging
 from datetime import datetime
 from enum import Enum
-from typing import Annotated, Optional
+from typing import Annotated, Any, Optional
 from uuid import UUID
 
 from arthur_common.models.common_schemas import PaginationParameters
@@ -33,6 +33,10 @@ from routers.route_handler import GenaiEngineRoute
 from routers.v2 import multi_validator
 from schemas.enums import PermissionLevelsEnum
 from schemas.internal_schemas import User
+from services.trace.span_metrics_queue_service import (
+    SPAN_METRICS_PENDING_HEADER,
+    enqueue_span_metrics_for_new_spans,
+)
 from utils.users import enforce_query_org_scope, permission_checker
 from utils.utils import common_pagination_parameters
 
@@ -90,6 +94,30 @@ def _create_response(
     )
 
 
+# Documents the header set by _set_span_metrics_pending_header on the metrics endpoints
+SPAN_METRICS_PENDING_RESPONSES: dict[int | str, dict[str, Any]] = {
+    200: {
+        "headers": {
+            SPAN_METRICS_PENDING_HEADER: {
+                "description": "Number of spans whose metrics are still being computed in the background, absent when there are none.",
+                "schema": {"type": "integer"},
+            },
+        },
+    },
+}
+
+
+def _set_span_metrics_pending_header(
+    response: Response,
+    span_repo: SpanRepository,
+) -> None:
+    """Report the spans whose metrics are still being computed in the background."""
+    if span_repo.pending_metric_span_ids:
+        response.headers[SPAN_METRICS_PENDING_HEADER] = str(
+            len(span_repo.pending_metric_span_ids),
+        )
+
+
 class ExtendedTraceQueryRequest(TraceQueryRequest):
     """Extends TraceQueryRequest with token count and span count filter support."""
 
@@ -466,7 +494,8 @@ def receive_traces(
     """Receive and process OpenInference trace data."""
     try:
         span_repo = _get_span_repository(db_session)
-        _, span_results = span_repo.create_traces(body)
+        db_spans, span_results = span_repo.create_traces(body)
+        enqueue_span_metrics_for_new_spans(db_session, db_spans)
         return _create_response(*span_results)
     except DecodeError as e:
         logger.error(f"Failed to decode protobuf message: {e}")
@@ -532,9 +561,10 @@ def query_spans(
 @span_routes.get(
     "/traces/metrics/",
     summary="Compute Missing Metrics and Query Traces",
-    description="Query traces with comprehensive filtering and compute metrics. Returns traces containing spans that match the filters with computed metrics.",
+    description="Query traces with comprehensive filtering and compute metrics. Returns traces containing spans that match the filters with computed metrics. When span metrics are computed in the background, returns the stored metrics and sets the X-Span-Metrics-Pending response header while some are still being computed.",
     response_model=QueryTracesWithMetricsResponse,
     response_model_exclude_none=True,
+    responses=SPAN_METRICS_PENDING_RESPONSES,
     deprecated=True,
     tags=["Spans"],
 )
@@ -549,6 +579,7 @@ def query_spans_with_metrics(
         TraceQueryRequest,
         Depends(trace_query_parameters),
     ],
+    response: Response,
     sort_by: TraceSortBy = Query(
         TraceSortBy.START_TIME,
         description="Column to sort results by.",
@@ -566,6 +597,7 @@ def query_spans_with_metrics(
             compute_new_metrics=True,
             sort_by=sort_by.value,
         )
+        _set_span_metrics_pending_header(response, span_repo)
         return QueryTracesWithMetricsResponse(count=span_count, traces=traces)
     except ValidationError as e:
         logger.error(f"Validation error: {e}")
@@ -704,15 +736,17 @@ def query_spans_by_type(
 @span_routes.get(
     "/span/{span_id}/metrics",
     summary="Compute Metrics for Span",
-    description="Compute metrics for a single span. Validates that the span is an LLM span.",
+    description="Compute metrics for a single span. Validates that the span is an LLM span. When span metrics are computed in the background, returns the stored metrics and sets the X-Span-Metrics-Pending response header while they are still being computed.",
     response_model=SpanWithMetricsResponse,
     response_model_exclude_none=True,
+    responses=SPAN_METRICS_PENDING_RESPONSES,
     deprecated=True,
     tags=["Spans"],
 )
 @permission_checker(permissions=PermissionLevelsEnum.INFERENCE_READ.value)
 def compute_span_metrics(
     span_id: str,
+    response: Response,
     db_session: Session = Depends(get_db_session),
     current_user: User | None = Depends(multi_validator.validate_api_multi_auth),
     org_scope: UUID | None = Depends(get_org_scope),
@@ -725,6 +759,7 @@ def compute_span_metrics(
         )
 
         # Return the single span with metrics
+        _set_span_metrics_pending_header(response, span_repo)
         return span._to_response_model()
     except ValueError as e:
         logger.error(f"Validation error: {e}")
@@ -1,3 +1,4 @@
+import json
 import logging
 from datetime import datetime
 from typing import Annotated
@@ -26,8 +27,10 @@ from repositories.tasks_metrics_repository import TasksMetricsRepository
 from repositories.tasks_repository import TaskRepository
 from routers.route_handler import GenaiEngineRoute
 from routers.v1.legacy_span_routes import (
+    SPAN_METRICS_PENDING_RESPONSES,
     TraceSortBy,
     _create_response,
+    _set_span_metrics_pending_header,
     trace_query_parameters,
 )
 from routers.v2 import multi_validator
@@ -51,10 +54,18 @@ from schemas.response_schemas import (
     UnregisteredRootSpanGroup,
     UnregisteredRootSpansResponse,
 )
+from services.trace.span_metrics_queue_service import (
+    enqueue_span_metrics_for_new_spans,
+)
+from services.trace.trace_ingest_queue_service import (
+    get_trace_ingest_queue_service,
+)
+from services.trace.trace_ingest_wal import TraceIngestQueueFullError
 from utils.currency_display import (
     apply_currency_to_token_cost_item,
     get_display_currency,
 )
+from utils.keyset_pagination import next_page_cursor
 from utils.users import enforce_query_org_scope, permission_checker
 from utils.utils import common_pagination_parameters
 
@@ -90,19 +101,40 @@ def receive_traces(
     db_session: Session = Depends(get_db_session),
     current_user: User | None = Depends(multi_validator.validate_api_multi_auth),
 ) -> Response:
-    """Receive and process OpenInference trace data."""
+    """Receive and process OpenInference trace data.
+
+    With asynchronous ingestion enabled the payload is only validated and queued:
+    the response is 202 Accepted, or 429 with Retry-After while the queue is full.
+    """
     try:
+        ingest_queue = get_trace_ingest_queue_service()
+        if ingest_queue is not None:
+            total_spans = ingest_queue.submit(body)
+            return Response(
+                content=json.dumps({"status": "accepted", "total_spans": total_spans}),
+                status_code=status.HTTP_202_ACCEPTED,
+                media_type="application/json",
+            )
+
         span_repo = _get_span_repository(db_session)
         db_spans, span_results = span_repo.create_traces(body)
 
         # Enqueue continuous evals for root spans
         continuous_evals_repo = ContinuousEvalsRepository(db_session)
         continuous_evals_repo.enqueue_continuous_evals_for_root_spans(db_spans)
+        enqueue_span_metrics_for_new_spans(db_session, db_spans)
 
         return _create_response(*span_results)
     except DecodeError as e:
         logger.error(f"Failed to decode protobuf message: {e}")
         raise HTTPException(status_code=400, detail="Invalid protobuf message format")
+    except TraceIngestQueueFullError as e:
+        logger.warning(str(e))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Trace ingest queue is full, retry later",
+            headers={"Retry-After": str(e.retry_after_seconds)},
+        )
     except Exception as e:
         logger.error(f"Error processing traces: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -137,6 +169,14 @@ def list_traces_metadata(
         False,
         description="Include flat list of spans for each trace. Defaults to false for performance.",
     ),
+    cursor: str | None = Query(
+        None,
+        description="Cursor from the next_cursor of the previous page. Continues after that page instead of at page, which makes deep pages as fast as the first. Requires sort_by=start_time.",
+    ),
+    include_count: bool = Query(
+        True,
+        description="Whether to include the total count of matching traces. Set to False to improve query performance for large datasets. Count will be returned as -1 if set to False.",
+    ),
     db_session: Session = Depends(get_db_session),
     application_config: ApplicationConfiguration = Depends(get_application_config),
     current_user: User | None = Depends(multi_validator.validate_api_multi_auth),
@@ -150,6 +190,8 @@ def list_traces_metadata(
             user_ids=trace_query.user_ids,
             include_spans=include_spans,
             sort_by=sort_by.value,
+            cursor=cursor,
+            include_count=include_count,
         )
 
         requested_currency = get_display_currency(application_config)
@@ -168,6 +210,16 @@ def list_traces_metadata(
             count=count,
             display_currency=effective_currency,
             traces=traces,
+            next_cursor=(
+                next_page_cursor(
+                    trace_metadata_list,
+                    pagination_parameters.page_size,
+                    pagination_parameters.sort == PaginationSortMethod.DESCENDING,
+                    lambda t: (t.start_time, t.trace_id),
+                )
+                if sort_by == TraceSortBy.START_TIME
+                else None
+            ),
         )
     except ValidationError as e:
         logger.error(f"Validation error: {e}")
@@ -318,6 +370,14 @@ def list_spans_metadata(
         TraceSortBy.START_TIME,
         description="Column to sort results by.",
     ),
+    cursor: str | None = Query(
+        None,
+        description="Cursor from the next_cursor of the previous page. Continues after that page instead of at page, which makes deep pages as fast as the first. Requires sort_by=start_time.",
+    ),
+    include_count: bool = Query(
+        True,
+        description="Whether to include the total count of matching spans. Set to False to improve query performance for large datasets. Count will be returned as -1 if set to False.",
+    ),
     db_session: Session = Depends(get_db_session),
     application_config: ApplicationConfiguration = Depends(get_application_config),
     current_user: User | None = Depends(multi_validator.validate_api_multi_auth),
@@ -335,6 +395,8 @@ def list_spans_metadata(
             compute_new_metrics=False,
             filters=trace_query,
             sort_by=sort_by.value,
+            cursor=cursor,
+            include_count=include_count,
         )
 
         requested_currency = get_display_currency(application_config)
@@ -353,6 +415,16 @@ def list_spans_metadata(
             count=total_count,
             display_currency=effective_currency,
             spans=metadata_spans,
+            next_cursor=(
+                next_page_cursor(
+                    spans,
+                    pagination_parameters.page_size,
+                    pagination_parameters.sort == PaginationSortMethod.DESCENDING,
+                    lambda span: (span.start_time, span.id),
+                )
+                if sort_by == TraceSortBy.START_TIME
+                else None
+            ),
         )
     except ValidationError as e:
         logger.error(f"Validation error: {e}")
@@ -467,14 +539,16 @@ def get_span_by_id(
 @trace_api_routes.get(
     "/traces/spans/{span_id}/metrics",
     summary="Compute Missing Span Metrics",
-    description="Compute all missing metrics for a single span on-demand. Returns span with computed metrics.",
+    description="Compute all missing metrics for a single span on-demand. Returns span with computed metrics. When span metrics are computed in the background, returns the stored metrics and sets the X-Span-Metrics-Pending response header while they are still being computed.",
     response_model=SpanWithMetricsResponse,
     response_model_exclude_none=True,
+    responses=SPAN_METRICS_PENDING_RESPONSES,
     tags=["Spans"],
 )
 @permission_checker(permissions=PermissionLevelsEnum.INFERENCE_READ.value)
 def compute_span_metrics(
     span_id: str,
+    response: Response,
     db_session: Session = Depends(get_db_session),
     current_user: User | None = Depends(multi_validator.validate_api_multi_auth),
     org_scope: UUID | None = Depends(get_org_scope),
@@ -487,6 +561,7 @@ def compute_span_metrics(
         if not span:
             raise HTTPException(status_code=404, detail=f"Span {span_id} not found")
 
+        _set_span_metrics_pending_header(response, span_repo)
         return span._to_response_model()
     except HTTPException:
         raise
@@ -547,6 +622,14 @@ def list_sessions_metadata(
         default=False,
         description="Include sessions originating from Arthur experiments. Defaults to false for most uses.",
     ),
+    cursor: str | None = Query(
+        None,
+        description="Cursor from the next_cursor of the previous page. Continues after that page instead of at page.",
+    ),
+    include_count: bool = Query(
+        True,
+        description="Whether to include the total count of matching sessions. Set to False to improve query performance for large datasets. Count will be returned as -1 if set to False.",
+    ),
     db_session: Session = Depends(get_db_session),
     application_config: ApplicationConfiguration = Depends(get_application_config),
     current_user: User | None = Depends(multi_validator.validate_api_multi_auth),
@@ -563,6 +646,8 @@ def list_sessions_metadata(
             session_ids=session_ids,
             pagination_parameters=pagination_parameters,
             include_experiment_sessions=include_experiment_sessions,
+            cursor=cursor,
+            include_count=include_count,
         )
 
         requested_currency = get_display_currency(application_config)
@@ -581,6 +666,17 @@ def list_sessions_metadata(
             count=count,
             display_currency=effective_currency,
             sessions=sessions,
+            next_cursor=next_page_cursor(
+                session_metadata_list,
+                pagination_parameters.page_size,
+                pagination_parameters.sort == PaginationSortMethod.DESCENDING,
+                lambda session: (
+                    session.earliest_start_time,
+                    session.session_id,
+                    session.task_id,
+                    session.user_id or "",
+                ),
+            ),
         )
     except ValidationError as e:
         logger.error(f"Validation error: {e}")
@@ -656,14 +752,16 @@ def get_session_traces(
 @trace_api_routes.get(
     "/traces/sessions/{session_id}/metrics",
     summary="Compute Missing Session Metrics",
-    description="Get all traces in a session and compute missing metrics. Returns list of full trace trees with computed metrics.",
+    description="Get all traces in a session and compute missing metrics. Returns list of full trace trees with computed metrics. When span metrics are computed in the background, returns the stored metrics and sets the X-Span-Metrics-Pending response header while some are still being computed.",
     response_model=SessionTracesResponse,
     response_model_exclude_none=True,
+    responses=SPAN_METRICS_PENDING_RESPONSES,
     tags=["Sessions"],
 )
 @permission_checker(permissions=PermissionLevelsEnum.INFERENCE_READ.value)
 def compute_session_metrics(
     session_id: str,
+    response: Response,
     pagination_parameters: Annotated[
         PaginationParameters,
         Depends(common_pagination_parameters),
@@ -696,6 +794,7 @@ def compute_session_metrics(
             "USD" if any(eff == "USD" for eff, _ in results) else requested_currency
         )
         traces = [item for _, item in results]
+        _set_span_metrics_pending_header(response, span_repo)
         return SessionTracesResponse(
             session_id=session_id,
             count=count,
@@ -880,14 +979,16 @@ def get_trace_by_id(
 @trace_api_routes.get(
     "/traces/{trace_id}/metrics",
     summary="Compute Missing Trace Metrics",
-    description="Compute all missing metrics for trace spans on-demand. Returns full trace tree with computed metrics.",
+    description="Compute all missing metrics for trace spans on-demand. Returns full trace tree with computed metrics. When span metrics are computed in the background, returns the stored metrics and sets the X-Span-Metrics-Pending response header while some are still being computed.",
     response_model=TraceResponse,
     response_model_exclude_none=True,
+    responses=SPAN_METRICS_PENDING_RESPONSES,
     tags=["Traces"],
 )
 @permission_checker(permissions=PermissionLevelsEnum.INFERENCE_READ.value)
 def compute_trace_metrics(
     trace_id: str,
+    response: Response,
     db_session: Session = Depends(get_db_session),
     current_user: User | None = Depends(multi_validator.validate_api_multi_auth),
     org_scope: UUID | None = Depends(get_org_scope),
@@ -903,6 +1004,7 @@ def compute_trace_metrics(
         if not trace:
             raise HTTPException(status_code=404, detail=f"Trace {trace_id} not found")
 
+        _set_span_metrics_pending_header(response, span_repo)
         return trace
     except HTTPException:
         raise
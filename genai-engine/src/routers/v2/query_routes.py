@@ -5,7 +5,7 @@ from typing import Annotated
 from arthur_common.models.common_schemas import PaginationParameters
 from arthur_common.models.enums import PaginationSortMethod, RuleResultEnum, RuleType
 from arthur_common.models.response_schemas import QueryInferencesResponse
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from dependencies import get_db_session, get_org_scope
@@ -15,6 +15,7 @@ from routers.v2 import multi_validator
 from schemas.enums import PermissionLevelsEnum
 from schemas.internal_schemas import Inference, User
 from utils import constants as constants
+from utils.keyset_pagination import NEXT_CURSOR_HEADER, next_page_cursor
 from utils.users import enforce_query_org_scope, permission_checker
 from utils.utils import common_pagination_parameters
 
@@ -26,9 +27,19 @@ query_routes = APIRouter(
 
 @query_routes.get(
     "/inferences/query",
-    description="Paginated inference querying. See parameters for available filters. Includes inferences from archived tasks and rules.",
+    description="Paginated inference querying. See parameters for available filters. Includes inferences from archived tasks and rules. When a page is full, the X-Next-Cursor response header holds the cursor of the next page.",
     tags=["Inferences"],
     response_model=QueryInferencesResponse,
+    responses={
+        200: {
+            "headers": {
+                NEXT_CURSOR_HEADER: {
+                    "description": "Cursor of the next page, absent on the last page.",
+                    "schema": {"type": "string"},
+                },
+            },
+        },
+    },
 )
 @permission_checker(permissions=PermissionLevelsEnum.INFERENCE_READ.value)
 @enforce_query_org_scope()
@@ -37,6 +48,7 @@ def query_inferences(
         PaginationParameters,
         Depends(common_pagination_parameters),
     ],
+    response: Response,
     task_ids: list[str] = Query([], description="Task ID to filter on."),
     task_name: str = Query(None, description="Task name to filter on."),
     conversation_id: str = Query(None, description="Conversation ID to filter on."),
@@ -73,6 +85,10 @@ def query_inferences(
         True,
         description="Whether to include the total count of matching inferences. Set to False to improve query performance for large datasets. Count will be returned as -1 if set to False.",
     ),
+    cursor: str | None = Query(
+        None,
+        description="Cursor from the X-Next-Cursor header of the previous page. Continues after that page instead of at page, which makes deep pages as fast as the first.",
+    ),
     db_session: Session = Depends(get_db_session),
     current_user: User | None = Depends(multi_validator.validate_api_multi_auth),
     org_scope: uuid.UUID | None = Depends(get_org_scope),
@@ -128,9 +144,23 @@ def query_inferences(
                 response_statuses=response_statuses,
                 user_id=user_id,
                 include_count=include_count,
+                cursor=cursor,
             )
 
+        # QueryInferencesResponse is shared with other services, so the cursor of the
+        # next page is returned as a header rather than a response field
+        next_cursor = next_page_cursor(
+            results,
+            pagination_parameters.page_size,
+            pagination_parameters.sort != PaginationSortMethod.ASCENDING,
+            lambda inference: (inference.created_at, inference.id),
+        )
+        if next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
         results_formatted = [i._to_response_model() for i in results]
         return QueryInferencesResponse(count=count, inferences=results_formatted)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     finally:
         db_session.close()
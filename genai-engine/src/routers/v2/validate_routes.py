@@ -16,7 +16,7 @@ from repositories.rules_repository import RuleRepository
 from repositories.tasks_rules_repository import TasksRulesRepository
 from routers.route_handler import GenaiEngineRoute
 from routers.v2 import multi_validator
-from rules_engine import RuleEngine
+from rules_engine import get_rule_engine
 from schemas.builtin_validate_schemas import (
     BuiltinValidationRequest,
     BuiltinValidationResponse,
@@ -257,7 +257,7 @@ def stateless_validate(
         response=body.response,
         context=body.context,
     )
-    engine_results = RuleEngine(scorer_client).evaluate(request, rules)
+    engine_results = get_rule_engine(scorer_client).evaluate(request, rules)
     results = [
         PromptRuleResult._from_rule_engine_model(r)._to_response_model()
         for r in engine_results
@@ -1,6 +1,6 @@
 import concurrent.futures
 import logging
-import re
+import threading
 import time
 from typing import List, Optional
 
@@ -14,9 +14,16 @@ from schemas.scorer_schemas import Example, RuleScore, ScoreRequest, ScorerRuleD
 from scorer.llm_client import get_llm_executor
 from scorer.score import ScorerClient
 from utils import constants
+from utils.compiled_rule_cache import COMPILED_RULE_CACHE
 from utils.metric_counters import RULE_FAILURE_COUNTER
+from utils.rule_executor import (
+    RULE_TYPE_LANES,
+    ExecutorLane,
+    get_rule_executor_pool,
+)
+from utils.rule_result_cache import RULE_RESULT_CACHE
 from utils.token_count import TokenCounter
-from utils.utils import TracedThreadPoolExecutor, get_env_var
+from utils.utils import get_env_var
 
 tracer = trace.get_tracer(__name__)
 logger = logging.getLogger()
@@ -83,16 +90,11 @@ class RuleEngine:
         thread_futures: list[
             tuple[Rule, concurrent.futures.Future[RuleEngineResult]]
         ] = []
-        num_threads = int(
-            get_env_var(
-                constants.GENAI_ENGINE_THREAD_POOL_MAX_WORKERS_ENV_VAR,
-                default=str(constants.DEFAULT_THREAD_POOL_MAX_WORKERS),
-            )
-        )
-        with TracedThreadPoolExecutor(tracer, max_workers=num_threads) as executor:
-            for rule in rules:
-                future = executor.submit(self.run_rule, request, rule)
-                thread_futures.append((rule, future))
+        executor_pool = get_rule_executor_pool()
+        for rule in rules:
+            lane = RULE_TYPE_LANES.get(rule.type, ExecutorLane.PATTERN)
+            future = executor_pool.submit(lane, self.run_rule, request, rule)
+            thread_futures.append((rule, future))
         rule_results: list[RuleEngineResult] = []
         for rule, future in thread_futures:
             exc = future.exception()
@@ -121,8 +123,30 @@ class RuleEngine:
         return rule_results
 
     def run_rule(self, request: ValidationRequest, rule: Rule) -> RuleEngineResult:
-        score: RuleScore | None = None
         start_time = time.time()
+        if RULE_RESULT_CACHE.enabled and RULE_RESULT_CACHE.is_cacheable(rule):
+            # prompt injection only ever scores the prompt
+            scoring_text = (
+                request.prompt
+                if rule.type == RuleType.PROMPT_INJECTION
+                else request.get_scoring_text()
+            )
+            cache_key = RULE_RESULT_CACHE.make_key(rule, scoring_text)
+            score = RULE_RESULT_CACHE.get(cache_key)
+            if score is None:
+                score = self.score_rule(request, rule)
+                RULE_RESULT_CACHE.put(cache_key, score)
+        else:
+            score = self.score_rule(request, rule)
+        end_time = time.time()
+        return RuleEngineResult(
+            rule_score_result=score,
+            rule=rule,
+            latency_ms=int((end_time - start_time) * 1000),
+        )
+
+    def score_rule(self, request: ValidationRequest, rule: Rule) -> RuleScore:
+        score: RuleScore
         match rule.type:
             case RuleType.REGEX:
                 score = self.run_regex_rule(request, rule)
@@ -143,22 +167,12 @@ class RuleEngine:
                 score = self.run_toxicity_rule(request, rule)
             case _:
                 raise NotImplementedError
-        end_time = time.time()
-        return RuleEngineResult(
-            rule_score_result=score,
-            rule=rule,
-            latency_ms=int((end_time - start_time) * 1000),
-        )
+        return score
 
     def run_regex_rule(self, request: ValidationRequest, rule: Rule) -> RuleScore:
-        regex_config = rule.get_regex_config()
-        regex_patterns = [
-            re.compile(pattern) for pattern in regex_config.regex_patterns
-        ]
-
         score_request = ScoreRequest(
             rule_type=RuleType.REGEX,
-            regex_patterns=regex_patterns,
+            regex_patterns=COMPILED_RULE_CACHE.get_regex_patterns(rule),
             scoring_text=request.get_scoring_text(),
         )
         if request.response is not None:
@@ -175,6 +189,7 @@ class RuleEngine:
         score_request = ScoreRequest(
             rule_type=RuleType.KEYWORD,
             keyword_list=keyword_config.keywords,
+            keyword_matcher=COMPILED_RULE_CACHE.get_keyword_matcher(rule),
             scoring_text=request.get_scoring_text(),
         )
 
@@ -333,3 +348,23 @@ class RuleEngine:
                 ),
             )
         return rule_score
+
+
+SINGLETON_RULE_ENGINE: RuleEngine | None = None
+_rule_engine_lock = threading.Lock()
+
+
+def get_rule_engine(scorer_client: ScorerClient) -> RuleEngine:
+    """Returns a RuleEngine for scorer_client, reusing the process-wide instance.
+
+    Building a RuleEngine loads a token encoder and resolves the LLM token limit, so it
+    is only rebuilt when called with a different scorer client than the cached one.
+    """
+    global SINGLETON_RULE_ENGINE
+    with _rule_engine_lock:
+        if (
+            SINGLETON_RULE_ENGINE is None
+            or SINGLETON_RULE_ENGINE.scorer is not scorer_client
+        ):
+            SINGLETON_RULE_ENGINE = RuleEngine(scorer_client)
+        return SINGLETON_RULE_ENGINE
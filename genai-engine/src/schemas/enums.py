@@ -52,6 +52,10 @@ class ApplicationConfigurations(str, Enum):
     MAX_LLM_RULES_PER_TASK_COUNT = "max_llm_rules_per_task_count"
     TRACE_RETENTION_DAYS = "trace_retention_days"
     CHATBOT_BLACKLIST_ENDPOINTS = "chatbot_blacklist_endpoints"
+    MATERIALIZED_ATTRIBUTES_BACKFILL_VERSION = (
+        "materialized_attributes_backfill_version"
+    )
+    TRACE_ROLLUPS_BACKFILL_VERSION = "trace_rollups_backfill_version"
 
 
 class ClaimClassifierResultEnum(str, Enum):
@@ -239,6 +239,7 @@ from schemas.scorer_schemas import (
 from utils import constants
 from utils import trace as trace_utils
 from utils.constants import MAX_DATASET_ROWS
+from utils.materialized_attributes import metric_result_columns
 from utils.utils import calculate_duration_ms
 
 tracer = trace.get_tracer(__name__)
@@ -534,6 +535,7 @@ class MetricResult(BaseModel):
             latency_ms=self.latency_ms,
             span_id=self.span_id,
             metric_id=self.metric_id,
+            **metric_result_columns(self.metric_type, details_dict),
         )
 
     def _to_response_model(self) -> MetricResultResponse:
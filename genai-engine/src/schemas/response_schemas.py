@@ -256,12 +256,18 @@ class SessionMetadataResponse(TokenCountCostSchema):
 class TraceListResponse(BaseModel):
     """Response for trace list endpoint"""
 
-    count: int = Field(description="Total number of traces matching filters")
+    count: int = Field(
+        description="Total number of traces matching filters, -1 if include_count was false",
+    )
     display_currency: Optional[str] = Field(
         None,
         description="Currency code for cost fields",
     )
     traces: list[TraceMetadataResponse] = Field(description="List of trace metadata")
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Cursor of the next page of traces, if this page was full. Pass it as cursor to continue after this page.",
+    )
 
 
 class UnregisteredRootSpanGroup(BaseModel):
@@ -285,18 +291,26 @@ class UnregisteredRootSpansResponse(BaseModel):
 class SpanListResponse(BaseModel):
     """Response for span list endpoint"""
 
-    count: int = Field(description="Total number of spans matching filters")
+    count: int = Field(
+        description="Total number of spans matching filters, -1 if include_count was false",
+    )
     display_currency: Optional[str] = Field(
         None,
         description="Currency code for cost fields",
     )
     spans: list[SpanMetadataResponse] = Field(description="List of span metadata")
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Cursor of the next page of spans, if this page was full. Pass it as cursor to continue after this page.",
+    )
 
 
 class SessionListResponse(BaseModel):
     """Response for session list endpoint"""
 
-    count: int = Field(description="Total number of sessions matching filters")
+    count: int = Field(
+        description="Total number of sessions matching filters, -1 if include_count was false",
+    )
     display_currency: Optional[str] = Field(
         None,
         description="Currency code for cost fields",
@@ -304,6 +318,10 @@ class SessionListResponse(BaseModel):
     sessions: list[SessionMetadataResponse] = Field(
         description="List of session metadata",
     )
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Cursor of the next page of sessions, if this page was full. Pass it as cursor to continue after this page.",
+    )
 
 
 class SessionTracesResponse(BaseModel):
@@ -7,7 +7,9 @@ from arthur_common.models.enums import (
     RuleType,
     ToxicityViolationType,
 )
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+from utils.keyword_matcher import KeywordMatcher
 
 
 class ScorerHallucinationClaim(BaseModel):
@@ -65,6 +67,8 @@ class Example(BaseModel):
 class ScoreRequest(BaseModel):
     """Scoring request object when scoring a rule"""
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     rule_type: RuleType
     user_prompt: Optional[str] = None
     llm_response: Optional[str] = None
@@ -73,6 +77,8 @@ class ScoreRequest(BaseModel):
     examples: Optional[List[Example]] = None
     hint: Optional[str] = None
     keyword_list: Optional[List[str]] = None
+    # precompiled from keyword_list; built on the fly by the scorer if not provided
+    keyword_matcher: Optional[KeywordMatcher] = None
     regex_patterns: Optional[list[Pattern[str]]] = None
     toxicity_threshold: Optional[float] = None
     disabled_pii_entities: Optional[List[str]] = None
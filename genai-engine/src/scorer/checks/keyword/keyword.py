@@ -1,5 +1,3 @@
-import re
-
 from arthur_common.models.enums import RuleResultEnum
 
 from schemas.scorer_schemas import (
@@ -10,32 +8,16 @@ from schemas.scorer_schemas import (
 )
 from scorer.scorer import RuleScorer
 from utils import constants
+from utils.keyword_matcher import KeywordMatcher
 from utils.token_count import TokenCounter
 
 TOKEN_COUNTER = TokenCounter()
 
 
-def is_punctuation_only(keyword: str) -> bool:
-    # Returns True if the keyword has no letters, digits, or underscores
-    return not re.search(r"\w", keyword)
-
-
-def get_keyword_regex_pattern(keyword: str) -> str:
-    escape_pattern = re.escape(keyword)
-
-    if not is_punctuation_only(keyword):
-        # if a keyword has word characters then use word-boundaries
-        return rf"(?<!\w){escape_pattern}(?!\w)"
-
-    return escape_pattern
-
-
 class KeywordScorer(RuleScorer):
     def score(self, request: ScoreRequest) -> RuleScore:
         """checks if request contains any bad keywords"""
         text = request.scoring_text
-        failed_keywords = []
-        keyword_found = False
         reason = constants.KEYWORD_NO_MATCHES_MESSAGE
 
         if not text:
@@ -49,12 +31,11 @@ class KeywordScorer(RuleScorer):
                 completion_tokens=0,
             )
 
-        for keyword in request.keyword_list or []:
-            keyword_pattern = get_keyword_regex_pattern(keyword)
-
-            if re.search(keyword_pattern, text, flags=re.IGNORECASE):
-                failed_keywords.append(keyword)
-                keyword_found = True
+        keyword_matcher = request.keyword_matcher or KeywordMatcher(
+            request.keyword_list or [],
+        )
+        failed_keywords = keyword_matcher.find(text)
+        keyword_found = bool(failed_keywords)
 
         if failed_keywords:
             reason = constants.KEYWORD_MATCHES_MESSAGE
@@ -5,12 +5,14 @@ This module provides utilities and classifiers for detecting PII in text data
 using both Presidio and GLiNER models.
 """
 
+import bisect
 import logging
 import re
+from typing import Any, Hashable
 
-import spacy
+import torch
 from arthur_common.models.enums import PIIEntityTypes, RuleResultEnum
-from date_spacy import find_dates  # noqa: F401 - Import registers the component
+from opentelemetry import trace
 
 from schemas.scorer_schemas import (
     DateTimeSpan,
@@ -29,13 +31,57 @@ from scorer.checks.pii.pii_utils import (
     sanitize,
 )
 from scorer.checks.pii.presidio_gliner_map import PresidioGlinerMapper
+from utils.micro_batching import MicroBatcher
 from utils.model_load import (
+    get_date_spacy_pipeline,
     get_gliner_model,
     get_gliner_tokenizer,
     get_presidio_analyzer,
 )
+from utils.rule_executor import ExecutorLane, get_lane_max_workers
+from utils.utils import TracedThreadPoolExecutor
 
 logging.getLogger("presidio-analyzer").setLevel(logging.ERROR)
+tracer = trace.get_tracer(__name__)
+
+# Supplementary DATE_TIME patterns for cases spaCy misses, in priority order
+DATETIME_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in [
+        # Day names
+        r"\b(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\b",
+        r"\b(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)\b",
+        # Month + Year combinations
+        r"\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}\b",
+        r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2}(?:st|nd|rd|th)?,?\s*\d{2,4}\b",
+        # Full date patterns
+        r"\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2}(?:st|nd|rd|th)?,?\s*\d{2,4}\b",
+        r"\b\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)(?:,?\s*\d{2,4})?\b",
+        # Year patterns
+        r"\b(19|20)\d{2}\b",
+        # Time patterns
+        r"\b\d{1,2}:\d{2}(?::\d{2})?\s*(?:am|pm|AM|PM|a\.m\.|p\.m\.)\b",
+        r"\b\d{1,2}\s*(?:am|pm|AM|PM|a\.m\.|p\.m\.)\b",
+        r"\b\d{1,2}\s*o'?clock\b",
+        r"\b(?:noon|midnight)\b",
+        r"\bquarter\s+past\b",
+        # Date formats
+        r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b",
+        r"\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b",
+        # Quantified time units (specific durations)
+        r"\b\d+\s*(?:seconds?|minutes?|hours?|days?|weeks?|months?|years?)\b",
+        r"\b\d+\s*(?:secs?|mins?|hrs?|wks?|yrs?)\b",
+        # Quarters
+        r"\bQ[1-4]\s*\d{4}\b",
+        # Holidays
+        r"\b(?:Christmas|Xmas|Easter|Halloween|Valentine|Thanksgiving|New\s+Year)\b",
+    ]
+]
+# Matches wherever any of DATETIME_PATTERNS matches
+DATETIME_COMBINED_PATTERN = re.compile(
+    "|".join(f"(?:{pattern.pattern})" for pattern in DATETIME_PATTERNS),
+    re.IGNORECASE,
+)
 
 
 class BinaryPIIDataClassifier:
@@ -59,10 +105,8 @@ class BinaryPIIDataClassifier:
         self.max_tokens_per_chunk = MAX_TOKENS_PER_CHUNK
         self.analyzer = get_presidio_analyzer()
 
-        # Initialize spaCy with date_spacy for datetime detection
-        # Create a minimal pipeline without NER to avoid entity conflicts
-        self.date_nlp = spacy.load("en_core_web_lg", exclude=["ner"])
-        self.date_nlp.add_pipe("find_dates")
+        # spaCy with date_spacy for datetime detection, shared across instances
+        self.date_nlp = get_date_spacy_pipeline()
 
         # Get all entity values from enum
         entities = PIIEntityTypes.values()
@@ -85,6 +129,32 @@ class BinaryPIIDataClassifier:
             for entity in self.gliner_entities
         ]
 
+        self.gliner_batcher = MicroBatcher.from_env("gliner", self._run_gliner)
+
+        # Presidio and date detection run here while GLiNER runs on the scoring thread.
+        # Each concurrent PII evaluation offloads two stages.
+        self.detector_executor = TracedThreadPoolExecutor(
+            tracer,
+            max_workers=2 * get_lane_max_workers(ExecutorLane.MODEL),
+            thread_name_prefix="pii-detector",
+        )
+
+    def _run_gliner(
+        self,
+        labels: Hashable,
+        chunks: list[str],
+    ) -> list[list[dict[str, Any]]]:
+        """Single GLiNER forward pass over chunks sharing one label set, used as the micro-batch function"""
+        if self.model is None:
+            raise ValueError("GLiNER model is not available.")
+        with torch.no_grad():
+            preds: list[list[dict[str, Any]]] = self.model.inference(
+                chunks,
+                labels=list(labels),  # type: ignore[call-overload]
+                batch_size=len(chunks),
+            )
+        return preds
+
     def score(self, request: ScoreRequest) -> RuleScore:
         """Score text for PII detection using Presidio, GLiNER, and date_spacy."""
         text = sanitize(request.scoring_text or "")
@@ -94,27 +164,34 @@ class BinaryPIIDataClassifier:
             request.pii_confidence_threshold or self.DEFAULT_CONFIDENCE_THRESHOLD
         )
 
-        # Process with Presidio
-        all_spans = process_presidio(
+        # Presidio, GLiNER and date_spacy are independent and spend most of their time
+        # in native code, so run them concurrently
+        presidio_future = self.detector_executor.submit(
+            process_presidio,
             text,
             self.analyzer,
             self.presidio_entities,
             disabled_entities,
             allow_list,
         )
+        date_future = self.detector_executor.submit(
+            self._process_date_spacy,
+            text,
+            disabled_entities,
+        )
 
         # Process with GLiNER (all other entities except DATE_TIME)
-        all_spans = all_spans + process_gliner(
+        gliner_spans = process_gliner(
             text,
             self.gliner_entity_types,
             disabled_entities,
             self.model,
             self.tokenizer,
             self.max_tokens_per_chunk,
+            batcher=self.gliner_batcher,
         )
 
-        # Process with date_spacy for DATE_TIME entities
-        all_spans = all_spans + self._process_date_spacy(text, disabled_entities)
+        all_spans = presidio_future.result() + gliner_spans + date_future.result()
 
         # Apply confidence threshold
         if confidence_threshold > 0:
@@ -201,52 +278,30 @@ class BinaryPIIDataClassifier:
                     )
 
         # Phase 2: Pattern-based supplementation for specific patterns spaCy misses
-        datetime_patterns = [
-            # Day names
-            r"\b(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\b",
-            r"\b(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)\b",
-            # Month + Year combinations
-            r"\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}\b",
-            r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2}(?:st|nd|rd|th)?,?\s*\d{2,4}\b",
-            # Full date patterns
-            r"\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2}(?:st|nd|rd|th)?,?\s*\d{2,4}\b",
-            r"\b\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)(?:,?\s*\d{2,4})?\b",
-            # Year patterns
-            r"\b(19|20)\d{2}\b",
-            # Time patterns
-            r"\b\d{1,2}:\d{2}(?::\d{2})?\s*(?:am|pm|AM|PM|a\.m\.|p\.m\.)\b",
-            r"\b\d{1,2}\s*(?:am|pm|AM|PM|a\.m\.|p\.m\.)\b",
-            r"\b\d{1,2}\s*o'?clock\b",
-            r"\b(?:noon|midnight)\b",
-            r"\bquarter\s+past\b",
-            # Date formats
-            r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b",
-            r"\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b",
-            # Quantified time units (specific durations)
-            r"\b\d+\s*(?:seconds?|minutes?|hours?|days?|weeks?|months?|years?)\b",
-            r"\b\d+\s*(?:secs?|mins?|hrs?|wks?|yrs?)\b",
-            # Quarters
-            r"\bQ[1-4]\s*\d{4}\b",
-            # Holidays
-            r"\b(?:Christmas|Xmas|Easter|Halloween|Valentine|Thanksgiving|New\s+Year)\b",
-        ]
-
-        for pattern in datetime_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
+        # one scan with the combined pattern skips the per-pattern passes for most texts
+        if not DATETIME_COMBINED_PATTERN.search(text):
+            return datetime_spans
+
+        # spaCy entities never overlap and neither do accepted pattern matches, so the
+        # accepted spans stay sorted by both start and end and a bisect finds overlaps
+        datetime_spans.sort(key=lambda span: span["start"])
+        starts = [span["start"] for span in datetime_spans]
+        ends = [span["end"] for span in datetime_spans]
+
+        # patterns keep their priority order: earlier patterns win overlapping matches
+        for pattern in DATETIME_PATTERNS:
+            for match in pattern.finditer(text):
                 span_text = match.group().strip()
                 start_pos = match.start()
                 end_pos = match.end()
 
-                # Avoid duplicates - check if overlaps with spaCy detections
-                overlaps = any(
-                    span["start"] <= start_pos < span["end"]
-                    or span["start"] < end_pos <= span["end"]
-                    or start_pos <= span["start"] < end_pos
-                    for span in datetime_spans
-                )
+                # Avoid duplicates - check if overlaps with earlier detections
+                index = bisect.bisect_left(starts, end_pos)
+                overlaps = index > 0 and ends[index - 1] > start_pos
 
                 if not overlaps and span_text:
-                    datetime_spans.append(
+                    datetime_spans.insert(
+                        index,
                         {
                             "entity": PIIEntityTypes.DATE_TIME.value,
                             "span": span_text,
@@ -255,5 +310,7 @@ class BinaryPIIDataClassifier:
                             "confidence": 0.9,  # Slightly lower for pattern matches
                         },
                     )
+                    starts.insert(index, start_pos)
+                    ends.insert(index, end_pos)
 
         return datetime_spans
@@ -23,6 +23,7 @@ from scorer.checks.pii.validations import (
     is_url,
     is_us_passport,
 )
+from utils.micro_batching import MicroBatcher
 from utils.text_chunking import ChunkIterator
 
 # Entity validation mapping
@@ -143,8 +144,13 @@ def process_gliner(
     model: Optional[GLiNER],
     tokenizer: Optional[PreTrainedTokenizerBase],
     max_tokens_per_chunk: int = MAX_TOKENS_PER_CHUNK,
+    batcher: Optional[MicroBatcher[str, list[dict[str, Any]]]] = None,
 ) -> list[DateTimeSpan]:
-    """Process text using GLiNER model."""
+    """Process text using GLiNER model.
+
+    If a batcher is provided, chunks are scored through it so concurrent requests
+    share GLiNER forward passes.
+    """
     if model is None or tokenizer is None:
         return []
 
@@ -158,12 +164,22 @@ def process_gliner(
     if not gliner_entities:
         return []
 
+    chunks = list(ChunkIterator(text, tokenizer, max_tokens_per_chunk))
+    if batcher is not None:
+        # labels are part of the key so only requests with the same entity set share a batch
+        chunk_preds = batcher.run(chunks, key=tuple(gliner_entities))
+    else:
+        chunk_preds = []
+        for chunk in chunks:
+            with torch.no_grad():
+                chunk_preds.append(
+                    model.predict_entities(chunk, labels=gliner_entities),
+                )
+
     gliner_preds: list[dict[str, Any]] = []
     current_offset: int = 0
 
-    for chunk in ChunkIterator(text, tokenizer, max_tokens_per_chunk):
-        with torch.no_grad():
-            preds = model.predict_entities(chunk, labels=gliner_entities)
+    for chunk, preds in zip(chunks, chunk_preds):
         for pred in preds:
             # Adjust offsets for chunk position
             pred["start"] += current_offset
@@ -194,7 +210,7 @@ def process_gliner(
 def remove_overlapping_spans(
     spans: list[DateTimeSpan],
 ) -> list[DateTimeSpan]:
-    """Remove overlapping spans using a greedy approach with confidence and length prioritization."""
+    """Remove overlapping spans using a greedy sweep with confidence and length prioritization."""
     if not spans:
         return []
 
@@ -204,17 +220,17 @@ def remove_overlapping_spans(
         key=lambda s: (s["start"], -s["confidence"], -(s["end"] - s["start"])),
     )
 
+    # Kept spans never overlap and are visited in start order, so a span overlaps
+    # a kept span exactly when it starts before the furthest kept end
     result = []
-    max_end = max((s["end"] for s in spans), default=0)
-    occupied = [False] * (max_end + 1)
-
+    occupied_until = 0
     for span in sorted_spans:
-        # Check if span overlaps with any occupied positions
-        if not any(occupied[pos] for pos in range(span["start"], span["end"])):
+        if span["end"] <= span["start"]:
+            # empty spans occupy no positions
+            result.append(span)
+        elif span["start"] >= occupied_until:
             result.append(span)
-            # Mark positions as occupied
-            for pos in range(span["start"], span["end"]):
-                occupied[pos] = True
+            occupied_until = span["end"]
 
     return result
 
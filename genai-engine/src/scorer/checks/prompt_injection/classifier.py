@@ -1,6 +1,6 @@
 import logging
 import threading
-from typing import Any
+from typing import Any, Hashable
 
 import torch
 import torch.nn.functional as F
@@ -10,18 +10,32 @@ from transformers.tokenization_utils_base import PreTrainedTokenizerBase
 
 from schemas.scorer_schemas import RuleScore, ScoreRequest
 from scorer.scorer import RuleScorer
+from utils import constants
+from utils.micro_batching import MicroBatcher
 from utils.model_load import (
     get_prompt_injection_classifier,
     get_prompt_injection_model,
     get_prompt_injection_tokenizer,
 )
 from utils.text_chunking import SlidingWindowChunkIterator
+from utils.utils import get_env_var
 
 logger = logging.getLogger()
 MAX_LENGTH = 512
 PROMPT_INJECTION_MODEL: PreTrainedModel | None = None
 PROMPT_INJECTION_TOKENIZER: PreTrainedTokenizerBase | None = None
 
+PROMPT_INJECTION_MODEL_BATCH_SIZE = max(
+    int(
+        get_env_var(
+            constants.GENAI_ENGINE_PROMPT_INJECTION_MODEL_BATCH_SIZE_ENV_VAR,
+            True,
+        )
+        or constants.DEFAULT_PROMPT_INJECTION_MODEL_BATCH_SIZE,
+    ),
+    1,
+)
+
 
 class BinaryPromptInjectionClassifier(RuleScorer):
     def __init__(
@@ -35,6 +49,28 @@ class BinaryPromptInjectionClassifier(RuleScorer):
             tokenizer if tokenizer is not None else get_prompt_injection_tokenizer()
         )
         self.injection_label = "INJECTION"
+        self.batcher = MicroBatcher.from_env(
+            "prompt_injection",
+            self._run_classifier,
+        )
+
+    def _run_classifier(
+        self,
+        _: Hashable,
+        chunks: list[str],
+    ) -> list[list[dict[str, Any]]]:
+        """Padded forward passes over a batch of chunks, used as the micro-batch function"""
+        if self.model is None:
+            raise ValueError("Prompt injection classifier is not available.")
+        with torch.no_grad():
+            raw_results = self.model(
+                chunks,
+                batch_size=PROMPT_INJECTION_MODEL_BATCH_SIZE,
+            )
+        # the pipeline returns one top-label dict per input when given a list
+        return [
+            result if isinstance(result, list) else [result] for result in raw_results
+        ]
 
     def chunk_text(self, text: str) -> list[str]:
         if not self.tokenizer:
@@ -63,6 +99,23 @@ class BinaryPromptInjectionClassifier(RuleScorer):
             PROMPT_INJECTION_TOKENIZER,
         )
 
+    def contains_injection(self, raw_results: list[list[dict[str, Any]]]) -> bool:
+        """Returns True if the top label of any window's results is the injection label"""
+        if not raw_results:
+            return False
+        # (# windows, # labels) scores, one softmax / argmax over the whole batch
+        scores = torch.tensor(
+            [
+                [float(item["score"]) for item in raw_scores]
+                for raw_scores in raw_results
+            ],
+        )
+        top_label_idx = torch.argmax(F.softmax(scores, dim=1), dim=1).tolist()
+        return any(
+            raw_scores[label_idx]["label"] == self.injection_label
+            for raw_scores, label_idx in zip(raw_results, top_label_idx)
+        )
+
     def score(self, request: ScoreRequest) -> RuleScore:
         """Scores prompt for how likely they are to be a prompt injection attack
         Requests greater than 2000 characters are truncated from the middle"""
@@ -88,19 +141,11 @@ class BinaryPromptInjectionClassifier(RuleScorer):
             )
         text_chunks = self.chunk_text(user_prompt)
 
-        for chunk in text_chunks:
-            # Get raw scores from model
-            with torch.no_grad():
-                raw_scores: list[dict[str, Any]] = self.model(chunk)
-
-            scores = torch.tensor([item["score"] for item in raw_scores])
-
-            probs = F.softmax(scores, dim=0)
-
-            max_prob_idx: int | float = torch.argmax(probs).item()
-            label: str = raw_scores[int(max_prob_idx)]["label"]
-
-            if label == self.injection_label:
+        # Score the windows a batch at a time, sharing the forward pass with concurrent
+        # requests, and stop at the first batch containing an injection
+        for start in range(0, len(text_chunks), PROMPT_INJECTION_MODEL_BATCH_SIZE):
+            batch = text_chunks[start : start + PROMPT_INJECTION_MODEL_BATCH_SIZE]
+            if self.contains_injection(self.batcher.run(batch)):
                 return RuleScore(
                     result=RuleResultEnum.FAIL,
                     prompt_tokens=0,
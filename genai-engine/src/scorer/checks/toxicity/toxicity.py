@@ -2,7 +2,7 @@ import logging
 import os
 import re
 import threading
-from typing import Any, List
+from typing import Any, Hashable, List
 
 import numpy as np
 import torch
@@ -21,6 +21,7 @@ from schemas.scorer_schemas import (
 from scorer.checks.toxicity.toxicity_profanity.profanity import detect_profanity
 from scorer.scorer import RuleScorer
 from utils import constants
+from utils.micro_batching import MicroBatcher
 from utils.model_load import (
     get_harmful_request_classifier,
     get_profanity_classifier,
@@ -28,7 +29,7 @@ from utils.model_load import (
     get_toxicity_model,
     get_toxicity_tokenizer,
 )
-from utils.text_chunking import ChunkIterator
+from utils.text_chunking import ChunkIterator, chunk_text_by_sizes
 from utils.utils import get_env_var, list_indicator_regex, pad_text
 
 logger = logging.getLogger()
@@ -82,6 +83,14 @@ class ToxicityScorer(RuleScorer):
             toxicity_tokenizer if toxicity_tokenizer else get_toxicity_tokenizer()
         )
         self.profanity_classifier = get_profanity_classifier()
+        self.toxicity_batcher = MicroBatcher.from_env(
+            "toxicity",
+            self._run_toxicity_classifier,
+        )
+        self.profanity_batcher = MicroBatcher.from_env(
+            "profanity",
+            self._run_profanity_classifier,
+        )
 
     def _download_model_and_tokenizer(self) -> None:
         # Download the model and tokenizer using the provided methods
@@ -94,6 +103,41 @@ class ToxicityScorer(RuleScorer):
         self.model = get_toxicity_classifier(TOXICITY_MODEL, TOXICITY_TOKENIZER)
         logger.info("Model and tokenizer downloaded and classifier initialized.")
 
+    def _run_toxicity_classifier(
+        self,
+        _: Hashable,
+        texts: list[str],
+    ) -> list[list[dict[str, str | float]]]:
+        """Single forward pass of the toxicity classifier, used as the micro-batch function"""
+        if self.model is None:
+            raise ValueError("Toxicity model is not available.")
+        with torch.no_grad():
+            # why we ignore assignment type error?
+            # return type in the transformers library is typed wrongly
+            # it returns list nested in list of dicts with label and score keys
+            tox_results: list[list[dict[str, str | float]]] = self.model(  # type: ignore[assignment]
+                texts,
+                batch_size=TOXICITY_MODEL_BATCH_SIZE,
+            )
+        return tox_results
+
+    def _run_profanity_classifier(
+        self,
+        _: Hashable,
+        texts: list[str],
+    ) -> list[list[dict[str, str | float]]]:
+        """Single forward pass of the profanity classifier, used as the micro-batch function"""
+        if self.profanity_classifier is None:
+            raise ValueError(
+                "Profanity classifier is not available.",
+            )
+        # This type ignore here is cause we know that this is the type that the classifier returns
+        prof_inference_res: list[list[dict[str, str | float]]] = self.profanity_classifier(  # type: ignore[assignment]
+            texts,
+            batch_size=TOXICITY_MODEL_BATCH_SIZE,
+        )
+        return prof_inference_res
+
     def chunk_text(self, text: str, chunk_size: int) -> list[str]:
         if self.toxicity_tokenizer is None:
             raise ValueError(
@@ -107,6 +151,14 @@ class ToxicityScorer(RuleScorer):
 
         return [chunk for chunk in chunk_iterator]
 
+    def chunk_text_by_sizes(self, text: str, chunk_sizes: list[int]) -> list[list[str]]:
+        """Chunks text for each of chunk_sizes from a single tokenization pass"""
+        if self.toxicity_tokenizer is None:
+            raise ValueError(
+                "Toxicity tokenizer is not available.",
+            )
+        return chunk_text_by_sizes(text, self.toxicity_tokenizer, chunk_sizes)
+
     def split_text_into_sections(self, text: str) -> list[str]:
         """Splits text into sections to localize where toxic text is identified
 
@@ -153,26 +205,27 @@ class ToxicityScorer(RuleScorer):
                 "Profanity classifier is not available.",
             )
         with tracer.start_as_current_span("toxicity: profanity detection"):
-            for section in texts:
-                # this calls the detect_profanity function found in toxicity_profanity/profanity.py
-                if detect_profanity(section):
-                    # if we detect profanity we can return early since later we check just if any profanity has been detected
-                    return True
-
-            # This type ignore here is cause we know that this is the type that the classifier returns
-            prof_inference_res: list[list[dict[str, str | float]]] = self.profanity_classifier(  # type: ignore[assignment]
+            return self.detect_profanity_regex(texts) or self.classify_profanity(
                 texts,
-                batch_size=TOXICITY_MODEL_BATCH_SIZE,
+                threshold,
             )
 
-            for dicts_arr in prof_inference_res:
-                if any(
-                    float(label_dict["score"]) > threshold
-                    for label_dict in dicts_arr
-                    if str(label_dict["label"]) == "OFFENSIVE"
-                ):
-                    return True
+    def detect_profanity_regex(self, texts: list[str]) -> bool:
+        """Checks texts against the profanity blacklist, see toxicity_profanity/profanity.py"""
+        # any() returns on the first section with profanity
+        return any(detect_profanity(section) for section in texts)
+
+    def classify_profanity(self, texts: list[str], threshold: float) -> bool:
+        """Returns True if the profanity classifier flags any of texts as offensive above threshold"""
+        if not texts:
             return False
+        prof_inference_res = self.profanity_batcher.run(texts)
+        return any(
+            float(label_dict["score"]) > threshold
+            for dicts_arr in prof_inference_res
+            for label_dict in dicts_arr
+            if str(label_dict["label"]) == "OFFENSIVE"
+        )
 
     def score_harmful_request(self, texts: List[str]) -> list[float]:
         """Scores using a harmful request classifier
@@ -201,18 +254,15 @@ class ToxicityScorer(RuleScorer):
         """
         if self.model is None:
             raise ValueError("Toxicity model is not available.")
+        if not texts:
+            return []
         with tracer.start_as_current_span("toxicity: run deberta classifier"):
             # note: a flaw in the model was identified Mar 18 2024
             # it was fine-tuned as a classifier on almost 0 examples of text < 20 chars
             # so for now, we apply repetition padding to the input sequences
-            with torch.no_grad():
-                # why we ignore assignment type error?
-                # return type in the transformers library is typed wrongly
-                # it returns list nested in list of dicts with label and score keys
-                tox_results: list[list[dict[str, str | float]]] = self.model(  # type: ignore[assignment]
-                    pad_text(texts, pad_type="repetition"),
-                    batch_size=TOXICITY_MODEL_BATCH_SIZE,
-                )
+            tox_results = self.toxicity_batcher.run(
+                pad_text(texts, pad_type="repetition"),
+            )
         toxscores: list[float] = []
         for l in tox_results:
             for l_ in l:
@@ -240,11 +290,8 @@ class ToxicityScorer(RuleScorer):
             message: str
                 message to be provided to the user (TBD on specific presentation of details)
         """
-        if (
-            profanity_results
-            or any(np.round(s, 3) > threshold for s in harmscores)
-            or any(np.round(s, 3) > threshold for s in toxscores)
-        ):
+        scores = np.asarray(harmscores + toxscores, dtype=float)
+        if profanity_results or bool(np.any(np.round(scores, 3) > threshold)):
             return "Toxicity detected"
         return "No toxicity detected!"
 
@@ -303,21 +350,55 @@ class ToxicityScorer(RuleScorer):
                 completion_tokens=0,
             )
 
-        text_chunks = self.chunk_text(request.scoring_text, TOXICITY_MAX_CHUNK_SIZE)
+        threshold = request.toxicity_threshold
+        # tokenize once and derive every chunking we need from that encoding; the harmful
+        # request chunks are only needed when that classifier is configured
+        if self.harmfulrequest_classifier is None:
+            (text_chunks,) = self.chunk_text_by_sizes(
+                request.scoring_text,
+                [TOXICITY_MAX_CHUNK_SIZE],
+            )
+            harmful_request_text_chunks: list[str] = []
+        else:
+            text_chunks, harmful_request_text_chunks = self.chunk_text_by_sizes(
+                request.scoring_text,
+                [TOXICITY_MAX_CHUNK_SIZE, HARMFUL_REQUEST_MAX_CHUNK_SIZE],
+            )
 
-        harmful_request_text_chunks = self.chunk_text(
-            request.scoring_text,
-            HARMFUL_REQUEST_MAX_CHUNK_SIZE,
-        )
+        if self.profanity_classifier is None:
+            raise ValueError(
+                "Profanity classifier is not available.",
+            )
 
-        # generate rule results & model predictions
-        profanity_results = self.detect_profanity(
-            text_chunks,
-            request.toxicity_threshold,
-        )
+        harmfulrequest_scores: list[float] = []
+        toxicity_scores: list[float] = []
 
-        harmfulrequest_scores = []
-        toxicity_scores = []
+        # the regex check is cheap, so it runs over the whole text before any model
+        with tracer.start_as_current_span("toxicity: profanity detection"):
+            profanity_results = self.detect_profanity_regex(text_chunks)
+
+        if not profanity_results and harmful_request_text_chunks:
+            harmfulrequest_scores = self.score_harmful_request(
+                harmful_request_text_chunks,
+            )
+
+        # the profanity classifier and the toxicity model run over the same batches of
+        # chunks; once a batch decides the result (profanity, or a chunk scoring above the
+        # threshold), the remaining batches are skipped
+        if (
+            not profanity_results
+            and max(harmfulrequest_scores, default=0.0) <= threshold
+        ):
+            for start in range(0, len(text_chunks), TOXICITY_MODEL_BATCH_SIZE):
+                batch = text_chunks[start : start + TOXICITY_MODEL_BATCH_SIZE]
+                with tracer.start_as_current_span("toxicity: run profanity classifier"):
+                    profanity_results = self.classify_profanity(batch, threshold)
+                if profanity_results:
+                    break
+                batch_scores = self.score_toxic_text(batch)
+                toxicity_scores.extend(batch_scores)
+                if max(batch_scores, default=0.0) > threshold:
+                    break
 
         # aggregate rule results & model predictions into the returned RuleScore
         if profanity_results:
@@ -325,15 +406,9 @@ class ToxicityScorer(RuleScorer):
             final_score = np.nextafter(1.0, 0.0)
             final_problem_type = ToxicityViolationType.PROFANITY  # Keep them as str
         else:
-            harmfulrequest_scores = self.score_harmful_request(
-                harmful_request_text_chunks,
-            )
-
-            # run the toxicity model in batches
-            toxicity_scores = self.score_toxic_text(text_chunks)
-
             # if no profanity, return the maximum score on any section from either of our classifiers
-            max_harm, max_tox = max(harmfulrequest_scores), max(toxicity_scores)
+            max_harm = max(harmfulrequest_scores, default=0.0)
+            max_tox = max(toxicity_scores, default=0.0)
 
             final_score = 0.0
             if max_harm > max_tox:
@@ -342,14 +417,14 @@ class ToxicityScorer(RuleScorer):
             else:
                 final_score = max_tox
                 final_problem_type = ToxicityViolationType.TOXIC_CONTENT
-        bool_result = final_score > request.toxicity_threshold or profanity_results
+        bool_result = final_score > threshold or profanity_results
         genai_engine_results = {False: RuleResultEnum.PASS, True: RuleResultEnum.FAIL}
         genai_engine_result = genai_engine_results[bool_result]
         message = self.write_score_details_message(
             profanity_results,
             harmfulrequest_scores,
             toxicity_scores,
-            request.toxicity_threshold,
+            threshold,
         )
         return RuleScore(
             result=genai_engine_result,
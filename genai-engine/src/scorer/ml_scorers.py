@@ -1,8 +1,13 @@
 """Concrete ML scorer implementations."""
 
-from typing import Any, Dict, Optional
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
 
+import torch
 from arthur_common.models.enums import RuleResultEnum, RuleType
+from spacy.language import Language
 
 from schemas.enums import EvalKind
 from schemas.response_schemas import EvalRunResponse
@@ -13,12 +18,14 @@ from scorer.checks.pii.classifier_v1 import BinaryPIIDataClassifierV1
 from scorer.checks.prompt_injection.classifier import BinaryPromptInjectionClassifier
 from scorer.checks.toxicity.toxicity import ToxicityScorer
 from utils.model_load import (
-    PROMPT_INJECTION_MODEL,
-    PROMPT_INJECTION_TOKENIZER,
-    TOXICITY_MODEL,
-    TOXICITY_TOKENIZER,
+    get_prompt_injection_model,
+    get_prompt_injection_tokenizer,
+    get_toxicity_model,
+    get_toxicity_tokenizer,
 )
 
+logger = logging.getLogger(__name__)
+
 ML_EVAL_INPUT_VARIABLE = "input"
 
 
@@ -86,32 +93,138 @@ class PromptInjectionMLScorer(BaseMLScorer):
         return _score_to_response(self._scorer.score(request))
 
 
+def _build_pii_scorer() -> BaseMLScorer:
+    return PIIScorerV2(BinaryPIIDataClassifier())
+
+
+def _build_pii_v1_scorer() -> BaseMLScorer:
+    return PIIScorerV1(BinaryPIIDataClassifierV1())
+
+
+def _build_toxicity_scorer() -> BaseMLScorer:
+    return ToxicityMLScorer(
+        ToxicityScorer(
+            toxicity_model=get_toxicity_model(),
+            toxicity_tokenizer=get_toxicity_tokenizer(),
+            harmful_request_model=None,
+            harmful_request_tokenizer=None,
+        ),
+    )
+
+
+def _build_prompt_injection_scorer() -> BaseMLScorer:
+    return PromptInjectionMLScorer(
+        BinaryPromptInjectionClassifier(
+            model=get_prompt_injection_model(),
+            tokenizer=get_prompt_injection_tokenizer(),
+        ),
+    )
+
+
+ML_SCORER_FACTORIES: dict[str, Callable[[], BaseMLScorer]] = {
+    EvalKind.PII.value: _build_pii_scorer,
+    EvalKind.PII_V1.value: _build_pii_v1_scorer,
+    EvalKind.TOXICITY.value: _build_toxicity_scorer,
+    EvalKind.PROMPT_INJECTION.value: _build_prompt_injection_scorer,
+}
+
+
+def estimate_memory_bytes(obj: Any, max_depth: int = 3) -> int:
+    """Estimates the memory held by the models reachable from obj.
+
+    Counts torch module parameters and buffers and spaCy word vectors, which account
+    for nearly all of a scorer's footprint. Objects shared between scorers (e.g. models
+    cached by model_load) are counted by each scorer that references them.
+    """
+    seen: set[int] = set()
+
+    def visit(value: Any, depth: int) -> int:
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+        if isinstance(value, torch.nn.Module):
+            tensors = list(value.parameters()) + list(value.buffers())
+            return sum(t.numel() * t.element_size() for t in tensors)
+        if isinstance(value, Language):
+            return int(value.vocab.vectors.data.nbytes)
+        if depth >= max_depth:
+            return 0
+        if isinstance(value, (list, tuple)):
+            return sum(visit(item, depth + 1) for item in value)
+        if isinstance(value, dict):
+            return sum(visit(item, depth + 1) for item in value.values())
+        if hasattr(value, "__dict__"):
+            return sum(visit(item, depth + 1) for item in vars(value).values())
+        return 0
+
+    return visit(obj, 0)
+
+
+class MLScorerRegistry:
+    """Long-lived ML scorer instances, one per EvalKind.
+
+    Scorers are built lazily on first use (or eagerly via warmup) and then reused,
+    so model loading such as spaCy pipelines happens once per process instead of
+    once per eval run.
+    """
+
+    def __init__(
+        self,
+        factories: dict[str, Callable[[], BaseMLScorer]] | None = None,
+    ) -> None:
+        self._factories = ML_SCORER_FACTORIES if factories is None else factories
+        self._scorers: dict[str, BaseMLScorer] = {}
+        self._memory_bytes: dict[str, int] = {}
+        self._locks = {eval_type: threading.Lock() for eval_type in self._factories}
+
+    def get(self, eval_type: str) -> Optional[BaseMLScorer]:
+        """Returns the scorer for eval_type, building it on first use, or None if unknown."""
+        scorer = self._scorers.get(eval_type)
+        if scorer is not None:
+            return scorer
+        if eval_type not in self._factories:
+            return None
+        with self._locks[eval_type]:
+            # another thread may have built it while we waited
+            if eval_type not in self._scorers:
+                start_time = time.time()
+                scorer = self._factories[eval_type]()
+                self._memory_bytes[eval_type] = estimate_memory_bytes(scorer)
+                self._scorers[eval_type] = scorer
+                logger.info(
+                    f"Loaded ML scorer '{eval_type}' in {time.time() - start_time:.2f}s "
+                    f"(~{self._memory_bytes[eval_type] / 1024**2:.0f} MiB of model weights)",
+                )
+            return self._scorers[eval_type]
+
+    def warmup(self, eval_types: list[str] | None = None) -> None:
+        """Builds the scorers for eval_types (all known kinds by default) ahead of use."""
+        for eval_type in eval_types or list(self._factories):
+            self.get(eval_type)
+
+    def memory_usage(self) -> dict[str, int]:
+        """Returns the estimated model memory in bytes of every loaded scorer."""
+        return dict(self._memory_bytes)
+
+    def loaded(self) -> list[str]:
+        return list(self._scorers)
+
+    def clear(self) -> None:
+        for eval_type in list(self._scorers):
+            with self._locks[eval_type]:
+                self._scorers.pop(eval_type, None)
+                self._memory_bytes.pop(eval_type, None)
+
+
+ML_SCORER_REGISTRY = MLScorerRegistry()
+
+
 def get_ml_scorer(eval_type: str) -> Optional[BaseMLScorer]:
     """Return a BaseMLScorer for the given eval_type, or None if unknown.
 
-    Underlying models are cached by model_load.py; scorer wrappers are lightweight.
+    Scorer instances are long-lived and shared through ML_SCORER_REGISTRY.
     """
-    if eval_type == EvalKind.PII.value:
-        return PIIScorerV2(BinaryPIIDataClassifier())
-    elif eval_type == EvalKind.PII_V1.value:
-        return PIIScorerV1(BinaryPIIDataClassifierV1())
-    elif eval_type == EvalKind.TOXICITY.value:
-        return ToxicityMLScorer(
-            ToxicityScorer(
-                toxicity_model=TOXICITY_MODEL,
-                toxicity_tokenizer=TOXICITY_TOKENIZER,
-                harmful_request_model=None,
-                harmful_request_tokenizer=None,
-            ),
-        )
-    elif eval_type == EvalKind.PROMPT_INJECTION.value:
-        return PromptInjectionMLScorer(
-            BinaryPromptInjectionClassifier(
-                model=PROMPT_INJECTION_MODEL,
-                tokenizer=PROMPT_INJECTION_TOKENIZER,
-            ),
-        )
-    return None
+    return ML_SCORER_REGISTRY.get(eval_type)
 
 
 def run_ml_scorer(eval_type: str, text: str, config: Dict[str, Any]) -> EvalRunResponse:
@@ -86,18 +86,36 @@ from services.currency import (
     initialize_currency_conversion_service,
     shutdown_currency_conversion_service,
 )
+from services.experiment_runner import shutdown_experiment_runner
+from services.materialized_attribute_backfill_service import (
+    initialize_materialized_attribute_backfill_service,
+    shutdown_materialized_attribute_backfill_service,
+)
 from services.system_tasks_service import initialize_system_tasks
 from services.task import (
     initialize_global_agent_polling_service,
     shutdown_global_agent_polling_service,
 )
+from services.trace.span_metrics_queue_service import (
+    initialize_span_metrics_queue_service,
+    shutdown_span_metrics_queue_service,
+)
+from services.trace.trace_ingest_queue_service import (
+    initialize_trace_ingest_queue_service,
+    shutdown_trace_ingest_queue_service,
+)
 from services.trace_retention_service import (
     initialize_trace_retention_service,
     shutdown_trace_retention_service,
 )
+from services.trace_rollup_reconciliation_service import (
+    initialize_trace_rollup_reconciliation_service,
+    shutdown_trace_rollup_reconciliation_service,
+)
 from utils import constants as constants
 from utils import model_load
 from utils.classifiers import get_device
+from utils.rule_executor import shutdown_rule_executor_pool
 from utils.utils import (
     get_env_var,
     get_genai_engine_version,
@@ -251,6 +269,18 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.error(f"Error initializing continuous eval queue service: {e}")
 
+    # Initialize span metrics queue service (only with GENAI_ENGINE_SPAN_METRICS_MODE=background)
+    try:
+        initialize_span_metrics_queue_service(num_workers=4)
+    except Exception as e:
+        logger.error(f"Error initializing span metrics queue service: {e}")
+
+    # Initialize trace ingest queue service (only with GENAI_ENGINE_TRACE_INGESTION_MODE=async)
+    try:
+        initialize_trace_ingest_queue_service()
+    except Exception as e:
+        logger.error(f"Error initializing trace ingest queue service: {e}")
+
     # Initialize currency conversion service (exchange rates, 6-hour refresh at 00/06/12/18 UTC)
     try:
         initialize_currency_conversion_service()
@@ -263,6 +293,18 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.error(f"Error initializing trace retention service: {e}")
 
+    # Initialize materialized attribute backfill (fills hot attribute columns of existing rows)
+    try:
+        initialize_materialized_attribute_backfill_service()
+    except Exception as e:
+        logger.error(f"Error initializing materialized attribute backfill service: {e}")
+
+    # Initialize trace rollup reconciliation (backfills and re-checks trace overview rollups)
+    try:
+        initialize_trace_rollup_reconciliation_service()
+    except Exception as e:
+        logger.error(f"Error initializing trace rollup reconciliation service: {e}")
+
     # Initialize global agent polling service
     try:
         initialize_global_agent_polling_service(num_workers=4)
@@ -285,10 +327,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     yield
 
     cleanup_cuda_cache()
+    shutdown_trace_ingest_queue_service()
+    shutdown_span_metrics_queue_service()
     shutdown_trace_retention_service()
+    shutdown_materialized_attribute_backfill_service()
+    shutdown_trace_rollup_reconciliation_service()
     shutdown_currency_conversion_service()
     shutdown_continuous_eval_queue_service()
     shutdown_global_agent_polling_service()
+    shutdown_experiment_runner()
+    shutdown_rule_executor_pool()
 
 
 class TransferEncodingMiddleware(BaseHTTPMiddleware):
@@ -51,6 +51,8 @@ from schemas.base_experiment_schemas import (
 )
 from schemas.enums import AgenticExperimentGeneratorType
 from services.experiment_executor import BaseExperimentExecutor
+from services.experiment_lookups import ExperimentLookups
+from services.experiment_runner import get_experiment_runner
 from services.prompt.chat_completion_service import ChatCompletionService
 from utils.constants import AGENT_EXPERIMENT_SESSION_PREFIX
 from utils.transform_executor import execute_transform
@@ -102,7 +104,22 @@ class AgenticExperimentExecutor(BaseExperimentExecutor):
         agentic_experiment_repo = AgenticExperimentRepository(db_session)
         return agentic_experiment_repo._get_db_test_case(test_case_id)
 
-    def _execute_experiment_outputs(
+    async def _execute_experiment_outputs(
+        self,
+        db_session: Session,
+        test_case: DatabaseAgenticExperimentTestCase,  # type: ignore[override]
+        lookups: ExperimentLookups,
+        request_time_parameters: Optional[List[RequestTimeParameter]] = None,
+    ) -> bool:
+        """Execute the HTTP request of a test case on the runner's thread pool."""
+        return await get_experiment_runner().run_sync(
+            self._execute_agent_request,
+            db_session,
+            test_case,
+            request_time_parameters,
+        )
+
+    def _execute_agent_request(
         self,
         db_session: Session,
         test_case: DatabaseAgenticExperimentTestCase,  # type: ignore[override]
@@ -536,6 +553,7 @@ class AgenticExperimentExecutor(BaseExperimentExecutor):
         self,
         db_session: Session,
         test_case: DatabaseAgenticExperimentTestCase,  # type: ignore[override]
+        lookups: ExperimentLookups,
     ) -> bool:
         """
         Execute all evaluations for an agentic test case.
@@ -543,6 +561,7 @@ class AgenticExperimentExecutor(BaseExperimentExecutor):
         Args:
             db_session: Database session
             test_case: Test case containing agentic result to evaluate
+            lookups: Lookups of the running experiment
 
         Returns:
             True if all evaluations executed successfully, False otherwise
@@ -557,6 +576,7 @@ class AgenticExperimentExecutor(BaseExperimentExecutor):
             success = self._execute_evaluations_for_result(
                 db_session,
                 test_case.agentic_result,
+                lookups,
             )
             return success
         except Exception as e:
@@ -570,6 +590,7 @@ class AgenticExperimentExecutor(BaseExperimentExecutor):
         self,
         db_session: Session,
         agentic_result: DatabaseAgenticExperimentTestCaseAgenticResult,
+        lookups: ExperimentLookups,
     ) -> bool:
         """
         Execute all evaluations for an agentic result.
@@ -577,6 +598,7 @@ class AgenticExperimentExecutor(BaseExperimentExecutor):
         Args:
             db_session: Database session
             agentic_result: Agentic result with trace to evaluate
+            lookups: Lookups of the running experiment
 
         Returns:
             True if all evaluations executed successfully, False otherwise
@@ -589,6 +611,7 @@ class AgenticExperimentExecutor(BaseExperimentExecutor):
                     db_session,
                     eval_score,
                     agentic_result,
+                    lookups,
                 )
                 if not success:
                     any_eval_failed = True
@@ -610,6 +633,7 @@ class AgenticExperimentExecutor(BaseExperimentExecutor):
         db_session: Session,
         eval_score: DatabaseAgenticExperimentTestCaseAgenticResultEvalScore,  # type: ignore[override]
         agentic_result: DatabaseAgenticExperimentTestCaseAgenticResult,  # type: ignore[override]
+        lookups: ExperimentLookups,
     ) -> bool:
         """
         Execute a single evaluation.
@@ -618,6 +642,7 @@ class AgenticExperimentExecutor(BaseExperimentExecutor):
             db_session: Database session
             eval_score: Eval score record to populate
             agentic_result: Agentic result with trace
+            lookups: Lookups of the running experiment
 
         Returns:
             True if eval executed successfully, False otherwise
@@ -707,13 +732,13 @@ class AgenticExperimentExecutor(BaseExperimentExecutor):
                 for name, value in variable_map.items()
             ]
             eval_score.eval_input_variables = eval_input_variables
-            db_session.commit()
 
             # Execute eval using shared method
             return self._execute_eval_with_variable_map(
                 db_session,
                 eval_score,
                 experiment,
+                lookups,
             )
 
         except Exception as e:
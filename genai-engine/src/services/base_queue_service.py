@@ -3,13 +3,27 @@ import threading
 import time
 from abc import ABC, abstractmethod
 from concurrent.futures import Future, ThreadPoolExecutor
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Generic, Hashable, Optional, Type, TypeVar
 
+from sqlalchemy.orm import Session
+
+from repositories.queue_job_repository import ClaimedQueueJob, NewQueueJob
+from services.durable_job_queue import (
+    DurableJobQueue,
+    create_durable_job_queue,
+    durable_job_queue_enabled,
+)
+from utils.delayed_job_scheduler import DelayedJobScheduler
+
 logger = logging.getLogger(__name__)
 
 JobType = TypeVar("JobType", bound="BaseQueueJob")
 
+# Priority of jobs a user is waiting on, so that the durable backend claims them ahead
+# of background work
+USER_REQUESTED_JOB_PRIORITY = 10
+
 
 class BaseQueueJob:
     """Represents a registered agent polling job to be executed."""
@@ -17,18 +31,32 @@ class BaseQueueJob:
     def __init__(
         self,
         delay_seconds: int = 10,
+        priority: int = 0,
     ):
         self.enqueued_at = datetime.now()
         self.delay_seconds = delay_seconds
         self.execute_at = time.time() + delay_seconds
+        # higher priorities are claimed first; only the durable backend orders by it
+        self.priority = priority
 
 
 class BaseQueueService(ABC, Generic[JobType]):
-    """Service that manages async execution of jobs using ThreadPoolExecutor."""
+    """Service that manages async execution of jobs using ThreadPoolExecutor.
+
+    Jobs that are due run on the executor right away. Delayed jobs wait in a
+    DelayedJobScheduler and are handed to the executor once due, so worker threads
+    only ever run jobs that are ready.
+
+    Services that set durable_queue_name and implement _serialize_job and
+    _deserialize_job use the durable queue backend instead when
+    GENAI_ENGINE_DURABLE_JOB_QUEUE_ENABLED is set: jobs are stored in the database and
+    the workers of every replica claim them from there.
+    """
 
     job_model: Type[JobType]
     service_name: str
     background_thread_name: str
+    durable_queue_name: Optional[str] = None
 
     def __init__(
         self,
@@ -38,6 +66,10 @@ class BaseQueueService(ABC, Generic[JobType]):
         self.num_workers = num_workers
         self.background_thread: Optional[threading.Thread] = None
         self.executor: Optional[ThreadPoolExecutor] = None
+        self.scheduler: Optional[DelayedJobScheduler[tuple[JobType, Future[Any]]]] = (
+            None
+        )
+        self.durable_queue: Optional[DurableJobQueue] = None
         self.shutdown_event = threading.Event()
         self.override_execution_delay = override_execution_delay
         self.active_jobs_lock = threading.Lock()
@@ -51,6 +83,19 @@ class BaseQueueService(ABC, Generic[JobType]):
 
         # Create executor for job execution
         self.executor = ThreadPoolExecutor(max_workers=self.num_workers)
+        self.scheduler = DelayedJobScheduler(
+            f"{self.background_thread_name}-scheduler",
+            self._dispatch_delayed_job,
+        )
+        self.scheduler.start()
+
+        if self.durable_queue_name is not None and durable_job_queue_enabled():
+            self.durable_queue = create_durable_job_queue(
+                self.durable_queue_name,
+                self.num_workers,
+                self._dispatch_durable_job,
+            )
+            self.durable_queue.start()
 
         # Start background thread that checks for stale annotations
         self.background_thread = threading.Thread(
@@ -67,6 +112,14 @@ class BaseQueueService(ABC, Generic[JobType]):
         logger.info(f"Stopping {self.service_name}")
         self.shutdown_event.set()
 
+        if self.durable_queue:
+            self.durable_queue.stop(timeout=timeout)
+
+        if self.scheduler:
+            for job, future in self.scheduler.stop(timeout=timeout):
+                future.cancel()
+                self._release_job(job)
+
         if self.executor:
             self.executor.shutdown(wait=True, cancel_futures=True)
 
@@ -82,18 +135,69 @@ class BaseQueueService(ABC, Generic[JobType]):
         """Get a hashable key for a job to prevent duplicate enqueueing."""
         raise NotImplementedError
 
-    def _submit_job(self, job: JobType, wait_time: float) -> Any:
-        """Submit a job to the executor after the wait time and return its result."""
-        if self.shutdown_event.is_set():
-            logger.warning(f"Skipping job due to shutdown")
-            return None
+    def _serialize_job(self, job: JobType) -> dict[str, Any]:
+        """JSON payload a durable queue job is stored with."""
+        raise NotImplementedError
+
+    def _deserialize_job(self, payload: dict[str, Any]) -> JobType:
+        """Job of a durable queue job's payload."""
+        raise NotImplementedError
+
+    def _get_wait_time(self, job: JobType, now: float) -> float:
+        """Seconds until a job is due, honoring override_execution_delay."""
+        if self.override_execution_delay is not None:
+            execute_at = (
+                job.execute_at - job.delay_seconds + self.override_execution_delay
+            )
+        else:
+            execute_at = job.execute_at
+        return max(0, execute_at - now)
 
-        if self.shutdown_event.wait(wait_time):
+    def _submit_job(self, job: JobType, wait_time: float) -> Future[Any]:
+        """Submit a job to the executor now, or to the scheduler if it isn't due yet."""
+        assert self.executor is not None and self.scheduler is not None
+        if wait_time <= 0:
+            return self.executor.submit(self._run_job, job)
+
+        future: Future[Any] = Future()
+        self.scheduler.schedule(wait_time, (job, future))
+        return future
+
+    def _dispatch_delayed_job(self, scheduled: tuple[JobType, Future[Any]]) -> None:
+        """Hand a delayed job that is due to the executor, on the scheduler thread."""
+        job, future = scheduled
+        if not future.set_running_or_notify_cancel():
+            self._release_job(job)
+            return
+
+        try:
+            assert self.executor is not None
+            executor_future = self.executor.submit(self._run_job, job)
+        except Exception as e:
+            # Executor is shutting down
+            self._release_job(job)
+            future.set_exception(e)
+            return
+
+        def copy_outcome(done: Future[Any]) -> None:
+            if done.cancelled():
+                future.set_exception(
+                    RuntimeError(f"{self.service_name} shut down before the job ran"),
+                )
+            elif done.exception() is not None:
+                future.set_exception(done.exception())
+            else:
+                future.set_result(done.result())
+
+        executor_future.add_done_callback(copy_outcome)
+
+    def _run_job(self, job: JobType) -> Any:
+        """Run a job that is due on an executor worker and return its result."""
+        if self.shutdown_event.is_set():
+            logger.warning("Skipping job due to shutdown")
+            self._release_job(job)
             return None
 
-        # Run the job directly on this thread — it is already executing inside the
-        # executor, so re-submitting to the same pool would cause a deadlock when
-        # all worker threads are occupied waiting on their own inner futures.
         return self._execute_job_wrapper(job)
 
     def _execute_job_wrapper(self, job: JobType) -> Any:
@@ -106,14 +210,76 @@ class BaseQueueService(ABC, Generic[JobType]):
             with self.active_jobs_lock:
                 self.active_jobs.discard(job_key)
 
-    def enqueue(self, job: JobType) -> tuple[bool, Optional[Future[Any]]]:
+    def _release_job(self, job: JobType) -> None:
+        with self.active_jobs_lock:
+            self.active_jobs.discard(self._get_job_key(job))
+
+    def _to_queue_job(self, job: JobType, now: float) -> NewQueueJob:
+        wait_time = self._get_wait_time(job, now)
+        return NewQueueJob(
+            job_key=str(self._get_job_key(job)),
+            payload=self._serialize_job(job),
+            visible_at=datetime.now() + timedelta(seconds=wait_time),
+            priority=job.priority,
+        )
+
+    def _dispatch_durable_job(self, claimed: ClaimedQueueJob) -> None:
+        """Hand a job claimed from the durable queue to the executor."""
+        assert self.executor is not None and self.durable_queue is not None
+        durable_queue = self.durable_queue
+        future = self.executor.submit(self._run_durable_job, claimed)
+
+        def release_if_cancelled(done: Future[Any]) -> None:
+            # the executor shut down before the job started
+            if done.cancelled():
+                durable_queue.release([claimed])
+
+        future.add_done_callback(release_if_cancelled)
+
+    def _run_durable_job(self, claimed: ClaimedQueueJob) -> None:
+        """Run a claimed job on an executor worker and remove it from the queue."""
+        assert self.durable_queue is not None
+        if self.shutdown_event.is_set():
+            self.durable_queue.release([claimed])
+            return
+
+        try:
+            self._execute_job(self._deserialize_job(claimed.payload))
+        except Exception as e:
+            logger.error(
+                f"Job {claimed.job_key} of {self.service_name} failed: {e}",
+                exc_info=True,
+            )
+        finally:
+            self.durable_queue.finish(claimed)
+
+    def enqueue(
+        self,
+        job: JobType,
+        wait_for_result: bool = False,
+        db_session: Optional[Session] = None,
+    ) -> tuple[bool, Optional[Future[Any]]]:
         """Schedule a job to be executed.
 
+        Args:
+            job: The job to execute
+            wait_for_result: Run the job in this process even with the durable queue
+                backend, so that the returned future resolves with its result
+            db_session: With the durable queue backend, queue the job in this session's
+                transaction instead of committing it on its own. The caller commits
+
         Returns:
             Tuple of (was_enqueued: bool, future: Optional[Future[Any]])
             - was_enqueued: True if enqueued, False if already active
-            - future: Future object if enqueued, None otherwise
+            - future: Future object if enqueued in this process, None otherwise
         """
+        if self.durable_queue is not None and not wait_for_result:
+            queued = self.durable_queue.enqueue(
+                [self._to_queue_job(job, time.time())],
+                db_session=db_session,
+            )
+            return queued > 0, None
+
         job_key = self._get_job_key(job)
 
         try:
@@ -126,14 +292,7 @@ class BaseQueueService(ABC, Generic[JobType]):
                     return False, None
                 self.active_jobs.add(job_key)
 
-            if self.override_execution_delay is not None:
-                wait_time = (
-                    job.execute_at - job.delay_seconds + self.override_execution_delay
-                )
-            else:
-                wait_time = job.execute_at
-
-            wait_time = max(0, wait_time - time.time())
+            wait_time = self._get_wait_time(job, time.time())
             if not self.executor:
                 logger.error(
                     f"Cannot submit job: executor is not initialized. Start the {self.service_name} first.",
@@ -145,7 +304,7 @@ class BaseQueueService(ABC, Generic[JobType]):
                     f"{self.service_name} is not initialized. Start the {self.service_name} first.",
                 )
 
-            future = self.executor.submit(self._submit_job, job, wait_time)
+            future = self._submit_job(job, wait_time)
         except Exception as e:
             # Executor might be shutting down or have other issues
             logger.error(
@@ -158,6 +317,63 @@ class BaseQueueService(ABC, Generic[JobType]):
 
         return True, future
 
+    def enqueue_many(
+        self,
+        jobs: list[JobType],
+        db_session: Optional[Session] = None,
+    ) -> int:
+        """Schedule a batch of jobs, skipping the ones that are already active.
+
+        Args:
+            jobs: The jobs to execute
+            db_session: With the durable queue backend, queue the jobs in this session's
+                transaction instead of committing them on their own. The caller commits
+
+        Returns:
+            The number of jobs that were enqueued
+        """
+        if not self.executor:
+            raise ValueError(
+                f"{self.service_name} is not initialized. Start the {self.service_name} first.",
+            )
+
+        if self.durable_queue is not None:
+            now = time.time()
+            return self.durable_queue.enqueue(
+                [self._to_queue_job(job, now) for job in jobs],
+                db_session=db_session,
+            )
+
+        # claim every job key under one lock acquisition
+        new_jobs = []
+        with self.active_jobs_lock:
+            for job in jobs:
+                job_key = self._get_job_key(job)
+                if job_key in self.active_jobs:
+                    logger.debug(
+                        f"Job with key {job_key} is already active, skipping enqueue",
+                    )
+                    continue
+                self.active_jobs.add(job_key)
+                new_jobs.append(job)
+
+        now = time.time()
+        for index, job in enumerate(new_jobs):
+            try:
+                self._submit_job(job, self._get_wait_time(job, now))
+            except Exception as e:
+                # Executor might be shutting down, release the jobs not submitted
+                logger.error(
+                    f"Failed to submit {len(new_jobs) - index} jobs of a batch: {e}",
+                    exc_info=True,
+                )
+                with self.active_jobs_lock:
+                    for unsubmitted in new_jobs[index:]:
+                        self.active_jobs.discard(self._get_job_key(unsubmitted))
+                raise e
+
+        return len(new_jobs)
+
     @abstractmethod
     def _background_loop(self) -> None:
         """Background thread that runs continuously"""
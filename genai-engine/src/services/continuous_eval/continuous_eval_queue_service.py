@@ -6,6 +6,7 @@ from typing import Any, Optional
 from arthur_common.models.common_schemas import VariableTemplateValue
 from arthur_common.models.enums import AgenticAnnotationType, ContinuousEvalRunStatus
 from fastapi import HTTPException
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from db_models.agentic_annotation_models import DatabaseAgenticAnnotation
@@ -21,6 +22,10 @@ from repositories.organizations_repository import (
 )
 from repositories.span_repository import SpanRepository
 from repositories.tasks_metrics_repository import TasksMetricsRepository
+from repositories.trace_rollup_repository import (
+    refresh_trace_rollups,
+    trace_rollup_keys,
+)
 from repositories.trace_transform_repository import TraceTransformRepository
 from schemas.enums import EvalKind, TestRunStatus
 from schemas.internal_schemas import ContinuousEval
@@ -29,6 +34,10 @@ from utils.transform_executor import execute_transform
 
 logger = logging.getLogger(__name__)
 
+# Transaction-level advisory lock key for the stale annotation scan, so that one
+# process scans at a time instead of every worker of every replica.
+STALE_ANNOTATION_SCAN_ADVISORY_LOCK_KEY = 17449344
+
 
 class ContinuousEvalJob(BaseQueueJob):
     """Represents a continuous eval job to be executed."""
@@ -40,8 +49,9 @@ class ContinuousEvalJob(BaseQueueJob):
         continuous_eval_id: uuid.UUID,
         task_id: str,
         delay_seconds: int = 10,
+        priority: int = 0,
     ):
-        super().__init__(delay_seconds)
+        super().__init__(delay_seconds, priority)
         self.annotation_id = annotation_id
         self.trace_id = trace_id
         self.continuous_eval_id = continuous_eval_id
@@ -54,11 +64,29 @@ class ContinuousEvalQueueService(BaseQueueService[ContinuousEvalJob]):
     job_model = ContinuousEvalJob
     service_name = "continuous_eval_queue_service"
     background_thread_name = "continuous-eval-background"
+    durable_queue_name = "continuous_eval"
 
     def _get_job_key(self, job: ContinuousEvalJob) -> uuid.UUID:
         """Use annotation_id as the unique key for deduplication."""
         return job.annotation_id
 
+    def _serialize_job(self, job: ContinuousEvalJob) -> dict[str, Any]:
+        return {
+            "annotation_id": str(job.annotation_id),
+            "trace_id": job.trace_id,
+            "continuous_eval_id": str(job.continuous_eval_id),
+            "task_id": job.task_id,
+        }
+
+    def _deserialize_job(self, payload: dict[str, Any]) -> ContinuousEvalJob:
+        return ContinuousEvalJob(
+            annotation_id=uuid.UUID(payload["annotation_id"]),
+            trace_id=payload["trace_id"],
+            continuous_eval_id=uuid.UUID(payload["continuous_eval_id"]),
+            task_id=payload["task_id"],
+            delay_seconds=0,
+        )
+
     def _background_loop(self) -> None:
         """Background thread that checks for stale pending annotations and re-queues them."""
         logger.info(f"Background thread started for {self.service_name}")
@@ -81,6 +109,17 @@ class ContinuousEvalQueueService(BaseQueueService[ContinuousEvalJob]):
         """Find and re-queue pending annotations that are older than 15 minutes."""
         db_session = next(get_db_session())
         try:
+            # held until the session closes, after the re-queueing
+            if (
+                db_session.get_bind().dialect.name == "postgresql"
+                and not db_session.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"),
+                    {"key": STALE_ANNOTATION_SCAN_ADVISORY_LOCK_KEY},
+                ).scalar()
+            ):
+                logger.debug("Another process is checking for stale annotations")
+                return
+
             cutoff_time = datetime.now() - timedelta(minutes=15)
 
             stale_annotations = (
@@ -394,6 +433,10 @@ class ContinuousEvalQueueService(BaseQueueService[ContinuousEvalJob]):
             logger.error(f"Annotation {annotation_id} not found")
             return
 
+        passed_changed = ContinuousEvalRunStatus.PASSED.value in (
+            db_annotation.run_status,
+            run_status,
+        )
         db_annotation.run_status = run_status
         db_annotation.updated_at = datetime.now()
 
@@ -408,6 +451,13 @@ class ContinuousEvalQueueService(BaseQueueService[ContinuousEvalJob]):
         if cost is not None:
             db_annotation.cost = cost
 
+        if passed_changed and db_annotation.trace_id is not None:
+            db_session.flush()
+            refresh_trace_rollups(
+                db_session,
+                trace_rollup_keys(db_session, [db_annotation.trace_id]),
+            )
+
         db_session.commit()
         logger.debug(f"Updated annotation {annotation_id} to status {run_status}")
 
@@ -0,0 +1,241 @@
+"""Durable queue backend for BaseQueueService, shared across workers and replicas.
+
+Jobs are rows of queue_jobs (see repositories.queue_job_repository). Each process runs
+one claim thread per queue that leases at most as many jobs as it has idle workers,
+hands them to dispatch_fn and extends the leases of the jobs it still holds. A job's
+key is unique within its queue while the job is queued or running, which replaces the
+per-process active job set for deduplication.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from dependencies import db_session_context
+from repositories.queue_job_repository import (
+    ClaimedQueueJob,
+    NewQueueJob,
+    claim_queue_jobs,
+    extend_queue_job_leases,
+    finish_queue_job,
+    insert_queue_jobs,
+    release_queue_jobs,
+)
+from utils import constants
+from utils.utils import get_env_var
+
+logger = logging.getLogger(__name__)
+
+
+def durable_job_queue_enabled() -> bool:
+    enabled = get_env_var(
+        constants.GENAI_ENGINE_DURABLE_JOB_QUEUE_ENABLED_ENV_VAR,
+        default="false",
+    )
+    return enabled.lower() == "true"
+
+
+def create_durable_job_queue(
+    queue_name: str,
+    capacity: int,
+    dispatch_fn: Callable[[ClaimedQueueJob], None],
+) -> "DurableJobQueue":
+    """Create a durable job queue configured from the environment."""
+    return DurableJobQueue(
+        queue_name,
+        capacity,
+        dispatch_fn,
+        lease_seconds=int(
+            get_env_var(
+                constants.GENAI_ENGINE_DURABLE_JOB_QUEUE_LEASE_SECONDS_ENV_VAR,
+                default=str(constants.DEFAULT_DURABLE_JOB_QUEUE_LEASE_SECONDS),
+            ),
+        ),
+        poll_interval_seconds=float(
+            get_env_var(
+                constants.GENAI_ENGINE_DURABLE_JOB_QUEUE_POLL_INTERVAL_SECONDS_ENV_VAR,
+                default=str(constants.DEFAULT_DURABLE_JOB_QUEUE_POLL_INTERVAL_SECONDS),
+            ),
+        ),
+        max_attempts=int(
+            get_env_var(
+                constants.GENAI_ENGINE_DURABLE_JOB_QUEUE_MAX_ATTEMPTS_ENV_VAR,
+                default=str(constants.DEFAULT_DURABLE_JOB_QUEUE_MAX_ATTEMPTS),
+            ),
+        ),
+    )
+
+
+class DurableJobQueue:
+    """Claims jobs of one queue for this process and keeps their leases alive."""
+
+    def __init__(
+        self,
+        queue_name: str,
+        capacity: int,
+        dispatch_fn: Callable[[ClaimedQueueJob], None],
+        lease_seconds: float,
+        poll_interval_seconds: float,
+        max_attempts: int,
+    ) -> None:
+        self.queue_name = queue_name
+        self.capacity = capacity
+        self.dispatch_fn = dispatch_fn
+        self.lease_seconds = lease_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_attempts = max_attempts
+
+        self._claimed: dict[uuid.UUID, ClaimedQueueJob] = {}
+        self._claimed_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"{self.queue_name}-claim",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 30) -> None:
+        """Stop claiming. Jobs still claimed should be finished or released after this."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.warning(f"Claim thread of {self.queue_name} did not shut down")
+
+    def enqueue(
+        self,
+        jobs: list[NewQueueJob],
+        db_session: Session | None = None,
+    ) -> int:
+        """Queue jobs whose key isn't queued yet. Returns the number queued.
+
+        With a db_session the jobs are inserted in the caller's transaction, so they
+        commit or roll back with the rows they refer to. The caller commits.
+        """
+        if not jobs:
+            return 0
+        if db_session is not None:
+            inserted = insert_queue_jobs(db_session, self.queue_name, jobs)
+            if inserted:
+                event.listen(
+                    db_session,
+                    "after_commit",
+                    lambda _: self._wakeup.set(),
+                    once=True,
+                )
+            return inserted
+        with db_session_context() as db_session:
+            inserted = insert_queue_jobs(db_session, self.queue_name, jobs)
+            db_session.commit()
+        if inserted:
+            self._wakeup.set()
+        return inserted
+
+    def finish(self, job: ClaimedQueueJob) -> None:
+        """Delete a job that ran and free its worker."""
+        try:
+            with db_session_context() as db_session:
+                if not finish_queue_job(db_session, job):
+                    logger.warning(
+                        f"Lease of {self.queue_name} job {job.job_key} expired while it "
+                        f"ran, it may run again",
+                    )
+                db_session.commit()
+        finally:
+            self._unclaim(job)
+
+    def release(self, jobs: list[ClaimedQueueJob]) -> None:
+        """Hand claimed jobs that never started back to the queue."""
+        if not jobs:
+            return
+        try:
+            with db_session_context() as db_session:
+                release_queue_jobs(db_session, jobs)
+                db_session.commit()
+        finally:
+            for job in jobs:
+                self._unclaim(job)
+
+    def _unclaim(self, job: ClaimedQueueJob) -> None:
+        with self._claimed_lock:
+            self._claimed.pop(job.id, None)
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        heartbeat_interval = self.lease_seconds / 3
+        next_heartbeat = time.monotonic() + heartbeat_interval
+
+        while not self._stopped.is_set():
+            self._wakeup.clear()
+            try:
+                if time.monotonic() >= next_heartbeat:
+                    self._heartbeat()
+                    next_heartbeat = time.monotonic() + heartbeat_interval
+                self._claim()
+            except Exception as e:
+                logger.error(
+                    f"Error claiming {self.queue_name} jobs: {e}",
+                    exc_info=True,
+                )
+
+            # enqueues and finished jobs of this process wake the thread early
+            self._wakeup.wait(
+                timeout=min(
+                    self.poll_interval_seconds,
+                    max(next_heartbeat - time.monotonic(), 0),
+                ),
+            )
+
+    def _idle_workers(self) -> int:
+        with self._claimed_lock:
+            return self.capacity - len(self._claimed)
+
+    def _claim(self) -> None:
+        limit = self._idle_workers()
+        if limit <= 0:
+            return
+
+        with db_session_context() as db_session:
+            jobs = claim_queue_jobs(
+                db_session,
+                self.queue_name,
+                limit,
+                self.lease_seconds,
+                self.max_attempts,
+            )
+            db_session.commit()
+
+        with self._claimed_lock:
+            for job in jobs:
+                self._claimed[job.id] = job
+
+        for index, job in enumerate(jobs):
+            try:
+                self.dispatch_fn(job)
+            except Exception as e:
+                logger.error(
+                    f"Failed to dispatch {len(jobs) - index} {self.queue_name} jobs: {e}",
+                    exc_info=True,
+                )
+                self.release(jobs[index:])
+                break
+
+    def _heartbeat(self) -> None:
+        with self._claimed_lock:
+            lease_ids = {job.lease_id for job in self._claimed.values()}
+        if not lease_ids:
+            return
+        with db_session_context() as db_session:
+            extend_queue_job_leases(db_session, lease_ids, self.lease_seconds)
+            db_session.commit()
@@ -3,15 +3,16 @@ Service for asynchronously executing experiments in the background.
 
 """
 
+import asyncio
 import json
 import logging
-import threading
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, List, Optional, TypeVar, Union
 
 from arthur_common.models.common_schemas import VariableTemplateValue
+from arthur_common.models.llm_model_providers import ModelProvider
 from sqlalchemy.orm import Session
 
 from db_models import (
@@ -19,14 +20,12 @@ from db_models import (
     DatabaseBaseExperiment,
     DatabaseBaseExperimentTestCase,
 )
-from db_models.llm_eval_models import DatabaseLLMEval
 from db_models.prompt_experiment_models import (
     DatabasePromptExperimentTestCasePromptResult,
 )
 from db_models.rag_experiment_models import (
     DatabaseRagExperimentTestCaseRagResult,
 )
-from db_models.task_models import DatabaseTask
 from dependencies import db_session_context
 from repositories.evaluator_factory import get_evaluator
 from repositories.llm_evals_repository import LLMEvalsRepository
@@ -37,20 +36,30 @@ from schemas.base_experiment_schemas import (
     ExperimentStatus,
     TestCaseStatus,
 )
-from schemas.enums import EvalKind
 from schemas.request_schemas import (
     BaseCompletionRequest,
 )
+from services.experiment_lookups import ExperimentLookups
+from services.experiment_result_buffer import ExperimentResultBuffer
+from services.experiment_runner import get_experiment_runner
+from utils.llm_concurrency_limiter import estimate_prompt_tokens
 from utils.trace import get_nested_value
 
 logger = logging.getLogger(__name__)
 EVAL_SCORE_TYPE = TypeVar("EVAL_SCORE_TYPE", bound=DatabaseBaseEvalScore)
 
 
-class BaseExperimentExecutor(ABC):
-    """Handles asynchronous execution of RAG experiments"""
+@dataclass
+class ExperimentRun:
+    """State shared by the test cases of a running experiment."""
+
+    test_case_ids: List[str]
+    lookups: ExperimentLookups
+    results: ExperimentResultBuffer
 
-    MAX_WORKERS = 5
+
+class BaseExperimentExecutor(ABC):
+    """Handles asynchronous execution of experiments on the shared experiment runner"""
 
     def __init__(self) -> None:
         pass
@@ -61,21 +70,19 @@ class BaseExperimentExecutor(ABC):
         request_time_parameters: Optional[List[RequestTimeParameter]] = None,
     ) -> None:
         """
-        Start asynchronous execution of an experiment in a background thread.
+        Schedule an experiment on the shared experiment runner.
 
-        This method returns immediately after spawning the background thread.
+        This method returns immediately. The experiment starts once the runner has a free
+        experiment slot.
 
         Args:
             experiment_id: ID of the experiment to execute
-            request_time_parameters: Optional list of request-time parameters to pass to the execution thread
+            request_time_parameters: Optional list of request-time parameters to pass to the execution
         """
-        thread = threading.Thread(
-            target=self._execute_experiment,
-            args=(experiment_id, request_time_parameters),
-            daemon=True,
+        get_experiment_runner().submit(
+            self._run_experiment(experiment_id, request_time_parameters),
         )
-        thread.start()
-        logger.info(f"Started background execution for experiment {experiment_id}")
+        logger.info(f"Queued experiment {experiment_id} for background execution")
 
     def _execute_experiment(
         self,
@@ -83,18 +90,15 @@ class BaseExperimentExecutor(ABC):
         request_time_parameters: Optional[List[RequestTimeParameter]] = None,
     ) -> None:
         """
-        Execute an experiment in the background with its own database session.
+        Execute an experiment on the shared experiment runner and wait for it to finish.
 
         Args:
             experiment_id: ID of the experiment to execute
             request_time_parameters: Optional list of request-time parameters to use during execution
         """
-        with db_session_context() as db_session:
-            self._execute_experiment_with_session(
-                db_session,
-                experiment_id,
-                request_time_parameters,
-            )
+        get_experiment_runner().run(
+            self._run_experiment(experiment_id, request_time_parameters),
+        )
 
     @abstractmethod
     def _get_database_experiment(
@@ -180,37 +184,124 @@ class BaseExperimentExecutor(ABC):
         new_status: TestCaseStatus,
         db_session: Session,
         total_cost: Optional[float] = None,
+        results: Optional[ExperimentResultBuffer] = None,
     ) -> None:
+        """
+        Set the status of a test case and commit the session, or stage its changes in the
+        experiment's result buffer when one is given.
+        """
         test_case.status = new_status
+        test_case_id = test_case.id
 
-        log_msg = f"Marked test case {test_case.id} as {new_status.value}."
+        log_msg = f"Marked test case {test_case_id} as {new_status.value}."
 
         if total_cost is not None:
             test_case.total_cost = f"{total_cost:.6f}"
             log_msg += f" Test case has total cost ${test_case.total_cost}"
 
-        db_session.commit()
+        if results is not None:
+            results.stage(db_session)
+        else:
+            db_session.commit()
         if new_status == TestCaseStatus.FAILED:
-            logger.error(f"Test case {test_case.id} failed.")
+            logger.error(f"Test case {test_case_id} failed.")
         else:
             logger.info(log_msg)
 
-    def _execute_experiment_with_session(
+    async def _run_experiment(
         self,
-        db_session: Session,
         experiment_id: str,
         request_time_parameters: Optional[List[RequestTimeParameter]] = None,
     ) -> None:
         """
-        Execute an experiment using the provided database session.
+        Execute an experiment on the runner's event loop.
+
+        Up to the runner's test case concurrency test cases are in flight at a time. Each
+        step that touches the database runs on the runner's thread pool with its own session.
+        Final test case states, eval results and progress are written in batches through the
+        experiment's result buffer.
 
         Args:
-            db_session: Database session
             experiment_id: ID of the experiment to execute
             request_time_parameters: Optional list of request-time parameters to use during execution
         """
+        runner = get_experiment_runner()
+        run: Optional[ExperimentRun] = None
         try:
-            # Mark experiment as running
+            run = await runner.run_sync(self._start_experiment, experiment_id)
+            if run is None:
+                return
+            results = run.results
+
+            completed_count = 0
+            failed_count = 0
+            progress_lock = asyncio.Lock()
+            pending_test_case_ids = iter(run.test_case_ids)
+
+            async def run_test_cases() -> None:
+                nonlocal completed_count, failed_count
+                # workers share the iterator, each takes the next test case once it's free
+                for test_case_id in pending_test_case_ids:
+                    try:
+                        success = await self._execute_test_case(
+                            test_case_id,
+                            run,
+                            request_time_parameters,
+                        )
+                    except Exception as e:
+                        logger.error(
+                            f"Test case {test_case_id} raised exception: {e}",
+                            exc_info=True,
+                        )
+                        success = False
+
+                    # serialized so flushes never overlap or write an older count
+                    async with progress_lock:
+                        if success:
+                            completed_count += 1
+                        else:
+                            failed_count += 1
+                        results.set_progress(completed_count, failed_count)
+                        if results.flush_due():
+                            try:
+                                await runner.run_sync(self._flush_results, results)
+                            except Exception as e:
+                                # the batch stays in the buffer for the next flush
+                                logger.error(
+                                    f"Error writing results of experiment {experiment_id}: {e}",
+                                    exc_info=True,
+                                )
+
+                    logger.info(
+                        f"Experiment {experiment_id} progress: "
+                        f"{completed_count}/{len(run.test_case_ids)} completed, {failed_count} failed",
+                    )
+
+            num_workers = min(len(run.test_case_ids), runner.test_case_concurrency)
+            await asyncio.gather(*(run_test_cases() for _ in range(num_workers)))
+
+            # summary results and costs are computed from the written results
+            await runner.run_sync(self._flush_results, results)
+            await runner.run_sync(self._finish_experiment, experiment_id, failed_count)
+
+        except Exception as e:
+            logger.error(
+                f"Error executing experiment {experiment_id}: {e}",
+                exc_info=True,
+            )
+            await runner.run_sync(
+                self._mark_experiment_failed,
+                experiment_id,
+                run.results if run is not None else None,
+            )
+
+    def _start_experiment(self, experiment_id: str) -> Optional[ExperimentRun]:
+        """
+        Mark an experiment as running and resolve what its test cases share.
+
+        An experiment without test cases is completed right away and None returned.
+        """
+        with db_session_context() as db_session:
             experiment = self._get_database_experiment(experiment_id, db_session)
 
             if experiment is None:
@@ -234,51 +325,32 @@ class BaseExperimentExecutor(ABC):
                     db_session,
                     new_total_cost=0.0,
                 )
-                return
-
-            # Execute test cases in parallel with worker pool
-            num_workers = min(len(test_cases), self.MAX_WORKERS)
-            completed_count = 0
-            failed_count = 0
-
-            with ThreadPoolExecutor(max_workers=num_workers) as executor:
-                # Submit all test case jobs with request_time_parameters
-                futures = {
-                    executor.submit(
-                        self._execute_test_case,
-                        test_case.id,
-                        request_time_parameters,
-                    ): test_case.id
-                    for test_case in test_cases
-                }
-
-                # Wait for all test cases to complete and update progress in real-time
-                for future in as_completed(futures):
-                    test_case_id = futures[future]
-                    try:
-                        success = future.result()
-                        if success:
-                            completed_count += 1
-                        else:
-                            failed_count += 1
-                    except Exception as e:
-                        logger.error(
-                            f"Test case {test_case_id} raised exception: {e}",
-                            exc_info=True,
-                        )
-                        failed_count += 1
+                return None
 
-                    # Update experiment progress after each completion (main thread, no concurrency issues)
-                    experiment.completed_rows = completed_count
-                    experiment.failed_rows = failed_count
-                    db_session.commit()
+            lookups = ExperimentLookups.load(
+                db_session,
+                experiment.task_id,
+                [
+                    (config["name"], str(config["version"]))
+                    for config in experiment.eval_configs
+                ],
+            )
+            return ExperimentRun(
+                test_case_ids=[test_case.id for test_case in test_cases],
+                lookups=lookups,
+                results=ExperimentResultBuffer.from_env(
+                    type(experiment),
+                    experiment_id,
+                ),
+            )
 
-                    logger.info(
-                        f"Experiment {experiment_id} progress: "
-                        f"{completed_count}/{len(test_cases)} completed, {failed_count} failed",
-                    )
+    def _flush_results(self, results: ExperimentResultBuffer) -> None:
+        with db_session_context() as db_session:
+            results.flush(db_session)
 
-            # fetch refreshed experiment object
+    def _finish_experiment(self, experiment_id: str, failed_count: int) -> None:
+        """Set summary results and total cost and mark the experiment completed or failed."""
+        with db_session_context() as db_session:
             experiment = self._get_database_experiment(experiment_id, db_session)
 
             if experiment is None:
@@ -286,6 +358,7 @@ class BaseExperimentExecutor(ABC):
                 return
 
             # Calculate total cost across all test cases
+            test_cases = self._get_db_test_cases(experiment_id, db_session)
             total_experiment_cost = self._calculate_total_cost(test_cases)
 
             # Calculate and set summary results now that all test cases have finished
@@ -310,12 +383,22 @@ class BaseExperimentExecutor(ABC):
                     total_experiment_cost,
                 )
 
-        except Exception as e:
-            logger.error(
-                f"Error executing experiment {experiment_id}: {e}",
-                exc_info=True,
-            )
+    def _mark_experiment_failed(
+        self,
+        experiment_id: str,
+        results: Optional[ExperimentResultBuffer] = None,
+    ) -> None:
+        if results is not None:
+            # keep what the finished test cases produced
             try:
+                self._flush_results(results)
+            except Exception as flush_error:
+                logger.error(
+                    f"Failed to write results of experiment {experiment_id}: {flush_error}",
+                    exc_info=True,
+                )
+        try:
+            with db_session_context() as db_session:
                 experiment = self._get_database_experiment(experiment_id, db_session)
                 if experiment:
                     self._update_experiment_status(
@@ -323,15 +406,16 @@ class BaseExperimentExecutor(ABC):
                         ExperimentStatus.FAILED,
                         db_session,
                     )
-            except Exception as commit_error:
-                logger.error(
-                    f"Failed to mark experiment as failed: {commit_error}",
-                    exc_info=True,
-                )
+        except Exception as commit_error:
+            logger.error(
+                f"Failed to mark experiment as failed: {commit_error}",
+                exc_info=True,
+            )
 
-    def _execute_test_case(
+    async def _execute_test_case(
         self,
         test_case_id: str,
+        run: ExperimentRun,
         request_time_parameters: Optional[List[RequestTimeParameter]] = None,
     ) -> bool:
         """
@@ -339,88 +423,126 @@ class BaseExperimentExecutor(ABC):
 
         Args:
             test_case_id: ID of the test case to execute
+            run: State of the running experiment
             request_time_parameters: Optional list of request-time parameters to use during execution
 
         Returns:
             True if test case completed successfully, False otherwise
         """
         with db_session_context() as db_session:
-            return self._execute_test_case_with_session(
-                db_session,
-                test_case_id,
-                request_time_parameters,
-            )
+            try:
+                return await self._execute_test_case_with_session(
+                    db_session,
+                    test_case_id,
+                    run,
+                    request_time_parameters,
+                )
+            finally:
+                # hand the connection back on the thread pool, not on the event loop
+                await get_experiment_runner().run_sync(db_session.close)
 
-    def _execute_test_case_with_session(
+    async def _execute_test_case_with_session(
         self,
         db_session: Session,
         test_case_id: str,
+        run: ExperimentRun,
         request_time_parameters: Optional[List[RequestTimeParameter]] = None,
     ) -> bool:
         """
         Execute a single test case using the provided database session.
 
+        Database work and evaluations run on the runner's thread pool, the session is only
+        used by one of its threads at a time. The final state of the test case, with its eval
+        results, is staged in the experiment's result buffer rather than committed.
+
         Args:
             db_session: Database session
             test_case_id: ID of the test case to execute
+            run: State of the running experiment
             request_time_parameters: Optional list of request-time parameters to use during execution
 
         Returns:
             True if test case completed successfully, False otherwise
         """
+        runner = get_experiment_runner()
         try:
             # Mark test case as running
-            test_case = self._get_db_test_case(test_case_id, db_session)
+            test_case = await runner.run_sync(
+                self._get_db_test_case,
+                test_case_id,
+                db_session,
+            )
             if not test_case:
                 logger.error(f"Test case {test_case_id} not found")
                 return False
 
-            self._update_test_case_status(test_case, TestCaseStatus.RUNNING, db_session)
+            await runner.run_sync(
+                self._update_test_case_status,
+                test_case,
+                TestCaseStatus.RUNNING,
+                db_session,
+            )
 
             # Execute all experiment outputs (RAG searches or prompts), tracking failures but continuing
-            all_outputs_passed = self._execute_experiment_outputs(
+            all_outputs_passed = await self._execute_experiment_outputs(
                 db_session,
                 test_case,
+                run.lookups,
                 request_time_parameters,
             )
 
             # If any outputs failed, mark test case as failed and return
             if not all_outputs_passed:
-                self._update_test_case_status(
+                await runner.run_sync(
+                    self._update_test_case_status,
                     test_case,
                     TestCaseStatus.FAILED,
                     db_session,
+                    results=run.results,
                 )
                 return False
 
             # All outputs executed successfully, now run evaluations
-            self._update_test_case_status(
+            await runner.run_sync(
+                self._update_test_case_status,
                 test_case,
                 TestCaseStatus.EVALUATING,
                 db_session,
             )
 
             # Execute all evaluations for this test case
-            all_evals_passed = self._execute_evaluations(db_session, test_case)
+            all_evals_passed = await runner.run_sync(
+                self._run_evaluations,
+                db_session,
+                test_case,
+                run.lookups,
+            )
 
             # If any evaluations failed, mark test case as failed and return
             if not all_evals_passed:
-                self._update_test_case_status(
+                await runner.run_sync(
+                    self._update_test_case_status,
                     test_case,
                     TestCaseStatus.FAILED,
                     db_session,
+                    results=run.results,
                 )
                 return False
 
             # Calculate total cost for this test case
-            total_cost = self._calculate_total_test_case_cost(test_case)
+            total_cost = await runner.run_sync(
+                self._calculate_total_test_case_cost,
+                test_case,
+            )
 
             # Mark test case as completed and store total cost
-            self._update_test_case_status(
+            await runner.run_sync(
+                self._update_test_case_status,
                 test_case,
                 TestCaseStatus.COMPLETED,
                 db_session,
                 total_cost,
+                results=run.results,
             )
             return True
 
@@ -429,34 +551,57 @@ class BaseExperimentExecutor(ABC):
                 f"Error executing test case {test_case_id}: {e}",
                 exc_info=True,
             )
-            try:
-                test_case = self._get_db_test_case(test_case_id, db_session)
-                if test_case:
-                    self._update_test_case_status(
-                        test_case,
-                        TestCaseStatus.FAILED,
-                        db_session,
-                    )
-            except Exception as commit_error:
-                logger.error(
-                    f"Failed to mark test case as failed: {commit_error}",
-                    exc_info=True,
-                )
+            await runner.run_sync(
+                self._mark_test_case_failed,
+                db_session,
+                test_case_id,
+            )
             return False
 
+    def _run_evaluations(
+        self,
+        db_session: Session,
+        test_case: DatabaseBaseExperimentTestCase,
+        lookups: ExperimentLookups,
+    ) -> bool:
+        # eval results are staged with the test case's final status, queries
+        # made by the evals must not flush them to the database first
+        with db_session.no_autoflush:
+            return self._execute_evaluations(db_session, test_case, lookups)
+
+    def _mark_test_case_failed(self, db_session: Session, test_case_id: str) -> None:
+        try:
+            test_case = self._get_db_test_case(test_case_id, db_session)
+            if test_case:
+                self._update_test_case_status(
+                    test_case,
+                    TestCaseStatus.FAILED,
+                    db_session,
+                )
+        except Exception as commit_error:
+            logger.error(
+                f"Failed to mark test case as failed: {commit_error}",
+                exc_info=True,
+            )
+
     @abstractmethod
-    def _execute_experiment_outputs(
+    async def _execute_experiment_outputs(
         self,
         db_session: Session,
         test_case: DatabaseBaseExperimentTestCase,
+        lookups: ExperimentLookups,
         request_time_parameters: Optional[List[RequestTimeParameter]] = None,
     ) -> bool:
         """
         Execute all experiment outputs for a test case (RAG searches or prompts).
 
+        Runs on the runner's event loop. Blocking work belongs on the runner's thread pool
+        (see ExperimentRunner.run_sync).
+
         Args:
             db_session: Database session
             test_case: Test case to execute outputs for
+            lookups: Lookups of the running experiment
             request_time_parameters: Optional dict of request-time parameters to use during execution
 
         Returns:
@@ -469,6 +614,7 @@ class BaseExperimentExecutor(ABC):
         self,
         db_session: Session,
         test_case: DatabaseBaseExperimentTestCase,
+        lookups: ExperimentLookups,
     ) -> bool:
         """
         Execute all evaluations for a test case.
@@ -476,6 +622,7 @@ class BaseExperimentExecutor(ABC):
         Args:
             db_session: Database session
             test_case: Test case containing results to evaluate
+            lookups: Lookups of the running experiment
 
         Returns:
             True if all evaluations executed successfully, False otherwise
@@ -487,6 +634,7 @@ class BaseExperimentExecutor(ABC):
         self,
         db_session: Session,
         test_case_result: Any,
+        lookups: ExperimentLookups,
     ) -> bool:
         """
         Execute all evaluations for a single test case result (RAG result or prompt result).
@@ -494,6 +642,7 @@ class BaseExperimentExecutor(ABC):
         Args:
             db_session: Database session
             test_case_result: Result object (RAG result or prompt result) to evaluate
+            lookups: Lookups of the running experiment
 
         Returns:
             True if all evaluations executed successfully, False otherwise
@@ -655,7 +804,6 @@ class BaseExperimentExecutor(ABC):
                 )
 
             eval_score.eval_input_variables = updated_eval_input_variables
-            db_session.commit()
             return True
 
         except Exception as e:
@@ -670,6 +818,7 @@ class BaseExperimentExecutor(ABC):
         db_session: Session,
         eval_score: DatabaseBaseEvalScore,
         experiment: DatabaseBaseExperiment,
+        lookups: ExperimentLookups,
     ) -> bool:
         """
         Execute an evaluation using the eval_score's eval_input_variables.
@@ -678,12 +827,15 @@ class BaseExperimentExecutor(ABC):
         - Getting LLM client
         - Converting eval to agentic prompt
         - Executing the chat completion
-        - Validating and saving results
+        - Setting results on the eval score
+
+        The results aren't committed here, they're written with the test case's final status.
 
         Args:
             db_session: Database session
             eval_score: Eval score record to populate (with eval_input_variables already set)
             experiment: Experiment containing the eval config
+            lookups: Lookups of the running experiment
 
         Returns:
             True if eval executed successfully, False otherwise
@@ -695,62 +847,50 @@ class BaseExperimentExecutor(ABC):
                 for var in eval_score.eval_input_variables
             }
 
-            # Look up the eval's type so we can dispatch to the right evaluator.
-            db_eval = (
-                db_session.query(DatabaseLLMEval)
-                .filter(
-                    DatabaseLLMEval.task_id == experiment.task_id,
-                    DatabaseLLMEval.name == eval_score.eval_name,
-                    DatabaseLLMEval.version == eval_score.eval_version,
-                )
-                .first()
+            # The eval's type decides which evaluator runs it
+            eval_kind, llm_eval = lookups.get_eval(
+                eval_score.eval_name,
+                str(eval_score.eval_version),
             )
-            if db_eval is None:
-                raise ValueError(
-                    f"Eval '{eval_score.eval_name}' version {eval_score.eval_version} "
-                    f"not found for task {experiment.task_id}.",
-                )
-            eval_type = EvalKind(db_eval.eval_type)
 
-            evaluator = get_evaluator(db_session, eval_type)
-
-            # Background experiment thread: org_id isn't on the experiment
-            # row, so derive it from the owning task. One SELECT per eval is
-            # negligible alongside the LLM call this billing context wraps.
-            task_org_id = (
-                db_session.query(DatabaseTask.org_id)
-                .filter(DatabaseTask.id == experiment.task_id)
-                .scalar()
-            )
-            if task_org_id is None:
-                raise ValueError(
-                    f"Cannot determine org for experiment task {experiment.task_id}.",
-                )
+            evaluator = get_evaluator(db_session, eval_kind)
 
             try:
                 if isinstance(evaluator, MLEvaluator):
-                    eval_response = evaluator.run(
-                        task_id=experiment.task_id,
-                        eval_name=eval_score.eval_name,
-                        eval_version=str(eval_score.eval_version),
-                        variable_mapping=[],
-                        resolved_variables=variable_map,
-                        org_id=task_org_id,
-                    )
+                    eval_response = evaluator.run_resolved(llm_eval, variable_map)
                 elif isinstance(evaluator, LLMEvaluator):
+                    if llm_eval.model_provider is None:
+                        raise ValueError(
+                            f"LLM eval '{llm_eval.name}' has no model_provider configured.",
+                        )
+                    llm_client = lookups.get_llm_client(
+                        db_session,
+                        llm_eval.model_provider,
+                    )
                     completion_request = BaseCompletionRequest(
                         variables=[
                             VariableTemplateValue(name=k, value=v)
                             for k, v in variable_map.items()
                         ],
                     )
-                    eval_response = LLMEvalsRepository(db_session).run_llm_eval(
-                        task_id=experiment.task_id,
-                        eval_name=eval_score.eval_name,
-                        org_id=task_org_id,
-                        version=str(eval_score.eval_version),
-                        completion_request=completion_request,
-                    )
+                    # run_llm_eval doesn't report token usage, so the estimate
+                    # reserved against the model's token budget stands
+                    with get_experiment_runner().llm_call_slot(
+                        ModelProvider(llm_eval.model_provider).value,
+                        str(llm_eval.model_name),
+                        estimated_tokens=estimate_prompt_tokens(
+                            llm_eval.instructions,
+                            *variable_map.values(),
+                        ),
+                    ):
+                        eval_response = LLMEvalsRepository(
+                            db_session,
+                        ).run_resolved_llm_eval(
+                            llm_eval,
+                            llm_client,
+                            org_id=lookups.org_id,
+                            completion_request=completion_request,
+                        )
                 else:
                     raise ValueError(
                         f"Unknown evaluator type: {type(evaluator).__name__}",
@@ -765,7 +905,6 @@ class BaseExperimentExecutor(ABC):
             eval_score.eval_result_score = eval_response.score
             eval_score.eval_result_explanation = eval_response.reason
             eval_score.eval_result_cost = eval_response.cost
-            db_session.commit()
 
             logger.info(
                 f"Executed eval {eval_score.eval_name} v{eval_score.eval_version} for experiment {experiment.id}",
@@ -787,6 +926,7 @@ class BaseExperimentExecutor(ABC):
             DatabaseRagExperimentTestCaseRagResult,
             DatabasePromptExperimentTestCasePromptResult,
         ],
+        lookups: ExperimentLookups,
     ) -> bool:
         """
         Execute a single evaluation.
@@ -795,6 +935,7 @@ class BaseExperimentExecutor(ABC):
             db_session: Database session
             eval_score: Eval score record to populate
             test_case_result: Result object (RAG result or prompt result) with output
+            lookups: Lookups of the running experiment
 
         Returns:
             True if eval executed successfully, False otherwise
@@ -817,6 +958,7 @@ class BaseExperimentExecutor(ABC):
                 db_session,
                 eval_score,
                 experiment,
+                lookups,
             )
 
         except Exception as e:
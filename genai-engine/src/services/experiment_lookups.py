@@ -0,0 +1,123 @@
+"""Lookups shared by every test case of a running experiment.
+
+The org of the experiment's task and the definitions of its evals are resolved once when
+the experiment starts. Model provider clients and saved prompts are resolved on first use
+and kept for the rest of the experiment. Test cases run on several threads at once, so
+lazily filled entries are guarded by a lock.
+"""
+
+import threading
+import uuid
+from typing import Dict, Iterable, Tuple, Union
+
+from arthur_common.models.llm_model_providers import ModelProvider
+from sqlalchemy.orm import Session
+
+from clients.llm.llm_client import LLMClient
+from db_models.llm_eval_models import DatabaseLLMEval
+from db_models.task_models import DatabaseTask
+from repositories.agentic_prompts_repository import AgenticPromptRepository
+from repositories.llm_evals_repository import LLMEvalsRepository
+from repositories.ml_evals_repository import MLEvalsRepository
+from repositories.model_provider_repository import ModelProviderRepository
+from schemas.agentic_prompt_schemas import AgenticPrompt
+from schemas.enums import EvalKind
+from schemas.llm_eval_schemas import Eval
+
+
+class ExperimentLookups:
+    """Lookups that don't change while an experiment runs, memoized for its test cases."""
+
+    def __init__(
+        self,
+        task_id: str,
+        org_id: uuid.UUID,
+        evals: Dict[Tuple[str, str], Tuple[EvalKind, Eval]],
+    ) -> None:
+        self.task_id = task_id
+        self.org_id = org_id
+        self._evals = evals
+        self._llm_clients: Dict[ModelProvider, LLMClient] = {}
+        self._saved_prompts: Dict[Tuple[str, str], AgenticPrompt] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(
+        cls,
+        db_session: Session,
+        task_id: str,
+        eval_refs: Iterable[Tuple[str, str]],
+    ) -> "ExperimentLookups":
+        """
+        Resolve the org of the task and the given (name, version) evals of the task.
+
+        Evals that can't be found are left out, test cases fail to run them.
+        """
+        org_id = (
+            db_session.query(DatabaseTask.org_id)
+            .filter(DatabaseTask.id == task_id)
+            .scalar()
+        )
+        if org_id is None:
+            raise ValueError(f"Cannot determine org for experiment task {task_id}.")
+
+        evals = {}
+        for eval_name, eval_version in set(eval_refs):
+            db_eval = (
+                db_session.query(DatabaseLLMEval.eval_type)
+                .filter(
+                    DatabaseLLMEval.task_id == task_id,
+                    DatabaseLLMEval.name == eval_name,
+                    DatabaseLLMEval.version == int(eval_version),
+                )
+                .first()
+            )
+            if db_eval is None:
+                continue
+            eval_kind = EvalKind(db_eval.eval_type or EvalKind.LLM_AS_A_JUDGE)
+            evals_repo: Union[LLMEvalsRepository, MLEvalsRepository] = (
+                LLMEvalsRepository(db_session)
+                if eval_kind == EvalKind.LLM_AS_A_JUDGE
+                else MLEvalsRepository(db_session)
+            )
+            evals[(eval_name, eval_version)] = (
+                eval_kind,
+                evals_repo.get_llm_item(task_id, eval_name, eval_version),
+            )
+        return cls(task_id, org_id, evals)
+
+    def get_eval(self, eval_name: str, eval_version: str) -> Tuple[EvalKind, Eval]:
+        """Get the kind and definition of an eval of the experiment."""
+        try:
+            return self._evals[(eval_name, eval_version)]
+        except KeyError:
+            raise ValueError(
+                f"Eval '{eval_name}' version {eval_version} not found for task {self.task_id}.",
+            )
+
+    def get_llm_client(self, db_session: Session, provider: ModelProvider) -> LLMClient:
+        with self._lock:
+            if provider not in self._llm_clients:
+                self._llm_clients[provider] = ModelProviderRepository(
+                    db_session,
+                ).get_model_provider_client(provider)
+            return self._llm_clients[provider]
+
+    def get_saved_prompt(
+        self,
+        db_session: Session,
+        prompt_name: str,
+        prompt_version: str,
+    ) -> AgenticPrompt:
+        """Get a saved prompt of the task. Raises ValueError if it doesn't exist."""
+        key = (prompt_name, prompt_version)
+        with self._lock:
+            if key not in self._saved_prompts:
+                self._saved_prompts[key] = AgenticPromptRepository(
+                    db_session,
+                ).get_llm_item(
+                    task_id=self.task_id,
+                    item_name=prompt_name,
+                    item_version=prompt_version,
+                )
+            return self._saved_prompts[key]
@@ -0,0 +1,166 @@
+"""Write-behind buffer for the results of a running experiment.
+
+A finished test case doesn't commit its final state. Its session's pending changes (the
+test case status and cost, eval input variables and eval results, ...) are staged in the
+buffer and rolled back in the session. The buffer writes everything staged, plus the
+experiment's progress counters, in one transaction per batch of test cases, so a test
+case costs a fraction of a transaction instead of one commit per eval and per update.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, Type
+
+from sqlalchemy import inspect, update
+from sqlalchemy.orm import Session
+
+from db_models import DatabaseBaseExperiment
+from utils import constants
+from utils.utils import get_env_var
+
+logger = logging.getLogger(__name__)
+
+# (mapped class, primary key values) of a staged row
+_RowKey = Tuple[Type[Any], Tuple[Any, ...]]
+
+
+class ExperimentResultBuffer:
+    """Stages row updates of one experiment and writes them in batches.
+
+    Staging and flushing may happen on different threads. Flushes of one buffer must not
+    overlap, the executor serializes them with the experiment's progress updates.
+    """
+
+    def __init__(
+        self,
+        experiment_model: Type[DatabaseBaseExperiment],
+        experiment_id: str,
+        max_batch_size: int,
+        flush_interval_seconds: float,
+    ) -> None:
+        self.experiment_model = experiment_model
+        self.experiment_id = experiment_id
+        self.max_batch_size = max(max_batch_size, 1)
+        self.flush_interval_seconds = flush_interval_seconds
+        self._rows: Dict[_RowKey, Dict[str, Any]] = {}
+        self._progress: Optional[Tuple[int, int]] = None
+        self._staged_test_cases = 0
+        self._last_flush_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(
+        cls,
+        experiment_model: Type[DatabaseBaseExperiment],
+        experiment_id: str,
+    ) -> "ExperimentResultBuffer":
+        return cls(
+            experiment_model,
+            experiment_id,
+            max_batch_size=int(
+                get_env_var(
+                    constants.GENAI_ENGINE_EXPERIMENT_RESULT_BATCH_SIZE_ENV_VAR,
+                    default=str(constants.DEFAULT_EXPERIMENT_RESULT_BATCH_SIZE),
+                ),
+            ),
+            flush_interval_seconds=float(
+                get_env_var(
+                    constants.GENAI_ENGINE_EXPERIMENT_RESULT_FLUSH_INTERVAL_SECONDS_ENV_VAR,
+                    default=str(
+                        constants.DEFAULT_EXPERIMENT_RESULT_FLUSH_INTERVAL_SECONDS,
+                    ),
+                ),
+            ),
+        )
+
+    def stage(self, db_session: Session) -> None:
+        """
+        Take the changed columns of the session's loaded rows into the buffer and roll the
+        session back. Objects of the session are expired afterwards.
+
+        Only updates of existing rows are staged. Pending inserts and deletes are rolled back
+        with the session, callers commit those themselves.
+        """
+        staged_rows = {}
+        for obj in db_session.dirty:
+            state = inspect(obj)
+            values = {
+                prop.key: state.attrs[prop.key].value
+                for prop in state.mapper.column_attrs
+                if state.attrs[prop.key].history.has_changes()
+            }
+            if values:
+                staged_rows[(type(obj), state.identity)] = values
+        db_session.rollback()
+
+        with self._lock:
+            for key, values in staged_rows.items():
+                self._rows.setdefault(key, {}).update(values)
+            self._staged_test_cases += 1
+
+    def set_progress(self, completed_count: int, failed_count: int) -> None:
+        with self._lock:
+            self._progress = (completed_count, failed_count)
+
+    def flush_due(self) -> bool:
+        """True once a batch of test cases is staged or the flush interval has passed."""
+        with self._lock:
+            if not self._rows and self._progress is None:
+                return False
+            return (
+                self._staged_test_cases >= self.max_batch_size
+                or time.monotonic() - self._last_flush_at >= self.flush_interval_seconds
+            )
+
+    def flush(self, db_session: Session) -> None:
+        """
+        Write everything staged in one transaction. If the write fails, the batch is kept
+        for the next flush and the error raised.
+        """
+        with self._lock:
+            rows, self._rows = self._rows, {}
+            progress, self._progress = self._progress, None
+            staged_test_cases, self._staged_test_cases = self._staged_test_cases, 0
+            self._last_flush_at = time.monotonic()
+
+        if not rows and progress is None:
+            return
+
+        try:
+            # bulk UPDATE by primary key, one executemany per table and set of columns
+            batches: Dict[Tuple[Type[Any], Tuple[str, ...]], list[Dict[str, Any]]] = {}
+            for (model, identity), values in rows.items():
+                mapper = inspect(model)
+                primary_key = {
+                    mapper.get_property_by_column(column).key: value
+                    for column, value in zip(mapper.primary_key, identity)
+                }
+                batches.setdefault((model, tuple(sorted(values))), []).append(
+                    {**primary_key, **values},
+                )
+            for (model, _), params in batches.items():
+                db_session.execute(update(model), params)
+
+            if progress is not None:
+                completed_count, failed_count = progress
+                db_session.execute(
+                    update(self.experiment_model)
+                    .where(self.experiment_model.id == self.experiment_id)
+                    .values(completed_rows=completed_count, failed_rows=failed_count),
+                )
+            db_session.commit()
+        except Exception:
+            db_session.rollback()
+            with self._lock:
+                # anything staged since takes precedence over the failed batch
+                for key, values in rows.items():
+                    self._rows[key] = {**values, **self._rows.get(key, {})}
+                if self._progress is None:
+                    self._progress = progress
+                self._staged_test_cases += staged_test_cases
+            raise
+
+        logger.debug(
+            f"Flushed {len(rows)} rows of {staged_test_cases} test cases for experiment {self.experiment_id}",
+        )
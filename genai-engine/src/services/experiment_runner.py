@@ -0,0 +1,166 @@
+"""Shared asyncio engine for prompt, RAG and agentic experiments.
+
+Experiments run as tasks on one event loop owned by a dedicated thread, instead of a
+thread per experiment. At most GENAI_ENGINE_EXPERIMENT_MAX_CONCURRENT_EXPERIMENTS run
+at a time and the rest wait on the loop without holding a thread. Blocking work
+(database sessions, evals, RAG searches, agent calls) runs on one bounded thread pool,
+and every LLM call of an experiment holds a slot of the runner's LLMConcurrencyLimiter,
+so concurrency follows the provider and model limits rather than a fixed worker count.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Coroutine, Iterator, TypeVar
+
+from opentelemetry import trace
+
+from utils import constants
+from utils.llm_concurrency_limiter import LLMCallSlot, LLMConcurrencyLimiter
+from utils.utils import TracedThreadPoolExecutor, get_env_var
+
+tracer = trace.get_tracer(__name__)
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _get_int_env_var(env_var: str, default: int) -> int:
+    return max(int(get_env_var(env_var, default=str(default))), 1)
+
+
+class ExperimentRunner:
+    """Runs experiment coroutines on a shared event loop with bounded concurrency."""
+
+    def __init__(
+        self,
+        max_concurrent_experiments: int,
+        test_case_concurrency: int,
+        max_workers: int,
+        llm_limiter: LLMConcurrencyLimiter,
+    ) -> None:
+        self.test_case_concurrency = test_case_concurrency
+        self.llm_limiter = llm_limiter
+        self._experiment_slots = asyncio.Semaphore(max_concurrent_experiments)
+        self._executor = TracedThreadPoolExecutor(
+            tracer,
+            max_workers=max_workers,
+            thread_name_prefix="experiment-worker",
+        )
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(self._executor)
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="experiment-runner",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @classmethod
+    def from_env(cls) -> "ExperimentRunner":
+        return cls(
+            max_concurrent_experiments=_get_int_env_var(
+                constants.GENAI_ENGINE_EXPERIMENT_MAX_CONCURRENT_EXPERIMENTS_ENV_VAR,
+                constants.DEFAULT_EXPERIMENT_MAX_CONCURRENT_EXPERIMENTS,
+            ),
+            test_case_concurrency=_get_int_env_var(
+                constants.GENAI_ENGINE_EXPERIMENT_TEST_CASE_CONCURRENCY_ENV_VAR,
+                constants.DEFAULT_EXPERIMENT_TEST_CASE_CONCURRENCY,
+            ),
+            max_workers=_get_int_env_var(
+                constants.GENAI_ENGINE_EXPERIMENT_MAX_WORKERS_ENV_VAR,
+                constants.DEFAULT_EXPERIMENT_MAX_WORKERS,
+            ),
+            llm_limiter=LLMConcurrencyLimiter.from_env(),
+        )
+
+    async def _run_experiment(self, experiment: Coroutine[Any, Any, T]) -> T:
+        async with self._experiment_slots:
+            return await experiment
+
+    def submit(self, experiment: Coroutine[Any, Any, T]) -> Future[T]:
+        """Schedule an experiment coroutine. It starts once an experiment slot is free."""
+        return asyncio.run_coroutine_threadsafe(
+            self._run_experiment(experiment),
+            self._loop,
+        )
+
+    def run(self, experiment: Coroutine[Any, Any, T]) -> T:
+        """Run an experiment coroutine and wait for it. Not callable from the loop."""
+        return self.submit(experiment).result()
+
+    async def run_sync(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Run blocking work on the runner's thread pool."""
+        return await self._loop.run_in_executor(
+            self._executor,
+            functools.partial(fn, *args, **kwargs),
+        )
+
+    @contextmanager
+    def llm_call_slot(
+        self,
+        provider: str,
+        model: str,
+        estimated_tokens: int = 0,
+    ) -> Iterator[LLMCallSlot]:
+        """Hold a limiter slot around a blocking LLM call made on the thread pool."""
+        slot = asyncio.run_coroutine_threadsafe(
+            self.llm_limiter.acquire(provider, model, estimated_tokens),
+            self._loop,
+        ).result()
+        try:
+            yield slot
+        finally:
+            self._loop.call_soon_threadsafe(self.llm_limiter.release, slot)
+
+    async def _cancel_experiments(self) -> None:
+        tasks = [
+            task
+            for task in asyncio.all_tasks(self._loop)
+            if task is not asyncio.current_task()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self, timeout: float = 30) -> None:
+        """Cancel running experiments and stop the loop and its thread pool."""
+        if self._loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    self._cancel_experiments(),
+                    self._loop,
+                ).result(timeout)
+            except Exception as e:
+                logger.warning(f"Error cancelling running experiments: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            logger.warning("Experiment runner thread did not shut down")
+        else:
+            self._loop.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+EXPERIMENT_RUNNER: ExperimentRunner | None = None
+_experiment_runner_lock = threading.Lock()
+
+
+def get_experiment_runner() -> ExperimentRunner:
+    global EXPERIMENT_RUNNER
+    with _experiment_runner_lock:
+        if EXPERIMENT_RUNNER is None:
+            EXPERIMENT_RUNNER = ExperimentRunner.from_env()
+        return EXPERIMENT_RUNNER
+
+
+def shutdown_experiment_runner() -> None:
+    """Shutdown the global experiment runner."""
+    global EXPERIMENT_RUNNER
+    with _experiment_runner_lock:
+        if EXPERIMENT_RUNNER is not None:
+            EXPERIMENT_RUNNER.stop()
+            EXPERIMENT_RUNNER = None
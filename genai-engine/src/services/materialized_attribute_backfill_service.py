@@ -0,0 +1,162 @@
+"""Background service that fills the materialized attribute columns of existing rows.
+
+Spans and metric results get their materialized attribute columns (see
+``utils.materialized_attributes``) when they are stored. Rows stored before a column
+existed are backfilled by this service: on startup it enqueues one job that walks
+spans and then metric results in id order, ``DEFAULT_MATERIALIZED_ATTRIBUTES_BATCH_SIZE``
+rows at a time with a short pause between batches, and finally records the attribute
+version in the configurations table. Later startups see the recorded version and do
+nothing.
+
+Only one replica backfills at a time: the job holds a PostgreSQL session-level
+advisory lock (``MATERIALIZED_ATTRIBUTES_ADVISORY_LOCK_KEY``) and exits when another
+replica holds it. Until the backfill completes, trace filters also check the JSON
+values of rows whose columns are still NULL.
+"""
+
+import logging
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from dependencies import db_session_context
+from repositories.materialized_attributes_repository import (
+    backfill_metric_result_columns,
+    backfill_span_model_names,
+    mark_materialized_attributes_ready,
+    materialized_attributes_ready,
+)
+from services.base_queue_service import BaseQueueJob, BaseQueueService
+
+logger = logging.getLogger(__name__)
+
+MATERIALIZED_ATTRIBUTES_BACKFILL_JOB_KEY = "materialized_attributes_backfill"
+# PostgreSQL session-level advisory lock key, unique across the application
+# (see also TRACE_RETENTION_ADVISORY_LOCK_KEY and POLLING_ADVISORY_LOCK_KEY).
+MATERIALIZED_ATTRIBUTES_ADVISORY_LOCK_KEY = 17449342
+INTER_BATCH_DELAY_SECONDS = 0.5
+
+
+class MaterializedAttributeBackfillJob(BaseQueueJob):
+    """Job representing one backfill of the materialized attribute columns."""
+
+    def __init__(self, delay_seconds: int = 0) -> None:
+        super().__init__(delay_seconds=delay_seconds)
+
+
+class MaterializedAttributeBackfillService(
+    BaseQueueService[MaterializedAttributeBackfillJob],
+):
+    """Background service that backfills materialized attribute columns once."""
+
+    job_model = MaterializedAttributeBackfillJob
+    service_name = "materialized_attribute_backfill_service"
+    background_thread_name = "materialized-attribute-backfill"
+
+    def _get_job_key(self, job: MaterializedAttributeBackfillJob) -> str:
+        return MATERIALIZED_ATTRIBUTES_BACKFILL_JOB_KEY
+
+    def _execute_job(self, job: MaterializedAttributeBackfillJob) -> None:
+        with db_session_context() as db_session:
+            if materialized_attributes_ready(db_session):
+                return
+
+            is_postgres = db_session.get_bind().dialect.name == "postgresql"
+            if (
+                is_postgres
+                and not db_session.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"),
+                    {"key": MATERIALIZED_ATTRIBUTES_ADVISORY_LOCK_KEY},
+                ).scalar()
+            ):
+                logger.info(
+                    "Another replica is backfilling materialized attributes, skipping",
+                )
+                return
+
+            try:
+                logger.info("Materialized attribute backfill starting")
+                spans = self._backfill(db_session, backfill_span_model_names)
+                metric_results = self._backfill(
+                    db_session,
+                    backfill_metric_result_columns,
+                )
+                if spans is None or metric_results is None:
+                    return
+
+                mark_materialized_attributes_ready(db_session)
+                db_session.commit()
+                logger.info(
+                    "Materialized attribute backfill complete: %d span batches, "
+                    "%d metric result batches",
+                    spans,
+                    metric_results,
+                )
+            except Exception:
+                logger.exception("Materialized attribute backfill failed")
+                db_session.rollback()
+            finally:
+                if is_postgres:
+                    db_session.execute(
+                        text("SELECT pg_advisory_unlock(:key)"),
+                        {"key": MATERIALIZED_ATTRIBUTES_ADVISORY_LOCK_KEY},
+                    )
+
+    def _backfill(
+        self,
+        db_session: Session,
+        backfill_batch: Callable[[Session, Optional[str]], Optional[str]],
+    ) -> Optional[int]:
+        """Runs backfill_batch until it reports no rows are left.
+
+        Returns:
+            The number of batches, or None if interrupted by shutdown
+        """
+        batches = 0
+        last_id = None
+        while True:
+            last_id = backfill_batch(db_session, last_id)
+            if last_id is None:
+                return batches
+            db_session.commit()
+            batches += 1
+            if self.shutdown_event.wait(INTER_BATCH_DELAY_SECONDS):
+                return None
+
+    def _background_loop(self) -> None:
+        """Enqueue the backfill once on startup."""
+        logger.info("Background thread started for %s", self.service_name)
+        self.enqueue(MaterializedAttributeBackfillJob(delay_seconds=0))
+        self.shutdown_event.wait()
+        logger.info("Background thread stopped for %s", self.service_name)
+
+
+MATERIALIZED_ATTRIBUTE_BACKFILL_SERVICE: Optional[
+    MaterializedAttributeBackfillService
+] = None
+
+
+def get_materialized_attribute_backfill_service() -> (
+    Optional[MaterializedAttributeBackfillService]
+):
+    """Return the global materialized attribute backfill service instance."""
+    return MATERIALIZED_ATTRIBUTE_BACKFILL_SERVICE
+
+
+def initialize_materialized_attribute_backfill_service() -> None:
+    """Initialize and start the global materialized attribute backfill service."""
+    global MATERIALIZED_ATTRIBUTE_BACKFILL_SERVICE
+    if MATERIALIZED_ATTRIBUTE_BACKFILL_SERVICE is None:
+        MATERIALIZED_ATTRIBUTE_BACKFILL_SERVICE = MaterializedAttributeBackfillService(
+            num_workers=1,
+        )
+        MATERIALIZED_ATTRIBUTE_BACKFILL_SERVICE.start()
+
+
+def shutdown_materialized_attribute_backfill_service() -> None:
+    """Shutdown the global materialized attribute backfill service."""
+    global MATERIALIZED_ATTRIBUTE_BACKFILL_SERVICE
+    if MATERIALIZED_ATTRIBUTE_BACKFILL_SERVICE is not None:
+        MATERIALIZED_ATTRIBUTE_BACKFILL_SERVICE.stop(timeout=30)
+        MATERIALIZED_ATTRIBUTE_BACKFILL_SERVICE = None
@@ -20,7 +20,7 @@ from litellm import (
 )
 from litellm.types.utils import ModelResponse, ModelResponseStream
 
-from clients.llm.llm_client import LLMClient, LLMModelResponse
+from clients.llm.llm_client import LLMClient, LLMModelResponse, RunSync
 from schemas.agentic_prompt_schemas import AgenticPrompt
 from schemas.enums import SSEEventType
 from schemas.request_schemas import CompletionRequest, PromptCompletionRequest
@@ -327,22 +327,67 @@ class ChatCompletionService:
             completion_request,
             org_id=org_id,
         )
-        if not isinstance(llm_model_response.response, ModelResponse):
+        return self._to_run_response(
+            llm_model_response.response,
+            llm_model_response.cost or "",
+        )
+
+    async def arun_chat_completion(
+        self,
+        prompt: AgenticPrompt,
+        llm_client: LLMClient,
+        completion_request: PromptCompletionRequest = PromptCompletionRequest(),
+        *,
+        org_id: uuid.UUID,
+        run_sync: RunSync | None = None,
+    ) -> AgenticPromptRunResponse:
+        """Non-streaming chat completion awaited on the event loop via acompletion.
+
+        run_sync runs the blocking token quota check and usage write, see acompletion.
+        """
+        if prompt.has_been_deleted():
+            raise ValueError(
+                f"Cannot run chat completion for this prompt because it was deleted on: {prompt.deleted_at}",
+            )
+
+        model, completion_params = self._get_completion_params(
+            prompt,
+            completion_request,
+        )
+        response = await llm_client.acompletion(
+            model=model,
+            org_id=org_id,
+            run_sync=run_sync,
+            **completion_params,
+        )
+        cost = (
+            llm_client.calculate_cost(response)
+            if isinstance(response, ModelResponse)
+            else ""
+        )
+        return self._to_run_response(response, cost)
+
+    def _to_run_response(
+        self,
+        response: Any,
+        cost: str,
+    ) -> AgenticPromptRunResponse:
+        if not isinstance(response, ModelResponse):
             raise ValueError("Response is not a ModelResponse")
-        if hasattr(llm_model_response.response.choices[0], "message"):
+        if hasattr(response.choices[0], "message"):
             msg: Message = cast(
                 Message,
-                getattr(llm_model_response.response.choices[0], "message"),
+                getattr(response.choices[0], "message"),
             )
             # Extract token counts from usage if available
             input_tokens, output_tokens, total_tokens = self._extract_token_counts(
-                llm_model_response.response,
+                response,
             )
 
             return AgenticPromptRunResponse(
                 content=msg.content,
                 tool_calls=msg.tool_calls,
-                cost=llm_model_response.cost or "",
+                cost=cost,
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
                 total_tokens=total_tokens,
@@ -9,6 +9,8 @@ This module handles the execution of prompt experiments by:
 
 import json
 import logging
+import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Optional
 
@@ -17,17 +19,16 @@ from arthur_common.models.llm_model_providers import ModelProvider
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from clients.llm.llm_client import LLMClient
 from db_models.prompt_experiment_models import (
     DatabasePromptExperiment,
     DatabasePromptExperimentTestCase,
     DatabasePromptExperimentTestCasePromptResult,
 )
-from db_models.task_models import DatabaseTask
-from repositories.agentic_prompts_repository import AgenticPromptRepository
-from repositories.model_provider_repository import ModelProviderRepository
 from repositories.organizations_repository import extract_token_limit_message
 from repositories.prompt_experiment_repository import PromptExperimentRepository
 from schemas.agentic_experiment_schemas import RequestTimeParameter
+from schemas.agentic_prompt_schemas import AgenticPrompt
 from schemas.base_experiment_schemas import (
     EvalResultSummary,
     TestCaseStatus,
@@ -37,12 +38,27 @@ from schemas.prompt_experiment_schemas import (
     SummaryResults,
 )
 from schemas.request_schemas import PromptCompletionRequest
+from schemas.response_schemas import AgenticPromptRunResponse
 from services.experiment_executor import BaseExperimentExecutor
+from services.experiment_lookups import ExperimentLookups
+from services.experiment_runner import get_experiment_runner
 from services.prompt.chat_completion_service import ChatCompletionService
+from utils.llm_concurrency_limiter import estimate_prompt_tokens
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _PromptCall:
+    """A rendered prompt of a test case, ready to be sent to its model."""
+
+    prompt: AgenticPrompt
+    llm_client: LLMClient
+    completion_request: PromptCompletionRequest
+    org_id: uuid.UUID
+    estimated_tokens: int
+
+
 class PromptExperimentExecutor(BaseExperimentExecutor):
     """Handles asynchronous execution of prompt experiments"""
 
@@ -78,10 +94,11 @@ class PromptExperimentExecutor(BaseExperimentExecutor):
         prompt_experiment_repo = PromptExperimentRepository(db_session)
         return prompt_experiment_repo._get_db_test_case(test_case_id)
 
-    def _execute_experiment_outputs(
+    async def _execute_experiment_outputs(
         self,
         db_session: Session,
         test_case: DatabasePromptExperimentTestCase,  # type: ignore[override]
+        lookups: ExperimentLookups,
         request_time_parameters: Optional[List[RequestTimeParameter]] = None,
     ) -> bool:
         """
@@ -90,18 +107,35 @@ class PromptExperimentExecutor(BaseExperimentExecutor):
         Args:
             db_session: Database session
             test_case: Test case to execute prompts for
+            lookups: Lookups of the running experiment
             request_time_parameters: Optional list of request-time parameters (not used for prompt experiments)
 
         Returns:
             True if all prompts executed successfully, False otherwise
         """
+        # read on the thread pool: after a commit, attribute access reloads from the database
+        test_case_id, prompt_results = await get_experiment_runner().run_sync(
+            lambda: (
+                test_case.id,
+                [
+                    (prompt_result, prompt_result.prompt_key)
+                    for prompt_result in test_case.prompt_results
+                ],
+            ),
+        )
+
         any_prompt_failed = False
-        for prompt_result in test_case.prompt_results:
-            success = self._execute_prompt(db_session, prompt_result, test_case)
+        for prompt_result, prompt_key in prompt_results:
+            success = await self._execute_prompt(
+                db_session,
+                prompt_result,
+                test_case,
+                lookups,
+            )
             if not success:
                 any_prompt_failed = True
                 logger.warning(
-                    f"Prompt {prompt_result.prompt_key} failed in test case {test_case.id}, continuing with other prompts",
+                    f"Prompt {prompt_key} failed in test case {test_case_id}, continuing with other prompts",
                 )
         return not any_prompt_failed
 
@@ -258,184 +292,247 @@ class PromptExperimentExecutor(BaseExperimentExecutor):
                 exclude_none=True,
             )
 
-    def _execute_prompt(
+    async def _execute_prompt(
         self,
         db_session: Session,
         prompt_result: DatabasePromptExperimentTestCasePromptResult,
         test_case: DatabasePromptExperimentTestCase,
+        lookups: ExperimentLookups,
     ) -> bool:
         """
         Execute a single prompt (saved or unsaved) and save the output.
 
+        Rendering, saving and the token quota check and usage write of the completion run on
+        the runner's thread pool. The completion is awaited on the event loop while it holds
+        a slot of the runner's LLM limiter for the prompt's model.
+
         Args:
             db_session: Database session
             prompt_result: Prompt result record to populate
             test_case: Test case containing input variables
+            lookups: Lookups of the running experiment
 
         Returns:
             True if prompt executed successfully, False otherwise
         """
+        runner = get_experiment_runner()
         try:
-            # Get the experiment using the test_case relationship
-            experiment = test_case.experiment
-
-            # Get or construct the prompt based on type
-            if prompt_result.prompt_type == "saved":
-                # Load saved prompt from repository
-                prompt_repo = AgenticPromptRepository(db_session)
-                try:
-                    prompt = prompt_repo.get_llm_item(
-                        task_id=experiment.task_id,
-                        item_name=str(prompt_result.name or ""),
-                        item_version=str(prompt_result.version or ""),
-                    )
-                except ValueError as e:
-                    logger.error(
-                        f"Saved prompt {prompt_result.name} v{prompt_result.version} not found: {e}",
-                    )
-                    return False
-
-            elif prompt_result.prompt_type == "unsaved":
-                # Construct prompt from unsaved config in experiment
-                # Find the matching config by auto_name
-                from schemas.agentic_prompt_schemas import AgenticPrompt
-
-                unsaved_config = None
-                for config in experiment.prompt_configs:
-                    if (
-                        config.get("type") == "unsaved"
-                        and config.get("auto_name")
-                        == prompt_result.unsaved_prompt_auto_name
-                    ):
-                        unsaved_config = config
-                        break
-
-                if not unsaved_config:
-                    logger.error(
-                        f"Unsaved prompt config '{prompt_result.unsaved_prompt_auto_name}' not found in experiment",
-                    )
-                    return False
-
-                # Construct AgenticPrompt object from unsaved config
-                prompt = AgenticPrompt(
-                    name=unsaved_config.get("auto_name", "unsaved_prompt"),
-                    messages=unsaved_config.get("messages", []),
-                    model_name=str(unsaved_config.get("model_name", "")),
-                    model_provider=ModelProvider(unsaved_config.get("model_provider")),
-                    version=1,  # Unsaved prompts don't have versions
-                    tools=unsaved_config.get("tools"),
-                    variables=unsaved_config.get("variables", []),
-                    created_at=datetime.now(),
-                )
-
-            else:
-                logger.error(f"Unknown prompt type: {prompt_result.prompt_type}")
+            prompt_call = await runner.run_sync(
+                self._prepare_prompt_call,
+                db_session,
+                prompt_result,
+                test_case,
+                lookups,
+            )
+            if prompt_call is None:
                 return False
 
-            # Get LLM client
-            model_provider_repo = ModelProviderRepository(db_session)
-            llm_client = model_provider_repo.get_model_provider_client(
-                prompt.require_configured_provider(),
+            async with runner.llm_limiter.limit(
+                prompt_call.llm_client.provider.value,
+                prompt_call.prompt.model_name,
+                estimated_tokens=prompt_call.estimated_tokens,
+            ) as slot:
+                response = await self.chat_completion_service.arun_chat_completion(
+                    prompt=prompt_call.prompt,
+                    llm_client=prompt_call.llm_client,
+                    completion_request=prompt_call.completion_request,
+                    org_id=prompt_call.org_id,
+                    run_sync=runner.run_sync,
+                )
+                slot.total_tokens = response.total_tokens
+
+            await runner.run_sync(
+                self._save_prompt_output,
+                db_session,
+                prompt_result,
+                test_case,
+                response,
             )
+            return True
 
-            # Build variable map from test case input variables
-            variable_map = {
-                var["variable_name"]: var["value"]
-                for var in test_case.prompt_input_variables
-            }
-
-            # Render the prompt
-            rendered_messages = self.chat_completion_service.replace_variables(
-                variable_map=variable_map,
-                messages=prompt.messages,
+        except Exception as e:
+            await runner.run_sync(
+                self._handle_prompt_error,
+                db_session,
+                prompt_result,
+                e,
             )
+            return False
 
-            # Convert messages to dictionaries for JSON serialization
-            # Handle both dict objects and Pydantic/OpenAI message objects
-            messages_as_dicts = []
-            for msg in rendered_messages:
-                # Pydantic model
-                messages_as_dicts.append(
-                    msg.model_dump(mode="python", exclude_none=True),
-                )
-
-            rendered_prompt_text = json.dumps(messages_as_dicts, indent=2)
-
-            # Save rendered prompt
-            prompt_result.rendered_prompt = rendered_prompt_text
-            db_session.commit()
+    def _prepare_prompt_call(
+        self,
+        db_session: Session,
+        prompt_result: DatabasePromptExperimentTestCasePromptResult,
+        test_case: DatabasePromptExperimentTestCase,
+        lookups: ExperimentLookups,
+    ) -> Optional[_PromptCall]:
+        """
+        Resolve and render a prompt and save the rendered prompt.
 
-            # Execute the prompt
-            completion_request = PromptCompletionRequest(
-                variables=[
-                    VariableTemplateValue(name=k, value=v)
-                    for k, v in variable_map.items()
-                ],
-            )
+        Args:
+            db_session: Database session
+            prompt_result: Prompt result record to populate
+            test_case: Test case containing input variables
+            lookups: Lookups of the running experiment
 
-            # Background experiment thread: derive org from the owning task.
-            task_org_id = (
-                db_session.query(DatabaseTask.org_id)
-                .filter(DatabaseTask.id == experiment.task_id)
-                .scalar()
-            )
-            if task_org_id is None:
-                raise ValueError(
-                    f"Cannot determine org for experiment task {experiment.task_id}.",
+        Returns:
+            The completion to run, or None if the prompt could not be resolved
+        """
+        # Get the experiment using the test_case relationship
+        experiment = test_case.experiment
+
+        # Get or construct the prompt based on type
+        if prompt_result.prompt_type == "saved":
+            # Load saved prompt, once per experiment
+            try:
+                prompt = lookups.get_saved_prompt(
+                    db_session,
+                    str(prompt_result.name or ""),
+                    str(prompt_result.version or ""),
                 )
-
-            response = self.chat_completion_service.run_chat_completion(
-                prompt=prompt,
-                llm_client=llm_client,
-                completion_request=completion_request,
-                org_id=task_org_id,
+            except ValueError as e:
+                logger.error(
+                    f"Saved prompt {prompt_result.name} v{prompt_result.version} not found: {e}",
+                )
+                return None
+
+        elif prompt_result.prompt_type == "unsaved":
+            # Construct prompt from unsaved config in experiment
+            # Find the matching config by auto_name
+            unsaved_config = None
+            for config in experiment.prompt_configs:
+                if (
+                    config.get("type") == "unsaved"
+                    and config.get("auto_name")
+                    == prompt_result.unsaved_prompt_auto_name
+                ):
+                    unsaved_config = config
+                    break
+
+            if not unsaved_config:
+                logger.error(
+                    f"Unsaved prompt config '{prompt_result.unsaved_prompt_auto_name}' not found in experiment",
+                )
+                return None
+
+            # Construct AgenticPrompt object from unsaved config
+            prompt = AgenticPrompt(
+                name=unsaved_config.get("auto_name", "unsaved_prompt"),
+                messages=unsaved_config.get("messages", []),
+                model_name=str(unsaved_config.get("model_name", "")),
+                model_provider=ModelProvider(unsaved_config.get("model_provider")),
+                version=1,  # Unsaved prompts don't have versions
+                tools=unsaved_config.get("tools"),
+                variables=unsaved_config.get("variables", []),
+                created_at=datetime.now(),
             )
 
-            # Save output to separate columns. Tool calls come back as
-            # ChatCompletionMessageToolCall Pydantic objects from the openai SDK;
-            # dump to plain dicts so SQLAlchemy's JSON column can serialize them.
-            prompt_result.output_content = (
-                response.content if response.content else None
-            )
-            prompt_result.output_tool_calls = (
-                [tc.model_dump(mode="json") for tc in response.tool_calls]
-                if response.tool_calls
-                else None
-            )
-            prompt_result.output_cost = response.cost or ""
-            db_session.commit()
+        else:
+            logger.error(f"Unknown prompt type: {prompt_result.prompt_type}")
+            return None
 
-            logger.info(
-                f"Executed prompt {prompt_result.prompt_key} for test case {test_case.id}",
+        # Get LLM client
+        llm_client = lookups.get_llm_client(
+            db_session,
+            prompt.require_configured_provider(),
+        )
+
+        # Build variable map from test case input variables
+        variable_map = {
+            var["variable_name"]: var["value"]
+            for var in test_case.prompt_input_variables
+        }
+
+        # Render the prompt
+        rendered_messages = self.chat_completion_service.replace_variables(
+            variable_map=variable_map,
+            messages=prompt.messages,
+        )
+
+        # Convert messages to dictionaries for JSON serialization
+        # Handle both dict objects and Pydantic/OpenAI message objects
+        messages_as_dicts = []
+        for msg in rendered_messages:
+            # Pydantic model
+            messages_as_dicts.append(
+                msg.model_dump(mode="python", exclude_none=True),
             )
-            return True
 
-        except Exception as e:
-            logger.error(
-                f"Error executing prompt {prompt_result.prompt_key}: {e}",
-                exc_info=True,
-            )
-            # UP-4390: surface the credit-limit message on the prompt result
-            # so the FE has something to render instead of an unexplained
-            # "failed". Other failure modes stay log-only — we don't want
-            # raw stack traces showing up as a prompt's output.
-            limit_message = extract_token_limit_message(e)
-            if limit_message is not None:
-                try:
-                    prompt_result.output_content = limit_message
-                    db_session.commit()
-                except Exception:
-                    db_session.rollback()
-                    logger.exception(
-                        "Failed to persist token-limit message on prompt_result %s",
-                        prompt_result.id,
-                    )
-            return False
+        rendered_prompt_text = json.dumps(messages_as_dicts, indent=2)
+
+        # Save rendered prompt
+        prompt_result.rendered_prompt = rendered_prompt_text
+        db_session.commit()
+
+        # Build the completion request
+        completion_request = PromptCompletionRequest(
+            variables=[
+                VariableTemplateValue(name=k, value=v) for k, v in variable_map.items()
+            ],
+        )
+
+        return _PromptCall(
+            prompt=prompt,
+            llm_client=llm_client,
+            completion_request=completion_request,
+            org_id=lookups.org_id,
+            estimated_tokens=estimate_prompt_tokens(rendered_prompt_text),
+        )
+
+    @staticmethod
+    def _save_prompt_output(
+        db_session: Session,
+        prompt_result: DatabasePromptExperimentTestCasePromptResult,
+        test_case: DatabasePromptExperimentTestCase,
+        response: AgenticPromptRunResponse,
+    ) -> None:
+        # Save output to separate columns. Tool calls come back as
+        # ChatCompletionMessageToolCall Pydantic objects from the openai SDK;
+        # dump to plain dicts so SQLAlchemy's JSON column can serialize them.
+        prompt_result.output_content = response.content if response.content else None
+        prompt_result.output_tool_calls = (
+            [tc.model_dump(mode="json") for tc in response.tool_calls]
+            if response.tool_calls
+            else None
+        )
+        prompt_result.output_cost = response.cost or ""
+        db_session.commit()
+
+        logger.info(
+            f"Executed prompt {prompt_result.prompt_key} for test case {test_case.id}",
+        )
+
+    @staticmethod
+    def _handle_prompt_error(
+        db_session: Session,
+        prompt_result: DatabasePromptExperimentTestCasePromptResult,
+        error: Exception,
+    ) -> None:
+        logger.error(
+            f"Error executing prompt {prompt_result.prompt_key}: {error}",
+            exc_info=error,
+        )
+        # UP-4390: surface the credit-limit message on the prompt result
+        # so the FE has something to render instead of an unexplained
+        # "failed". Other failure modes stay log-only — we don't want
+        # raw stack traces showing up as a prompt's output.
+        limit_message = extract_token_limit_message(error)
+        if limit_message is not None:
+            try:
+                prompt_result.output_content = limit_message
+                db_session.commit()
+            except Exception:
+                db_session.rollback()
+                logger.exception(
+                    "Failed to persist token-limit message on prompt_result %s",
+                    prompt_result.id,
+                )
 
     def _execute_evaluations(
         self,
         db_session: Session,
         test_case: DatabasePromptExperimentTestCase,  # type: ignore[override]
+        lookups: ExperimentLookups,
     ) -> bool:
         """
         Execute all evaluations for a prompt test case.
@@ -443,6 +540,7 @@ class PromptExperimentExecutor(BaseExperimentExecutor):
         Args:
             db_session: Database session
             test_case: Test case containing prompt results to evaluate
+            lookups: Lookups of the running experiment
 
         Returns:
             True if all evaluations executed successfully, False otherwise
@@ -453,6 +551,7 @@ class PromptExperimentExecutor(BaseExperimentExecutor):
                 success = self._execute_evaluations_for_result(
                     db_session,
                     prompt_result,
+                    lookups,
                 )
                 if not success:
                     any_eval_failed = True
@@ -471,6 +570,7 @@ class PromptExperimentExecutor(BaseExperimentExecutor):
         self,
         db_session: Session,
         prompt_result: DatabasePromptExperimentTestCasePromptResult,
+        lookups: ExperimentLookups,
     ) -> bool:
         """
         Execute all evaluations for a prompt result.
@@ -478,6 +578,7 @@ class PromptExperimentExecutor(BaseExperimentExecutor):
         Args:
             db_session: Database session
             prompt_result: Prompt result with output to evaluate
+            lookups: Lookups of the running experiment
 
         Returns:
             True if all evaluations executed successfully, False otherwise
@@ -490,6 +591,7 @@ class PromptExperimentExecutor(BaseExperimentExecutor):
                     db_session,
                     eval_score,
                     prompt_result,
+                    lookups,
                 )
                 if not success:
                     any_eval_failed = True
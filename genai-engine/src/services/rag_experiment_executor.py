@@ -49,6 +49,8 @@ from schemas.request_schemas import (
 )
 from schemas.response_schemas import RagProviderQueryResponse
 from services.experiment_executor import BaseExperimentExecutor
+from services.experiment_lookups import ExperimentLookups
+from services.experiment_runner import get_experiment_runner
 
 logger = logging.getLogger(__name__)
 
@@ -94,7 +96,22 @@ class RagExperimentExecutor(BaseExperimentExecutor):
         rag_experiment_repo = RagExperimentRepository(db_session)
         return rag_experiment_repo._get_db_test_case(test_case_id)
 
-    def _execute_experiment_outputs(
+    async def _execute_experiment_outputs(
+        self,
+        db_session: Session,
+        test_case: DatabaseRagExperimentTestCase,  # type: ignore[override]
+        lookups: ExperimentLookups,
+        request_time_parameters: Optional[List[RequestTimeParameter]] = None,
+    ) -> bool:
+        """Execute all RAG searches for a test case on the runner's thread pool."""
+        return await get_experiment_runner().run_sync(
+            self._execute_rag_searches,
+            db_session,
+            test_case,
+            request_time_parameters,
+        )
+
+    def _execute_rag_searches(
         self,
         db_session: Session,
         test_case: DatabaseRagExperimentTestCase,  # type: ignore[override]
@@ -456,6 +473,7 @@ class RagExperimentExecutor(BaseExperimentExecutor):
         self,
         db_session: Session,
         test_case: DatabaseRagExperimentTestCase,  # type: ignore[override]
+        lookups: ExperimentLookups,
     ) -> bool:
         """
         Execute all evaluations for a RAG test case.
@@ -463,6 +481,7 @@ class RagExperimentExecutor(BaseExperimentExecutor):
         Args:
             db_session: Database session
             test_case: Test case containing RAG results to evaluate
+            lookups: Lookups of the running experiment
 
         Returns:
             True if all evaluations executed successfully, False otherwise
@@ -470,7 +489,11 @@ class RagExperimentExecutor(BaseExperimentExecutor):
         try:
             any_eval_failed = False
             for rag_result in test_case.rag_results:
-                success = self._execute_evaluations_for_result(db_session, rag_result)
+                success = self._execute_evaluations_for_result(
+                    db_session,
+                    rag_result,
+                    lookups,
+                )
                 if not success:
                     any_eval_failed = True
                     logger.warning(
@@ -488,6 +511,7 @@ class RagExperimentExecutor(BaseExperimentExecutor):
         self,
         db_session: Session,
         rag_result: DatabaseRagExperimentTestCaseRagResult,
+        lookups: ExperimentLookups,
     ) -> bool:
         """
         Execute all evaluations for a RAG result.
@@ -495,6 +519,7 @@ class RagExperimentExecutor(BaseExperimentExecutor):
         Args:
             db_session: Database session
             rag_result: RAG result with output to evaluate
+            lookups: Lookups of the running experiment
 
         Returns:
             True if all evaluations executed successfully, False otherwise
@@ -507,6 +532,7 @@ class RagExperimentExecutor(BaseExperimentExecutor):
                     db_session,
                     eval_score,
                     rag_result,
+                    lookups,
                 )
                 if not success:
                     any_eval_failed = True
@@ -3,7 +3,7 @@ import os
 import uuid
 from concurrent.futures import wait
 from datetime import datetime, timedelta
-from typing import Hashable, Optional
+from typing import Any, Hashable, Optional
 
 import vertexai
 from arthur_common.models.agent_governance_schemas import (
@@ -54,8 +54,8 @@ AGENTIC_POLLING_INTERVAL_SECONDS: int = int(
 class AgentPollingJob(BaseQueueJob):
     """Represents a polling job for a single task."""
 
-    def __init__(self, task_id: str, delay_seconds: int = 0):
-        super().__init__(delay_seconds)
+    def __init__(self, task_id: str, delay_seconds: int = 0, priority: int = 0):
+        super().__init__(delay_seconds, priority)
         self.task_id = task_id
 
 
@@ -76,11 +76,18 @@ class GlobalAgentPollingService(BaseQueueService[AgentPollingJob]):
     job_model = AgentPollingJob
     service_name = "global_agent_polling_service"
     background_thread_name = "global-agent-polling-background"
+    durable_queue_name = "agent_polling"
 
     def _get_job_key(self, job: AgentPollingJob) -> Hashable:
         """Use task_id as the unique key for deduplication."""
         return job.task_id
 
+    def _serialize_job(self, job: AgentPollingJob) -> dict[str, Any]:
+        return {"task_id": job.task_id}
+
+    def _deserialize_job(self, payload: dict[str, Any]) -> AgentPollingJob:
+        return AgentPollingJob(task_id=payload["task_id"])
+
     def _background_loop(self) -> None:
         """Background thread that runs discovery + polling at regular intervals.
 
@@ -382,10 +389,10 @@ class GlobalAgentPollingService(BaseQueueService[AgentPollingJob]):
 
             # Execute based on mode
             if wait_for_completion:
-                # Synchronous mode: enqueue and wait for all jobs
+                # Synchronous mode: run the jobs in this process and wait for all of them
                 futures_to_jobs = {}
                 for job in jobs_to_enqueue:
-                    enqueued, future = self.enqueue(job)
+                    enqueued, future = self.enqueue(job, wait_for_result=True)
                     if enqueued and future:
                         futures_to_jobs[future] = job
 
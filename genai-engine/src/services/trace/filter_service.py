@@ -3,15 +3,18 @@ Filter service containing shared components for both trace-based and span-based
 """
 
 import logging
-from typing import Any
+from typing import Any, Callable
 
 from arthur_common.models.enums import ComparisonOperatorEnum, MetricType, ToolClassEnum
-from sqlalchemy import ColumnElement, and_, exists, func, select
+from sqlalchemy import ColumnElement, and_, exists, func, or_, select
 from sqlalchemy.orm import InstrumentedAttribute, Session
 from sqlalchemy.sql.elements import KeyedColumnElement
 from sqlalchemy.types import Float, Integer
 
 from db_models import DatabaseMetricResult, DatabaseSpan
+from repositories.materialized_attributes_repository import (
+    materialized_attributes_ready,
+)
 from schemas.internal_schemas import FloatRangeFilter, TraceQuerySchema
 from utils.constants import SPAN_KIND_LLM, SPAN_KIND_TOOL
 
@@ -26,12 +29,14 @@ class FilterService:
     - Filter validation and compatibility checking
     - Span type auto-detection from filter presence
     - Database-specific JSON extraction functions
+    - Conditions on materialized attribute columns
     - Comparison condition building
     - Metric EXISTS clause generation
     """
 
     def __init__(self, db_session: Session):
         self.db_session = db_session
+        self._materialized_attributes_ready: bool | None = None
 
     # ============================================================================
     # Filter Validation and Auto-Detection
@@ -116,6 +121,32 @@ class FilterService:
             json_path = "$." + ".".join(path_components)
             return func.json_extract(column, json_path)
 
+    # ============================================================================
+    # Materialized Attribute Columns
+    # ============================================================================
+
+    def build_materialized_condition(
+        self,
+        column: ColumnElement[Any],
+        json_value: ColumnElement[Any],
+        build_condition: Callable[[ColumnElement[Any]], ColumnElement[bool]],
+    ) -> ColumnElement[bool]:
+        """Build a condition on a materialized attribute column.
+
+        Until the materialized attribute backfill completes, rows whose column is
+        still NULL are matched on the JSON value instead.
+        """
+        if self._materialized_attributes_ready is None:
+            self._materialized_attributes_ready = materialized_attributes_ready(
+                self.db_session,
+            )
+        if self._materialized_attributes_ready:
+            return build_condition(column)
+        return or_(
+            build_condition(column),
+            and_(column.is_(None), build_condition(json_value)),
+        )
+
     # ============================================================================
     # Comparison Condition Building
     # ============================================================================
@@ -171,10 +202,13 @@ class FilterService:
         )
 
         # Build relevance conditions
-        relevance_conditions = [
-            self.build_comparison_condition(func.cast(score_path, Float), f)
-            for f in relevance_filters
-        ]
+        relevance_condition = self.build_materialized_condition(
+            inner_metric.c.relevance_score,
+            func.cast(score_path, Float),
+            lambda score: and_(
+                *[self.build_comparison_condition(score, f) for f in relevance_filters],
+            ),
+        )
 
         return exists(
             select(1)
@@ -190,7 +224,7 @@ class FilterService:
                     inner_span.c.task_id.in_(task_ids),
                     inner_span.c.span_kind == SPAN_KIND_LLM,
                     inner_metric.c.metric_type == metric_type.value,
-                    *relevance_conditions,
+                    relevance_condition,
                 ),
             ),
         )
@@ -215,8 +249,10 @@ class FilterService:
             field_name,
         )
 
-        classification_condition = (
-            func.cast(classification_path, Integer) == tool_class.value
+        classification_condition = self.build_materialized_condition(
+            inner_metric.c[field_name],
+            func.cast(classification_path, Integer),
+            lambda classification: classification == tool_class.value,
         )
 
         return exists(
@@ -413,10 +449,13 @@ class FilterService:
         )
 
         # Build relevance conditions
-        relevance_conditions = [
-            self.build_comparison_condition(func.cast(score_path, Float), f)
-            for f in relevance_filters
-        ]
+        relevance_condition = self.build_materialized_condition(
+            inner_metric.c.relevance_score,
+            func.cast(score_path, Float),
+            lambda score: and_(
+                *[self.build_comparison_condition(score, f) for f in relevance_filters],
+            ),
+        )
 
         return exists(
             select(1)
@@ -425,7 +464,7 @@ class FilterService:
                 and_(
                     inner_metric.c.span_id == span_id_column,
                     inner_metric.c.metric_type == metric_type.value,
-                    *relevance_conditions,
+                    relevance_condition,
                 ),
             ),
         )
@@ -447,8 +486,10 @@ class FilterService:
             field_name,
         )
 
-        classification_condition = (
-            func.cast(classification_path, Integer) == tool_class.value
+        classification_condition = self.build_materialized_condition(
+            inner_metric.c[field_name],
+            func.cast(classification_path, Integer),
+            lambda classification: classification == tool_class.value,
         )
 
         return exists(
@@ -262,7 +262,7 @@ def guardrail_span(
     Usage::
 
         with guardrail_span(db_session, enabled=..., task_id=..., inference_id=..., ...) as gspan:
-            rule_results = RuleEngine(scorer_client).evaluate(request, rules)
+            rule_results = get_rule_engine(scorer_client).evaluate(request, rules)
             gspan.set_rule_results(rule_results)  # raw RuleEngineResult list
         inference = repo.save_prompt(...)  # business write commits first
         gspan.persist()                    # only now is the span flushed
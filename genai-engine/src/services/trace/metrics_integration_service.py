@@ -14,6 +14,7 @@ from repositories.tasks_metrics_repository import TasksMetricsRepository
 from schemas.internal_schemas import MetricResult, Span
 from utils import trace as trace_utils
 from utils.constants import SPAN_KIND_LLM
+from utils.materialized_attributes import metric_result_columns
 
 logger = logging.getLogger(__name__)
 
@@ -88,6 +89,26 @@ class MetricsIntegrationService:
             logger.error(f"Error computing metrics for span {span.id}: {e}")
             return []
 
+    def get_spans_awaiting_metrics(self, spans: list[Span]) -> list[Span]:
+        """Get the spans without metric results that metrics would be computed for.
+
+        Expects the spans' stored results to be embedded, see add_metrics_to_spans.
+        """
+        spans_awaiting_metrics = []
+        task_has_metrics: dict[str, bool] = {}
+        for span in spans:
+            if span.metric_results or not span.task_id:
+                continue
+            if span.span_kind != SPAN_KIND_LLM:
+                continue
+            if span.task_id not in task_has_metrics:
+                task_has_metrics[span.task_id] = bool(
+                    self.tasks_metrics_repo.get_task_metrics_ids_cached(span.task_id),
+                )
+            if task_has_metrics[span.task_id]:
+                spans_awaiting_metrics.append(span)
+        return spans_awaiting_metrics
+
     def get_metric_results_for_spans(
         self,
         span_ids: list[str],
@@ -227,6 +248,10 @@ class MetricsIntegrationService:
                 "latency_ms": result.latency_ms,
                 "span_id": span_id,
                 "metric_id": result.metric_id,
+                **metric_result_columns(
+                    result.metric_type,
+                    result.details.model_dump() if result.details else None,
+                ),
             }
             for result in results
         ]
@@ -0,0 +1,134 @@
+"""
+Direct conversion of OTLP protobuf spans for trace ingestion.
+
+Trace ingestion used to turn the whole ExportTraceServiceRequest into a dict with
+MessageToDict, which base64-encodes IDs, stringifies 64-bit integers and wraps every
+attribute value in an OTEL value dict, only for span processing to undo all of it.
+This converter reads the protobuf messages directly instead: IDs are hex-encoded
+from their bytes and attribute values are extracted with their native types.
+
+Spans are still stored with the same raw_data as before, so the dict built for a span
+keeps the MessageToDict layout for every field but the attributes, which are handed
+to the normalizer as a flat dict of already typed values.
+"""
+
+import base64
+from typing import Any
+
+from google.protobuf.json_format import MessageToDict
+from opentelemetry.proto.common.v1.common_pb2 import AnyValue, KeyValue
+from opentelemetry.proto.resource.v1.resource_pb2 import Resource
+from opentelemetry.proto.trace.v1.trace_pb2 import Span, Status
+
+from services.trace.span_normalization_service import SpanNormalizationService
+
+SCALAR_VALUE_FIELDS = frozenset(
+    {"string_value", "bool_value", "int_value", "double_value"},
+)
+
+
+def _b64(value: bytes) -> str:
+    return base64.b64encode(value).decode("ascii")
+
+
+def scalar_value(value: AnyValue) -> str | bool | int | float | None:
+    """Native value of a string / bool / int / double AnyValue, None for other kinds."""
+    kind = value.WhichOneof("value")
+    if kind in SCALAR_VALUE_FIELDS:
+        scalar: str | bool | int | float = getattr(value, kind)
+        return scalar
+    return None
+
+
+def _otel_value_dict(value: AnyValue) -> Any:
+    """Value of a non-scalar AnyValue in the form the OTEL dict conversion produced."""
+    kind = value.WhichOneof("value")
+    if kind == "array_value":
+        return MessageToDict(value.array_value)
+    if kind == "kvlist_value":
+        return MessageToDict(value.kvlist_value)
+    # bytes values and unset values were kept as their raw OTEL value dict
+    return MessageToDict(value)
+
+
+class OtlpSpanConverter:
+    """Builds span dicts for ingestion straight from OTLP protobuf messages."""
+
+    def __init__(self, span_normalizer: SpanNormalizationService) -> None:
+        self.span_normalizer = span_normalizer
+
+    def resource_attributes(self, resource: Resource) -> dict[str, Any]:
+        """Scalar resource attributes as a dict of native values."""
+        result = {}
+        for attr in resource.attributes:
+            value = scalar_value(attr.value)
+            if attr.key and value is not None:
+                result[attr.key] = value
+        return result
+
+    def _flat_attributes(self, attributes: list[KeyValue]) -> dict[str, Any]:
+        attrs = {}
+        for attr in attributes:
+            if not attr.key:
+                continue
+            value = scalar_value(attr.value)
+            if value is None:
+                attrs[attr.key] = _otel_value_dict(attr.value)
+            else:
+                attrs[attr.key] = self.span_normalizer.convert_attribute_value(
+                    attr.key,
+                    value,
+                )
+        return attrs
+
+    def span_to_dict(self, span: Span) -> dict[str, Any]:
+        """
+        Span dict in the MessageToDict layout, with flat typed attributes.
+
+        Fields are emitted in field number order and only when set, the same way
+        MessageToDict does, so the normalized span is identical to the one the dict
+        based ingestion path stores.
+        """
+        result: dict[str, Any] = {}
+        if span.trace_id:
+            result["traceId"] = _b64(span.trace_id)
+        if span.span_id:
+            result["spanId"] = _b64(span.span_id)
+        if span.trace_state:
+            result["traceState"] = span.trace_state
+        if span.parent_span_id:
+            result["parentSpanId"] = _b64(span.parent_span_id)
+        if span.name:
+            result["name"] = span.name
+        if span.kind:
+            result["kind"] = Span.SpanKind.Name(span.kind)
+        if span.start_time_unix_nano:
+            result["startTimeUnixNano"] = str(span.start_time_unix_nano)
+        if span.end_time_unix_nano:
+            result["endTimeUnixNano"] = str(span.end_time_unix_nano)
+        if span.attributes:
+            result["attributes"] = self._flat_attributes(span.attributes)
+        if span.dropped_attributes_count:
+            result["droppedAttributesCount"] = span.dropped_attributes_count
+        if span.events:
+            result["events"] = [MessageToDict(event) for event in span.events]
+        if span.dropped_events_count:
+            result["droppedEventsCount"] = span.dropped_events_count
+        if span.links:
+            result["links"] = [MessageToDict(link) for link in span.links]
+        if span.dropped_links_count:
+            result["droppedLinksCount"] = span.dropped_links_count
+        if span.HasField("status"):
+            status: dict[str, Any] = {}
+            if span.status.message:
+                status["message"] = span.status.message
+            if span.status.code:
+                status["code"] = Status.StatusCode.Name(span.status.code)
+            result["status"] = status
+        if span.flags:
+            result["flags"] = span.flags
+        return result
+
+    def normalize_span(self, span: Span) -> dict[str, Any]:
+        """Normalized raw_data of a span, see SpanNormalizationService."""
+        return self.span_normalizer.normalize_flat_span(self.span_to_dict(span))
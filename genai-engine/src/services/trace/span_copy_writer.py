@@ -0,0 +1,142 @@
+"""
+Bulk span writes for PostgreSQL through COPY.
+
+Adding thousands of DatabaseSpan objects to the session makes SQLAlchemy flush them as
+individual INSERTs, with unit of work bookkeeping for every row. For large batches the
+ingestion service instead streams the spans as CSV through COPY ... FROM STDIN into a
+per-connection temporary staging table, and moves them into spans with an
+INSERT ... SELECT that runs as a CTE of the trace metadata upsert, so both tables are
+written by one set-based statement.
+
+SQLite (unit tests) has no COPY and keeps using the ORM path.
+"""
+
+import csv
+import io
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import CTE, column, insert, select, table
+from sqlalchemy.orm import Session
+
+from db_models import DatabaseSpan
+from utils import constants
+from utils.utils import get_env_var
+
+logger = logging.getLogger(__name__)
+
+STAGING_TABLE_NAME = "spans_copy_staging"
+
+# Every spans column but created_at / updated_at, which take their server defaults
+SPAN_COPY_COLUMNS = [
+    "id",
+    "trace_id",
+    "span_id",
+    "parent_span_id",
+    "span_name",
+    "span_kind",
+    "start_time",
+    "end_time",
+    "task_id",
+    "org_id",
+    "resource_id",
+    "session_id",
+    "user_id",
+    "status_code",
+    "raw_data",
+    "prompt_token_count",
+    "completion_token_count",
+    "total_token_count",
+    "prompt_token_cost",
+    "completion_token_cost",
+    "total_token_cost",
+    "model_name",
+]
+
+_RAW_DATA_INDEX = SPAN_COPY_COLUMNS.index("raw_data")
+
+SPAN_COPY_MIN_BATCH_SIZE = int(
+    get_env_var(
+        constants.GENAI_ENGINE_SPAN_COPY_MIN_BATCH_SIZE_ENV_VAR,
+        default=str(constants.DEFAULT_SPAN_COPY_MIN_BATCH_SIZE),
+    ),
+)
+
+_STAGING_TABLE = table(
+    STAGING_TABLE_NAME,
+    *[column(name) for name in SPAN_COPY_COLUMNS],
+    schema="pg_temp",
+)
+
+
+def use_span_copy_writer(db_session: Session, span_count: int) -> bool:
+    """Whether a batch of span_count spans should be written with COPY."""
+    bind = db_session.get_bind()
+    return (
+        bind.dialect.name == "postgresql"
+        and SPAN_COPY_MIN_BATCH_SIZE > 0
+        and span_count >= SPAN_COPY_MIN_BATCH_SIZE
+    )
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+class SpanCopyWriter:
+    """Writes spans to PostgreSQL with COPY through a temporary staging table."""
+
+    def __init__(self, db_session: Session) -> None:
+        self.db_session = db_session
+
+    def copy_to_staging(self, spans: list[DatabaseSpan]) -> None:
+        """Replaces the staging table contents of this transaction with spans."""
+        connection = self.db_session.connection()
+        # created once per database connection, emptied at the end of every transaction
+        connection.exec_driver_sql(
+            f"CREATE TEMPORARY TABLE IF NOT EXISTS {STAGING_TABLE_NAME} "
+            "(LIKE spans INCLUDING DEFAULTS) ON COMMIT DELETE ROWS",
+        )
+        # rows of an earlier batch of the same, uncommitted, transaction
+        connection.exec_driver_sql(f"TRUNCATE pg_temp.{STAGING_TABLE_NAME}")
+
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY pg_temp.{STAGING_TABLE_NAME} ({', '.join(SPAN_COPY_COLUMNS)}) "
+                "FROM STDIN WITH (FORMAT csv)",
+                self._to_csv(spans),
+            )
+        finally:
+            cursor.close()
+        logger.debug(f"Copied {len(spans)} spans to the staging table")
+
+    def insert_from_staging(self) -> CTE:
+        """INSERT ... SELECT moving the staged spans into spans, as a CTE."""
+        return (
+            insert(DatabaseSpan)
+            .from_select(
+                SPAN_COPY_COLUMNS,
+                select(*[_STAGING_TABLE.c[name] for name in SPAN_COPY_COLUMNS]),
+            )
+            .cte("copied_spans")
+        )
+
+    def _to_csv(self, spans: list[DatabaseSpan]) -> io.StringIO:
+        buffer = io.StringIO()
+        # None is written unquoted, which COPY reads as NULL, and everything else
+        # quoted, so empty strings stay empty strings
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NOTNULL, lineterminator="\n")
+        for span in spans:
+            row = [_csv_value(getattr(span, name)) for name in SPAN_COPY_COLUMNS]
+            row[_RAW_DATA_INDEX] = json.dumps(span.raw_data)
+            writer.writerow(row)
+        buffer.seek(0)
+        return buffer
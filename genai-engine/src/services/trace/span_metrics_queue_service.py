@@ -0,0 +1,244 @@
+"""Background computation of span metrics.
+
+With GENAI_ENGINE_SPAN_METRICS_MODE=background, ingestion queues a job for every new
+LLM span of a task with enabled metrics, and the workers of this service compute and
+store its metric results. The metrics endpoints then only embed stored results: spans
+still missing them are queued again and reported as pending instead of being computed
+on the request path.
+"""
+
+import logging
+import threading
+from typing import Any, Hashable
+
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from db_models import DatabaseMetricResult, DatabaseSpan
+from db_models.telemetry_models import DatabaseTaskToMetrics
+from dependencies import get_db_session
+from repositories.metrics_repository import MetricRepository
+from repositories.tasks_metrics_repository import TasksMetricsRepository
+from schemas.internal_schemas import Span
+from services.base_queue_service import BaseQueueJob, BaseQueueService
+from services.trace.metrics_integration_service import MetricsIntegrationService
+from utils import constants
+from utils.constants import SPAN_KIND_LLM
+from utils.utils import get_env_var
+
+logger = logging.getLogger(__name__)
+
+# Number of spans in a metrics response whose metrics are still being computed
+SPAN_METRICS_PENDING_HEADER = "X-Span-Metrics-Pending"
+
+# How many spans, and for how long, are remembered as computed without results, so
+# reads don't queue them again; once forgotten the next read retries them
+SETTLED_SPANS_MAX_SIZE = 100_000
+SETTLED_SPANS_TTL_SECONDS = 3600
+
+
+def background_span_metrics_enabled() -> bool:
+    return (
+        str(
+            get_env_var(
+                constants.GENAI_ENGINE_SPAN_METRICS_MODE_ENV_VAR,
+                default=constants.DEFAULT_SPAN_METRICS_MODE,
+            ),
+        ).lower()
+        == "background"
+    )
+
+
+class SpanMetricsJob(BaseQueueJob):
+    """Represents the metric computation of a single span."""
+
+    def __init__(
+        self,
+        span_id: str,
+        delay_seconds: int = 0,
+        priority: int = 0,
+    ):
+        super().__init__(delay_seconds, priority)
+        self.span_id = span_id
+
+
+class SpanMetricsQueueService(BaseQueueService[SpanMetricsJob]):
+    """Service that computes and stores span metrics off the request path."""
+
+    job_model = SpanMetricsJob
+    service_name = "span_metrics_queue_service"
+    background_thread_name = "span-metrics-background"
+    durable_queue_name = "span_metrics"
+
+    def __init__(self, num_workers: int = 4) -> None:
+        super().__init__(num_workers)
+        # spans whose job ran but produced no results, e.g. every metric failed
+        self._settled_span_ids: TTLCache[str, bool] = TTLCache(
+            maxsize=SETTLED_SPANS_MAX_SIZE,
+            ttl=SETTLED_SPANS_TTL_SECONDS,
+        )
+        self._settled_lock = threading.Lock()
+
+    def get_settled_span_ids(self, span_ids: list[str]) -> set[str]:
+        """Get the spans whose metrics were computed recently without any results."""
+        with self._settled_lock:
+            return {
+                span_id for span_id in span_ids if span_id in self._settled_span_ids
+            }
+
+    def _settle_span(self, span_id: str) -> None:
+        with self._settled_lock:
+            self._settled_span_ids[span_id] = True
+
+    def _get_job_key(self, job: SpanMetricsJob) -> Hashable:
+        """Use the span's database id as the unique key for deduplication."""
+        return job.span_id
+
+    def _serialize_job(self, job: SpanMetricsJob) -> dict[str, Any]:
+        return {"span_id": job.span_id}
+
+    def _deserialize_job(self, payload: dict[str, Any]) -> SpanMetricsJob:
+        return SpanMetricsJob(span_id=payload["span_id"])
+
+    def _background_loop(self) -> None:
+        """Jobs come from ingestion and from reads, there is nothing to poll for."""
+        logger.info(f"Background thread started for {self.service_name}")
+        self.shutdown_event.wait()
+        logger.info("Background thread stopped")
+
+    def _execute_job(self, job: SpanMetricsJob) -> None:
+        """Compute and store the metrics of a span that has none yet."""
+        db_session = next(get_db_session())
+        try:
+            db_span = db_session.scalars(
+                select(DatabaseSpan).where(DatabaseSpan.id == job.span_id),
+            ).first()
+            if db_span is None:
+                logger.debug(f"Span {job.span_id} no longer exists, skipping metrics")
+                return
+
+            # a read in on_read mode or an earlier job may have stored them already
+            has_results = db_session.scalar(
+                select(DatabaseMetricResult.id)
+                .where(DatabaseMetricResult.span_id == job.span_id)
+                .limit(1),
+            )
+            if has_results is not None:
+                return
+
+            metrics_integration_service = MetricsIntegrationService(
+                db_session,
+                TasksMetricsRepository(db_session),
+                MetricRepository(db_session),
+            )
+            results = metrics_integration_service.compute_metrics_for_single_span(
+                Span._from_database_model(db_span),
+            )
+            if not results:
+                # nothing was stored, without this every read would queue it again
+                logger.debug(f"No metric results for span {job.span_id}")
+                self._settle_span(job.span_id)
+        finally:
+            db_session.close()
+
+
+def enqueue_span_metrics(span_ids: list[str], priority: int = 0) -> int:
+    """Queue metric computation for spans by database id. Returns the number queued."""
+    queue_service = get_span_metrics_queue_service()
+    if queue_service is None or not span_ids:
+        return 0
+
+    try:
+        enqueued = queue_service.enqueue_many(
+            [
+                SpanMetricsJob(span_id=span_id, priority=priority)
+                for span_id in span_ids
+            ],
+        )
+    except Exception as e:
+        logger.error(
+            f"Error enqueueing metric computation for {len(span_ids)} spans: {e}",
+            exc_info=True,
+        )
+        return 0
+
+    logger.debug(f"Enqueued metric computation for {enqueued} spans")
+    return enqueued
+
+
+def get_span_ids_awaiting_metrics(span_ids: list[str]) -> list[str]:
+    """Drop the spans that were computed recently without results from span_ids."""
+    queue_service = get_span_metrics_queue_service()
+    if queue_service is None or not span_ids:
+        return span_ids
+
+    settled_span_ids = queue_service.get_settled_span_ids(span_ids)
+    return [span_id for span_id in span_ids if span_id not in settled_span_ids]
+
+
+def enqueue_span_metrics_for_new_spans(
+    db_session: Session,
+    db_spans: list[DatabaseSpan],
+) -> None:
+    """Queue metric computation for the LLM spans of an ingest batch.
+
+    Only spans of tasks with enabled metrics are queued, and only in background mode.
+    """
+    queue_service = get_span_metrics_queue_service()
+    if queue_service is None:
+        return
+
+    llm_spans = [
+        span for span in db_spans if span.task_id and span.span_kind == SPAN_KIND_LLM
+    ]
+    if not llm_spans:
+        return
+
+    try:
+        task_ids_with_metrics = set(
+            db_session.scalars(
+                select(DatabaseTaskToMetrics.task_id)
+                .where(
+                    DatabaseTaskToMetrics.task_id.in_(
+                        {span.task_id for span in llm_spans},
+                    ),
+                    DatabaseTaskToMetrics.enabled == True,
+                )
+                .distinct(),
+            ).all(),
+        )
+        enqueue_span_metrics(
+            [span.id for span in llm_spans if span.task_id in task_ids_with_metrics],
+        )
+    except Exception as e:
+        logger.error(
+            f"Error enqueueing metric computation for {len(llm_spans)} spans: {e}",
+            exc_info=True,
+        )
+
+
+SPAN_METRICS_QUEUE_SERVICE: SpanMetricsQueueService | None = None
+
+
+def get_span_metrics_queue_service() -> SpanMetricsQueueService | None:
+    """Get the global span metrics queue service, None unless span metrics run in the background."""
+    return SPAN_METRICS_QUEUE_SERVICE
+
+
+def initialize_span_metrics_queue_service(num_workers: int = 4) -> None:
+    """Initialize and start the global span metrics queue service in background mode."""
+    global SPAN_METRICS_QUEUE_SERVICE
+    if SPAN_METRICS_QUEUE_SERVICE is not None or not background_span_metrics_enabled():
+        return
+
+    SPAN_METRICS_QUEUE_SERVICE = SpanMetricsQueueService(num_workers)
+    SPAN_METRICS_QUEUE_SERVICE.start()
+
+
+def shutdown_span_metrics_queue_service() -> None:
+    """Shutdown the global span metrics queue service."""
+    global SPAN_METRICS_QUEUE_SERVICE
+    if SPAN_METRICS_QUEUE_SERVICE is not None:
+        SPAN_METRICS_QUEUE_SERVICE.stop()
+        SPAN_METRICS_QUEUE_SERVICE = None
@@ -6,12 +6,10 @@ from various formats (OTEL, flat dict) into a standardized nested structure
 based on OpenInference semantic conventions.
 """
 
-import copy
+import functools
 import json
 import logging
-from typing import Any, cast
-
-from benedict import benedict
+from typing import Any, Callable, cast
 
 from services.trace.span_semantic_conventions import SpanSemanticConventions
 from utils.trace import value_dict_to_value
@@ -19,6 +17,20 @@ from utils.trace import value_dict_to_value
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=8192)
+def _is_json_key(key: str) -> bool:
+    """Whether the conventions list the key as JSON, cached as keys repeat across spans."""
+    return SpanSemanticConventions.should_deserialize_as_json(key)
+
+
+@functools.lru_cache(maxsize=8192)
+def _mime_type_key(key: str) -> str | None:
+    """Key of the mime type attribute describing a *.value attribute, if any."""
+    if ".value" not in key:
+        return None
+    return key.replace(".value", ".mime_type")
+
+
 class SpanNormalizationService:
     """
     Service for normalizing span data using OpenInference semantic conventions.
@@ -28,6 +40,10 @@ class SpanNormalizationService:
     - Deserializes JSON fields deterministically based on semantic conventions
     - Handles nested message structures
     - Validates span versions
+
+    Normalization never modifies or deep-copies the input span: the nested structure
+    is built alongside it, and parts of the input that need no changes (event lists,
+    array values, ...) are shared with the result.
     """
 
     def __init__(self) -> None:
@@ -41,7 +57,8 @@ class SpanNormalizationService:
         1. Converts OTEL format (list of key-value pairs) to flat dict
         2. Deserializes JSON fields based on semantic conventions
         3. Handles nested message.contents with special message_content nesting
-        4. Uses benedict to unflatten dot notation to nested structure
+        4. Nests dot notation keys, walking the sorted keys so shared prefixes are
+           only built once
         5. Converts numeric keys to lists
 
         Args:
@@ -50,8 +67,7 @@ class SpanNormalizationService:
         Returns:
             Normalized span with nested dictionary structure
         """
-        result = copy.deepcopy(span)
-        raw_attrs = result.get("attributes", {})
+        raw_attrs = span.get("attributes", {})
 
         # Convert OTEL format to flat dict first
         if isinstance(raw_attrs, list):
@@ -59,29 +75,78 @@ class SpanNormalizationService:
         else:
             attrs = raw_attrs
 
-        # Deserialize JSON fields based on semantic conventions
-        attrs = self._deserialize_json_attributes(attrs)
+        return self._normalize_flat_attributes(span, attrs)
 
-        # Handle message.contents with special nesting for message_content
-        attrs = self._handle_message_contents(attrs)
+    def normalize_spans_to_nested_dicts(
+        self,
+        spans: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Batch form of normalize_span_to_nested_dict."""
+        return [self.normalize_span_to_nested_dict(span) for span in spans]
 
-        result["attributes"] = attrs
+    def normalize_flat_span(self, span: dict[str, Any]) -> dict[str, Any]:
+        """
+        Normalize a span whose attributes are already a flat dict of typed values.
 
-        # Use benedict to unflatten dot notation to nested dicts for entire span structure
-        # Keypath separator is set to / to avoid conflicts with the dot notation.
-        b = benedict(result, keypath_separator="/")
-        # Unflatten the dot notation to nested dicts.
-        # Separator is set to . to match the dot notation.
-        b = b.unflatten(separator=".")
-        nested = self._convert_numeric_keys_to_lists(b)
+        The attribute values must already have gone through convert_attribute_value, as
+        the OTEL format conversion does in normalize_span_to_nested_dict.
 
-        # Deserialize any remaining JSON strings in nested structures (e.g., tool_call arguments)
-        try:
-            nested = self._deserialize_nested_json_fields(nested)
-        except Exception as e:
-            logger.error(f"Error deserializing nested JSON fields: {e}", exc_info=True)
+        Args:
+            span: Span dictionary with flat, typed attributes
+
+        Returns:
+            Normalized span with nested dictionary structure
+        """
+        return self._normalize_flat_attributes(span, span.get("attributes", {}))
+
+    def normalize_flat_spans(self, spans: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Batch form of normalize_flat_span."""
+        return [self.normalize_flat_span(span) for span in spans]
 
-        return cast(dict[str, Any], nested)
+    def convert_attribute_value(self, key: str, value: Any) -> Any:
+        """
+        Apply semantic convention type coercion to an already extracted attribute value.
+
+        Equivalent to the coercion applied to OTEL format attributes, for callers that
+        read attribute values straight from protobuf messages.
+
+        Args:
+            key: Attribute key
+            value: Attribute value in its native Python type
+
+        Returns:
+            Properly typed value
+        """
+        expected_type = self.conventions.get_expected_type(key)
+        # bool first, it is a subclass of int
+        if isinstance(value, bool):
+            return self._convert_bool_to_type(value, expected_type, key)
+        if isinstance(value, int):
+            return self._convert_int_to_type(value, expected_type, key)
+        if isinstance(value, float):
+            return self._convert_float_to_type(value, expected_type, key)
+        if isinstance(value, str):
+            return self._convert_string_to_type(value, expected_type, key)
+        return value
+
+    def _normalize_flat_attributes(
+        self,
+        span: dict[str, Any],
+        attrs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Shared tail of span normalization once attributes are a flat dict."""
+        result: dict[str, Any] = {}
+        for key, value in span.items():
+            # top level span fields are OTEL field names, only their dict values nest
+            result[key] = self._unflatten(value) if isinstance(value, dict) else value
+
+        # Deserialize JSON fields and message.contents while nesting the attributes
+        result["attributes"] = self._unflatten(
+            attrs,
+            lambda key, value: self._deserialize_attribute(key, value, attrs),
+        )
+
+        return cast(dict[str, Any], self._finalize_nested(result))
 
     def _convert_otel_to_flat_dict(
         self,
@@ -246,45 +311,48 @@ class SpanNormalizationService:
         # Bool or unknown - return as-is
         return value
 
-    def _deserialize_json_attributes(self, attrs: dict[str, Any]) -> dict[str, Any]:
+    def _deserialize_attribute(
+        self,
+        key: str,
+        value: Any,
+        attrs: dict[str, Any],
+    ) -> Any:
         """
-        Deserialize JSON attributes based on semantic conventions.
+        Deserialize a flat attribute value based on semantic conventions.
 
         This handles:
         - Non-OTEL format attributes (already flat dict, not from OTEL conversion)
         - Mime type-based JSON detection (input.value with application/json mime_type)
+        - message.contents, see _nest_message_contents
 
         Note: OTEL format attributes are already type-converted in _convert_otel_to_flat_dict
 
         Args:
-            attrs: Flat dictionary of attributes
+            key: Attribute key
+            value: Attribute value
+            attrs: Flat dictionary of all attributes of the span, for mime type lookups
 
         Returns:
-            Dictionary with JSON fields deserialized
+            Deserialized value
         """
-        result = {}
-
-        for key, value in attrs.items():
-            # Check if this should be JSON based on semantic conventions
-            mime_type_key = key.replace(".value", ".mime_type")
-            mime_type = attrs.get(mime_type_key)
-
-            should_deserialize = self.conventions.should_deserialize_as_json(
-                key,
-                mime_type,
-            )
-
-            if should_deserialize and isinstance(value, str):
-                try:
-                    result[key] = json.loads(value)
-                except (json.JSONDecodeError, TypeError):
-                    result[key] = value
-            else:
-                result[key] = value
+        if not isinstance(value, str):
+            return value
+
+        mime_type_key = _mime_type_key(key)
+        if _is_json_key(key) or (
+            mime_type_key is not None
+            and attrs.get(mime_type_key) == self.conventions.MIME_TYPE_JSON
+        ):
+            try:
+                return json.loads(value)
+            except (json.JSONDecodeError, TypeError):
+                pass
 
-        return result
+        if key.endswith("message.contents"):
+            return self._nest_message_contents(value)
+        return value
 
-    def _handle_message_contents(self, attrs: dict[str, Any]) -> dict[str, Any]:
+    def _nest_message_contents(self, value: str) -> Any:
         """
         Handle message.contents with special nesting for message_content.
 
@@ -292,63 +360,145 @@ class SpanNormalizationService:
         transformed into a nested structure with message_content objects.
 
         Args:
-            attrs: Dictionary of attributes
+            value: JSON encoded message.contents attribute
 
         Returns:
-            Dictionary with message.contents properly nested
+            List of contents with message_content properly nested, or the value
+            unchanged if it isn't valid JSON
         """
-        result = attrs.copy()
-
-        for k in list(result.keys()):
-            if k.endswith("message.contents") and isinstance(result[k], str):
-                try:
-                    contents_list = json.loads(result[k])
-                    nested_list = []
-                    for item in contents_list:
-                        new_item = {}
-                        msg_content = {}
-                        for ik, iv in item.items():
-                            if ik.startswith("message_content."):
-                                subkey = ik.split(".", 1)[1]
-                                msg_content[subkey] = iv
-                            else:
-                                new_item[ik] = iv
-                        if msg_content:
-                            new_item["message_content"] = msg_content
-                        nested_list.append(new_item)
-                    result[k] = nested_list
-                except (json.JSONDecodeError, TypeError):
-                    pass
-
-        return result
-
-    def _convert_numeric_keys_to_lists(
+        try:
+            contents_list = json.loads(value)
+            nested_list = []
+            for item in contents_list:
+                new_item = {}
+                msg_content = {}
+                for ik, iv in item.items():
+                    if ik.startswith("message_content."):
+                        subkey = ik.split(".", 1)[1]
+                        msg_content[subkey] = iv
+                    else:
+                        new_item[ik] = iv
+                if msg_content:
+                    new_item["message_content"] = msg_content
+                nested_list.append(new_item)
+            return nested_list
+        except (json.JSONDecodeError, TypeError):
+            return value
+
+    def _unflatten(
         self,
-        d: dict[str, Any] | list[Any],
-    ) -> list[Any] | dict[str, Any]:
+        flat: dict[str, Any],
+        prepare: Callable[[str, Any], Any] | None = None,
+    ) -> dict[str, Any]:
         """
-        Recursively convert dictionaries with numeric keys to lists.
+        Nest dot notation keys into dicts, recursing into dict values.
+
+        Keys are walked in sorted order, so keys sharing a prefix are adjacent and the
+        dicts along the previous key's path are reused instead of being looked up from
+        the root again. Sorting also puts a key before the keys extending it, so a
+        value set at a prefix (e.g. input.value) is replaced by, or merged into, the
+        dict its extensions (e.g. input.value.query) build.
 
         Args:
-            d: Dictionary or other data structure to process
+            flat: Dictionary with potentially dotted keys
+            prepare: Optional conversion applied to each value before nesting it
 
         Returns:
-            Converted data structure with numeric-keyed dicts converted to lists
+            New nested dictionary, the input is left untouched
         """
-        if isinstance(d, dict):
-            # Check if all keys are numeric strings
-            if all(k.isdigit() for k in d.keys()):
+        if not any("." in key for key in flat):
+            nested = {}
+            for key, value in flat.items():
+                if prepare is not None:
+                    value = prepare(key, value)
+                nested[key] = (
+                    self._unflatten(value) if isinstance(value, dict) else value
+                )
+            return nested
+
+        nested = {}
+        # path of dict keys to the previous key's parent, and the dicts along it
+        path: list[str] = []
+        nodes: list[dict[str, Any]] = [nested]
+        for key in sorted(flat):
+            value = flat[key]
+            if prepare is not None:
+                value = prepare(key, value)
+            if isinstance(value, dict):
+                value = self._unflatten(value)
+
+            *parents, leaf = key.split(".")
+            depth = 0
+            shared = min(len(path), len(parents))
+            while depth < shared and path[depth] == parents[depth]:
+                depth += 1
+            del path[depth:]
+            del nodes[depth + 1 :]
+
+            node = nodes[depth]
+            for part in parents[depth:]:
+                child = node.get(part)
+                if not isinstance(child, dict):
+                    child = {}
+                    node[part] = child
+                path.append(part)
+                nodes.append(child)
+                node = child
+            node[leaf] = value
+        return nested
+
+    def _finalize_nested(self, value: Any) -> Any:
+        """
+        Convert numeric-keyed dicts to lists and deserialize nested JSON fields.
+
+        Single recursive pass over the nested span. Dicts whose keys are all numeric
+        strings become lists ordered by index, and string values of keys the semantic
+        conventions list as JSON are deserialized (e.g. metadata inside a decoded
+        metadata object). Containers are only rebuilt when something inside them
+        changes, otherwise the value itself is returned.
+
+        Args:
+            value: Nested dictionary, list or leaf value
+
+        Returns:
+            Converted value
+        """
+        if isinstance(value, dict):
+            if all(k.isdigit() for k in value.keys()):
                 # Sort by numeric value and convert to list
-                return [
-                    self._convert_numeric_keys_to_lists(d[k])
-                    for k in sorted(d.keys(), key=int)
-                ]
-            else:
-                return {k: self._convert_numeric_keys_to_lists(v) for k, v in d.items()}
-        elif isinstance(d, list):
-            return [self._convert_numeric_keys_to_lists(x) for x in d]
-        else:
-            return d
+                return [self._finalize_nested(value[k]) for k in sorted(value, key=int)]
+
+            result = value
+            for key, item in value.items():
+                if isinstance(item, str):
+                    if not _is_json_key(key):
+                        continue
+                    try:
+                        # Deserialize and then recurse in case the result contains more nested structures
+                        new_item = self._deserialize_nested_json_fields(
+                            json.loads(item),
+                        )
+                    except (json.JSONDecodeError, TypeError):
+                        continue
+                else:
+                    new_item = self._finalize_nested(item)
+                if new_item is not item:
+                    if result is value:
+                        result = dict(value)
+                    result[key] = new_item
+            return result
+
+        if isinstance(value, list):
+            result_list = value
+            for index, item in enumerate(value):
+                new_item = self._finalize_nested(item)
+                if new_item is not item:
+                    if result_list is value:
+                        result_list = list(value)
+                    result_list[index] = new_item
+            return result_list
+
+        return value
 
     def _deserialize_nested_json_fields(self, obj: Any) -> Any:
         """
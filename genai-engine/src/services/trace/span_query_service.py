@@ -54,6 +54,7 @@ from utils.constants import (
     SPAN_KIND_LLM,
     UNMAPPED_TASK_ID,
 )
+from utils.keyset_pagination import keyset_after, keyset_order_by
 from utils.trace import validate_span_version
 
 logger = logging.getLogger(__name__)
@@ -96,10 +97,16 @@ class SpanQueryService:
         filters: TraceQuerySchema,
         pagination_parameters: PaginationParameters,
         sort_by: str = "start_time",
+        cursor: Optional[str] = None,
+        include_count: bool = True,
     ) -> Tuple[List[str], int]:
         """
         Single-query strategy that combines all filters and uses database pagination.
         Returns tuple of (trace_ids, total_count).
+
+        With a cursor, the page starts after the (start_time, trace_id) key of the
+        cursor instead of at the page offset. Without include_count, total_count is
+        -1 and the count query is skipped.
         """
         if not filters.task_ids:
             return [], 0
@@ -108,11 +115,16 @@ class SpanQueryService:
         base_query = self._build_unified_trace_query(filters)
 
         # Get total count before pagination
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total_count = self.db_session.execute(count_query).scalar()
+        total_count = -1
+        if include_count:
+            count_query = select(func.count()).select_from(base_query.subquery())
+            total_count = typing_cast(
+                int,
+                self.db_session.execute(count_query).scalar(),
+            )
 
-        if not total_count:
-            return [], 0
+            if not total_count:
+                return [], 0
 
         sort_column = TRACE_SORT_COLUMN_MAP.get(
             sort_by, DatabaseTraceMetadata.start_time
@@ -122,6 +134,8 @@ class SpanQueryService:
             pagination_parameters,
             sort_column=sort_column,
             nullable=sort_by in NULLABLE_SORT_COLUMNS,
+            tiebreak_column=DatabaseTraceMetadata.trace_id,
+            cursor=cursor,
         )
 
         # Execute with database-level pagination
@@ -537,21 +551,43 @@ class SpanQueryService:
             InstrumentedAttribute[Any] | ColumnElement[Any] | Label[Any] | str | None
         ) = None,
         nullable: bool = False,
+        tiebreak_column: InstrumentedAttribute[str] | None = None,
+        cursor: Optional[str] = None,
     ) -> Select[Tuple[Any]]:
         """Apply database-level sorting and pagination.
 
         When nullable=True, NULL values are pushed to the end of results
-        regardless of sort direction.
+        regardless of sort direction. tiebreak_column makes the order total, in
+        the same direction as sort_column; with a cursor, the page starts after
+        the cursor's (sort_column, tiebreak_column) key instead of at an offset.
         """
         if sort_column is None:
             sort_column = DatabaseTraceMetadata.start_time
 
-        if pagination_parameters.sort == PaginationSortMethod.DESCENDING:
+        descending = pagination_parameters.sort == PaginationSortMethod.DESCENDING
+        if descending:
             order_expr = desc(sort_column)
             query = query.order_by(nullslast(order_expr) if nullable else order_expr)
         else:
             order_expr = asc(sort_column)
             query = query.order_by(nullslast(order_expr) if nullable else order_expr)
+        if tiebreak_column is not None:
+            query = query.order_by(*keyset_order_by([tiebreak_column], descending))
+
+        if cursor is not None:
+            # cursors hold a timestamp sort key
+            if tiebreak_column is None or getattr(sort_column, "key", None) != (
+                "start_time"
+            ):
+                raise ValueError("Cursor pagination requires sorting by start_time")
+            query = query.where(
+                keyset_after(
+                    [typing_cast(ColumnElement[Any], sort_column), tiebreak_column],
+                    cursor,
+                    descending,
+                ),
+            )
+            return query.limit(pagination_parameters.page_size)
 
         offset = pagination_parameters.page * pagination_parameters.page_size
         query = query.offset(offset).limit(pagination_parameters.page_size)
@@ -686,11 +722,16 @@ class SpanQueryService:
         filters: TraceQuerySchema,
         pagination_parameters: PaginationParameters,
         sort_by: str = "start_time",
+        cursor: Optional[str] = None,
+        include_count: bool = True,
     ) -> tuple[list[Span], int]:
         """
         Span-based filtering that finds individual spans matching criteria.
         Returns tuple of (spans, total_count).
 
+        Cursors and include_count work as in get_paginated_trace_ids_with_filters,
+        keyed on (start_time, id).
+
         This implements the span-first query pattern from the TDD:
         - Base Query: SELECT DatabaseSpan WHERE task_id IN (...)
         - Trace Filters: JOIN with DatabaseTraceMetadata when needed
@@ -716,11 +757,16 @@ class SpanQueryService:
         base_query = self._build_unified_span_query(filters)
 
         # Get total count before pagination
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total_count = self.db_session.execute(count_query).scalar()
+        total_count = -1
+        if include_count:
+            count_query = select(func.count()).select_from(base_query.subquery())
+            total_count = typing_cast(
+                int,
+                self.db_session.execute(count_query).scalar(),
+            )
 
-        if not total_count:
-            return [], 0
+            if not total_count:
+                return [], 0
 
         sort_column = SPAN_SORT_COLUMN_MAP.get(sort_by, DatabaseSpan.start_time)
         query = self._apply_sorting_and_pagination(
@@ -728,6 +774,8 @@ class SpanQueryService:
             pagination_parameters,
             sort_column=sort_column,
             nullable=sort_by in NULLABLE_SORT_COLUMNS,
+            tiebreak_column=DatabaseSpan.id,
+            cursor=cursor,
         )
 
         # Execute with database-level pagination
@@ -809,10 +857,14 @@ class SpanQueryService:
         # Direct trace metadata filters
         if filters.trace_ids:
             conditions.append(DatabaseTraceMetadata.trace_id.in_(filters.trace_ids))
+        # Spans lie within their trace's time range, so the same bounds hold for
+        # spans.start_time and let a partitioned spans table be pruned.
         if filters.start_time:
             conditions.append(DatabaseTraceMetadata.start_time >= filters.start_time)
+            conditions.append(DatabaseSpan.start_time >= filters.start_time)
         if filters.end_time:
             conditions.append(DatabaseTraceMetadata.end_time <= filters.end_time)
+            conditions.append(DatabaseSpan.start_time <= filters.end_time)
         if filters.user_ids:
             conditions.append(
                 or_(
@@ -1135,8 +1187,14 @@ class SpanQueryService:
         trace_ids: Optional[list[str]] = None,
         session_ids: Optional[list[str]] = None,
         include_experiment_sessions: Optional[bool] = False,
+        cursor: Optional[str] = None,
+        include_count: bool = True,
     ) -> tuple[int, list[SessionMetadata]]:
-        """Perform session-level aggregations with filtering."""
+        """Perform session-level aggregations with filtering.
+
+        Sessions are ordered by (earliest_start_time, session_id, task_id, user_id),
+        which a cursor continues after. Without include_count, the count is -1.
+        """
         if not task_ids:
             return 0, []
 
@@ -1227,10 +1285,23 @@ class SpanQueryService:
             DatabaseTraceMetadata.user_id,
         )
 
-        # Apply pagination with bite-sized functions
-        query = self._apply_sorting(query, pagination_parameters, "earliest_start_time")
-        total_count = self._get_count_from_query(query)
-        query = self._apply_pagination(query, pagination_parameters)
+        total_count = -1
+        if include_count:
+            total_count = self._get_count_from_query(query)
+
+        descending = pagination_parameters.sort == PaginationSortMethod.DESCENDING
+        session_key = [
+            func.min(DatabaseTraceMetadata.start_time),
+            DatabaseTraceMetadata.session_id,
+            DatabaseTraceMetadata.task_id,
+            func.coalesce(DatabaseTraceMetadata.user_id, ""),
+        ]
+        query = query.order_by(*keyset_order_by(session_key, descending))
+        if cursor is not None:
+            query = query.having(keyset_after(session_key, cursor, descending))
+            query = query.limit(pagination_parameters.page_size)
+        else:
+            query = self._apply_pagination(query, pagination_parameters)
         results = self.db_session.execute(query).all()
 
         # Convert to SessionMetadata objects
@@ -0,0 +1,282 @@
+"""Asynchronous trace ingestion backed by the local write-ahead queue.
+
+With GENAI_ENGINE_TRACE_INGESTION_MODE=async, POST /api/v1/traces only validates the
+OTLP payload and appends it to a TraceIngestWAL, answering 202 Accepted as soon as
+the payload is fsynced (or 429 with Retry-After when the queue is over its byte
+budget). This service drains the queue in the background: every sealed segment is
+claimed by one worker, whose payloads are ingested in a single transaction through
+the same TraceIngestionService path as synchronous ingestion, followed by the
+continuous eval enqueue for the new root spans.
+
+Delivery is at-least-once: a segment is deleted only after its spans are committed,
+so a crash between the commit and the delete replays that segment.
+"""
+
+import logging
+import time
+from typing import Optional
+
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+    ExportTraceServiceRequest,
+)
+from sqlalchemy.orm import Session
+
+from dependencies import db_session_context
+from repositories.continuous_evals_repository import ContinuousEvalsRepository
+from repositories.metrics_repository import MetricRepository
+from repositories.span_repository import SpanRepository
+from repositories.tasks_metrics_repository import TasksMetricsRepository
+from services.base_queue_service import BaseQueueJob, BaseQueueService
+from services.trace.span_metrics_queue_service import (
+    enqueue_span_metrics_for_new_spans,
+)
+from services.trace.trace_ingest_wal import ClaimedSegment, TraceIngestWAL
+from utils import constants, metric_counters
+from utils.utils import get_env_var
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 0.25
+RECOVERY_INTERVAL_SECONDS = 30
+# attempts before a segment that keeps failing as a whole is moved to the dead letters
+MAX_SEGMENT_ATTEMPTS = 5
+
+
+def async_trace_ingestion_enabled() -> bool:
+    return (
+        str(
+            get_env_var(
+                constants.GENAI_ENGINE_TRACE_INGESTION_MODE_ENV_VAR,
+                default=constants.DEFAULT_TRACE_INGESTION_MODE,
+            ),
+        ).lower()
+        == "async"
+    )
+
+
+def count_spans(trace_data: bytes) -> int:
+    """Validates an OTLP payload, raising DecodeError if malformed, and counts its spans."""
+    trace_request = ExportTraceServiceRequest()
+    trace_request.ParseFromString(trace_data)
+    return sum(
+        len(scope_span.spans)
+        for resource_span in trace_request.resource_spans
+        for scope_span in resource_span.scope_spans
+    )
+
+
+class TraceIngestJob(BaseQueueJob):
+    """Ingests the payloads of one claimed queue segment."""
+
+    def __init__(self, segment: ClaimedSegment):
+        super().__init__(delay_seconds=0)
+        self.segment = segment
+
+
+class TraceIngestQueueService(BaseQueueService[TraceIngestJob]):
+    """Drains the trace ingest write-ahead queue into the database."""
+
+    job_model = TraceIngestJob
+    service_name = "trace_ingest_queue_service"
+    background_thread_name = "trace-ingest-background"
+
+    def __init__(self, wal: TraceIngestWAL, num_workers: int = 2):
+        super().__init__(num_workers)
+        self.wal = wal
+        self.segment_attempts: dict[str, int] = {}
+
+    def submit(self, trace_data: bytes) -> int:
+        """Validates and durably queues an OTLP payload, returning its span count.
+
+        Raises DecodeError for malformed payloads and TraceIngestQueueFullError when
+        the queue is over its byte budget.
+        """
+        span_count = count_spans(trace_data)
+        if span_count:
+            self.wal.append(trace_data)
+        return span_count
+
+    def stop(self, timeout: int = 30) -> None:
+        super().stop(timeout)
+        # seal what's been accepted so far so the next process ingests it
+        self.wal.close()
+
+    def _get_job_key(self, job: TraceIngestJob) -> str:
+        return job.segment.name
+
+    def _background_loop(self) -> None:
+        logger.info(f"Background thread started for {self.service_name}")
+        last_recovery = time.monotonic()
+
+        while not self.shutdown_event.wait(POLL_INTERVAL_SECONDS):
+            try:
+                self.wal.seal_expired()
+                if time.monotonic() - last_recovery >= RECOVERY_INTERVAL_SECONDS:
+                    self.wal.recover()
+                    last_recovery = time.monotonic()
+                self.wal.refresh_stats()
+
+                with self.active_jobs_lock:
+                    idle_workers = self.num_workers - len(self.active_jobs)
+                for segment in self.wal.claim(idle_workers):
+                    self.enqueue(TraceIngestJob(segment))
+            except Exception as e:
+                logger.error(f"Error in background loop: {e}", exc_info=True)
+
+        logger.info("Background thread stopped")
+
+    def _execute_job(self, job: TraceIngestJob) -> int:
+        """Ingests a segment, returning the number of payloads ingested."""
+        segment = job.segment
+        try:
+            payloads = segment.read()
+            with db_session_context() as db_session:
+                failed_payloads = self._ingest_payloads(db_session, payloads)
+        except Exception as e:
+            attempts = self.segment_attempts.get(segment.name, 0) + 1
+            if attempts >= MAX_SEGMENT_ATTEMPTS:
+                self.segment_attempts.pop(segment.name, None)
+                failed_name = self.wal.dead_letter(segment, segment.read())
+                logger.error(
+                    f"Giving up on trace ingest queue segment {segment.name} after "
+                    f"{attempts} attempts, payloads kept in {failed_name}: {e}",
+                    exc_info=True,
+                )
+            else:
+                self.segment_attempts[segment.name] = attempts
+                self.wal.release(segment)
+                logger.warning(
+                    f"Failed to ingest trace ingest queue segment {segment.name} "
+                    f"(attempt {attempts}), it will be retried: {e}",
+                )
+            return 0
+
+        self.segment_attempts.pop(segment.name, None)
+        if failed_payloads:
+            failed_name = self.wal.dead_letter(segment, failed_payloads)
+            logger.error(
+                f"{len(failed_payloads)} of {len(payloads)} trace payloads in "
+                f"{segment.name} could not be ingested, kept in {failed_name}",
+            )
+        else:
+            self.wal.complete(segment)
+        return len(payloads) - len(failed_payloads)
+
+    def _ingest_payloads(
+        self,
+        db_session: Session,
+        payloads: list[bytes],
+    ) -> list[bytes]:
+        """Ingests payloads in one transaction, falling back to one per payload.
+
+        Returns the payloads that failed on their own. Raises if every payload failed,
+        which usually means the database is unavailable rather than bad payloads.
+        """
+        if not payloads:
+            return []
+        try:
+            # serialized protobuf messages concatenate into their merge, so the whole
+            # segment parses as a single ExportTraceServiceRequest
+            self._ingest(db_session, b"".join(payloads))
+            return []
+        except Exception as e:
+            db_session.rollback()
+            if len(payloads) == 1:
+                raise
+            logger.warning(
+                f"Batched ingest of {len(payloads)} trace payloads failed, "
+                f"retrying them one by one: {e}",
+            )
+
+        failed_payloads = []
+        last_error: Exception | None = None
+        for payload in payloads:
+            try:
+                self._ingest(db_session, payload)
+            except Exception as e:
+                db_session.rollback()
+                failed_payloads.append(payload)
+                last_error = e
+        if last_error is not None and len(failed_payloads) == len(payloads):
+            raise last_error
+        return failed_payloads
+
+    def _ingest(self, db_session: Session, trace_data: bytes) -> None:
+        span_repo = SpanRepository(
+            db_session,
+            TasksMetricsRepository(db_session),
+            MetricRepository(db_session),
+        )
+        db_spans, _ = span_repo.create_traces(trace_data)
+        ContinuousEvalsRepository(db_session).enqueue_continuous_evals_for_root_spans(
+            db_spans,
+        )
+        enqueue_span_metrics_for_new_spans(db_session, db_spans)
+
+
+TRACE_INGEST_QUEUE_SERVICE: TraceIngestQueueService | None = None
+
+
+def get_trace_ingest_queue_service() -> TraceIngestQueueService | None:
+    """Get the global trace ingest queue service, None unless ingestion is async."""
+    return TRACE_INGEST_QUEUE_SERVICE
+
+
+def initialize_trace_ingest_queue_service(
+    num_workers: Optional[int] = None,
+) -> None:
+    """Initialize and start the global trace ingest queue service if ingestion is async."""
+    global TRACE_INGEST_QUEUE_SERVICE
+    if TRACE_INGEST_QUEUE_SERVICE is not None or not async_trace_ingestion_enabled():
+        return
+
+    # accepted payloads only live in the queue directory, a temp dir default could be
+    # wiped by a restart (tmpfs, container filesystem) and lose them
+    directory = get_env_var(
+        constants.GENAI_ENGINE_TRACE_INGEST_QUEUE_DIR_ENV_VAR,
+        none_on_missing=True,
+    )
+    if not directory:
+        raise ValueError(
+            f"{constants.GENAI_ENGINE_TRACE_INGEST_QUEUE_DIR_ENV_VAR} must be set to a "
+            "persistent local directory when trace ingestion is async",
+        )
+
+    wal = TraceIngestWAL(
+        directory=directory,
+        max_pending_bytes=int(
+            get_env_var(
+                constants.GENAI_ENGINE_TRACE_INGEST_QUEUE_MAX_BYTES_ENV_VAR,
+                default=str(constants.DEFAULT_TRACE_INGEST_QUEUE_MAX_BYTES),
+            ),
+        ),
+        retry_after_seconds=int(
+            get_env_var(
+                constants.GENAI_ENGINE_TRACE_INGEST_RETRY_AFTER_SECONDS_ENV_VAR,
+                default=str(constants.DEFAULT_TRACE_INGEST_RETRY_AFTER_SECONDS),
+            ),
+        ),
+    )
+    if num_workers is None:
+        num_workers = int(
+            get_env_var(
+                constants.GENAI_ENGINE_TRACE_INGEST_WORKERS_ENV_VAR,
+                default=str(constants.DEFAULT_TRACE_INGEST_WORKERS),
+            ),
+        )
+    TRACE_INGEST_QUEUE_SERVICE = TraceIngestQueueService(wal, num_workers)
+    TRACE_INGEST_QUEUE_SERVICE.start()
+    metric_counters.register_observable_gauge(
+        constants.NEWRELIC_CUSTOM_METRIC_TRACE_INGEST_QUEUE_DEPTH,
+        wal.depth,
+        unit="payloads",
+        description="Number of trace payloads waiting in the trace ingest queue.",
+    )
+
+
+def shutdown_trace_ingest_queue_service() -> None:
+    """Shutdown the global trace ingest queue service."""
+    global TRACE_INGEST_QUEUE_SERVICE
+    if TRACE_INGEST_QUEUE_SERVICE is not None:
+        TRACE_INGEST_QUEUE_SERVICE.stop()
+        TRACE_INGEST_QUEUE_SERVICE = None
@@ -0,0 +1,363 @@
+"""Durable local write-ahead queue for raw OTLP trace payloads.
+
+Payloads are appended to segment files in a local directory as length-prefixed
+records and fsynced before the append returns. Each process writes to its own open
+segment, which is sealed once it holds enough records or bytes or gets old enough.
+Sealed segments are claimed by ingest workers, which delete them once their payloads
+are committed to the database.
+
+Segment states are encoded in the file name:
+
+- ``<base>.open``: being appended to by its writer
+- ``<base>-<records>.seg``: sealed, waiting to be claimed
+- ``<base>-<records>.seg.claimed``: being ingested
+- ``<base>-<records>.seg.failed``: payloads that could not be ingested (dead letters)
+
+Open and claimed segments are held under an exclusive ``flock`` by the owning
+process. The kernel releases the lock when that process dies, so any other process
+can recover the segment by taking the lock and sealing / unclaiming it. The directory
+must be on a local filesystem shared only by the processes of one host.
+"""
+
+import fcntl
+import logging
+import os
+import struct
+import threading
+import time
+from typing import BinaryIO
+
+logger = logging.getLogger(__name__)
+
+OPEN_SUFFIX = ".open"
+SEALED_SUFFIX = ".seg"
+CLAIMED_SUFFIX = ".seg.claimed"
+FAILED_SUFFIX = ".seg.failed"
+
+RECORD_HEADER = struct.Struct(">I")
+
+DEFAULT_MAX_SEGMENT_RECORDS = 500
+DEFAULT_MAX_SEGMENT_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_SEGMENT_AGE_SECONDS = 1.0
+
+
+class TraceIngestQueueFullError(Exception):
+    """Raised when the queue is over its byte budget and can't accept more payloads."""
+
+    def __init__(self, pending_bytes: int, retry_after_seconds: int) -> None:
+        super().__init__(
+            f"Trace ingest queue is full ({pending_bytes} bytes pending)",
+        )
+        self.pending_bytes = pending_bytes
+        self.retry_after_seconds = retry_after_seconds
+
+
+def _try_lock(file: BinaryIO) -> bool:
+    try:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def _is_at_path(file: BinaryIO, path: str) -> bool:
+    """True if path still names the open file, i.e. nobody renamed or replaced it."""
+    try:
+        return os.stat(path).st_ino == os.fstat(file.fileno()).st_ino
+    except FileNotFoundError:
+        return False
+
+
+def _read_records(file: BinaryIO) -> list[bytes]:
+    """Reads every complete record of a segment, ignoring a torn trailing write."""
+    file.seek(0)
+    data = file.read()
+    records = []
+    offset = 0
+    while offset + RECORD_HEADER.size <= len(data):
+        (length,) = RECORD_HEADER.unpack_from(data, offset)
+        start = offset + RECORD_HEADER.size
+        if start + length > len(data):
+            break
+        records.append(data[start : start + length])
+        offset = start + length
+    return records
+
+
+def _record_count(file_name: str) -> int:
+    """Record count encoded in a sealed / claimed / failed segment file name."""
+    try:
+        return int(file_name.split(".", 1)[0].rsplit("-", 1)[1])
+    except (IndexError, ValueError):
+        return 0
+
+
+class ClaimedSegment:
+    """A sealed segment claimed by this process, locked until completed or released."""
+
+    def __init__(self, directory: str, name: str, file: BinaryIO) -> None:
+        self.directory = directory
+        self.name = name
+        self.file = file
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, self.name)
+
+    @property
+    def sealed_name(self) -> str:
+        return self.name.removesuffix(CLAIMED_SUFFIX) + SEALED_SUFFIX
+
+    @property
+    def record_count(self) -> int:
+        return _record_count(self.name)
+
+    def read(self) -> list[bytes]:
+        return _read_records(self.file)
+
+
+class TraceIngestWAL:
+    """Segmented, fsynced, multi-process safe queue of raw trace payloads."""
+
+    def __init__(
+        self,
+        directory: str,
+        max_pending_bytes: int,
+        retry_after_seconds: int = 5,
+        max_segment_records: int = DEFAULT_MAX_SEGMENT_RECORDS,
+        max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+        max_segment_age_seconds: float = DEFAULT_MAX_SEGMENT_AGE_SECONDS,
+    ) -> None:
+        self.directory = directory
+        self.max_pending_bytes = max_pending_bytes
+        self.retry_after_seconds = retry_after_seconds
+        self.max_segment_records = max_segment_records
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age_seconds = max_segment_age_seconds
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._open_file: BinaryIO | None = None
+        self._open_name: str | None = None
+        self._open_records = 0
+        self._open_bytes = 0
+        self._opened_at = 0.0
+        self._claimed: dict[str, ClaimedSegment] = {}
+
+        # totals over every other segment in the directory, see refresh_stats
+        self._pending_bytes = 0
+        self._pending_records = 0
+
+        self.recover()
+        self.refresh_stats()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def append(self, payload: bytes) -> None:
+        """Durably appends a payload, raising TraceIngestQueueFullError over budget."""
+        record = RECORD_HEADER.pack(len(payload)) + payload
+        with self._lock:
+            pending_bytes = self._pending_bytes + self._open_bytes
+            # a payload larger than the whole budget is still accepted into an empty queue
+            if (
+                pending_bytes > 0
+                and pending_bytes + len(record) > self.max_pending_bytes
+            ):
+                raise TraceIngestQueueFullError(pending_bytes, self.retry_after_seconds)
+
+            if self._open_file is None:
+                self._open_segment_locked()
+            assert self._open_file is not None
+            self._open_file.write(record)
+            self._open_file.flush()
+            os.fsync(self._open_file.fileno())
+            self._open_records += 1
+            self._open_bytes += len(record)
+
+            if (
+                self._open_records >= self.max_segment_records
+                or self._open_bytes >= self.max_segment_bytes
+            ):
+                self._seal_locked()
+
+    def _open_segment_locked(self) -> None:
+        while True:
+            self._sequence += 1
+            name = (
+                f"{time.time_ns():020d}-{os.getpid()}-{self._sequence:06d}{OPEN_SUFFIX}"
+            )
+            path = self._path(name)
+            file = open(path, "ab")
+            # another process's recover() can take the new file for a dead writer's
+            # segment before we lock it, leave that one to it and start a fresh one
+            if _try_lock(file) and _is_at_path(file, path):
+                break
+            file.close()
+        self._open_file = file
+        self._open_name = name
+        self._open_records = 0
+        self._open_bytes = 0
+        self._opened_at = time.monotonic()
+
+    def _seal_locked(self) -> None:
+        if self._open_file is None or self._open_name is None:
+            return
+        base = self._open_name.removesuffix(OPEN_SUFFIX)
+        os.rename(
+            self._path(self._open_name),
+            self._path(f"{base}-{self._open_records}{SEALED_SUFFIX}"),
+        )
+        # closing the file releases the lock, after the rename so nobody recovers it
+        self._open_file.close()
+        self._pending_bytes += self._open_bytes
+        self._pending_records += self._open_records
+        self._open_file = None
+        self._open_name = None
+        self._open_records = 0
+        self._open_bytes = 0
+
+    def seal_expired(self) -> None:
+        """Seals this process's open segment if it has been open for too long."""
+        with self._lock:
+            if (
+                self._open_file is not None
+                and time.monotonic() - self._opened_at >= self.max_segment_age_seconds
+            ):
+                self._seal_locked()
+
+    def claim(self, limit: int) -> list[ClaimedSegment]:
+        """Claims up to limit sealed segments, oldest first."""
+        if limit <= 0:
+            return []
+        claimed = []
+        for name in sorted(os.listdir(self.directory)):
+            if len(claimed) >= limit:
+                break
+            if not name.endswith(SEALED_SUFFIX):
+                continue
+            try:
+                file = open(self._path(name), "rb")
+            except FileNotFoundError:
+                continue
+            claimed_name = name.removesuffix(SEALED_SUFFIX) + CLAIMED_SUFFIX
+            # lock before renaming so recover() can never see the claim unlocked
+            try:
+                if not _try_lock(file):
+                    file.close()
+                    continue
+                os.rename(self._path(name), self._path(claimed_name))
+            except FileNotFoundError:
+                # another process claimed it first
+                file.close()
+                continue
+            segment = ClaimedSegment(self.directory, claimed_name, file)
+            with self._lock:
+                self._claimed[claimed_name] = segment
+            claimed.append(segment)
+        return claimed
+
+    def complete(self, segment: ClaimedSegment) -> None:
+        """Deletes a segment whose payloads have all been ingested."""
+        size = os.fstat(segment.file.fileno()).st_size
+        os.remove(segment.path)
+        with self._lock:
+            self._pending_bytes = max(self._pending_bytes - size, 0)
+            self._pending_records = max(
+                self._pending_records - segment.record_count,
+                0,
+            )
+        self._forget(segment)
+
+    def release(self, segment: ClaimedSegment) -> None:
+        """Returns a claimed segment to the queue so it is retried."""
+        os.rename(segment.path, self._path(segment.sealed_name))
+        self._forget(segment)
+
+    def dead_letter(self, segment: ClaimedSegment, payloads: list[bytes]) -> str:
+        """Writes payloads that can't be ingested next to the queue and completes segment."""
+        base = segment.name.removesuffix(CLAIMED_SUFFIX).rsplit("-", 1)[0]
+        failed_name = f"{base}-{len(payloads)}{FAILED_SUFFIX}"
+        with open(self._path(failed_name), "wb") as file:
+            for payload in payloads:
+                file.write(RECORD_HEADER.pack(len(payload)) + payload)
+            file.flush()
+            os.fsync(file.fileno())
+        self.complete(segment)
+        return failed_name
+
+    def _forget(self, segment: ClaimedSegment) -> None:
+        with self._lock:
+            self._claimed.pop(segment.name, None)
+        segment.file.close()
+
+    def recover(self) -> int:
+        """Returns the open and claimed segments of dead processes to the queue."""
+        recovered = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(OPEN_SUFFIX):
+                if name == self._open_name:
+                    continue
+                target = None
+            elif name.endswith(CLAIMED_SUFFIX):
+                if name in self._claimed:
+                    continue
+                target = name.removesuffix(CLAIMED_SUFFIX) + SEALED_SUFFIX
+            else:
+                continue
+            try:
+                with open(self._path(name), "rb") as file:
+                    if not _try_lock(file):
+                        # the owning process is still alive
+                        continue
+                    if target is None:
+                        records = len(_read_records(file))
+                        target = (
+                            f"{name.removesuffix(OPEN_SUFFIX)}-{records}{SEALED_SUFFIX}"
+                        )
+                    os.rename(self._path(name), self._path(target))
+            except FileNotFoundError:
+                continue
+            recovered += 1
+            logger.info(f"Recovered trace ingest queue segment {name}")
+        return recovered
+
+    def refresh_stats(self) -> None:
+        """Recomputes the pending bytes / records of every segment but our open one."""
+        pending_bytes = 0
+        pending_records = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name == self._open_name or entry.name.endswith(FAILED_SUFFIX):
+                    continue
+                try:
+                    pending_bytes += entry.stat().st_size
+                except FileNotFoundError:
+                    continue
+                # other processes' open segments count towards bytes only
+                if not entry.name.endswith(OPEN_SUFFIX):
+                    pending_records += _record_count(entry.name)
+        with self._lock:
+            self._pending_bytes = pending_bytes
+            self._pending_records = pending_records
+
+    def depth(self) -> int:
+        """Approximate number of payloads waiting to be ingested."""
+        with self._lock:
+            return self._pending_records + self._open_records
+
+    def pending_bytes(self) -> int:
+        with self._lock:
+            return self._pending_bytes + self._open_bytes
+
+    def close(self) -> None:
+        """Seals the open segment and returns unprocessed claimed segments to the queue."""
+        with self._lock:
+            self._seal_locked()
+            claimed = list(self._claimed.values())
+        for segment in claimed:
+            try:
+                self.release(segment)
+            except FileNotFoundError:
+                self._forget(segment)
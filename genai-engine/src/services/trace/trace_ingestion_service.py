@@ -9,6 +9,7 @@ from openinference.semconv.trace import SpanAttributes
 from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
     ExportTraceServiceRequest,
 )
+from opentelemetry.proto.trace.v1.trace_pb2 import Span, Status
 from sqlalchemy import ColumnElement, func, select
 from sqlalchemy.dialects.postgresql import Insert as PGInsertType
 from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -21,11 +22,16 @@ from sqlalchemy.orm import InstrumentedAttribute, Session
 from db_models import DatabaseSpan, DatabaseTask, DatabaseTraceMetadata
 from dependencies import get_task_repository
 from repositories.configuration_repository import ConfigurationRepository
-from repositories.organizations_repository import lookup_org_id
 from repositories.resource_metadata_repository import ResourceMetadataRepository
 from repositories.service_name_mapping_repository import (
     ServiceNameMappingRepository,
 )
+from repositories.trace_rollup_repository import (
+    refresh_trace_rollups,
+    trace_rollup_keys,
+)
+from services.trace.otlp_span_converter import OtlpSpanConverter
+from services.trace.span_copy_writer import SpanCopyWriter, use_span_copy_writer
 from services.trace.span_normalization_service import SpanNormalizationService
 from utils import trace as trace_utils
 from utils.constants import (
@@ -39,6 +45,8 @@ from utils.constants import (
     USER_ID_KEY,
 )
 from utils.gcp import parse_gcp_resource_path
+from utils.ingestion_lookup_cache import INGESTION_LOOKUP_CACHE, TaskLookup
+from utils.materialized_attributes import span_model_name
 from utils.token_count import safe_add
 
 logger = logging.getLogger(__name__)
@@ -80,9 +88,10 @@ class TraceIngestionService:
     def __init__(self, db_session: Session):
         self.db_session = db_session
         self.span_normalizer = SpanNormalizationService()
+        self.span_converter = OtlpSpanConverter(self.span_normalizer)
 
         config_repo = ConfigurationRepository(db_session)
-        app_config = config_repo.get_configurations()
+        app_config = config_repo.get_configurations_cached()
         self.task_repo = get_task_repository(db_session, app_config)
 
     def process_trace_data(
@@ -91,9 +100,9 @@ class TraceIngestionService:
         commit: bool = True,
     ) -> tuple[list[DatabaseSpan], tuple[int, int, int, list[str]]]:
         """Process trace data from protobuf format and return statistics."""
-        json_traces = self._grpc_trace_to_dict(trace_data)
+        trace_request = self._parse_trace_request(trace_data)
 
-        spans_data, stats = self._extract_and_process_spans(json_traces)
+        spans_data, stats = self._extract_and_process_proto_spans(trace_request)
 
         if spans_data:
             self._store_spans(spans_data, commit=commit)
@@ -101,15 +110,76 @@ class TraceIngestionService:
 
         return spans_data, stats
 
-    def _grpc_trace_to_dict(self, trace_data: bytes) -> dict[str, Any]:
-        """Convert gRPC trace data to dictionary format."""
+    def _parse_trace_request(self, trace_data: bytes) -> ExportTraceServiceRequest:
+        """Parse gRPC trace data into an ExportTraceServiceRequest."""
         try:
             trace_request = ExportTraceServiceRequest()
             trace_request.ParseFromString(trace_data)
-            return cast(dict[str, Any], MessageToDict(trace_request))
+            return trace_request
         except DecodeError as e:
             raise DecodeError("Failed to decode protobuf message.") from e
 
+    def _grpc_trace_to_dict(self, trace_data: bytes) -> dict[str, Any]:
+        """Convert gRPC trace data to dictionary format."""
+        return cast(
+            dict[str, Any],
+            MessageToDict(self._parse_trace_request(trace_data)),
+        )
+
+    def _extract_and_process_proto_spans(
+        self,
+        trace_request: ExportTraceServiceRequest,
+    ) -> tuple[list[DatabaseSpan], tuple[int, int, int, list[str]]]:
+        """Extract and process spans straight from the protobuf trace request.
+
+        Produces the same spans as _extract_and_process_spans on the MessageToDict
+        output, without the dict round trip.
+        """
+        total_spans = 0
+        accepted_spans = 0
+        rejected_spans = 0
+        rejected_reasons = []
+        spans_data = []
+
+        for resource_span in trace_request.resource_spans:
+            resource_attributes = self.span_converter.resource_attributes(
+                resource_span.resource,
+            )
+            resource_task_id = resource_attributes.get(TASK_ID_KEY)
+            resolved_task_id, resource_id, resolved_org_id = self._resolve_resource(
+                str(resource_task_id) if resource_task_id is not None else None,
+                resource_attributes,
+            )
+
+            for scope_span in resource_span.scope_spans:
+                for span in scope_span.spans:
+                    total_spans += 1
+
+                    try:
+                        processed_span = self._process_proto_span(
+                            span,
+                            resolved_task_id,
+                            resource_id,
+                            resolved_org_id,
+                        )
+                        spans_data.append(processed_span)
+                        accepted_spans += 1
+                    except Exception as e:
+                        rejected_spans += 1
+                        error_msg = f"Invalid span data format: {str(e)}"
+                        rejected_reasons.append(error_msg)
+                        logger.error(
+                            f"Rejected span due to error: {str(e)}\nSpan name: {span.name}",
+                            exc_info=True,
+                        )
+
+        return spans_data, (
+            total_spans,
+            accepted_spans,
+            rejected_spans,
+            rejected_reasons,
+        )
+
     def _extract_and_process_spans(
         self,
         json_traces: dict[str, Any],
@@ -129,42 +199,9 @@ class TraceIngestionService:
 
             # Extract all resource attributes
             resource_attributes = self._extract_all_resource_attributes(resource_span)
-            service_name = resource_attributes.get(SERVICE_NAME_KEY)
-
-            # Create or retrieve resource metadata record
-            resource_id = None
-            if resource_attributes:
-                try:
-                    resource_id = self._create_or_get_resource_metadata(
-                        resource_attributes,
-                        service_name,
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to create resource metadata: {e}",
-                        exc_info=True,
-                    )
-
-            # Resolve task_id using priority hierarchy
-            # This ensures all traces have a task_id (no NULL values)
-            resolved_task_id = self._resolve_task_id(
-                explicit_task_id=resource_task_id,
-                service_name=service_name,
-                resource_attributes=resource_attributes,
-            )
-
-            logger.debug(f"Resolved task_id: {resolved_task_id}")
-
-            # Resolve the org_id for this batch from the owning task. Cheaper
-            # than threading the task-org join through every read, but the
-            # task→org binding can't change without a re-ingest so caching
-            # per resource_span is safe. Fall back to DEFAULT_ORG_ID if the
-            # task disappeared between resolve and lookup (shouldn't happen
-            # since `_resolve_task_id` guarantees the row exists or auto-creates).
-            resolved_org_id = lookup_org_id(
-                self.db_session,
-                select(DatabaseTask.org_id).where(DatabaseTask.id == resolved_task_id),
-                default=DEFAULT_ORG_ID,
+            resolved_task_id, resource_id, resolved_org_id = self._resolve_resource(
+                resource_task_id,
+                resource_attributes,
             )
 
             for scope_span in resource_span.get("scopeSpans", []):
@@ -197,6 +234,48 @@ class TraceIngestionService:
             rejected_reasons,
         )
 
+    def _resolve_resource(
+        self,
+        resource_task_id: str | None,
+        resource_attributes: dict[str, Any],
+    ) -> tuple[str, str | None, uuid.UUID]:
+        """Resolve the task_id, resource_id and org_id of a resource span."""
+        service_name = resource_attributes.get(SERVICE_NAME_KEY)
+
+        # Create or retrieve resource metadata record
+        resource_id = None
+        if resource_attributes:
+            try:
+                resource_id = self._create_or_get_resource_metadata(
+                    resource_attributes,
+                    service_name,
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to create resource metadata: {e}",
+                    exc_info=True,
+                )
+
+        # Resolve task_id using priority hierarchy
+        # This ensures all traces have a task_id (no NULL values)
+        resolved_task_id = self._resolve_task_id(
+            explicit_task_id=resource_task_id,
+            service_name=service_name,
+            resource_attributes=resource_attributes,
+        )
+
+        logger.debug(f"Resolved task_id: {resolved_task_id}")
+
+        # Resolve the org_id for this batch from the owning task. Cheaper
+        # than threading the task-org join through every read, but the
+        # task→org binding can't change without a re-ingest so caching
+        # per resource_span is safe. Fall back to DEFAULT_ORG_ID if the
+        # task disappeared between resolve and lookup (shouldn't happen
+        # since `_resolve_task_id` guarantees the row exists or auto-creates).
+        task = self._lookup_task(resolved_task_id)
+        resolved_org_id = task.org_id if task else DEFAULT_ORG_ID
+        return resolved_task_id, resource_id, resolved_org_id
+
     def _extract_task_id_from_resource_attributes(
         self,
         resource_span: dict[str, Any],
@@ -273,11 +352,8 @@ class TraceIngestionService:
         if explicit_task_id:
             logger.debug(f"Using explicit task_id: {explicit_task_id}")
             try:
-                task = self.task_repo.get_db_task_by_id(
-                    explicit_task_id,
-                    include_archived=True,
-                )
-                if task.archived:
+                task = self._lookup_task(explicit_task_id)
+                if task and task.archived:
                     logger.warning(
                         f"Trace received with explicit task ID '{explicit_task_id}' which is archived. "
                         "Traces are still being written to this task. "
@@ -292,7 +368,13 @@ class TraceIngestionService:
         # Step 2: If no task_id but service.name present → lookup in mapping
         if service_name and service_name.strip() != "":
             mapping_repo = ServiceNameMappingRepository(self.db_session)
-            existing_task_id = mapping_repo.get_task_id_by_service_name(service_name)
+            existing_task_id = INGESTION_LOOKUP_CACHE.get_task_id(service_name)
+            if existing_task_id is None:
+                existing_task_id = mapping_repo.get_task_id_by_service_name(
+                    service_name,
+                )
+                if existing_task_id:
+                    INGESTION_LOOKUP_CACHE.put_task_id(service_name, existing_task_id)
 
             # Step 3: If lookup finds mapping → return mapped task_id
             if existing_task_id:
@@ -301,11 +383,8 @@ class TraceIngestionService:
                 )
                 # Check if the mapped task is archived — warn but still route to it
                 try:
-                    mapped_task = self.task_repo.get_db_task_by_id(
-                        existing_task_id,
-                        include_archived=True,
-                    )
-                    if mapped_task.archived:
+                    mapped_task = self._lookup_task(existing_task_id)
+                    if mapped_task and mapped_task.archived:
                         logger.warning(
                             f"Service name '{service_name}' is mapped to archived task "
                             f"{existing_task_id}. Traces are still being written to this task. "
@@ -340,6 +419,10 @@ class TraceIngestionService:
                                     service_name,
                                     existing_task.id,
                                 )
+                                INGESTION_LOOKUP_CACHE.put_task_id(
+                                    service_name,
+                                    existing_task.id,
+                                )
                                 logger.info(
                                     f"Matched service.name='{service_name}' to existing GCP task "
                                     f"'{existing_task.name}' (id={existing_task.id}) via cloud.resource_id",
@@ -359,6 +442,7 @@ class TraceIngestionService:
                 new_task = self.task_repo.create_auto_task(service_name)
 
                 mapping_repo.create_mapping(service_name, new_task.id)
+                INGESTION_LOOKUP_CACHE.put_task_id(service_name, new_task.id)
 
                 logger.info(f"Auto-created task '{new_task.name}' (id={new_task.id})")
                 return new_task.id
@@ -375,6 +459,23 @@ class TraceIngestionService:
         logger.debug(f"No service.name provided, using UNMAPPED_TASK_ID")
         return UNMAPPED_TASK_ID
 
+    def _lookup_task(self, task_id: str) -> TaskLookup | None:
+        """Org and archived state of a task, None if the task does not exist."""
+        task = INGESTION_LOOKUP_CACHE.get_task(task_id)
+        if task is not None:
+            return task
+
+        row = self.db_session.execute(
+            select(DatabaseTask.org_id, DatabaseTask.archived).where(
+                DatabaseTask.id == task_id,
+            ),
+        ).one_or_none()
+        if row is None:
+            return None
+        task = TaskLookup(org_id=row.org_id, archived=row.archived)
+        INGESTION_LOOKUP_CACHE.put_task(task_id, task)
+        return task
+
     def _process_span_data(
         self,
         span_data: dict[str, Any],
@@ -408,6 +509,71 @@ class TraceIngestionService:
                 "status.code",
                 default="Unset",
             )
+
+        return self._build_database_span(
+            span_data,
+            trace_id=trace_utils.convert_id_to_hex(span_data.get("traceId", "")),
+            span_id=trace_utils.convert_id_to_hex(span_data.get("spanId", "")),
+            parent_span_id=self._get_parent_span_id(span_data),
+            start_time=start_time,
+            end_time=end_time,
+            status_code=status_code,
+            task_id=resource_task_id,
+            resource_id=resource_id,
+            org_id=resource_org_id,
+        )
+
+    def _process_proto_span(
+        self,
+        span: Span,
+        resource_task_id: str,
+        resource_id: str | None = None,
+        resource_org_id: uuid.UUID = DEFAULT_ORG_ID,
+    ) -> DatabaseSpan:
+        """Process a protobuf span, reading IDs, timestamps and status off the message."""
+        span_data = self.span_converter.normalize_span(span)
+        # Inject version into raw data
+        span_data[SPAN_VERSION_KEY] = EXPECTED_SPAN_VERSION
+
+        return self._build_database_span(
+            span_data,
+            trace_id=span.trace_id.hex(),
+            span_id=span.span_id.hex(),
+            parent_span_id=span.parent_span_id.hex() or None,
+            start_time=(
+                trace_utils.timestamp_ns_to_datetime(span.start_time_unix_nano)
+                if span.start_time_unix_nano
+                else None
+            ),
+            end_time=(
+                trace_utils.timestamp_ns_to_datetime(span.end_time_unix_nano)
+                if span.end_time_unix_nano
+                else None
+            ),
+            status_code=(
+                Status.StatusCode.Name(span.status.code)
+                if span.status.code
+                else "Unset"
+            ),
+            task_id=resource_task_id,
+            resource_id=resource_id,
+            org_id=resource_org_id,
+        )
+
+    def _build_database_span(
+        self,
+        span_data: dict[str, Any],
+        trace_id: str,
+        span_id: str,
+        parent_span_id: str | None,
+        start_time: datetime | None,
+        end_time: datetime | None,
+        status_code: str,
+        task_id: str,
+        resource_id: str | None,
+        org_id: uuid.UUID,
+    ) -> DatabaseSpan:
+        """Build the span row from normalized span data."""
         span_status_code = trace_utils.clean_status_code(status_code)
 
         # Extract token/cost info (fast - from attributes only, compute cost if needed)
@@ -416,15 +582,15 @@ class TraceIngestionService:
 
         return DatabaseSpan(
             id=str(uuid.uuid4()),
-            trace_id=trace_utils.convert_id_to_hex(span_data.get("traceId", "")),
-            span_id=trace_utils.convert_id_to_hex(span_data.get("spanId", "")),
-            parent_span_id=self._get_parent_span_id(span_data),
+            trace_id=trace_id,
+            span_id=span_id,
+            parent_span_id=parent_span_id,
             span_kind=span_kind,
             span_name=span_data.get("name"),
             start_time=start_time,
             end_time=end_time,
-            task_id=resource_task_id,
-            org_id=resource_org_id,
+            task_id=task_id,
+            org_id=org_id,
             resource_id=resource_id,
             session_id=self._get_attribute_value(span_data, SpanAttributes.SESSION_ID),
             user_id=self._get_attribute_value(span_data, USER_ID_KEY),
@@ -436,6 +602,7 @@ class TraceIngestionService:
             prompt_token_cost=token_data.prompt_token_cost,
             completion_token_cost=token_data.completion_token_cost,
             total_token_cost=token_data.total_token_cost,
+            model_name=span_model_name(span_data, span_kind),
         )
 
     def _extract_value_from_otel_format(
@@ -536,8 +703,24 @@ class TraceIngestionService:
         if not spans:
             return
 
-        self.db_session.add_all(spans)
-        self._batch_upsert_trace_metadata(spans)
+        # rollups of the minutes the batch's traces start in, before and after it
+        trace_ids = {span.trace_id for span in spans}
+        rollup_keys = trace_rollup_keys(self.db_session, trace_ids)
+
+        if use_span_copy_writer(self.db_session, len(spans)):
+            # spans and trace metadata are written by a single statement
+            writer = SpanCopyWriter(self.db_session)
+            writer.copy_to_staging(spans)
+            stmt = self._build_trace_metadata_upsert(spans)
+            self.db_session.execute(stmt.add_cte(writer.insert_from_staging()))
+        else:
+            self.db_session.add_all(spans)
+            self._batch_upsert_trace_metadata(spans)
+
+        refresh_trace_rollups(
+            self.db_session,
+            rollup_keys | trace_rollup_keys(self.db_session, trace_ids),
+        )
 
         if commit:
             self.db_session.commit()
@@ -555,6 +738,15 @@ class TraceIngestionService:
         if not spans:
             return
 
+        self.db_session.execute(self._build_trace_metadata_upsert(spans))
+
+        logger.debug(f"Upserted trace metadata from {len(spans)} spans")
+
+    def _build_trace_metadata_upsert(
+        self,
+        spans: list[DatabaseSpan],
+    ) -> PGInsertType | SQLiteInsertType:
+        """Build the trace metadata upsert for a non-empty batch of spans."""
         # Group spans by trace_id to batch updates
         trace_updates: dict[str, TraceUpdateDict] = {}
         current_time = datetime.now()
@@ -659,9 +851,6 @@ class TraceIngestionService:
                     span_value,
                 )
 
-        if not trace_updates:
-            return
-
         # Remove tracking field before database upsert (not a database column)
         # Create copies without earliest_root_start_time for database insertion
         values_list: list[TraceUpdateDBBase] = [
@@ -687,11 +876,7 @@ class TraceIngestionService:
                 set_=self._build_upsert_set_dict(stmt, func.min, func.max),
             )
 
-        self.db_session.execute(stmt)
-
-        logger.debug(
-            f"Upserted metadata for {len(trace_updates)} traces from {len(spans)} spans",
-        )
+        return stmt
 
     def _build_upsert_set_dict(
         self,
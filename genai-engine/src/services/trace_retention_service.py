@@ -21,6 +21,18 @@ so the deletion workload doesn't spike database load, especially on startup
 when a large backlog may exist.  The pause is interruptible via the shutdown
 event for graceful termination.
 
+Partitioned spans
+-----------------
+When ``spans`` is range partitioned by ``start_time`` (opt-in migration
+9b4d2e7c1a3f), each job instead creates the next
+``GENAI_ENGINE_SPAN_PARTITION_PREMAKE`` daily or weekly partitions, detaches
+and drops every partition that ends before the cutoff together with the
+metric results of its spans, and deletes the trace metadata and annotations
+of traces that ended before the oldest remaining partition in batches of
+``PARTITIONED_TRACE_METADATA_BATCH_SIZE`` (5 000) without pausing.  Retention
+then works at partition granularity, and the runaway deletion cap does not
+apply since whole partitions are dropped.
+
 Circuit breaker / fail-stop latch
 ---------------------------------
 The service maintains a consecutive-failure counter.  If a run fails
@@ -39,12 +51,21 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from sqlalchemy import text
+from sqlalchemy.orm import Session
 
 from dependencies import db_session_context, get_db_session
 from repositories.configuration_repository import ConfigurationRepository
+from repositories.span_partition_repository import (
+    delete_default_partition_spans,
+    drop_span_partition,
+    ensure_future_span_partitions,
+    list_span_partitions,
+    spans_partitioned,
+)
 from repositories.trace_retention_repository import (
     DEFAULT_TRACE_RETENTION_BATCH_SIZE,
     delete_trace_batch,
+    delete_trace_metadata_batch,
     get_expired_trace_ids,
 )
 from services.base_queue_service import BaseQueueJob, BaseQueueService
@@ -63,6 +84,8 @@ INTER_BATCH_DELAY_SECONDS = 1
 MAX_TRACES_PER_RUN = 100_000
 CIRCUIT_BREAKER_THRESHOLD = 3
 LEADER_ELECTION_RETRY_SECONDS = 60
+# Trace metadata rows are small once their spans are gone with their partition
+PARTITIONED_TRACE_METADATA_BATCH_SIZE = 5000
 
 
 def _resolve_interval_seconds() -> int:
@@ -94,6 +117,29 @@ def _resolve_interval_seconds() -> int:
     return hours * 3600
 
 
+def _resolve_partition_settings() -> tuple[str, int]:
+    """Resolve the span partition interval and how many partitions to create ahead."""
+    interval = get_env_var(
+        constants.GENAI_ENGINE_SPAN_PARTITION_INTERVAL_ENV_VAR,
+        default=constants.DEFAULT_SPAN_PARTITION_INTERVAL,
+    ).lower()
+    if interval not in constants.SPAN_PARTITION_INTERVALS:
+        logger.warning(
+            "Invalid %s=%r; falling back to %s partitions",
+            constants.GENAI_ENGINE_SPAN_PARTITION_INTERVAL_ENV_VAR,
+            interval,
+            constants.DEFAULT_SPAN_PARTITION_INTERVAL,
+        )
+        interval = constants.DEFAULT_SPAN_PARTITION_INTERVAL
+    premake = int(
+        get_env_var(
+            constants.GENAI_ENGINE_SPAN_PARTITION_PREMAKE_ENV_VAR,
+            default=str(constants.DEFAULT_SPAN_PARTITION_PREMAKE),
+        ),
+    )
+    return interval, max(premake, 1)
+
+
 class TraceRetentionJob(BaseQueueJob):
     """Job representing one run of the trace retention cleanup."""
 
@@ -138,36 +184,42 @@ class TraceRetentionService(BaseQueueService[TraceRetentionJob]):
                     days=config.trace_retention_days,
                 )
 
-                while True:
-                    try:
-                        trace_ids = get_expired_trace_ids(
-                            db_session,
-                            cutoff,
-                            batch_size=DEFAULT_TRACE_RETENTION_BATCH_SIZE,
-                        )
-                        if not trace_ids:
+                if spans_partitioned(db_session):
+                    total_deleted, batch_error = self._run_partition_retention(
+                        db_session,
+                        cutoff,
+                    )
+                else:
+                    while True:
+                        try:
+                            trace_ids = get_expired_trace_ids(
+                                db_session,
+                                cutoff,
+                                batch_size=DEFAULT_TRACE_RETENTION_BATCH_SIZE,
+                            )
+                            if not trace_ids:
+                                break
+                            delete_trace_batch(db_session, trace_ids)
+                            db_session.commit()
+                            total_deleted += len(trace_ids)
+                        except Exception:
+                            logger.exception(
+                                "Trace retention batch failed after deleting %d traces",
+                                total_deleted,
+                            )
+                            db_session.rollback()
+                            batch_error = True
                             break
-                        delete_trace_batch(db_session, trace_ids)
-                        db_session.commit()
-                        total_deleted += len(trace_ids)
-                    except Exception:
-                        logger.exception(
-                            "Trace retention batch failed after deleting %d traces",
-                            total_deleted,
-                        )
-                        db_session.rollback()
-                        batch_error = True
-                        break
 
-                    if total_deleted >= MAX_TRACES_PER_RUN:
-                        self._trip_latch(
-                            f"runaway deletion cap reached: deleted {total_deleted} "
-                            f"traces (cutoff={cutoff.isoformat()})",
-                        )
-                        break
+                        if total_deleted >= MAX_TRACES_PER_RUN:
+                            self._trip_latch(
+                                f"runaway deletion cap reached: deleted {total_deleted} "
+                                f"traces (cutoff={cutoff.isoformat()})",
+                            )
+                            break
 
-                    if self.shutdown_event.wait(INTER_BATCH_DELAY_SECONDS):
-                        break
+                        if self.shutdown_event.wait(INTER_BATCH_DELAY_SECONDS):
+                            break
 
                 logger.info(
                     "Trace retention run complete: deleted %d traces "
@@ -205,6 +257,68 @@ class TraceRetentionService(BaseQueueService[TraceRetentionJob]):
                 f"{failures} consecutive failures",
             )
 
+    def _run_partition_retention(
+        self,
+        db_session: Session,
+        cutoff: datetime,
+    ) -> tuple[int, bool]:
+        """Retention for partitioned spans.
+
+        Creates the upcoming span partitions, drops the partitions that end before the
+        cutoff and then deletes the traces that ended before the oldest remaining
+        partition, whose spans went with the dropped ones.
+
+        Returns:
+            Tuple of (deleted trace count, whether a step failed)
+        """
+        interval, premake = _resolve_partition_settings()
+        # span timestamps are stored as naive UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        cutoff = cutoff.astimezone(timezone.utc).replace(tzinfo=None)
+        total_deleted = 0
+
+        try:
+            ensure_future_span_partitions(db_session, now, interval, premake)
+
+            dropped = 0
+            for partition in list_span_partitions(db_session):
+                if partition.upper > cutoff or self.shutdown_event.is_set():
+                    break
+                drop_span_partition(db_session, partition)
+                db_session.commit()
+                dropped += 1
+
+            remaining = list_span_partitions(db_session)
+            bound = min(cutoff, remaining[0].lower) if remaining else cutoff
+            delete_default_partition_spans(db_session, bound)
+            db_session.commit()
+            logger.info(
+                "Trace retention dropped %d span partitions, deleting traces before %s",
+                dropped,
+                bound.isoformat(),
+            )
+
+            while not self.shutdown_event.is_set():
+                trace_ids = get_expired_trace_ids(
+                    db_session,
+                    bound,
+                    batch_size=PARTITIONED_TRACE_METADATA_BATCH_SIZE,
+                )
+                if not trace_ids:
+                    break
+                delete_trace_metadata_batch(db_session, trace_ids)
+                db_session.commit()
+                total_deleted += len(trace_ids)
+        except Exception:
+            logger.exception(
+                "Partitioned trace retention failed after deleting %d traces",
+                total_deleted,
+            )
+            db_session.rollback()
+            return total_deleted, True
+
+        return total_deleted, False
+
     def _background_loop(self) -> None:
         """Run retention once, then wait 24 hours and enqueue again.
 
@@ -0,0 +1,212 @@
+"""Background service that backfills the trace rollups and checks them for drift.
+
+Trace rollups (see ``repositories.trace_rollup_repository``) are recomputed by every
+write that changes traces or continuous eval annotations. This service covers what
+those writes can't: the first run recomputes the rollups of every task and day with
+traces and then records the rollup version in the configurations table, after which
+the trace overview endpoints read the rollups. Later runs, every
+``GENAI_ENGINE_TRACE_ROLLUP_RECONCILE_INTERVAL_MINUTES``, compare the rollups of the
+last ``GENAI_ENGINE_TRACE_ROLLUP_RECONCILE_LOOKBACK_DAYS`` days with trace_metadata and
+rewrite the days that drifted, e.g. after a write path that bypassed the rollups.
+
+Only one replica reconciles at a time: the leader holds a PostgreSQL session-level
+advisory lock (``TRACE_ROLLUP_RECONCILIATION_ADVISORY_LOCK_KEY``) and the others stand
+by, like trace retention. The service only runs with
+``GENAI_ENGINE_TRACE_ROLLUPS_ENABLED``; startups without it clear the backfill record,
+since rollups aren't maintained while disabled.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import text
+
+from dependencies import db_session_context, get_db_session
+from repositories.trace_rollup_repository import (
+    clear_trace_rollups_ready,
+    get_trace_rollup_days,
+    mark_trace_rollups_ready,
+    reconcile_trace_rollups,
+    trace_rollups_enabled,
+    trace_rollups_ready,
+)
+from services.base_queue_service import BaseQueueJob, BaseQueueService
+from utils import constants
+from utils.utils import get_env_var
+
+logger = logging.getLogger(__name__)
+
+TRACE_ROLLUP_RECONCILIATION_JOB_KEY = "trace_rollup_reconciliation"
+# PostgreSQL session-level advisory lock key for leader election, unique across the
+# application (see also TRACE_RETENTION_ADVISORY_LOCK_KEY).
+TRACE_ROLLUP_RECONCILIATION_ADVISORY_LOCK_KEY = 17449343
+INTER_DAY_DELAY_SECONDS = 0.1
+LEADER_ELECTION_RETRY_SECONDS = 60
+
+
+def _resolve_reconcile_settings() -> tuple[int, int]:
+    """Resolve the reconciliation interval in seconds and the lookback in days."""
+    interval_minutes = int(
+        get_env_var(
+            constants.GENAI_ENGINE_TRACE_ROLLUP_RECONCILE_INTERVAL_MINUTES_ENV_VAR,
+            default=str(constants.DEFAULT_TRACE_ROLLUP_RECONCILE_INTERVAL_MINUTES),
+        ),
+    )
+    lookback_days = int(
+        get_env_var(
+            constants.GENAI_ENGINE_TRACE_ROLLUP_RECONCILE_LOOKBACK_DAYS_ENV_VAR,
+            default=str(constants.DEFAULT_TRACE_ROLLUP_RECONCILE_LOOKBACK_DAYS),
+        ),
+    )
+    return max(interval_minutes, 1) * 60, max(lookback_days, 1)
+
+
+class TraceRollupReconciliationJob(BaseQueueJob):
+    """Job representing one reconciliation run of the trace rollups."""
+
+    def __init__(self, delay_seconds: int = 0) -> None:
+        super().__init__(delay_seconds=delay_seconds)
+
+
+class TraceRollupReconciliationService(
+    BaseQueueService[TraceRollupReconciliationJob],
+):
+    """Background service that backfills trace rollups and periodically fixes drift."""
+
+    job_model = TraceRollupReconciliationJob
+    service_name = "trace_rollup_reconciliation_service"
+    background_thread_name = "trace-rollup-reconciliation"
+
+    def __init__(self, **kwargs: object) -> None:
+        super().__init__(**kwargs)  # type: ignore[arg-type]
+        self._interval_seconds, self._lookback_days = _resolve_reconcile_settings()
+
+    def _get_job_key(self, job: TraceRollupReconciliationJob) -> str:
+        return TRACE_ROLLUP_RECONCILIATION_JOB_KEY
+
+    def _execute_job(self, job: TraceRollupReconciliationJob) -> None:
+        """Reconcile every task and day on the first run, the last few days after."""
+        with db_session_context() as db_session:
+            backfill = not trace_rollups_ready(db_session)
+            since = None
+            if not backfill:
+                # trace timestamps are stored as naive UTC
+                since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+                    days=self._lookback_days,
+                )
+
+            logger.info(
+                "Trace rollup %s starting",
+                "backfill" if backfill else "reconciliation",
+            )
+            drifted_days = 0
+            drifted_rows = 0
+            try:
+                days = get_trace_rollup_days(db_session, since)
+                db_session.commit()
+                for task_id, day in days:
+                    drift = reconcile_trace_rollups(db_session, task_id, day)
+                    db_session.commit()
+                    if drift:
+                        drifted_days += 1
+                        drifted_rows += drift
+                    if self.shutdown_event.wait(INTER_DAY_DELAY_SECONDS):
+                        return
+
+                if backfill:
+                    mark_trace_rollups_ready(db_session)
+                    db_session.commit()
+            except Exception:
+                logger.exception("Trace rollup reconciliation failed")
+                db_session.rollback()
+                return
+
+            if drifted_rows and not backfill:
+                logger.warning(
+                    "Trace rollup reconciliation fixed %d rollups in %d task days",
+                    drifted_rows,
+                    drifted_days,
+                )
+            logger.info(
+                "Trace rollup %s complete: %d task days checked, %d rewritten",
+                "backfill" if backfill else "reconciliation",
+                len(days),
+                drifted_days,
+            )
+
+    def _background_loop(self) -> None:
+        """Reconcile on startup and then every interval while holding the leader lock."""
+        logger.info("Background thread started for %s", self.service_name)
+
+        while not self.shutdown_event.is_set():
+            leader_session = None
+            try:
+                leader_session = next(get_db_session())
+                is_postgres = leader_session.get_bind().dialect.name == "postgresql"
+                if (
+                    is_postgres
+                    and not leader_session.execute(
+                        text("SELECT pg_try_advisory_lock(:key)"),
+                        {"key": TRACE_ROLLUP_RECONCILIATION_ADVISORY_LOCK_KEY},
+                    ).scalar()
+                ):
+                    logger.info(
+                        "Another replica holds the trace rollup reconciliation "
+                        "leader lock, standing by",
+                    )
+                    self.shutdown_event.wait(timeout=self._interval_seconds)
+                    continue
+
+                while not self.shutdown_event.is_set():
+                    self.enqueue(TraceRollupReconciliationJob(delay_seconds=0))
+                    if self.shutdown_event.wait(timeout=self._interval_seconds):
+                        break
+            except Exception as e:
+                logger.error(
+                    "Error in trace rollup reconciliation leader election: %s",
+                    e,
+                    exc_info=True,
+                )
+                self.shutdown_event.wait(timeout=LEADER_ELECTION_RETRY_SECONDS)
+            finally:
+                if leader_session is not None:
+                    leader_session.close()
+
+        logger.info("Background thread stopped for %s", self.service_name)
+
+
+TRACE_ROLLUP_RECONCILIATION_SERVICE: Optional[TraceRollupReconciliationService] = None
+
+
+def get_trace_rollup_reconciliation_service() -> (
+    Optional[TraceRollupReconciliationService]
+):
+    """Return the global trace rollup reconciliation service instance."""
+    return TRACE_ROLLUP_RECONCILIATION_SERVICE
+
+
+def initialize_trace_rollup_reconciliation_service() -> None:
+    """Initialize and start the global trace rollup reconciliation service."""
+    global TRACE_ROLLUP_RECONCILIATION_SERVICE
+    if not trace_rollups_enabled():
+        with db_session_context() as db_session:
+            clear_trace_rollups_ready(db_session)
+            db_session.commit()
+        return
+
+    if TRACE_ROLLUP_RECONCILIATION_SERVICE is None:
+        TRACE_ROLLUP_RECONCILIATION_SERVICE = TraceRollupReconciliationService(
+            num_workers=1,
+        )
+        TRACE_ROLLUP_RECONCILIATION_SERVICE.start()
+
+
+def shutdown_trace_rollup_reconciliation_service() -> None:
+    """Shutdown the global trace rollup reconciliation service."""
+    global TRACE_ROLLUP_RECONCILIATION_SERVICE
+    if TRACE_ROLLUP_RECONCILIATION_SERVICE is not None:
+        TRACE_ROLLUP_RECONCILIATION_SERVICE.stop(timeout=30)
+        TRACE_ROLLUP_RECONCILIATION_SERVICE = None
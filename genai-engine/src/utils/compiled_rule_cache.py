@@ -0,0 +1,64 @@
+import re
+import threading
+from datetime import datetime
+
+from cachetools import LRUCache
+
+from config.cache_config import cache_config
+from schemas.internal_schemas import Rule
+from utils.keyword_matcher import KeywordMatcher
+
+# Keyed by (rule id, rule updated_at) so a changed config never reuses a stale artifact
+CompiledRuleKey = tuple[str, datetime]
+
+
+class CompiledRuleCache:
+    """Bounded cache of compiled regex patterns and keyword matchers per rule version.
+
+    Regex and keyword rule configs are otherwise recompiled on every validation
+    request, which for large keyword lists dominates the cost of the rule.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._regex_patterns: LRUCache[CompiledRuleKey, list[re.Pattern[str]]] = (
+            LRUCache(maxsize=maxsize)
+        )
+        self._keyword_matchers: LRUCache[CompiledRuleKey, KeywordMatcher] = LRUCache(
+            maxsize=maxsize,
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(rule: Rule) -> CompiledRuleKey:
+        return rule.id, rule.updated_at
+
+    def get_regex_patterns(self, rule: Rule) -> list[re.Pattern[str]]:
+        key = self._key(rule)
+        with self._lock:
+            patterns = self._regex_patterns.get(key)
+        if patterns is None:
+            patterns = [
+                re.compile(pattern)
+                for pattern in rule.get_regex_config().regex_patterns
+            ]
+            with self._lock:
+                self._regex_patterns[key] = patterns
+        return patterns
+
+    def get_keyword_matcher(self, rule: Rule) -> KeywordMatcher:
+        key = self._key(rule)
+        with self._lock:
+            matcher = self._keyword_matchers.get(key)
+        if matcher is None:
+            matcher = KeywordMatcher(rule.get_keywords_config().keywords)
+            with self._lock:
+                self._keyword_matchers[key] = matcher
+        return matcher
+
+    def clear(self) -> None:
+        with self._lock:
+            self._regex_patterns.clear()
+            self._keyword_matchers.clear()
+
+
+COMPILED_RULE_CACHE = CompiledRuleCache(maxsize=cache_config.COMPILED_RULES_CACHE_SIZE)
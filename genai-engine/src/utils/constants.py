@@ -42,6 +42,9 @@ GENAI_ENGINE_THREAD_POOL_MAX_WORKERS_ENV_VAR = "GENAI_ENGINE_THREAD_POOL_MAX_WOR
 DEFAULT_THREAD_POOL_MAX_WORKERS = (
     1 if cpu_count is None else math.floor(cpu_count / 2) + 1
 )
+GENAI_ENGINE_MODEL_RULE_MAX_WORKERS_ENV_VAR = "GENAI_ENGINE_MODEL_RULE_MAX_WORKERS"
+GENAI_ENGINE_LLM_RULE_MAX_WORKERS_ENV_VAR = "GENAI_ENGINE_LLM_RULE_MAX_WORKERS"
+DEFAULT_LLM_RULE_MAX_WORKERS = 32
 DEFAULT_PAGE_SIZE = 5  # Reduced for trace-level pagination
 MAX_PAGE_SIZE = 5000
 MODEL_REPOSITORY_URL_ENV_VAR = "MODEL_REPOSITORY_URL"
@@ -81,6 +84,83 @@ DEFAULT_TRACE_RETENTION_DAYS = 90
 ALLOWED_TRACE_RETENTION_DAYS = (7, 14, 30, 90, 120, 365)
 TRACE_RETENTION_INTERVAL_HOURS_ENV_VAR = "TRACE_RETENTION_INTERVAL_HOURS"
 MIN_TRACE_RETENTION_INTERVAL_HOURS = 1
+GENAI_ENGINE_TRACE_INGESTION_MODE_ENV_VAR = "GENAI_ENGINE_TRACE_INGESTION_MODE"
+DEFAULT_TRACE_INGESTION_MODE = "sync"
+GENAI_ENGINE_TRACE_INGEST_QUEUE_DIR_ENV_VAR = "GENAI_ENGINE_TRACE_INGEST_QUEUE_DIR"
+GENAI_ENGINE_TRACE_INGEST_QUEUE_MAX_BYTES_ENV_VAR = (
+    "GENAI_ENGINE_TRACE_INGEST_QUEUE_MAX_BYTES"
+)
+DEFAULT_TRACE_INGEST_QUEUE_MAX_BYTES = 512 * 1024 * 1024
+GENAI_ENGINE_TRACE_INGEST_WORKERS_ENV_VAR = "GENAI_ENGINE_TRACE_INGEST_WORKERS"
+DEFAULT_TRACE_INGEST_WORKERS = 2
+GENAI_ENGINE_TRACE_INGEST_RETRY_AFTER_SECONDS_ENV_VAR = (
+    "GENAI_ENGINE_TRACE_INGEST_RETRY_AFTER_SECONDS"
+)
+DEFAULT_TRACE_INGEST_RETRY_AFTER_SECONDS = 5
+GENAI_ENGINE_SPAN_COPY_MIN_BATCH_SIZE_ENV_VAR = "GENAI_ENGINE_SPAN_COPY_MIN_BATCH_SIZE"
+DEFAULT_SPAN_COPY_MIN_BATCH_SIZE = 500
+GENAI_ENGINE_SPAN_PARTITION_INTERVAL_ENV_VAR = "GENAI_ENGINE_SPAN_PARTITION_INTERVAL"
+SPAN_PARTITION_INTERVALS = ("daily", "weekly")
+DEFAULT_SPAN_PARTITION_INTERVAL = "daily"
+GENAI_ENGINE_SPAN_PARTITION_PREMAKE_ENV_VAR = "GENAI_ENGINE_SPAN_PARTITION_PREMAKE"
+DEFAULT_SPAN_PARTITION_PREMAKE = 7
+GENAI_ENGINE_TRACE_ROLLUPS_ENABLED_ENV_VAR = "GENAI_ENGINE_TRACE_ROLLUPS_ENABLED"
+GENAI_ENGINE_TRACE_ROLLUP_RECONCILE_INTERVAL_MINUTES_ENV_VAR = (
+    "GENAI_ENGINE_TRACE_ROLLUP_RECONCILE_INTERVAL_MINUTES"
+)
+DEFAULT_TRACE_ROLLUP_RECONCILE_INTERVAL_MINUTES = 60
+GENAI_ENGINE_TRACE_ROLLUP_RECONCILE_LOOKBACK_DAYS_ENV_VAR = (
+    "GENAI_ENGINE_TRACE_ROLLUP_RECONCILE_LOOKBACK_DAYS"
+)
+DEFAULT_TRACE_ROLLUP_RECONCILE_LOOKBACK_DAYS = 2
+GENAI_ENGINE_DURABLE_JOB_QUEUE_ENABLED_ENV_VAR = (
+    "GENAI_ENGINE_DURABLE_JOB_QUEUE_ENABLED"
+)
+GENAI_ENGINE_DURABLE_JOB_QUEUE_LEASE_SECONDS_ENV_VAR = (
+    "GENAI_ENGINE_DURABLE_JOB_QUEUE_LEASE_SECONDS"
+)
+DEFAULT_DURABLE_JOB_QUEUE_LEASE_SECONDS = 60
+GENAI_ENGINE_DURABLE_JOB_QUEUE_POLL_INTERVAL_SECONDS_ENV_VAR = (
+    "GENAI_ENGINE_DURABLE_JOB_QUEUE_POLL_INTERVAL_SECONDS"
+)
+DEFAULT_DURABLE_JOB_QUEUE_POLL_INTERVAL_SECONDS = 2
+GENAI_ENGINE_DURABLE_JOB_QUEUE_MAX_ATTEMPTS_ENV_VAR = (
+    "GENAI_ENGINE_DURABLE_JOB_QUEUE_MAX_ATTEMPTS"
+)
+DEFAULT_DURABLE_JOB_QUEUE_MAX_ATTEMPTS = 5
+GENAI_ENGINE_SPAN_METRICS_MODE_ENV_VAR = "GENAI_ENGINE_SPAN_METRICS_MODE"
+DEFAULT_SPAN_METRICS_MODE = "on_read"
+GENAI_ENGINE_EXPERIMENT_MAX_CONCURRENT_EXPERIMENTS_ENV_VAR = (
+    "GENAI_ENGINE_EXPERIMENT_MAX_CONCURRENT_EXPERIMENTS"
+)
+DEFAULT_EXPERIMENT_MAX_CONCURRENT_EXPERIMENTS = 4
+GENAI_ENGINE_EXPERIMENT_TEST_CASE_CONCURRENCY_ENV_VAR = (
+    "GENAI_ENGINE_EXPERIMENT_TEST_CASE_CONCURRENCY"
+)
+DEFAULT_EXPERIMENT_TEST_CASE_CONCURRENCY = 32
+GENAI_ENGINE_EXPERIMENT_MAX_WORKERS_ENV_VAR = "GENAI_ENGINE_EXPERIMENT_MAX_WORKERS"
+DEFAULT_EXPERIMENT_MAX_WORKERS = 32
+GENAI_ENGINE_EXPERIMENT_PROVIDER_MAX_CONCURRENCY_ENV_VAR = (
+    "GENAI_ENGINE_EXPERIMENT_PROVIDER_MAX_CONCURRENCY"
+)
+DEFAULT_EXPERIMENT_PROVIDER_MAX_CONCURRENCY = 32
+GENAI_ENGINE_EXPERIMENT_MODEL_MAX_CONCURRENCY_ENV_VAR = (
+    "GENAI_ENGINE_EXPERIMENT_MODEL_MAX_CONCURRENCY"
+)
+DEFAULT_EXPERIMENT_MODEL_MAX_CONCURRENCY = 16
+GENAI_ENGINE_EXPERIMENT_MODEL_TOKENS_PER_MINUTE_ENV_VAR = (
+    "GENAI_ENGINE_EXPERIMENT_MODEL_TOKENS_PER_MINUTE"
+)
+# 0 disables the per-model token budget
+DEFAULT_EXPERIMENT_MODEL_TOKENS_PER_MINUTE = 0
+GENAI_ENGINE_EXPERIMENT_RESULT_BATCH_SIZE_ENV_VAR = (
+    "GENAI_ENGINE_EXPERIMENT_RESULT_BATCH_SIZE"
+)
+DEFAULT_EXPERIMENT_RESULT_BATCH_SIZE = 50
+GENAI_ENGINE_EXPERIMENT_RESULT_FLUSH_INTERVAL_SECONDS_ENV_VAR = (
+    "GENAI_ENGINE_EXPERIMENT_RESULT_FLUSH_INTERVAL_SECONDS"
+)
+DEFAULT_EXPERIMENT_RESULT_FLUSH_INTERVAL_SECONDS = 2
 DEFAULT_TOXICITY_RULE_THRESHOLD = 0.5
 GENAI_ENGINE_TOXICITY_HARMFUL_REQUESTS_CHUNK_SIZE_ENV_VAR = (
     "GENAI_ENGINE_TOXICITY_HARMFUL_REQUESTS_CHUNK_SIZE"
@@ -91,6 +171,10 @@ GENAI_ENGINE_TOXICITY_MAX_CHUNK_SIZE_SIZE_ENV_VAR = (
 GENAI_ENGINE_TOXICITY_MODEL_BATCH_SIZE_ENV_VAR = (
     "GENAI_ENGINE_TOXICITY_MODEL_BATCH_SIZE"
 )
+GENAI_ENGINE_PROMPT_INJECTION_MODEL_BATCH_SIZE_ENV_VAR = (
+    "GENAI_ENGINE_PROMPT_INJECTION_MODEL_BATCH_SIZE"
+)
+DEFAULT_PROMPT_INJECTION_MODEL_BATCH_SIZE = 8
 GENAI_ENGINE_USE_PII_MODEL_V2_ENV_VAR = "GENAI_ENGINE_USE_PII_MODEL_V2"
 DEFAULT_PII_RULE_CONFIDENCE_SCORE_THRESHOLD = 0
 GENAI_ENGINE_SENSITIVE_DATA_CHECK_MAX_TOKEN_LIMIT_ENV_VAR = (
@@ -103,6 +187,14 @@ GENAI_ENGINE_TOXICITY_CHECK_MAX_TOKEN_LIMIT_ENV_VAR = (
     "GENAI_ENGINE_TOXICITY_CHECK_MAX_TOKEN_LIMIT"
 )
 ENABLE_RELEVANCE_MODELS_ENV_VAR = "ENABLE_RELEVANCE_MODELS"
+GENAI_ENGINE_MICRO_BATCHING_ENABLED_ENV_VAR = "GENAI_ENGINE_MICRO_BATCHING_ENABLED"
+GENAI_ENGINE_MICRO_BATCH_MAX_SIZE_ENV_VAR = "GENAI_ENGINE_MICRO_BATCH_MAX_SIZE"
+GENAI_ENGINE_MICRO_BATCH_MAX_WAIT_MS_ENV_VAR = "GENAI_ENGINE_MICRO_BATCH_MAX_WAIT_MS"
+DEFAULT_MICRO_BATCH_MAX_SIZE = 64
+DEFAULT_MICRO_BATCH_MAX_WAIT_MS = 5
+GENAI_ENGINE_CLASSIFIER_BACKEND_ENV_VAR = "GENAI_ENGINE_CLASSIFIER_BACKEND"
+GENAI_ENGINE_ONNX_INTRA_OP_THREADS_ENV_VAR = "GENAI_ENGINE_ONNX_INTRA_OP_THREADS"
+GENAI_ENGINE_PRELOAD_MODELS_ENV_VAR = "GENAI_ENGINE_PRELOAD_MODELS"
 
 ##################################################################
 # Chat
@@ -206,6 +298,9 @@ REFERRER_POLICY_HEADER = "Referrer-Policy"
 NEWRELIC_ENABLED_ENV_VAR = "NEWRELIC_ENABLED"
 NEWRELIC_APP_NAME_ENV_VAR = "NEW_RELIC_APP_NAME"
 NEWRELIC_CUSTOM_METRIC_RULE_FAILURES = "custom.rule_failures"
+NEWRELIC_CUSTOM_METRIC_RULE_RESULT_CACHE_HITS = "custom.rule_result_cache_hits"
+NEWRELIC_CUSTOM_METRIC_RULE_RESULT_CACHE_MISSES = "custom.rule_result_cache_misses"
+NEWRELIC_CUSTOM_METRIC_TRACE_INGEST_QUEUE_DEPTH = "custom.trace_ingest_queue_depth"
 
 ##################################################################
 # RBAC
@@ -0,0 +1,88 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+ItemT = TypeVar("ItemT")
+
+
+class DelayedJobScheduler(Generic[ItemT]):
+    """Timer for delayed jobs, holding them in a min-heap ordered by due time.
+
+    A single scheduler thread sleeps until the earliest item is due and then passes it
+    to dispatch_fn, which should only hand it off (e.g. submit it to an executor) since
+    it runs on the scheduler thread. Any number of items can wait for their delay
+    without tying up a thread each. Items with the same due time are dispatched in
+    scheduling order.
+    """
+
+    def __init__(self, name: str, dispatch_fn: Callable[[ItemT], None]) -> None:
+        self.name = name
+        self.dispatch_fn = dispatch_fn
+
+        self._heap: list[tuple[float, int, ItemT]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run,
+            name=self.name,
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> list[ItemT]:
+        """Stop the scheduler thread and return the items that were never dispatched."""
+        with self._condition:
+            self._stopped = True
+            pending = [item for _, _, item in sorted(self._heap)]
+            self._heap.clear()
+            self._condition.notify()
+
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.warning(f"Scheduler thread {self.name} did not shut down")
+        return pending
+
+    def schedule(self, delay_seconds: float, item: ItemT) -> None:
+        """Dispatch item once delay_seconds have passed."""
+        due_at = time.monotonic() + max(delay_seconds, 0)
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError(f"Scheduler {self.name} is stopped")
+            heapq.heappush(self._heap, (due_at, next(self._sequence), item))
+            # only a new earliest item changes how long the thread should sleep
+            if self._heap[0][2] is item:
+                self._condition.notify()
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._heap)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    remaining = self._heap[0][0] - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._stopped:
+                    return
+                _, _, item = heapq.heappop(self._heap)
+
+            try:
+                self.dispatch_fn(item)
+            except Exception:
+                logger.exception(f"Scheduler {self.name} failed to dispatch an item")
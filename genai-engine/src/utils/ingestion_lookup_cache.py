@@ -0,0 +1,105 @@
+import threading
+import uuid
+from typing import NamedTuple
+
+from cachetools import TTLCache
+
+from config.cache_config import cache_config
+
+
+class TaskLookup(NamedTuple):
+    """What trace ingestion needs to know about the task a resource span routes to."""
+
+    org_id: uuid.UUID
+    archived: bool
+
+
+class IngestionLookupCache:
+    """Per-process cache of the lookups trace ingestion repeats for every resource span.
+
+    The same agent sends the same resource attributes over and over, so resolving them
+    to a task, an org and a resource_metadata row gives the same answer every time.
+    Holds three bounded TTL caches:
+
+    - service.name -> task_id, for names with a service name mapping
+    - task_id -> TaskLookup (org_id, archived)
+    - resource_id of resource_metadata rows known to exist (the id is the content hash
+      of the resource attributes)
+
+    Writes through the repositories invalidate the affected entries of this process,
+    other workers pick changes up once their entries expire.
+    """
+
+    def __init__(self, max_size: int, ttl: int, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._task_ids_by_service_name: TTLCache[str, str] = TTLCache(
+            maxsize=max_size,
+            ttl=ttl,
+        )
+        self._tasks: TTLCache[str, TaskLookup] = TTLCache(maxsize=max_size, ttl=ttl)
+        self._resource_ids: TTLCache[str, bool] = TTLCache(maxsize=max_size, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get_task_id(self, service_name: str) -> str | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            return self._task_ids_by_service_name.get(service_name)
+
+    def put_task_id(self, service_name: str, task_id: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._task_ids_by_service_name[service_name] = task_id
+
+    def get_task(self, task_id: str) -> TaskLookup | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            return self._tasks.get(task_id)
+
+    def put_task(self, task_id: str, task: TaskLookup) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._tasks[task_id] = task
+
+    def has_resource(self, resource_id: str) -> bool:
+        if not self.enabled:
+            return False
+        with self._lock:
+            return resource_id in self._resource_ids
+
+    def add_resource(self, resource_id: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._resource_ids[resource_id] = True
+
+    def invalidate_task(self, task_id: str) -> None:
+        """Drops task_id and every service name resolved to it."""
+        with self._lock:
+            self._tasks.pop(task_id, None)
+            for service_name in [
+                name
+                for name, mapped_task_id in self._task_ids_by_service_name.items()
+                if mapped_task_id == task_id
+            ]:
+                self._task_ids_by_service_name.pop(service_name, None)
+
+    def invalidate_service_name(self, service_name: str) -> None:
+        with self._lock:
+            self._task_ids_by_service_name.pop(service_name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._task_ids_by_service_name.clear()
+            self._tasks.clear()
+            self._resource_ids.clear()
+
+
+INGESTION_LOOKUP_CACHE = IngestionLookupCache(
+    max_size=cache_config.INGESTION_LOOKUP_CACHE_MAX_SIZE,
+    ttl=cache_config.INGESTION_LOOKUP_CACHE_TTL,
+    enabled=cache_config.INGESTION_LOOKUP_CACHE_ENABLED,
+)
@@ -0,0 +1,95 @@
+"""
+Opaque cursors for keyset pagination of the trace, span, session and inference listings.
+
+With OFFSET pagination the database reads and discards every row before the requested
+page, so walking a listing page by page gets quadratically slower. A cursor instead
+holds the sort key of the last row of a page: its timestamp, plus the ids that break
+ties between rows with the same timestamp. The next page starts right after that key,
+which is an index range scan however deep the page is.
+
+A cursor is only valid for the listing and sort direction that returned it.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, Sequence, TypeVar
+
+from sqlalchemy import ColumnElement, UnaryExpression, asc, desc, tuple_
+
+T = TypeVar("T")
+
+# response header of listings whose response model has no next_cursor field
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# the sort timestamp, then the tiebreaking ids
+CursorKey = tuple[datetime | str, ...]
+
+
+def encode_cursor(descending: bool, key: CursorKey) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor."""
+    sort_value, *tiebreakers = key
+    if not isinstance(sort_value, datetime):
+        raise TypeError("Cursor keys start with the sort timestamp")
+    payload = {"d": descending, "k": [sort_value.isoformat(), *tiebreakers]}
+    encoded = base64.urlsafe_b64encode(
+        json.dumps(payload, separators=(",", ":")).encode(),
+    )
+    return encoded.decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, descending: bool, key_size: int) -> CursorKey:
+    """Decode a cursor into its sort key.
+
+    Raises ValueError for malformed cursors and cursors of another sort direction.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        sort_value, *tiebreakers = payload["k"]
+        key = (datetime.fromisoformat(sort_value), *map(str, tiebreakers))
+        cursor_descending = payload["d"]
+    except (binascii.Error, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise ValueError("Invalid pagination cursor")
+
+    if len(key) != key_size:
+        raise ValueError("Invalid pagination cursor")
+    if cursor_descending != descending:
+        raise ValueError(
+            "Pagination cursor was issued for the opposite sort order",
+        )
+    return key
+
+
+def keyset_order_by(
+    columns: Sequence[ColumnElement[Any]],
+    descending: bool,
+) -> list[UnaryExpression[Any]]:
+    """ORDER BY clauses for a keyset, all columns in the same direction."""
+    direction = desc if descending else asc
+    return [direction(column) for column in columns]
+
+
+def keyset_after(
+    columns: Sequence[ColumnElement[Any]],
+    cursor: str,
+    descending: bool,
+) -> ColumnElement[bool]:
+    """Condition selecting the rows that come after the cursor in keyset order."""
+    key = decode_cursor(cursor, descending, len(columns))
+    row = tuple_(*columns)
+    after = tuple_(*key, types=[column.type for column in columns])
+    return row < after if descending else row > after
+
+
+def next_page_cursor(
+    items: Sequence[T],
+    page_size: int,
+    descending: bool,
+    key: Callable[[T], CursorKey],
+) -> str | None:
+    """Cursor of the page after items, or None when items is the last page."""
+    if not items or len(items) < page_size:
+        return None
+    return encode_cursor(descending, key(items[-1]))
@@ -0,0 +1,149 @@
+import re
+
+WORD_CHAR_REGEX = re.compile(r"\w")
+
+
+def is_punctuation_only(keyword: str) -> bool:
+    # Returns True if the keyword has no letters, digits, or underscores
+    return not WORD_CHAR_REGEX.search(keyword)
+
+
+def get_keyword_regex_pattern(keyword: str) -> str:
+    escape_pattern = re.escape(keyword)
+
+    if not is_punctuation_only(keyword):
+        # if a keyword has word characters then use word-boundaries
+        return rf"(?<!\w){escape_pattern}(?!\w)"
+
+    return escape_pattern
+
+
+class KeywordMatcher:
+    """Case-insensitive keyword matcher built on an Aho-Corasick automaton.
+
+    Finds every keyword in a text with a single pass over the text, regardless of how
+    many keywords there are. Keywords containing word characters only match on word
+    boundaries, with the same semantics as get_keyword_regex_pattern. Keywords or texts
+    whose lowercase form changes length (a handful of unicode characters) fall back to
+    per-keyword regex search so match positions stay aligned with the original text.
+    """
+
+    def __init__(self, keywords: list[str]) -> None:
+        self.keywords = list(keywords)
+
+        # automaton states: transitions, failure links and matched keyword ids
+        self._transitions: list[dict[str, int]] = [{}]
+        self._failure: list[int] = [0]
+        self._outputs: list[list[int]] = [[]]
+
+        # per keyword id (index into self.keywords)
+        self._lengths: list[int] = []
+        self._needs_word_boundary: list[bool] = []
+        self._always_matched: list[int] = []
+        self._regex_fallback: dict[int, re.Pattern[str]] = {}
+
+        for keyword_id, keyword in enumerate(self.keywords):
+            lowered = keyword.lower()
+            self._lengths.append(len(keyword))
+            self._needs_word_boundary.append(not is_punctuation_only(keyword))
+            if not keyword:
+                # an empty pattern matches any text
+                self._always_matched.append(keyword_id)
+            elif len(lowered) != len(keyword):
+                self._regex_fallback[keyword_id] = self._compile_keyword(keyword)
+            else:
+                self._add_keyword(keyword_id, lowered)
+        self._build_failure_links()
+
+    @staticmethod
+    def _compile_keyword(keyword: str) -> re.Pattern[str]:
+        return re.compile(get_keyword_regex_pattern(keyword), flags=re.IGNORECASE)
+
+    def _add_keyword(self, keyword_id: int, lowered: str) -> None:
+        state = 0
+        for char in lowered:
+            next_state = self._transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self._transitions)
+                self._transitions[state][char] = next_state
+                self._transitions.append({})
+                self._failure.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append(keyword_id)
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._transitions[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, next_state in self._transitions[state].items():
+                queue.append(next_state)
+                failure = self._failure[state]
+                while failure and char not in self._transitions[failure]:
+                    failure = self._failure[failure]
+                fallback = self._transitions[failure].get(char, 0)
+                self._failure[next_state] = fallback if fallback != next_state else 0
+                # a state also matches everything its longest proper suffix matches
+                self._outputs[next_state] = (
+                    self._outputs[next_state] + self._outputs[self._failure[next_state]]
+                )
+
+    def _is_bounded(self, text: str, start: int, end: int) -> bool:
+        if start > 0 and WORD_CHAR_REGEX.match(text[start - 1]):
+            return False
+        if end < len(text) and WORD_CHAR_REGEX.match(text[end]):
+            return False
+        return True
+
+    def _regex_search(self, keyword_ids: list[int], text: str) -> set[int]:
+        found = set()
+        for keyword_id in keyword_ids:
+            pattern = self._regex_fallback.get(keyword_id)
+            if pattern is None:
+                pattern = self._compile_keyword(self.keywords[keyword_id])
+            if pattern.search(text):
+                found.add(keyword_id)
+        return found
+
+    def find(self, text: str) -> list[str]:
+        """Returns the keywords found in text, in keyword list order."""
+        if not text:
+            return []
+
+        found = set(self._always_matched)
+        found |= self._regex_search(list(self._regex_fallback), text)
+
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            found |= self._regex_search(
+                [i for i in range(len(self.keywords)) if i not in found],
+                text,
+            )
+        else:
+            transitions = self._transitions
+            failure = self._failure
+            outputs = self._outputs
+            state = 0
+            for position, char in enumerate(lowered):
+                while state and char not in transitions[state]:
+                    state = failure[state]
+                state = transitions[state].get(char, 0)
+                for keyword_id in outputs[state]:
+                    if keyword_id in found:
+                        continue
+                    end = position + 1
+                    start = end - self._lengths[keyword_id]
+                    if not self._needs_word_boundary[keyword_id] or self._is_bounded(
+                        text,
+                        start,
+                        end,
+                    ):
+                        found.add(keyword_id)
+
+        return [
+            keyword
+            for keyword_id, keyword in enumerate(self.keywords)
+            if keyword_id in found
+        ]
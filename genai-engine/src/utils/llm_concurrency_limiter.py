@@ -0,0 +1,182 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from utils import constants
+from utils.token_count import TokenCounter
+from utils.utils import get_env_var
+
+
+def estimate_prompt_tokens(*texts: str | None) -> int:
+    """Rough input token count of a prompt, reserved against token budgets before a call."""
+    token_counter = TokenCounter()
+    return sum(token_counter.count(text) for text in texts)
+
+
+class _TokenBudget:
+    """Tokens per minute of one model, refilled continuously.
+
+    Calls reserve their estimated tokens before they start and settle the difference
+    to their actual usage once it's known, so the budget can go negative after a call
+    that used more than estimated. Callers then wait until it has refilled.
+    """
+
+    def __init__(self, tokens_per_minute: int) -> None:
+        self.tokens_per_minute = tokens_per_minute
+        self.available = float(tokens_per_minute)
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(
+            float(self.tokens_per_minute),
+            self.available + (now - self._updated_at) * self.tokens_per_minute / 60,
+        )
+        self._updated_at = now
+
+    async def reserve(self, tokens: int) -> int:
+        """Wait until the tokens are available and take them. Returns the number taken."""
+        # a call estimated above the whole budget waits for a full minute's worth
+        tokens = min(max(tokens, 0), self.tokens_per_minute)
+        while True:
+            self._refill()
+            if self.available >= tokens:
+                self.available -= tokens
+                return tokens
+            await asyncio.sleep(
+                (tokens - self.available) * 60 / self.tokens_per_minute,
+            )
+
+    def settle(self, tokens: int) -> None:
+        """Take more tokens, or give back unused ones when negative."""
+        self._refill()
+        self.available = min(
+            float(self.tokens_per_minute),
+            self.available - tokens,
+        )
+
+
+class LLMCallSlot:
+    """A permit for one LLM call, held from acquire until release."""
+
+    def __init__(self, provider: str, model: str, reserved_tokens: int) -> None:
+        self.provider = provider
+        self.model = model
+        self.reserved_tokens = reserved_tokens
+        # set by the caller once the response reports its usage
+        self.total_tokens: int | None = None
+
+
+class LLMConcurrencyLimiter:
+    """Per-provider and per-model limits on concurrent LLM calls, plus optional
+    per-model token-per-minute budgets.
+
+    A call holds its model's semaphore, then its provider's, so a model at its limit
+    doesn't tie up provider slots other models of the provider could use. Semaphores
+    and budgets are created lazily for every (provider, model) seen. Must be used from
+    a single event loop.
+    """
+
+    def __init__(
+        self,
+        provider_max_concurrency: int,
+        model_max_concurrency: int,
+        model_tokens_per_minute: int = 0,
+    ) -> None:
+        self.provider_max_concurrency = max(provider_max_concurrency, 1)
+        self.model_max_concurrency = max(model_max_concurrency, 1)
+        self.model_tokens_per_minute = max(model_tokens_per_minute, 0)
+        self._provider_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._model_semaphores: dict[tuple[str, str], asyncio.Semaphore] = {}
+        self._token_budgets: dict[tuple[str, str], _TokenBudget] = {}
+
+    @classmethod
+    def from_env(cls) -> "LLMConcurrencyLimiter":
+        return cls(
+            provider_max_concurrency=int(
+                get_env_var(
+                    constants.GENAI_ENGINE_EXPERIMENT_PROVIDER_MAX_CONCURRENCY_ENV_VAR,
+                    default=str(constants.DEFAULT_EXPERIMENT_PROVIDER_MAX_CONCURRENCY),
+                ),
+            ),
+            model_max_concurrency=int(
+                get_env_var(
+                    constants.GENAI_ENGINE_EXPERIMENT_MODEL_MAX_CONCURRENCY_ENV_VAR,
+                    default=str(constants.DEFAULT_EXPERIMENT_MODEL_MAX_CONCURRENCY),
+                ),
+            ),
+            model_tokens_per_minute=int(
+                get_env_var(
+                    constants.GENAI_ENGINE_EXPERIMENT_MODEL_TOKENS_PER_MINUTE_ENV_VAR,
+                    default=str(constants.DEFAULT_EXPERIMENT_MODEL_TOKENS_PER_MINUTE),
+                ),
+            ),
+        )
+
+    def _provider_semaphore(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._provider_semaphores:
+            self._provider_semaphores[provider] = asyncio.Semaphore(
+                self.provider_max_concurrency,
+            )
+        return self._provider_semaphores[provider]
+
+    def _model_semaphore(self, provider: str, model: str) -> asyncio.Semaphore:
+        key = (provider, model)
+        if key not in self._model_semaphores:
+            self._model_semaphores[key] = asyncio.Semaphore(self.model_max_concurrency)
+        return self._model_semaphores[key]
+
+    def _token_budget(self, provider: str, model: str) -> _TokenBudget | None:
+        if not self.model_tokens_per_minute:
+            return None
+        key = (provider, model)
+        if key not in self._token_budgets:
+            self._token_budgets[key] = _TokenBudget(self.model_tokens_per_minute)
+        return self._token_budgets[key]
+
+    async def acquire(
+        self,
+        provider: str,
+        model: str,
+        estimated_tokens: int = 0,
+    ) -> LLMCallSlot:
+        """Wait until a call to the model may start. The slot must be released."""
+        model_semaphore = self._model_semaphore(provider, model)
+        await model_semaphore.acquire()
+        try:
+            reserved_tokens = 0
+            token_budget = self._token_budget(provider, model)
+            if token_budget is not None:
+                reserved_tokens = await token_budget.reserve(estimated_tokens)
+            try:
+                await self._provider_semaphore(provider).acquire()
+            except BaseException:
+                if token_budget is not None:
+                    token_budget.settle(-reserved_tokens)
+                raise
+        except BaseException:
+            model_semaphore.release()
+            raise
+        return LLMCallSlot(provider, model, reserved_tokens)
+
+    def release(self, slot: LLMCallSlot) -> None:
+        """Free the slot's permits and settle its token usage against the budget."""
+        token_budget = self._token_budget(slot.provider, slot.model)
+        if token_budget is not None and slot.total_tokens is not None:
+            token_budget.settle(slot.total_tokens - slot.reserved_tokens)
+        self._provider_semaphore(slot.provider).release()
+        self._model_semaphore(slot.provider, slot.model).release()
+
+    @asynccontextmanager
+    async def limit(
+        self,
+        provider: str,
+        model: str,
+        estimated_tokens: int = 0,
+    ) -> AsyncIterator[LLMCallSlot]:
+        slot = await self.acquire(provider, model, estimated_tokens)
+        try:
+            yield slot
+        finally:
+            self.release(slot)
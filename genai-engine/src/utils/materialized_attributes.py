@@ -0,0 +1,92 @@
+"""
+Hot span and metric result attributes that are materialized into typed columns.
+
+Filters on these values used to extract them from the JSON of spans.raw_data or
+metric_results.details, which no B-tree index can serve. They are now also written to
+their own indexed columns when a span or metric result is stored, and the
+materialized attribute backfill fills the columns of rows stored before they existed.
+
+Filters keep a JSON fallback for rows whose column is still NULL, so they stay
+correct while the backfill runs. Bump MATERIALIZED_ATTRIBUTES_VERSION when adding an
+attribute here, so the backfill runs again for existing rows.
+"""
+
+from enum import Enum
+from typing import Any
+
+from arthur_common.models.enums import MetricType
+
+from utils.constants import SPAN_KIND_LLM
+
+MATERIALIZED_ATTRIBUTES_VERSION = 1
+
+# spans.model_name of LLM spans, at raw_data.attributes.llm.model_name
+SPAN_MODEL_NAME_PATH = ("attributes", "llm", "model_name")
+
+# metric_results.relevance_score, per metric type
+RELEVANCE_SCORE_PATHS = {
+    MetricType.QUERY_RELEVANCE: ("query_relevance", "llm_relevance_score"),
+    MetricType.RESPONSE_RELEVANCE: ("response_relevance", "llm_relevance_score"),
+}
+
+# metric_results.tool_selection and tool_usage of tool selection metric results
+TOOL_CLASSIFICATION_PATHS = {
+    "tool_selection": ("tool_selection", "tool_selection"),
+    "tool_usage": ("tool_selection", "tool_usage"),
+}
+
+
+def _get_path(obj: Any, path: tuple[str, ...]) -> Any:
+    for key in path:
+        if not isinstance(obj, dict):
+            return None
+        obj = obj.get(key)
+    return obj
+
+
+def _to_float(value: Any) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value: Any) -> int | None:
+    if isinstance(value, Enum):
+        value = value.value
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def span_model_name(
+    raw_data: dict[str, Any] | None,
+    span_kind: str | None,
+) -> str | None:
+    """Model name column value of a span."""
+    if span_kind != SPAN_KIND_LLM:
+        return None
+    model_name = _get_path(raw_data, SPAN_MODEL_NAME_PATH)
+    return str(model_name) if model_name is not None else None
+
+
+def metric_result_columns(
+    metric_type: MetricType | str,
+    details: dict[str, Any] | None,
+) -> dict[str, Any]:
+    """relevance_score, tool_selection and tool_usage column values of a metric result."""
+    metric_type = MetricType(metric_type)
+    columns: dict[str, Any] = {
+        "relevance_score": None,
+        "tool_selection": None,
+        "tool_usage": None,
+    }
+    if metric_type in RELEVANCE_SCORE_PATHS:
+        columns["relevance_score"] = _to_float(
+            _get_path(details, RELEVANCE_SCORE_PATHS[metric_type]),
+        )
+    elif metric_type == MetricType.TOOL_SELECTION:
+        for column, path in TOOL_CLASSIFICATION_PATHS.items():
+            columns[column] = _to_int(_get_path(details, path))
+    return columns
@@ -1,5 +1,8 @@
+from typing import Callable, Iterable
+
 from opentelemetry import metrics
 from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
+from opentelemetry.metrics import CallbackOptions, Observation
 from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
 from opentelemetry.sdk.resources import Resource
@@ -11,6 +14,8 @@ from . import constants
 
 RULE_FAILURE_COUNTER = None
 METRIC_FAILURE_COUNTER = None
+RULE_RESULT_CACHE_HIT_COUNTER = None
+RULE_RESULT_CACHE_MISS_COUNTER = None
 
 if new_relic_enabled():
     service_name: str = get_env_var(constants.NEWRELIC_APP_NAME_ENV_VAR) or ""
@@ -44,3 +49,42 @@ if new_relic_enabled():
         unit="failures",
         description="Number of metric evaluation failures.",
     )
+
+    RULE_RESULT_CACHE_HIT_COUNTER = metrics.get_meter(
+        "opentelemetry.instrumentation.custom",
+    ).create_counter(
+        constants.NEWRELIC_CUSTOM_METRIC_RULE_RESULT_CACHE_HITS,
+        unit="lookups",
+        description="Number of rule evaluations served from the rule result cache.",
+    )
+
+    RULE_RESULT_CACHE_MISS_COUNTER = metrics.get_meter(
+        "opentelemetry.instrumentation.custom",
+    ).create_counter(
+        constants.NEWRELIC_CUSTOM_METRIC_RULE_RESULT_CACHE_MISSES,
+        unit="lookups",
+        description="Number of cacheable rule evaluations that missed the rule result cache.",
+    )
+
+
+def register_observable_gauge(
+    name: str,
+    callback: Callable[[], int | float],
+    unit: str,
+    description: str,
+) -> None:
+    """Reports callback() as a gauge on every metric export, when New Relic is enabled."""
+    if not new_relic_enabled():
+        return
+
+    def observe(_: CallbackOptions) -> Iterable[Observation]:
+        return [Observation(callback())]
+
+    metrics.get_meter(
+        "opentelemetry.instrumentation.custom",
+    ).create_observable_gauge(
+        name,
+        callbacks=[observe],
+        unit=unit,
+        description=description,
+    )
@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Generic, Hashable, TypeVar
+
+from utils import constants
+from utils.utils import get_env_var
+
+logger = logging.getLogger(__name__)
+
+InputT = TypeVar("InputT")
+OutputT = TypeVar("OutputT")
+
+
+def micro_batching_enabled() -> bool:
+    """Check if cross-request micro-batching of ML scorer forward passes is enabled."""
+    enabled = get_env_var(
+        constants.GENAI_ENGINE_MICRO_BATCHING_ENABLED_ENV_VAR,
+        default="false",
+    )
+    return enabled.lower() == "true"
+
+
+def get_micro_batch_max_size() -> int:
+    return int(
+        get_env_var(
+            constants.GENAI_ENGINE_MICRO_BATCH_MAX_SIZE_ENV_VAR,
+            default=str(constants.DEFAULT_MICRO_BATCH_MAX_SIZE),
+        ),
+    )
+
+
+def get_micro_batch_max_wait_ms() -> float:
+    return float(
+        get_env_var(
+            constants.GENAI_ENGINE_MICRO_BATCH_MAX_WAIT_MS_ENV_VAR,
+            default=str(constants.DEFAULT_MICRO_BATCH_MAX_WAIT_MS),
+        ),
+    )
+
+
+class _PendingRequest(Generic[InputT, OutputT]):
+    def __init__(self, items: list[InputT], key: Hashable) -> None:
+        self.items = items
+        self.key = key
+        self.future: Future[list[OutputT]] = Future()
+
+
+class MicroBatcher(Generic[InputT, OutputT]):
+    """Dynamic batching scheduler for a single model.
+
+    Concurrent callers submit lists of inputs (e.g. the text chunks of one rule
+    evaluation). A single scheduler thread collects pending submissions until either
+    max_batch_size inputs are queued or max_wait_ms has elapsed since the first one
+    arrived, runs batch_fn once over the concatenated inputs and fans the outputs back
+    out to each caller in submission order.
+
+    Submissions with different keys are never mixed in one batch, which lets callers
+    batch models whose forward pass depends on per-request arguments (e.g. GLiNER
+    labels).
+
+    When disabled, run() calls batch_fn directly on the caller's thread.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[Hashable, list[InputT]], list[OutputT]],
+        max_batch_size: int,
+        max_wait_ms: float,
+        enabled: bool = True,
+    ) -> None:
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_wait_seconds = max(max_wait_ms, 0) / 1000
+        self.enabled = enabled
+
+        self._pending: list[_PendingRequest[InputT, OutputT]] = []
+        self._condition = threading.Condition()
+        self._scheduler_thread: threading.Thread | None = None
+
+    @classmethod
+    def from_env(
+        cls,
+        name: str,
+        batch_fn: Callable[[Hashable, list[InputT]], list[OutputT]],
+    ) -> "MicroBatcher[InputT, OutputT]":
+        return cls(
+            name=name,
+            batch_fn=batch_fn,
+            max_batch_size=get_micro_batch_max_size(),
+            max_wait_ms=get_micro_batch_max_wait_ms(),
+            enabled=micro_batching_enabled(),
+        )
+
+    def run(self, items: list[InputT], key: Hashable = None) -> list[OutputT]:
+        """Run batch_fn over items, sharing the forward pass with concurrent callers."""
+        if not items:
+            return []
+        if not self.enabled:
+            return self.batch_fn(key, items)
+
+        request: _PendingRequest[InputT, OutputT] = _PendingRequest(items, key)
+        with self._condition:
+            self._ensure_scheduler_started()
+            self._pending.append(request)
+            self._condition.notify()
+        return request.future.result()
+
+    def _ensure_scheduler_started(self) -> None:
+        if self._scheduler_thread is None or not self._scheduler_thread.is_alive():
+            self._scheduler_thread = threading.Thread(
+                target=self._scheduler_loop,
+                name=f"{self.name}-micro-batcher",
+                daemon=True,
+            )
+            self._scheduler_thread.start()
+
+    def _queued_size(self, key: Hashable) -> int:
+        return sum(len(r.items) for r in self._pending if r.key == key)
+
+    def _take_batch(self) -> list[_PendingRequest[InputT, OutputT]]:
+        """Block until a batch is ready and remove it from the pending list.
+
+        Must be called while holding self._condition.
+        """
+        while not self._pending:
+            self._condition.wait()
+
+        key = self._pending[0].key
+        deadline = time.monotonic() + self.max_wait_seconds
+        while self._queued_size(key) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._condition.wait(remaining)
+
+        batch: list[_PendingRequest[InputT, OutputT]] = []
+        batch_size = 0
+        remaining_requests: list[_PendingRequest[InputT, OutputT]] = []
+        for request in self._pending:
+            # always take at least one request so oversized submissions still make progress
+            if request.key == key and (
+                not batch or batch_size + len(request.items) <= self.max_batch_size
+            ):
+                batch.append(request)
+                batch_size += len(request.items)
+            else:
+                remaining_requests.append(request)
+        self._pending = remaining_requests
+        return batch
+
+    def _scheduler_loop(self) -> None:
+        while True:
+            with self._condition:
+                batch = self._take_batch()
+            self._execute_batch(batch)
+
+    def _execute_batch(self, batch: list[_PendingRequest[InputT, OutputT]]) -> None:
+        inputs = [item for request in batch for item in request.items]
+        try:
+            outputs = self.batch_fn(batch[0].key, inputs)
+            if len(outputs) != len(inputs):
+                raise ValueError(
+                    f"{self.name} batch returned {len(outputs)} outputs for {len(inputs)} inputs",
+                )
+        except Exception as e:
+            logger.error(f"{self.name} micro-batch of {len(inputs)} inputs failed: {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        logger.debug(
+            f"{self.name} micro-batch ran {len(inputs)} inputs from {len(batch)} requests",
+        )
+        offset = 0
+        for request in batch:
+            request.future.set_result(outputs[offset : offset + len(request.items)])
+            offset += len(request.items)
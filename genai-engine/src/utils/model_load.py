@@ -7,14 +7,18 @@ from typing import Callable
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
 import requests
+import spacy
 import torch
 from bert_score import BERTScorer
+from date_spacy import find_dates  # noqa: F401 - Import registers the component
 from gliner import GLiNER, GLiNERConfig
 from huggingface_hub import hf_hub_download
 from huggingface_hub.constants import ENDPOINT as DEFAULT_HUGGINGFACE_CO_URL
 from presidio_analyzer import AnalyzerEngine
 from sentence_transformers import SentenceTransformer
+from spacy.language import Language
 from transformers import (
+    AutoConfig,
     AutoModelForSequenceClassification,
     AutoTokenizer,
     TextClassificationPipeline,
@@ -26,6 +30,12 @@ from transformers.tokenization_utils_base import PreTrainedTokenizerBase
 from custom_types import P, T
 from utils import constants
 from utils.classifiers import get_device
+from utils.onnx_classifier import (
+    InferenceBackend,
+    OnnxTextClassificationPipeline,
+    get_inference_backend,
+    load_onnx_text_classifier,
+)
 from utils.utils import (
     get_env_var,
     get_logger,
@@ -84,21 +94,55 @@ def get_local_model_path(model_name: str) -> str:
     return model_name
 
 
+def get_onnx_classifier(
+    model_name: str,
+    model: PreTrainedModel | None,
+    tokenizer: PreTrainedTokenizerBase,
+    top_k: int | None = None,
+) -> OnnxTextClassificationPipeline | None:
+    """Serves model_name through ONNX Runtime when GENAI_ENGINE_CLASSIFIER_BACKEND asks for it.
+
+    Returns None when the torch backend is configured or ONNX Runtime can't be used.
+    Exported / quantized models are stored in the onnx directory of the local model.
+    """
+    backend = get_inference_backend()
+    if backend == InferenceBackend.TORCH:
+        return None
+    if model is not None:
+        config = model.config
+    else:
+        config = AutoConfig.from_pretrained(get_local_model_path(model_name))
+    return load_onnx_text_classifier(
+        model_name,
+        onnx_dir=os.path.join(get_models_dir(), model_name, "onnx"),
+        backend=backend,
+        model=model,
+        tokenizer=tokenizer,
+        config=config,
+        top_k=top_k,
+    )
+
+
 CLAIM_CLASSIFIER_EMBEDDING_MODEL: SentenceTransformer | None = None
 PROMPT_INJECTION_MODEL: PreTrainedModel | None = None
 PROMPT_INJECTION_TOKENIZER: PreTrainedTokenizerBase | None = None
-PROMPT_INJECTION_CLASSIFIER: TextClassificationPipeline | None = None
+PROMPT_INJECTION_CLASSIFIER: (
+    TextClassificationPipeline | OnnxTextClassificationPipeline | None
+) = None
 TOXICITY_MODEL: AutoModelForSequenceClassification | None = None
 TOXICITY_TOKENIZER: PreTrainedTokenizerBase | None = None
 RELEVANCE_MODEL: AutoModelForSequenceClassification | None = None
 RELEVANCE_TOKENIZER: PreTrainedTokenizerBase | None = None
-TOXICITY_CLASSIFIER: TextClassificationPipeline | None = None
+TOXICITY_CLASSIFIER: (
+    TextClassificationPipeline | OnnxTextClassificationPipeline | None
+) = None
 PROFANITY_CLASSIFIER = None
 BERT_SCORER: BERTScorer | None = None
 RELEVANCE_RERANKER: TextClassificationPipeline | None = None
 PII_GLINER_MODEL = None
 PII_GLINER_TOKENIZER: PreTrainedTokenizerBase | None = None
 PII_PRESIDIO_ANALYZER = None
+PII_DATE_SPACY_PIPELINE: Language | None = None
 
 
 def log_model_loading(
@@ -341,7 +385,7 @@ def get_prompt_injection_tokenizer() -> PreTrainedTokenizerBase | None:
 def get_prompt_injection_classifier(
     model: PreTrainedModel | None,
     tokenizer: PreTrainedTokenizerBase | None,
-) -> TextClassificationPipeline | None:
+) -> TextClassificationPipeline | OnnxTextClassificationPipeline | None:
     """Loads in the prompt injection binary classifier"""
     if model is None:
         model = get_prompt_injection_model()
@@ -353,6 +397,12 @@ def get_prompt_injection_classifier(
         return None
 
     global PROMPT_INJECTION_CLASSIFIER
+    if PROMPT_INJECTION_CLASSIFIER is None:
+        PROMPT_INJECTION_CLASSIFIER = get_onnx_classifier(
+            "ProtectAI/deberta-v3-base-prompt-injection-v2",
+            model,
+            tokenizer,
+        )
     if PROMPT_INJECTION_CLASSIFIER is None:
         PROMPT_INJECTION_CLASSIFIER = TextClassificationPipeline(  # type: ignore[no-untyped-call]
             model=model,
@@ -403,7 +453,7 @@ def get_toxicity_tokenizer() -> PreTrainedTokenizerBase | None:
 def get_toxicity_classifier(
     model: AutoModelForSequenceClassification | None,
     tokenizer: PreTrainedTokenizerBase | None,
-) -> TextClassificationPipeline | None:
+) -> TextClassificationPipeline | OnnxTextClassificationPipeline | None:
     if not model:
         model = get_toxicity_model()
     if not tokenizer:
@@ -414,6 +464,13 @@ def get_toxicity_classifier(
         return None
 
     global TOXICITY_CLASSIFIER
+    if TOXICITY_CLASSIFIER is None:
+        TOXICITY_CLASSIFIER = get_onnx_classifier(
+            "s-nlp/roberta_toxicity_classifier",
+            model,  # type: ignore[arg-type]
+            tokenizer,
+            top_k=99999,
+        )
     if TOXICITY_CLASSIFIER is None:
         TOXICITY_CLASSIFIER = pipeline(  # type: ignore[call-overload]
             "text-classification",
@@ -428,13 +485,28 @@ def get_toxicity_classifier(
 
 
 @log_model_loading("profanity classifier", "PROFANITY_CLASSIFIER")
-def get_profanity_classifier() -> TextClassificationPipeline | None:
+def get_profanity_classifier() -> (
+    TextClassificationPipeline | OnnxTextClassificationPipeline | None
+):
     if skip_model_loading():
         logger.info(
             "Skipping profanity classifier - GENAI_ENGINE_SKIP_MODEL_LOADING is True",
         )
         return None
     global PROFANITY_CLASSIFIER
+    if (
+        PROFANITY_CLASSIFIER is None
+        and get_inference_backend() != InferenceBackend.TORCH
+    ):
+        # the model repository ships fp32 and int8 ONNX exports
+        PROFANITY_CLASSIFIER = get_onnx_classifier(
+            "tarekziade/pardonmyai",
+            None,
+            AutoTokenizer.from_pretrained(
+                get_local_model_path("tarekziade/pardonmyai"),
+            ),
+            top_k=99999,
+        )
     if PROFANITY_CLASSIFIER is None:
         model_path = get_local_model_path("tarekziade/pardonmyai")
         PROFANITY_CLASSIFIER = pipeline(
@@ -633,3 +705,15 @@ def get_presidio_analyzer() -> AnalyzerEngine | None:
     if PII_PRESIDIO_ANALYZER is None:
         PII_PRESIDIO_ANALYZER = AnalyzerEngine()
     return PII_PRESIDIO_ANALYZER
+
+
+@log_model_loading("date spacy pipeline", "PII_DATE_SPACY_PIPELINE")
+def get_date_spacy_pipeline() -> Language:
+    """spaCy pipeline with date_spacy used for PII DATE_TIME detection"""
+    global PII_DATE_SPACY_PIPELINE
+    if PII_DATE_SPACY_PIPELINE is None:
+        # Create a minimal pipeline without NER to avoid entity conflicts
+        date_nlp = spacy.load("en_core_web_lg", exclude=["ner"])
+        date_nlp.add_pipe("find_dates")
+        PII_DATE_SPACY_PIPELINE = date_nlp
+    return PII_DATE_SPACY_PIPELINE
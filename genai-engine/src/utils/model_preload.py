@@ -0,0 +1,68 @@
+"""Loads models in the gunicorn master so forked workers share their memory.
+
+With GENAI_ENGINE_PRELOAD_MODELS enabled, the master process downloads and loads
+every model before forking workers. Workers inherit the loaded weights through
+copy-on-write pages instead of each loading their own copy, and the model_load
+getters find them already set, so resident memory no longer grows with the
+number of workers.
+"""
+
+import gc
+import logging
+import time
+
+import torch
+
+from utils import model_load
+from utils.onnx_classifier import InferenceBackend, get_inference_backend
+from utils.utils import relevance_models_enabled
+
+logger = logging.getLogger(__name__)
+
+# torch thread count to restore in the workers, see preload_models
+_WORKER_NUM_THREADS: int | None = None
+
+
+def preload_models() -> None:
+    """Downloads and loads all models into the current (master) process."""
+    global _WORKER_NUM_THREADS
+    start_time = time.time()
+
+    # Keep torch from starting its intra-op thread pool in the master: thread pools
+    # don't survive fork, and workers restore the thread count in init_worker
+    _WORKER_NUM_THREADS = torch.get_num_threads()
+    torch.set_num_threads(1)
+
+    model_load.download_models(1)
+
+    model_load.get_claim_classifier_embedding_model()
+    model_load.get_prompt_injection_model()
+    model_load.get_prompt_injection_tokenizer()
+    model_load.get_toxicity_model()
+    model_load.get_toxicity_tokenizer()
+    # ONNX Runtime sessions own thread pools, so they are only built in the workers
+    if get_inference_backend() == InferenceBackend.TORCH:
+        model_load.get_profanity_classifier()
+    if model_load.USE_PII_MODEL_V2:
+        model_load.get_gliner_tokenizer()
+        model_load.get_gliner_model()
+        model_load.get_date_spacy_pipeline()
+    model_load.get_presidio_analyzer()
+    if relevance_models_enabled():
+        model_load.get_bert_scorer()
+        model_load.get_relevance_reranker()
+
+    # Move everything allocated so far out of the garbage collector's view so that
+    # collections in the workers don't write to, and un-share, those pages
+    gc.collect()
+    gc.freeze()
+    logger.info(
+        f"Preloaded models in the master process in {time.time() - start_time:.1f}s "
+        f"({gc.get_freeze_count()} objects frozen)",
+    )
+
+
+def init_worker() -> None:
+    """Restores per-process settings in a worker forked from a preloaded master."""
+    if _WORKER_NUM_THREADS is not None:
+        torch.set_num_threads(_WORKER_NUM_THREADS)
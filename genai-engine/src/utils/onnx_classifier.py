@@ -0,0 +1,268 @@
+"""ONNX Runtime inference backend for the sequence classification models.
+
+Serves the toxicity, profanity and prompt injection classifiers through ONNX Runtime
+instead of PyTorch, either at full precision or with int8 dynamically quantized
+weights. Quantization also needs the onnx package. When onnxruntime is missing, or a
+model can't be exported or quantized, the classifiers stay on the torch backend.
+"""
+
+import logging
+import os
+from enum import Enum
+from typing import Any
+
+import numpy as np
+import torch
+from transformers import PretrainedConfig, PreTrainedModel
+from transformers.tokenization_utils_base import PreTrainedTokenizerBase
+
+from utils import constants
+from utils.utils import get_env_var
+
+logger = logging.getLogger(__name__)
+
+ONNX_MODEL_FILENAME = "model.onnx"
+ONNX_QUANTIZED_MODEL_FILENAME = "model_quantized.onnx"
+ONNX_OPSET_VERSION = 17
+
+
+class InferenceBackend(str, Enum):
+    TORCH = "torch"
+    ONNX = "onnx"
+    ONNX_INT8 = "onnx_int8"
+
+
+def get_inference_backend() -> InferenceBackend:
+    value = get_env_var(
+        constants.GENAI_ENGINE_CLASSIFIER_BACKEND_ENV_VAR,
+        default=InferenceBackend.TORCH.value,
+    )
+    try:
+        return InferenceBackend(str(value).lower())
+    except ValueError:
+        logger.warning(
+            f"Unknown {constants.GENAI_ENGINE_CLASSIFIER_BACKEND_ENV_VAR} '{value}', "
+            f"using {InferenceBackend.TORCH.value}",
+        )
+        return InferenceBackend.TORCH
+
+
+def onnxruntime_available() -> bool:
+    try:
+        import onnxruntime  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _LogitsOnly(torch.nn.Module):
+    """Exposes only the logits of a sequence classification model for export."""
+
+    def __init__(self, model: PreTrainedModel) -> None:
+        super().__init__()
+        self.model = model
+
+    def forward(
+        self,
+        input_ids: torch.Tensor,
+        attention_mask: torch.Tensor,
+    ) -> torch.Tensor:
+        logits: torch.Tensor = self.model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+        ).logits
+        return logits
+
+
+def export_onnx_model(
+    model: PreTrainedModel,
+    tokenizer: PreTrainedTokenizerBase,
+    output_path: str,
+) -> None:
+    """Exports a sequence classification model to ONNX with dynamic batch and sequence axes."""
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    sample = tokenizer(["onnx export sample"], return_tensors="pt")
+    # export restores the wrapper's training mode afterwards, recursively, so the
+    # wrapper must be in eval mode too or the torch model is left with dropout on
+    wrapper = _LogitsOnly(model).eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapper,
+            (sample["input_ids"], sample["attention_mask"]),
+            output_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"},
+            },
+            opset_version=ONNX_OPSET_VERSION,
+            dynamo=False,
+        )
+
+
+def quantize_onnx_model(input_path: str, output_path: str) -> None:
+    """Writes an int8 dynamically quantized copy of an ONNX model."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(input_path, output_path, weight_type=QuantType.QInt8)
+
+
+def resolve_onnx_model_path(
+    onnx_dir: str,
+    backend: InferenceBackend,
+    model: PreTrainedModel | None,
+    tokenizer: PreTrainedTokenizerBase,
+) -> str:
+    """Returns the ONNX file for backend in onnx_dir, exporting / quantizing it if missing."""
+    fp32_path = os.path.join(onnx_dir, ONNX_MODEL_FILENAME)
+    int8_path = os.path.join(onnx_dir, ONNX_QUANTIZED_MODEL_FILENAME)
+    target_path = int8_path if backend == InferenceBackend.ONNX_INT8 else fp32_path
+    if os.path.exists(target_path):
+        return target_path
+
+    if not os.path.exists(fp32_path):
+        if model is None:
+            raise ValueError(f"No ONNX model at {fp32_path} and no model to export")
+        logger.info(f"Exporting ONNX model to {fp32_path}")
+        export_onnx_model(model, tokenizer, fp32_path)
+    if backend == InferenceBackend.ONNX_INT8:
+        logger.info(f"Quantizing ONNX model to {int8_path}")
+        quantize_onnx_model(fp32_path, int8_path)
+    return target_path
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    result: np.ndarray = shifted / shifted.sum(axis=-1, keepdims=True)
+    return result
+
+
+def _sigmoid(logits: np.ndarray) -> np.ndarray:
+    result: np.ndarray = 1.0 / (1.0 + np.exp(-logits))
+    return result
+
+
+class OnnxTextClassificationPipeline:
+    """Drop-in replacement for the transformers text-classification pipeline on ONNX Runtime.
+
+    Returns the same structure as the pipeline: with top_k set, a list of
+    {"label", "score"} dicts sorted by score for every input; without it, the top
+    label dict for every input.
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        tokenizer: PreTrainedTokenizerBase,
+        config: PretrainedConfig,
+        max_length: int = 512,
+        top_k: int | None = None,
+        batch_size: int = 32,
+    ) -> None:
+        self.session = session
+        self.tokenizer = tokenizer
+        self.id2label = {int(i): label for i, label in config.id2label.items()}
+        self.max_length = max_length
+        self.top_k = top_k
+        self.batch_size = batch_size
+        self.input_names = {model_input.name for model_input in session.get_inputs()}
+        # same rule the transformers pipeline uses to pick its output function
+        self.use_sigmoid = (
+            config.problem_type == "multi_label_classification"
+            or config.num_labels == 1
+        )
+
+    def predict_proba(self, texts: list[str]) -> np.ndarray:
+        """Returns the (len(texts), num_labels) class probabilities."""
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="np",
+        )
+        feed = {
+            name: np.asarray(value, dtype=np.int64)
+            for name, value in encoded.items()
+            if name in self.input_names
+        }
+        logits = self.session.run(None, feed)[0]
+        return _sigmoid(logits) if self.use_sigmoid else _softmax(logits)
+
+    def _format(self, probs: np.ndarray) -> list[dict[str, Any]] | dict[str, Any]:
+        ranked = [
+            {"label": self.id2label[int(i)], "score": float(probs[i])}
+            for i in np.argsort(-probs, kind="stable")
+        ]
+        if self.top_k is None:
+            return ranked[0]
+        return ranked[: self.top_k]
+
+    def __call__(
+        self,
+        inputs: str | list[str],
+        batch_size: int | None = None,
+        **kwargs: Any,
+    ) -> list[Any]:
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        batch_size = batch_size or self.batch_size
+        results: list[Any] = []
+        for start in range(0, len(texts), batch_size):
+            probs = self.predict_proba(texts[start : start + batch_size])
+            results.extend(self._format(row) for row in probs)
+        if isinstance(inputs, str) and self.top_k is not None:
+            return list(results[0])
+        return results
+
+
+def load_onnx_text_classifier(
+    model_name: str,
+    onnx_dir: str,
+    backend: InferenceBackend,
+    model: PreTrainedModel | None,
+    tokenizer: PreTrainedTokenizerBase,
+    config: PretrainedConfig,
+    top_k: int | None = None,
+    max_length: int = 512,
+) -> OnnxTextClassificationPipeline | None:
+    """Builds an ONNX Runtime classifier, or returns None to fall back to torch."""
+    if not onnxruntime_available():
+        logger.warning(
+            f"onnxruntime is not installed, serving {model_name} with torch",
+        )
+        return None
+    import onnxruntime
+
+    try:
+        model_path = resolve_onnx_model_path(onnx_dir, backend, model, tokenizer)
+        session_options = onnxruntime.SessionOptions()
+        intra_op_threads = int(
+            get_env_var(
+                constants.GENAI_ENGINE_ONNX_INTRA_OP_THREADS_ENV_VAR,
+                default="0",
+            )
+            or 0,
+        )
+        if intra_op_threads > 0:
+            session_options.intra_op_num_threads = intra_op_threads
+        session = onnxruntime.InferenceSession(
+            model_path,
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"],
+        )
+    except Exception as e:
+        logger.warning(
+            f"Failed to load {model_name} with ONNX Runtime, serving it with torch: {e}",
+        )
+        return None
+
+    logger.info(f"Serving {model_name} with ONNX Runtime from {model_path}")
+    return OnnxTextClassificationPipeline(
+        session,
+        tokenizer,
+        config,
+        max_length=max_length,
+        top_k=top_k,
+    )
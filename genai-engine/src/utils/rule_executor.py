@@ -0,0 +1,176 @@
+import logging
+import threading
+from concurrent.futures import Future
+from enum import Enum
+from typing import Callable
+
+from arthur_common.models.enums import MetricType, RuleType
+from opentelemetry import trace
+
+from custom_types import P, T
+from utils import constants
+from utils.utils import TracedThreadPoolExecutor, get_env_var
+
+tracer = trace.get_tracer(__name__)
+logger = logging.getLogger(__name__)
+
+
+class ExecutorLane(str, Enum):
+    """Groups of rule / metric types that share a concurrency limit."""
+
+    # regex and keyword matching: cheap, CPU bound
+    PATTERN = "pattern"
+    # local classifier models: CPU / GPU bound forward passes
+    MODEL = "model"
+    # LLM-backed checks: slow, upstream I/O bound
+    LLM = "llm"
+
+
+RULE_TYPE_LANES: dict[RuleType, ExecutorLane] = {
+    RuleType.REGEX: ExecutorLane.PATTERN,
+    RuleType.KEYWORD: ExecutorLane.PATTERN,
+    RuleType.PROMPT_INJECTION: ExecutorLane.MODEL,
+    RuleType.PII_DATA: ExecutorLane.MODEL,
+    RuleType.TOXICITY: ExecutorLane.MODEL,
+    RuleType.MODEL_SENSITIVE_DATA: ExecutorLane.LLM,
+    RuleType.MODEL_HALLUCINATION_V2: ExecutorLane.LLM,
+}
+
+METRIC_TYPE_LANES: dict[MetricType, ExecutorLane] = {
+    MetricType.QUERY_RELEVANCE: ExecutorLane.LLM,
+    MetricType.RESPONSE_RELEVANCE: ExecutorLane.LLM,
+    MetricType.TOOL_SELECTION: ExecutorLane.LLM,
+}
+
+
+def get_lane_max_workers(lane: ExecutorLane) -> int:
+    match lane:
+        case ExecutorLane.LLM:
+            env_var = constants.GENAI_ENGINE_LLM_RULE_MAX_WORKERS_ENV_VAR
+            default = constants.DEFAULT_LLM_RULE_MAX_WORKERS
+        case ExecutorLane.MODEL:
+            env_var = constants.GENAI_ENGINE_MODEL_RULE_MAX_WORKERS_ENV_VAR
+            default = constants.DEFAULT_THREAD_POOL_MAX_WORKERS
+        case _:
+            env_var = constants.GENAI_ENGINE_THREAD_POOL_MAX_WORKERS_ENV_VAR
+            default = constants.DEFAULT_THREAD_POOL_MAX_WORKERS
+    return max(int(get_env_var(env_var, default=str(default))), 1)
+
+
+class _LaneStats:
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+
+
+class RuleExecutorPool:
+    """Process-wide, bounded executor for rule and metric evaluation.
+
+    Each ExecutorLane gets its own long-lived TracedThreadPoolExecutor, so the number
+    of concurrent evaluations of one kind is capped independently of the others and a
+    backlog of slow LLM checks can't starve regex or classifier rules. Pools are
+    created lazily on first use and reused across requests.
+    """
+
+    def __init__(self, lane_max_workers: dict[ExecutorLane, int] | None = None):
+        self._lane_max_workers = lane_max_workers or {
+            lane: get_lane_max_workers(lane) for lane in ExecutorLane
+        }
+        self._executors: dict[ExecutorLane, TracedThreadPoolExecutor] = {}
+        self._stats = {
+            lane: _LaneStats(self._lane_max_workers[lane]) for lane in ExecutorLane
+        }
+        self._lock = threading.Lock()
+
+    def _get_executor(self, lane: ExecutorLane) -> TracedThreadPoolExecutor:
+        with self._lock:
+            if lane not in self._executors:
+                self._executors[lane] = TracedThreadPoolExecutor(
+                    tracer,
+                    max_workers=self._lane_max_workers[lane],
+                    thread_name_prefix=f"rule-executor-{lane.value}",
+                )
+            return self._executors[lane]
+
+    def submit(
+        self,
+        lane: ExecutorLane,
+        fn: Callable[P, T],
+        /,
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> Future[T]:
+        """Submit an evaluation to the pool for its lane."""
+        stats = self._stats[lane]
+
+        def run() -> T:
+            with self._lock:
+                stats.queued -= 1
+                stats.active += 1
+            succeeded = False
+            try:
+                result = fn(*args, **kwargs)
+                succeeded = True
+                return result
+            finally:
+                with self._lock:
+                    stats.active -= 1
+                    if succeeded:
+                        stats.completed += 1
+                    else:
+                        stats.failed += 1
+
+        executor = self._get_executor(lane)
+        with self._lock:
+            stats.queued += 1
+            if stats.queued > stats.max_workers:
+                logger.debug(
+                    f"{stats.queued} evaluations queued on the {lane.value} rule executor lane "
+                    f"({stats.active}/{stats.max_workers} workers busy)",
+                )
+        return executor.submit(run)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Returns a snapshot of worker limits and queue depth for every lane."""
+        with self._lock:
+            return {
+                lane.value: {
+                    "max_workers": stats.max_workers,
+                    "queued": stats.queued,
+                    "active": stats.active,
+                    "completed": stats.completed,
+                    "failed": stats.failed,
+                }
+                for lane, stats in self._stats.items()
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executors = list(self._executors.values())
+            self._executors = {}
+        for executor in executors:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+RULE_EXECUTOR_POOL: RuleExecutorPool | None = None
+_rule_executor_pool_lock = threading.Lock()
+
+
+def get_rule_executor_pool() -> RuleExecutorPool:
+    global RULE_EXECUTOR_POOL
+    with _rule_executor_pool_lock:
+        if RULE_EXECUTOR_POOL is None:
+            RULE_EXECUTOR_POOL = RuleExecutorPool()
+        return RULE_EXECUTOR_POOL
+
+
+def shutdown_rule_executor_pool() -> None:
+    """Shutdown the global rule executor pool."""
+    global RULE_EXECUTOR_POOL
+    with _rule_executor_pool_lock:
+        if RULE_EXECUTOR_POOL is not None:
+            RULE_EXECUTOR_POOL.shutdown(wait=True)
+            RULE_EXECUTOR_POOL = None
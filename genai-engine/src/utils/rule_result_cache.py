@@ -0,0 +1,123 @@
+import hashlib
+import logging
+import threading
+
+from arthur_common.models.enums import RuleResultEnum, RuleType
+from cachetools import TTLCache
+
+from config.cache_config import cache_config
+from schemas.internal_schemas import Rule
+from schemas.scorer_schemas import RuleScore
+from utils import metric_counters
+
+logger = logging.getLogger(__name__)
+
+# Rule types whose score depends only on the rule config and the scored text.
+# LLM-backed rules are excluded: their output isn't reproducible and they consume tokens.
+DETERMINISTIC_RULE_TYPES = frozenset(
+    {
+        RuleType.REGEX,
+        RuleType.KEYWORD,
+        RuleType.PII_DATA,
+        RuleType.TOXICITY,
+        RuleType.PROMPT_INJECTION,
+    },
+)
+
+# (rule id, rule config hash, scoring text hash)
+RuleResultKey = tuple[str, str, str]
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def get_rule_config_hash(rule: Rule) -> str:
+    """Stable hash of everything in a rule that affects how it scores text."""
+    config = sorted((data.data_type.value, data.data) for data in rule.rule_data)
+    return _sha256(repr((rule.type.value, config)))
+
+
+class RuleResultCache:
+    """Content-addressed cache of deterministic rule scores.
+
+    Entries are keyed by (rule id, rule config hash, scoring text hash) and stored as
+    serialized RuleScores, so each hit hands out a fresh object and the memory budget
+    is accounted in bytes. Entries expire after ttl seconds and the least recently used
+    ones are evicted once max_bytes is exceeded.
+    """
+
+    def __init__(self, max_bytes: int, ttl: int, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._cache: TTLCache[RuleResultKey, bytes] = TTLCache(
+            maxsize=max_bytes,
+            ttl=ttl,
+            getsizeof=len,
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def is_cacheable(rule: Rule) -> bool:
+        return rule.type in DETERMINISTIC_RULE_TYPES
+
+    @staticmethod
+    def make_key(rule: Rule, scoring_text: str | None) -> RuleResultKey:
+        return rule.id, get_rule_config_hash(rule), _sha256(scoring_text or "")
+
+    def get(self, key: RuleResultKey) -> RuleScore | None:
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if cached is None:
+            if metric_counters.RULE_RESULT_CACHE_MISS_COUNTER is not None:
+                metric_counters.RULE_RESULT_CACHE_MISS_COUNTER.add(1)
+            return None
+        if metric_counters.RULE_RESULT_CACHE_HIT_COUNTER is not None:
+            metric_counters.RULE_RESULT_CACHE_HIT_COUNTER.add(1)
+        return RuleScore.model_validate_json(cached)
+
+    def put(self, key: RuleResultKey, score: RuleScore) -> None:
+        # only definitive results, unavailable models and failures are transient
+        if score.result not in (RuleResultEnum.PASS, RuleResultEnum.FAIL):
+            return
+        serialized = score.model_dump_json().encode("utf-8")
+        with self._lock:
+            try:
+                self._cache[key] = serialized
+            except ValueError:
+                logger.debug(
+                    f"Rule score of {len(serialized)} bytes exceeds the rule result cache budget",
+                )
+
+    def invalidate_rule(self, rule_id: str) -> None:
+        """Drops every cached score for rule_id."""
+        with self._lock:
+            for key in [key for key in self._cache.keys() if key[0] == rule_id]:
+                self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            self._cache.expire()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._cache),
+                "bytes": int(self._cache.currsize),
+                "max_bytes": int(self._cache.maxsize),
+            }
+
+
+RULE_RESULT_CACHE = RuleResultCache(
+    max_bytes=cache_config.RULE_RESULTS_CACHE_MAX_BYTES,
+    ttl=cache_config.RULE_RESULTS_CACHE_TTL,
+    enabled=cache_config.RULE_RESULTS_CACHE_ENABLED,
+)
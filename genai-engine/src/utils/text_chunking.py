@@ -1,4 +1,33 @@
-from transformers import PreTrainedTokenizerBase
+from transformers import BatchEncoding, PreTrainedTokenizerBase
+
+
+def tokenize_for_chunking(
+    text: str,
+    tokenizer: PreTrainedTokenizerBase,
+) -> BatchEncoding:
+    """Tokenizes text with the offsets and word ids the chunk iterators need"""
+    return tokenizer(
+        text,
+        return_offsets_mapping=True,
+        add_special_tokens=False,
+    )
+
+
+def chunk_text_by_sizes(
+    text: str,
+    tokenizer: PreTrainedTokenizerBase,
+    chunk_sizes: list[int],
+) -> list[list[str]]:
+    """Chunks text once per chunk size from a single tokenization of the text
+
+    Returns:
+        list[list[str]]: the chunks for each entry in chunk_sizes, in the same order
+    """
+    encoding = tokenize_for_chunking(text, tokenizer)
+    return [
+        list(ChunkIterator(text, tokenizer, chunk_size, encoding=encoding))
+        for chunk_size in chunk_sizes
+    ]
 
 
 class ChunkIterator:
@@ -9,6 +38,8 @@ class ChunkIterator:
         text: The input text to be chunked
         tokenizer: The tokenizer used to extract encodings
         chunk_size: Maximum number of word tokens per chunk
+        encoding: Precomputed encoding of text (see tokenize_for_chunking), lets several
+            chunk sizes share a single tokenizer call
     """
 
     def __init__(
@@ -16,10 +47,12 @@ class ChunkIterator:
         text: str,
         tokenizer: PreTrainedTokenizerBase,
         chunk_size: int,
+        encoding: BatchEncoding | None = None,
     ) -> None:
         self.tokenizer = tokenizer
         self.chunk_size = chunk_size
         self.text = text
+        self.encoding = encoding
 
         self.setup_text()
 
@@ -33,11 +66,9 @@ class ChunkIterator:
          - extracting token IDs, offset mappings, and word IDs
          - initializing tracking variables
         """
-        encoding = self.tokenizer(
-            self.text,
-            return_offsets_mapping=True,
-            add_special_tokens=False,
-        )
+        encoding = self.encoding
+        if encoding is None:
+            encoding = tokenize_for_chunking(self.text, self.tokenizer)
 
         # the IDs for each token in the text
         self.token_ids = encoding["input_ids"]
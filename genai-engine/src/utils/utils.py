@@ -59,6 +59,17 @@ def relevance_models_enabled() -> bool:
     return False
 
 
+def preload_models_enabled() -> bool:
+    """Check if models are loaded in the gunicorn master before forking workers."""
+    return (
+        get_env_var(
+            constants.GENAI_ENGINE_PRELOAD_MODELS_ENV_VAR,
+            default="false",
+        ).lower()
+        == "true"
+    )
+
+
 def skip_model_loading() -> bool:
     """Check if model downloading and loading should be skipped."""
     if skip_loading := get_env_var(
@@ -100,8 +111,12 @@ class TracedThreadPoolExecutor(ThreadPoolExecutor):
         context: otel_context.Context,
         fn: Callable[..., T],
     ) -> T:
-        otel_context.attach(context)
-        return fn()
+        # detach afterwards so long-lived pool threads don't keep a stale context
+        token = otel_context.attach(context)
+        try:
+            return fn()
+        finally:
+            otel_context.detach(token)
 
     # "/" marker in function signature is to enforce positional-only arguments
     def submit(
@@ -3,7 +3,7 @@ from arthur_common.models.response_schemas import ValidationResult
 from sqlalchemy.orm import Session
 
 from repositories.inference_repository import InferenceRepository
-from rules_engine import RuleEngine
+from rules_engine import get_rule_engine
 from schemas.internal_schemas import Rule, ValidationRequest
 from scorer.score import ScorerClient
 from services.trace.guardrail_span_emitter import guardrail_span
@@ -47,7 +47,10 @@ def validate_response(
         user_id=inference.user_id,
         session_id=inference.conversation_id,
     ) as gspan:
-        rule_results = RuleEngine(scorer_client).evaluate(validation_request, rules)
+        rule_results = get_rule_engine(scorer_client).evaluate(
+            validation_request,
+            rules,
+        )
         gspan.set_rule_results(rule_results)
 
     inference_response = inference_repo.save_response(
@@ -2254,6 +2254,8 @@ class GenaiEngineTestClientBase(httpx.Client):
         trace_duration_gte: float | None = None,
         trace_duration_lt: float | None = None,
         trace_duration_lte: float | None = None,
+        cursor: str | None = None,
+        include_count: bool | None = None,
     ) -> tuple[int, TraceListResponse | str]:
         """Get lightweight trace metadata for browsing/filtering operations.
 
@@ -2327,6 +2329,10 @@ class GenaiEngineTestClientBase(httpx.Client):
             params["trace_duration_lt"] = trace_duration_lt
         if trace_duration_lte is not None:
             params["trace_duration_lte"] = trace_duration_lte
+        if cursor is not None:
+            params["cursor"] = cursor
+        if include_count is not None:
+            params["include_count"] = include_count
 
         resp = self.base_client.get(
             f"/api/v1/traces?{urllib.parse.urlencode(params, doseq=True)}",
@@ -2530,6 +2536,8 @@ class GenaiEngineTestClientBase(httpx.Client):
         trace_duration_gte: float | None = None,
         trace_duration_lt: float | None = None,
         trace_duration_lte: float | None = None,
+        cursor: str | None = None,
+        include_count: bool | None = None,
     ) -> tuple[int, SpanListResponse | str]:
         """Get lightweight span metadata with comprehensive filtering support.
 
@@ -2622,6 +2630,10 @@ class GenaiEngineTestClientBase(httpx.Client):
             params["trace_duration_lt"] = trace_duration_lt
         if trace_duration_lte is not None:
             params["trace_duration_lte"] = trace_duration_lte
+        if cursor is not None:
+            params["cursor"] = cursor
+        if include_count is not None:
+            params["include_count"] = include_count
 
         resp = self.base_client.get(
             f"/api/v1/traces/spans?{urllib.parse.urlencode(params, doseq=True)}",
@@ -2,7 +2,6 @@ import uuid
 from datetime import datetime
 from typing import Optional
 from unittest.mock import MagicMock, patch
-from utils.constants import DEFAULT_ORG_ID
 
 import pytest
 from arthur_common.models.enums import AgenticAnnotationType, ContinuousEvalRunStatus
@@ -25,6 +24,7 @@ from tests.clients.base_test_client import (
     GenaiEngineTestClientBase,
     override_get_db_session,
 )
+from utils.constants import DEFAULT_ORG_ID
 
 
 def mock_get_db_session_generator():
@@ -1496,10 +1496,12 @@ def test_only_enabled_continuous_evals_are_enqueued(
     repo.enqueue_continuous_evals_for_root_spans(root_spans, delay_seconds=0)
 
     # Verify that only one job was enqueued (for the enabled continuous eval)
-    assert mock_queue_service.enqueue.call_count == 1
+    assert mock_queue_service.enqueue_many.call_count == 1
+    enqueued_jobs = mock_queue_service.enqueue_many.call_args[0][0]
+    assert len(enqueued_jobs) == 1
 
     # Verify the enqueued job is for the enabled continuous eval
-    enqueued_job = mock_queue_service.enqueue.call_args[0][0]
+    enqueued_job = enqueued_jobs[0]
     assert enqueued_job.continuous_eval_id == enabled_continuous_eval.id
     assert enqueued_job.trace_id == test_data["trace_id"]
     assert enqueued_job.task_id == agentic_task.id
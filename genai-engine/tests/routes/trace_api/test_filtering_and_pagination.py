@@ -7,13 +7,13 @@ from arthur_common.models.enums import AgenticAnnotationType, ContinuousEvalRunS
 
 from db_models.agentic_annotation_models import DatabaseAgenticAnnotation
 from db_models.llm_eval_models import DatabaseContinuousEval
-from utils.constants import DEFAULT_ORG_ID
 from schemas.internal_schemas import AgenticAnnotation
 from schemas.request_schemas import AgenticAnnotationRequest
 from tests.clients.base_test_client import (
     GenaiEngineTestClientBase,
     override_get_db_session,
 )
+from utils.constants import DEFAULT_ORG_ID
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -229,6 +229,51 @@ def test_trace_metadata_pagination(
     assert first_page_ids.isdisjoint(second_page_ids)
 
 
+@pytest.mark.unit_tests
+def test_trace_metadata_cursor_pagination(
+    client: GenaiEngineTestClientBase,
+    comprehensive_test_data,
+):
+    """Test that following next_cursor returns the same traces as one large page."""
+    status_code, data = client.trace_api_list_traces_metadata(
+        task_ids=["api_task1", "api_task2"],
+        page_size=100,
+    )
+    assert status_code == 200
+    expected_ids = [trace.trace_id for trace in data.traces]
+
+    paged_ids = []
+    cursors = []
+    cursor = None
+    while True:
+        status_code, data = client.trace_api_list_traces_metadata(
+            task_ids=["api_task1", "api_task2"],
+            page_size=3,
+            cursor=cursor,
+            include_count=False,
+        )
+        assert status_code == 200
+        assert data.count == -1
+        paged_ids.extend(trace.trace_id for trace in data.traces)
+        cursor = data.next_cursor
+        if cursor is None:
+            break
+        cursors.append(cursor)
+
+    assert cursors
+    assert paged_ids == expected_ids
+
+    # cursors only continue the order they were issued for
+    for bad_cursor in [cursors[0], "not-a-cursor"]:
+        status_code, _ = client.trace_api_list_traces_metadata(
+            task_ids=["api_task1", "api_task2"],
+            page_size=3,
+            sort="asc",
+            cursor=bad_cursor,
+        )
+        assert status_code == 400
+
+
 @pytest.mark.unit_tests
 def test_trace_metadata_sorting(
     client: GenaiEngineTestClientBase,
@@ -859,6 +904,41 @@ def test_span_metadata_pagination(
     assert single_ids == paginated_ids
 
 
+@pytest.mark.unit_tests
+def test_span_metadata_cursor_pagination(
+    client: GenaiEngineTestClientBase,
+    comprehensive_test_data,
+):
+    """Test that following next_cursor returns the same spans as one large page."""
+    status_code, spans_response = client.trace_api_list_spans_metadata(
+        task_ids=["api_task1", "api_task2"],
+        page_size=100,
+        sort="asc",
+    )
+    assert status_code == 200
+    expected_ids = [span.span_id for span in spans_response.spans]
+
+    paged_ids = []
+    status_code, data = client.trace_api_list_spans_metadata(
+        task_ids=["api_task1", "api_task2"],
+        page_size=2,
+        sort="asc",
+    )
+    while True:
+        assert status_code == 200
+        paged_ids.extend(span.span_id for span in data.spans)
+        if data.next_cursor is None:
+            break
+        status_code, data = client.trace_api_list_spans_metadata(
+            task_ids=["api_task1", "api_task2"],
+            page_size=2,
+            sort="asc",
+            cursor=data.next_cursor,
+        )
+
+    assert paged_ids == expected_ids
+
+
 @pytest.mark.unit_tests
 def test_span_metadata_filter_validation_edge_cases(
     client: GenaiEngineTestClientBase,
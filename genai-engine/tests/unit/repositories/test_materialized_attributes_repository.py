@@ -0,0 +1,152 @@
+"""Unit tests for the materialized attribute backfill."""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from arthur_common.models.enums import MetricType, ToolClassEnum
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from db_models import DatabaseMetric, DatabaseMetricResult, DatabaseSpan, DatabaseTask
+from repositories.materialized_attributes_repository import (
+    backfill_metric_result_columns,
+    backfill_span_model_names,
+)
+from tests.clients.base_test_client import override_get_db_session
+from utils.constants import DEFAULT_ORG_ID, SPAN_KIND_LLM
+from utils.materialized_attributes import metric_result_columns, span_model_name
+
+
+def _run_backfill(db_session: Session, backfill_batch) -> None:
+    last_id = None
+    while (last_id := backfill_batch(db_session, last_id, batch_size=2)) is not None:
+        db_session.commit()
+
+
+@pytest.mark.unit_tests
+def test_materialized_values_are_extracted_from_json() -> None:
+    raw_data = {"attributes": {"llm": {"model_name": "gpt-4o"}}}
+    assert span_model_name(raw_data, SPAN_KIND_LLM) == "gpt-4o"
+    assert span_model_name(raw_data, "TOOL") is None
+
+    assert metric_result_columns(
+        MetricType.RESPONSE_RELEVANCE,
+        {"response_relevance": {"llm_relevance_score": 0.75}},
+    ) == {"relevance_score": 0.75, "tool_selection": None, "tool_usage": None}
+    assert metric_result_columns(
+        MetricType.TOOL_SELECTION,
+        {
+            "tool_selection": {
+                "tool_selection": ToolClassEnum.CORRECT,
+                "tool_usage": ToolClassEnum.INCORRECT,
+            },
+        },
+    ) == {
+        "relevance_score": None,
+        "tool_selection": ToolClassEnum.CORRECT.value,
+        "tool_usage": ToolClassEnum.INCORRECT.value,
+    }
+    assert (
+        metric_result_columns(MetricType.QUERY_RELEVANCE, None)["relevance_score"]
+        is None
+    )
+
+
+@pytest.mark.unit_tests
+def test_backfill_fills_columns_of_existing_rows() -> None:
+    db_session: Session = override_get_db_session()
+    now = datetime.now(timezone.utc)
+    task_id = str(uuid.uuid4())
+    metric_id = str(uuid.uuid4())
+    db_session.add(
+        DatabaseTask(
+            id=task_id,
+            name=f"materialized_attributes_test_{task_id[:8]}",
+            created_at=now,
+            updated_at=now,
+            is_agentic=True,
+            archived=False,
+            org_id=DEFAULT_ORG_ID,
+        ),
+    )
+    db_session.add(
+        DatabaseMetric(
+            id=metric_id,
+            type=MetricType.QUERY_RELEVANCE.value,
+            name="test_metric",
+            metric_metadata="{}",
+        ),
+    )
+    db_session.commit()
+
+    span_ids = [str(uuid.uuid4()) for _ in range(3)]
+    for index, span_id in enumerate(span_ids):
+        db_session.add(
+            DatabaseSpan(
+                id=span_id,
+                trace_id=str(uuid.uuid4()),
+                span_id=span_id,
+                span_kind=SPAN_KIND_LLM,
+                start_time=now,
+                end_time=now,
+                task_id=task_id,
+                org_id=DEFAULT_ORG_ID,
+                raw_data={"attributes": {"llm": {"model_name": f"model-{index}"}}},
+                status_code="Unset",
+            ),
+        )
+    db_session.commit()
+
+    metric_result_ids = [str(uuid.uuid4()) for _ in range(2)]
+    for metric_result_id, metric_type, details in [
+        (
+            metric_result_ids[0],
+            MetricType.QUERY_RELEVANCE,
+            {"query_relevance": {"llm_relevance_score": 0.4}},
+        ),
+        (
+            metric_result_ids[1],
+            MetricType.TOOL_SELECTION,
+            {"tool_selection": {"tool_selection": 1, "tool_usage": 0}},
+        ),
+    ]:
+        db_session.add(
+            DatabaseMetricResult(
+                id=metric_result_id,
+                metric_type=metric_type.value,
+                details=details,
+                prompt_tokens=0,
+                completion_tokens=0,
+                latency_ms=0,
+                span_id=span_ids[0],
+                metric_id=metric_id,
+            ),
+        )
+    db_session.commit()
+
+    try:
+        _run_backfill(db_session, backfill_span_model_names)
+        _run_backfill(db_session, backfill_metric_result_columns)
+        db_session.expire_all()
+
+        for index, span_id in enumerate(span_ids):
+            assert db_session.get(DatabaseSpan, span_id).model_name == f"model-{index}"
+
+        relevance = db_session.get(DatabaseMetricResult, metric_result_ids[0])
+        assert relevance.relevance_score == pytest.approx(0.4)
+        assert relevance.tool_selection is None
+        tool_selection = db_session.get(DatabaseMetricResult, metric_result_ids[1])
+        assert tool_selection.relevance_score is None
+        assert (tool_selection.tool_selection, tool_selection.tool_usage) == (1, 0)
+    finally:
+        db_session.execute(
+            delete(DatabaseMetricResult).where(
+                DatabaseMetricResult.id.in_(metric_result_ids),
+            ),
+        )
+        db_session.execute(delete(DatabaseSpan).where(DatabaseSpan.id.in_(span_ids)))
+        db_session.execute(delete(DatabaseMetric).where(DatabaseMetric.id == metric_id))
+        db_session.execute(delete(DatabaseTask).where(DatabaseTask.id == task_id))
+        db_session.commit()
+        db_session.close()
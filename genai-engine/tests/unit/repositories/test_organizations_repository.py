@@ -326,3 +326,41 @@ async def test_llm_client_acompletion_blocks_exhausted_org(
 
     assert exc_info.value.status_code == 429
     mock_acompletion.assert_not_called()
+
+
+@pytest.mark.unit_tests
+@pytest.mark.asyncio
+@patch("clients.llm.llm_client.record_org_token_usage")
+@patch("clients.llm.llm_client.enforce_token_quota")
+@patch("clients.llm.llm_client.litellm.acompletion")
+async def test_llm_client_acompletion_meters_through_run_sync(
+    mock_acompletion,
+    mock_enforce,
+    mock_record,
+):
+    """With run_sync, the blocking quota check and usage write run through it."""
+    from litellm.types.utils import ModelResponse
+
+    mock_response = MagicMock(spec=ModelResponse)
+    mock_response.usage = MagicMock(total_tokens=42)
+    mock_acompletion.return_value = mock_response
+    org_id = uuid.uuid4()
+    ran_sync = []
+
+    async def run_sync(fn, /, *args, **kwargs):
+        ran_sync.append(fn)
+        return fn(*args, **kwargs)
+
+    llm_client = LLMClient(provider=ModelProvider.OPENAI, api_key="test-key")
+    response = await llm_client.acompletion(
+        model="openai/gpt-4o",
+        messages=[{"role": "user", "content": "hi"}],
+        org_id=org_id,
+        run_sync=run_sync,
+    )
+
+    assert response is mock_response
+    assert ran_sync == [mock_enforce, llm_client.record_token_usage]
+    mock_enforce.assert_called_once_with(org_id)
+    mock_record.assert_called_once_with(org_id, 42)
+    assert "run_sync" not in mock_acompletion.call_args.kwargs
@@ -0,0 +1,211 @@
+"""Unit tests for the durable queue backend's job repository."""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from db_models import DatabaseQueueJob
+from repositories.queue_job_repository import (
+    NewQueueJob,
+    claim_queue_jobs,
+    extend_queue_job_leases,
+    finish_queue_job,
+    insert_queue_jobs,
+    release_queue_jobs,
+)
+from tests.clients.base_test_client import override_get_db_session
+
+
+@pytest.fixture
+def queue_name():
+    name = f"test_queue_{uuid.uuid4().hex[:8]}"
+    yield name
+    db_session: Session = override_get_db_session()
+    db_session.execute(
+        delete(DatabaseQueueJob).where(DatabaseQueueJob.queue_name == name),
+    )
+    db_session.commit()
+    db_session.close()
+
+
+def _new_job(key: str, priority: int = 0, delay_seconds: int = 0) -> NewQueueJob:
+    return NewQueueJob(
+        job_key=key,
+        payload={"key": key},
+        visible_at=datetime.now() + timedelta(seconds=delay_seconds),
+        priority=priority,
+    )
+
+
+def _expire_leases(db_session: Session, queue_name: str) -> None:
+    db_session.execute(
+        update(DatabaseQueueJob)
+        .where(DatabaseQueueJob.queue_name == queue_name)
+        .values(visible_at=datetime.now() - timedelta(seconds=1)),
+    )
+    db_session.commit()
+
+
+@pytest.mark.unit_tests
+def test_insert_skips_keys_already_queued(queue_name: str) -> None:
+    db_session: Session = override_get_db_session()
+    try:
+        assert insert_queue_jobs(db_session, queue_name, [_new_job("a")]) == 1
+        assert (
+            insert_queue_jobs(
+                db_session,
+                queue_name,
+                [_new_job("a"), _new_job("b"), _new_job("b")],
+            )
+            == 1
+        )
+        db_session.commit()
+
+        keys = db_session.scalars(
+            select(DatabaseQueueJob.job_key).where(
+                DatabaseQueueJob.queue_name == queue_name,
+            ),
+        ).all()
+        assert sorted(keys) == ["a", "b"]
+    finally:
+        db_session.close()
+
+
+@pytest.mark.unit_tests
+def test_claims_visible_jobs_by_priority(queue_name: str) -> None:
+    db_session: Session = override_get_db_session()
+    try:
+        insert_queue_jobs(
+            db_session,
+            queue_name,
+            [
+                _new_job("low"),
+                _new_job("high", priority=10),
+                _new_job("later", priority=20, delay_seconds=3600),
+            ],
+        )
+        db_session.commit()
+
+        claimed = claim_queue_jobs(db_session, queue_name, 1, 60, 5)
+        db_session.commit()
+        assert [job.job_key for job in claimed] == ["high"]
+        assert claimed[0].payload == {"key": "high"}
+        assert claimed[0].attempts == 1
+
+        claimed = claim_queue_jobs(db_session, queue_name, 10, 60, 5)
+        db_session.commit()
+        # leased and not yet due jobs aren't visible
+        assert [job.job_key for job in claimed] == ["low"]
+        assert claim_queue_jobs(db_session, queue_name, 10, 60, 5) == []
+    finally:
+        db_session.close()
+
+
+@pytest.mark.unit_tests
+def test_concurrent_claims_get_different_jobs(queue_name: str) -> None:
+    first_session: Session = override_get_db_session()
+    second_session: Session = override_get_db_session()
+    try:
+        insert_queue_jobs(
+            first_session,
+            queue_name,
+            [_new_job(f"job-{i}") for i in range(4)],
+        )
+        first_session.commit()
+
+        # the first claim's row locks are held until it commits
+        first = claim_queue_jobs(first_session, queue_name, 2, 60, 5)
+        if first_session.get_bind().dialect.name != "postgresql":
+            first_session.commit()
+        second = claim_queue_jobs(second_session, queue_name, 10, 60, 5)
+        first_session.commit()
+        second_session.commit()
+
+        first_keys = {job.job_key for job in first}
+        second_keys = {job.job_key for job in second}
+        assert len(first_keys) == 2
+        assert first_keys.isdisjoint(second_keys)
+        assert first_keys | second_keys == {f"job-{i}" for i in range(4)}
+    finally:
+        first_session.close()
+        second_session.close()
+
+
+@pytest.mark.unit_tests
+def test_expired_leases_are_claimed_again_and_fence_the_old_holder(
+    queue_name: str,
+) -> None:
+    db_session: Session = override_get_db_session()
+    try:
+        insert_queue_jobs(db_session, queue_name, [_new_job("a")])
+        [first] = claim_queue_jobs(db_session, queue_name, 1, 60, 5)
+        db_session.commit()
+
+        assert extend_queue_job_leases(db_session, [first.lease_id], 60) == 1
+        db_session.commit()
+        assert claim_queue_jobs(db_session, queue_name, 1, 60, 5) == []
+
+        # the first holder died: its lease expires and the job is claimed again
+        _expire_leases(db_session, queue_name)
+        [second] = claim_queue_jobs(db_session, queue_name, 1, 60, 5)
+        db_session.commit()
+        assert second.id == first.id
+        assert second.attempts == 2
+        assert second.lease_id != first.lease_id
+
+        # only the current holder can extend or finish it
+        assert extend_queue_job_leases(db_session, [first.lease_id], 60) == 0
+        assert not finish_queue_job(db_session, first)
+        assert finish_queue_job(db_session, second)
+        db_session.commit()
+        assert db_session.get(DatabaseQueueJob, first.id) is None
+    finally:
+        db_session.close()
+
+
+@pytest.mark.unit_tests
+def test_jobs_are_dropped_after_max_attempts(queue_name: str) -> None:
+    db_session: Session = override_get_db_session()
+    try:
+        insert_queue_jobs(db_session, queue_name, [_new_job("a")])
+        db_session.commit()
+        for _ in range(2):
+            assert len(claim_queue_jobs(db_session, queue_name, 1, 60, 2)) == 1
+            db_session.commit()
+            _expire_leases(db_session, queue_name)
+
+        assert claim_queue_jobs(db_session, queue_name, 1, 60, 2) == []
+        db_session.commit()
+        assert (
+            db_session.scalar(
+                select(DatabaseQueueJob.id).where(
+                    DatabaseQueueJob.queue_name == queue_name,
+                ),
+            )
+            is None
+        )
+    finally:
+        db_session.close()
+
+
+@pytest.mark.unit_tests
+def test_released_jobs_are_visible_again_without_using_an_attempt(
+    queue_name: str,
+) -> None:
+    db_session: Session = override_get_db_session()
+    try:
+        insert_queue_jobs(db_session, queue_name, [_new_job("a")])
+        claimed = claim_queue_jobs(db_session, queue_name, 1, 60, 5)
+        db_session.commit()
+
+        assert release_queue_jobs(db_session, claimed) == 1
+        db_session.commit()
+
+        [reclaimed] = claim_queue_jobs(db_session, queue_name, 1, 60, 5)
+        db_session.commit()
+        assert reclaimed.attempts == 1
+    finally:
+        db_session.close()
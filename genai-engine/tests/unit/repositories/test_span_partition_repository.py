@@ -0,0 +1,30 @@
+"""Unit tests for the span partition helpers."""
+
+from datetime import datetime
+
+import pytest
+
+from repositories.span_partition_repository import (
+    partition_end,
+    partition_name,
+    partition_start,
+)
+
+
+@pytest.mark.unit_tests
+def test_daily_partition_bounds() -> None:
+    timestamp = datetime(2026, 10, 16, 13, 45)
+    lower = partition_start(timestamp, "daily")
+    assert lower == datetime(2026, 10, 16)
+    assert partition_end(lower, "daily") == datetime(2026, 10, 17)
+    assert partition_name(lower) == "spans_p20261016"
+
+
+@pytest.mark.unit_tests
+def test_weekly_partitions_start_on_monday() -> None:
+    # 2026-10-16 is a Friday
+    lower = partition_start(datetime(2026, 10, 16, 13, 45), "weekly")
+    assert lower == datetime(2026, 10, 12)
+    assert partition_end(lower, "weekly") == datetime(2026, 10, 19)
+    # across a month boundary
+    assert partition_start(datetime(2026, 11, 1), "weekly") == datetime(2026, 10, 26)
@@ -0,0 +1,195 @@
+"""Unit tests for the per-task trace rollups."""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from arthur_common.models.enums import AgenticAnnotationType, ContinuousEvalRunStatus
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from db_models import (
+    DatabaseAgenticAnnotation,
+    DatabaseTask,
+    DatabaseTraceMetadata,
+    DatabaseTraceRollup,
+)
+from repositories import trace_rollup_repository
+from repositories.metrics_repository import MetricRepository
+from repositories.span_repository import SpanRepository
+from repositories.tasks_metrics_repository import TasksMetricsRepository
+from repositories.trace_rollup_repository import (
+    DAY,
+    HOUR,
+    MINUTE,
+    plan_rollup_ranges,
+    reconcile_trace_rollups,
+    refresh_trace_rollups,
+    trace_rollup_keys,
+)
+from schemas.enums import TaskAnalyticsBucketSize
+from tests.clients.base_test_client import override_get_db_session
+from utils.constants import (
+    DEFAULT_ORG_ID,
+    GENAI_ENGINE_TRACE_ROLLUPS_ENABLED_ENV_VAR,
+)
+
+
+@pytest.mark.unit_tests
+def test_plan_rollup_ranges_uses_whole_units_inside_buckets() -> None:
+    start = datetime(2026, 10, 1, 10, 17, 30)
+    plan = plan_rollup_ranges([start, datetime(2026, 10, 3, 2, 5, 0)])
+
+    assert plan.raw_ranges == [(start, datetime(2026, 10, 1, 10, 18))]
+    assert plan.rollup_ranges[MINUTE] == [
+        (datetime(2026, 10, 1, 10, 18), datetime(2026, 10, 1, 11)),
+        (datetime(2026, 10, 3, 2), datetime(2026, 10, 3, 2, 5)),
+    ]
+    assert plan.rollup_ranges[HOUR] == [
+        (datetime(2026, 10, 1, 11), datetime(2026, 10, 2)),
+        (datetime(2026, 10, 3), datetime(2026, 10, 3, 2)),
+    ]
+    assert plan.rollup_ranges[DAY] == [(datetime(2026, 10, 2), datetime(2026, 10, 3))]
+
+    # the minutes bucket boundaries fall in are read from trace_metadata
+    plan = plan_rollup_ranges(
+        [start, start + timedelta(hours=1), start + timedelta(hours=2)],
+    )
+    assert plan.raw_ranges == [
+        (start, datetime(2026, 10, 1, 10, 18)),
+        (datetime(2026, 10, 1, 11, 17), datetime(2026, 10, 1, 11, 18)),
+        (datetime(2026, 10, 1, 12, 17), start + timedelta(hours=2)),
+    ]
+    assert plan.rollup_ranges[MINUTE] == [
+        (datetime(2026, 10, 1, 10, 18), datetime(2026, 10, 1, 11, 17)),
+        (datetime(2026, 10, 1, 11, 18), datetime(2026, 10, 1, 12, 17)),
+    ]
+    assert plan.rollup_ranges[HOUR] == []
+
+
+@pytest.mark.unit_tests
+def test_rollups_serve_the_totals_of_trace_metadata(monkeypatch) -> None:
+    monkeypatch.setenv(GENAI_ENGINE_TRACE_ROLLUPS_ENABLED_ENV_VAR, "true")
+    db_session: Session = override_get_db_session()
+    now = datetime.now()
+    task_id = str(uuid.uuid4())
+    db_session.add(
+        DatabaseTask(
+            id=task_id,
+            name=f"trace_rollups_test_{task_id[:8]}",
+            created_at=now,
+            updated_at=now,
+            is_agentic=True,
+            archived=False,
+            org_id=DEFAULT_ORG_ID,
+        ),
+    )
+    db_session.commit()
+
+    trace_ids = []
+    for index in range(12):
+        trace_id = str(uuid.uuid4())
+        start_time = now - timedelta(hours=7 * index, seconds=13 * index)
+        db_session.add(
+            DatabaseTraceMetadata(
+                trace_id=trace_id,
+                task_id=task_id,
+                org_id=DEFAULT_ORG_ID,
+                start_time=start_time,
+                end_time=start_time + timedelta(seconds=5),
+                span_count=1,
+                total_token_count=10 * index,
+                total_token_cost=0.25 * index,
+            ),
+        )
+        trace_ids.append(trace_id)
+    db_session.flush()
+    for index, trace_id in enumerate(trace_ids[:6]):
+        db_session.add(
+            DatabaseAgenticAnnotation(
+                id=uuid.uuid4(),
+                annotation_type=AgenticAnnotationType.CONTINUOUS_EVAL.value,
+                trace_id=trace_id,
+                continuous_eval_id=uuid.uuid4(),
+                run_status=(
+                    ContinuousEvalRunStatus.PASSED.value
+                    if index % 2
+                    else ContinuousEvalRunStatus.FAILED.value
+                ),
+                created_at=now,
+                updated_at=now,
+                org_id=DEFAULT_ORG_ID,
+            ),
+        )
+    db_session.flush()
+    refresh_trace_rollups(db_session, trace_rollup_keys(db_session, trace_ids))
+    db_session.commit()
+
+    span_repo = SpanRepository(
+        db_session,
+        TasksMetricsRepository(db_session),
+        MetricRepository(db_session),
+    )
+    start_time = now - timedelta(days=3, minutes=30, seconds=20)
+
+    def read_endpoints():
+        overview = span_repo.get_trace_overview_for_tasks([task_id], start_time, now)
+        timeseries = [
+            span_repo.get_trace_timeseries_for_task(
+                task_id,
+                start_time,
+                now + timedelta(seconds=1),
+                bucket_size,
+            )
+            for bucket_size in TaskAnalyticsBucketSize
+        ]
+        return overview, timeseries
+
+    try:
+        expected_overview, expected_timeseries = read_endpoints()
+        assert expected_overview.overviews[0].trace_count == 11
+        assert expected_overview.overviews[0].eval_count == 6
+
+        monkeypatch.setattr(trace_rollup_repository, "_backfill_complete", True)
+        assert db_session.query(DatabaseTraceRollup).filter_by(task_id=task_id).count()
+        overview, timeseries = read_endpoints()
+        assert overview.model_dump() == expected_overview.model_dump()
+        assert [series.model_dump() for series in timeseries] == [
+            series.model_dump() for series in expected_timeseries
+        ]
+
+        # a write that bypassed the rollups is found and fixed by reconciliation
+        db_session.query(DatabaseTraceMetadata).filter_by(
+            trace_id=trace_ids[0],
+        ).update({"total_token_count": 1000})
+        db_session.commit()
+        day = trace_rollup_repository.floor_time(
+            db_session.get(DatabaseTraceMetadata, trace_ids[0]).start_time,
+            timedelta(days=1),
+        )
+        assert reconcile_trace_rollups(db_session, task_id, day) == 3
+        db_session.commit()
+        assert reconcile_trace_rollups(db_session, task_id, day) == 0
+        assert (
+            span_repo.get_trace_overview_for_tasks([task_id], start_time, now)
+            .overviews[0]
+            .trace_token_count
+            == expected_overview.overviews[0].trace_token_count + 1000
+        )
+    finally:
+        db_session.execute(
+            delete(DatabaseAgenticAnnotation).where(
+                DatabaseAgenticAnnotation.trace_id.in_(trace_ids),
+            ),
+        )
+        db_session.execute(
+            delete(DatabaseTraceMetadata).where(
+                DatabaseTraceMetadata.trace_id.in_(trace_ids),
+            ),
+        )
+        db_session.execute(
+            delete(DatabaseTraceRollup).where(DatabaseTraceRollup.task_id == task_id),
+        )
+        db_session.execute(delete(DatabaseTask).where(DatabaseTask.id == task_id))
+        db_session.commit()
+        db_session.close()
@@ -13,7 +13,7 @@ and clean up test state after execution.
 """
 
 import random
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from litellm.types.utils import ModelResponse
@@ -48,6 +48,7 @@ from tests.unit.routes.conftest import setup_db_session_context_mock
 @patch("services.experiment_executor.db_session_context")
 @patch("repositories.llm_evals_repository.supports_response_schema")
 @patch("clients.llm.llm_client.completion_cost")
+@patch("clients.llm.llm_client.litellm.acompletion", new_callable=AsyncMock)
 @patch("clients.llm.llm_client.litellm.completion")
 @patch("services.prompt_experiment_executor.logger")
 @patch("services.experiment_executor.logger")
@@ -60,6 +61,7 @@ def test_prompt_experiment_routes_happy_path(
     mock_experiment_logger,
     mock_prompt_logger,
     mock_completion,
+    mock_acompletion,
     mock_completion_cost,
     mock_supports_response_schema,
     mock_db_session_context,
@@ -218,16 +220,9 @@ def test_prompt_experiment_routes_happy_path(
     mock_eval_response.usage = MagicMock()
     mock_eval_response.usage.total_tokens = 50
 
-    call_count = [0]
-
-    def mock_completion_side_effect(*args, **kwargs):
-        call_count[0] += 1
-        if call_count[0] == 1:
-            return mock_prompt_response
-        else:
-            return mock_eval_response
-
-    mock_completion.side_effect = mock_completion_side_effect
+    # prompts run through litellm.acompletion, LLM evals through litellm.completion
+    mock_acompletion.return_value = mock_prompt_response
+    mock_completion.return_value = mock_eval_response
     mock_completion_cost.return_value = 0.002345
 
     mock_prompt_logger.info = MagicMock()
@@ -530,6 +525,7 @@ def test_prompt_experiment_routes_happy_path(
         raise Exception("LLM completion failed for testing")
 
     mock_completion.side_effect = mock_completion_failure
+    mock_acompletion.side_effect = mock_completion_failure
 
     status_code, failed_experiment_summary = client.create_prompt_experiment(
         task_id=task_id,
@@ -607,6 +603,7 @@ def test_prompt_experiment_routes_happy_path(
 @patch("services.experiment_executor.db_session_context")
 @patch("repositories.llm_evals_repository.supports_response_schema")
 @patch("clients.llm.llm_client.completion_cost")
+@patch("clients.llm.llm_client.litellm.acompletion", new_callable=AsyncMock)
 @patch("clients.llm.llm_client.litellm.completion")
 @patch("services.prompt_experiment_executor.logger")
 @patch("services.experiment_executor.logger")
@@ -621,6 +618,7 @@ def test_prompt_experiment_none_value_conversion(
     mock_experiment_logger,
     mock_prompt_logger,
     mock_completion,
+    mock_acompletion,
     mock_completion_cost,
     mock_supports_response_schema,
     mock_db_session_context,
@@ -765,16 +763,9 @@ def test_prompt_experiment_none_value_conversion(
     mock_eval_response.usage = MagicMock()
     mock_eval_response.usage.total_tokens = 50
 
-    call_count = [0]
-
-    def mock_completion_side_effect(*args, **kwargs):
-        call_count[0] += 1
-        if call_count[0] == 1:
-            return mock_prompt_response
-        else:
-            return mock_eval_response
-
-    mock_completion.side_effect = mock_completion_side_effect
+    # prompts run through litellm.acompletion, LLM evals through litellm.completion
+    mock_acompletion.return_value = mock_prompt_response
+    mock_completion.return_value = mock_eval_response
     mock_completion_cost.return_value = 0.002345
 
     mock_repo_logger.warning = MagicMock()
@@ -914,6 +905,7 @@ def test_prompt_experiment_none_value_conversion(
 @patch("services.experiment_executor.db_session_context")
 @patch("repositories.llm_evals_repository.supports_response_schema")
 @patch("clients.llm.llm_client.completion_cost")
+@patch("clients.llm.llm_client.litellm.acompletion", new_callable=AsyncMock)
 @patch("clients.llm.llm_client.litellm.completion")
 @patch("services.prompt_experiment_executor.logger")
 @patch("services.experiment_executor.logger")
@@ -926,6 +918,7 @@ def test_prompt_experiment_unsaved_prompt(
     mock_experiment_logger,
     mock_prompt_logger,
     mock_completion,
+    mock_acompletion,
     mock_completion_cost,
     mock_supports_response_schema,
     mock_db_session_context,
@@ -1030,16 +1023,9 @@ def test_prompt_experiment_unsaved_prompt(
     mock_eval_response.usage = MagicMock()
     mock_eval_response.usage.total_tokens = 50
 
-    call_count = [0]
-
-    def mock_completion_side_effect(*args, **kwargs):
-        call_count[0] += 1
-        if call_count[0] == 1:
-            return mock_prompt_response
-        else:
-            return mock_eval_response
-
-    mock_completion.side_effect = mock_completion_side_effect
+    # prompts run through litellm.acompletion, LLM evals through litellm.completion
+    mock_acompletion.return_value = mock_prompt_response
+    mock_completion.return_value = mock_eval_response
     mock_completion_cost.return_value = 0.002345
 
     mock_prompt_logger.info = MagicMock()
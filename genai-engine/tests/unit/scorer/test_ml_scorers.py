@@ -0,0 +1,66 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+import pytest
+import torch
+
+from schemas.enums import EvalKind
+from schemas.response_schemas import EvalRunResponse
+from scorer.base_ml_scorer import BaseMLScorer
+from scorer.ml_scorers import MLScorerRegistry, estimate_memory_bytes
+
+
+class FakeScorer(BaseMLScorer):
+    def __init__(self) -> None:
+        self.model = torch.nn.Linear(4, 2)
+
+    def run(self, text: str, config: Dict[str, Any]) -> EvalRunResponse:
+        return EvalRunResponse(reason="ok", score=1, cost="")
+
+
+@pytest.mark.unit_tests
+def test_registry_builds_each_scorer_once():
+    builds = []
+    lock = threading.Lock()
+
+    def build() -> BaseMLScorer:
+        with lock:
+            builds.append(1)
+        return FakeScorer()
+
+    registry = MLScorerRegistry({EvalKind.PII.value: build})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        scorers = list(executor.map(registry.get, [EvalKind.PII.value] * 16))
+
+    assert len(builds) == 1
+    assert all(scorer is scorers[0] for scorer in scorers)
+    assert registry.loaded() == [EvalKind.PII.value]
+
+
+@pytest.mark.unit_tests
+def test_registry_is_lazy_and_unknown_kinds_return_none():
+    registry = MLScorerRegistry(
+        {EvalKind.PII.value: FakeScorer, EvalKind.TOXICITY.value: FakeScorer},
+    )
+
+    assert registry.loaded() == []
+    assert registry.get(EvalKind.LLM_AS_A_JUDGE.value) is None
+
+    registry.warmup([EvalKind.TOXICITY.value])
+    assert registry.loaded() == [EvalKind.TOXICITY.value]
+
+    registry.clear()
+    assert registry.loaded() == []
+    assert registry.memory_usage() == {}
+
+
+@pytest.mark.unit_tests
+def test_memory_accounting_counts_model_weights():
+    registry = MLScorerRegistry({EvalKind.PII.value: FakeScorer})
+    registry.warmup()
+
+    # Linear(4, 2): 8 weights + 2 biases of float32
+    assert registry.memory_usage() == {EvalKind.PII.value: 10 * 4}
+    assert estimate_memory_bytes(object()) == 0
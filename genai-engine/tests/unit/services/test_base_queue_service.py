@@ -1,9 +1,21 @@
-from typing import Hashable
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Hashable
 from unittest.mock import patch
 
 import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
 
-from services.base_queue_service import BaseQueueJob, BaseQueueService
+from db_models.queue_job_models import DatabaseQueueJob
+from repositories.queue_job_repository import ClaimedQueueJob, NewQueueJob
+from services.base_queue_service import (
+    USER_REQUESTED_JOB_PRIORITY,
+    BaseQueueJob,
+    BaseQueueService,
+)
+from services.durable_job_queue import DurableJobQueue
 
 
 class TestQueueService(BaseQueueService[BaseQueueJob]):
@@ -31,22 +43,209 @@ def service():
     svc.stop(timeout=5)
 
 
-def test_enqueue_submits_job_with_delay_and_waits(service):
-    """Test that enqueue passes the correct wait_time to _submit_job, and _submit_job waits that duration."""
+def test_enqueue_schedules_delayed_job_without_using_a_worker(service):
+    """Test that a delayed job waits in the scheduler rather than on an executor worker."""
     delay_seconds = 5
     job = BaseQueueJob(delay_seconds=delay_seconds)
 
-    # Capture the args enqueue passes to _submit_job, without actually running it async
-    with patch.object(service.executor, "submit") as mock_executor_submit:
-        service.enqueue(job)
+    with patch.object(service.scheduler, "schedule") as mock_schedule:
+        with patch.object(service.executor, "submit") as mock_executor_submit:
+            was_enqueued, future = service.enqueue(job)
 
-    # enqueue calls executor.submit(_submit_job, job, wait_time)
-    _, enqueued_job, wait_time = mock_executor_submit.call_args.args
+    assert was_enqueued
+    assert not future.done()
+    mock_executor_submit.assert_not_called()
+    wait_time, (scheduled_job, scheduled_future) = mock_schedule.call_args.args
     assert 0 < wait_time <= delay_seconds
+    assert scheduled_job is job
+    assert scheduled_future is future
 
-    # Now call _submit_job directly with that wait_time and assert it waits on it
-    with patch.object(service.shutdown_event, "wait", return_value=False) as mock_wait:
-        with patch.object(service.executor, "submit"):
-            service._submit_job(enqueued_job, wait_time)
 
-    mock_wait.assert_called_once_with(wait_time)
+def test_delayed_job_runs_once_due():
+    """Test that the future returned by enqueue resolves once the delayed job has run."""
+    executed = threading.Event()
+
+    class RecordingQueueService(TestQueueService):
+        def _execute_job(self, job: BaseQueueJob) -> str:
+            executed.set()
+            return "done"
+
+    svc = RecordingQueueService(num_workers=1, override_execution_delay=0)
+    svc.start()
+    try:
+        _, future = svc.enqueue(BaseQueueJob(delay_seconds=60))
+        assert future.result(timeout=5) == "done"
+        assert executed.is_set()
+        assert svc.active_jobs == set()
+    finally:
+        svc.stop(timeout=5)
+
+
+def test_delayed_jobs_do_not_block_due_jobs(service):
+    """Test that more delayed jobs than workers don't hold up a job that is due now."""
+    delayed = [BaseQueueJob(delay_seconds=60) for _ in range(service.num_workers * 3)]
+    assert service.enqueue_many(delayed) == len(delayed)
+
+    _, future = service.enqueue(BaseQueueJob(delay_seconds=0))
+
+    future.result(timeout=5)
+    assert len(service.scheduler) == len(delayed)
+
+
+def test_stop_cancels_pending_delayed_jobs():
+    """Test that stopping the service cancels delayed jobs and releases their keys."""
+    svc = TestQueueService(num_workers=1)
+    svc.start()
+    _, future = svc.enqueue(BaseQueueJob(delay_seconds=60))
+
+    svc.stop(timeout=5)
+
+    assert future.cancelled()
+    assert svc.active_jobs == set()
+
+
+def test_enqueue_many_skips_active_jobs(service):
+    """Test that enqueue_many schedules every new job once and skips already active ones."""
+    active_job = BaseQueueJob(delay_seconds=5)
+    new_jobs = [BaseQueueJob(delay_seconds=5) for _ in range(3)]
+
+    with patch.object(service.scheduler, "schedule") as mock_schedule:
+        service.enqueue(active_job)
+        enqueued = service.enqueue_many([active_job, *new_jobs, new_jobs[0]])
+
+    assert enqueued == 3
+    scheduled_jobs = [call.args[1][0] for call in mock_schedule.call_args_list]
+    assert scheduled_jobs == [active_job, *new_jobs]
+    assert all(0 < call.args[0] <= 5 for call in mock_schedule.call_args_list)
+
+
+def test_enqueue_many_releases_jobs_it_could_not_submit(service):
+    """Test that jobs of a failed batch submission can be enqueued again."""
+    jobs = [BaseQueueJob(delay_seconds=0) for _ in range(2)]
+
+    with patch.object(service.executor, "submit", side_effect=RuntimeError("closed")):
+        with pytest.raises(RuntimeError):
+            service.enqueue_many(jobs)
+
+    assert service.active_jobs == set()
+
+
+class DurableTestQueueService(TestQueueService):
+    durable_queue_name = "test_queue"
+
+    def _serialize_job(self, job: BaseQueueJob) -> dict[str, Any]:
+        return {"delay_seconds": job.delay_seconds}
+
+    def _deserialize_job(self, payload: dict[str, Any]) -> BaseQueueJob:
+        return BaseQueueJob(delay_seconds=payload["delay_seconds"])
+
+
+@pytest.fixture
+def durable_service():
+    svc = DurableTestQueueService(num_workers=2)
+    with (
+        patch(
+            "services.base_queue_service.durable_job_queue_enabled",
+            return_value=True,
+        ),
+        patch("services.base_queue_service.create_durable_job_queue"),
+    ):
+        svc.start()
+    yield svc
+    svc.stop(timeout=5)
+
+
+def test_durable_enqueue_stores_jobs_in_the_durable_queue(durable_service):
+    """Test that jobs of a durable service are queued in the database, not in memory."""
+    durable_service.durable_queue.enqueue.return_value = 1
+    job = BaseQueueJob(delay_seconds=5, priority=USER_REQUESTED_JOB_PRIORITY)
+
+    assert durable_service.enqueue(job) == (True, None)
+
+    [queue_job] = durable_service.durable_queue.enqueue.call_args.args[0]
+    assert queue_job.job_key == str(id(job))
+    assert queue_job.payload == {"delay_seconds": 5}
+    assert queue_job.priority == USER_REQUESTED_JOB_PRIORITY
+    assert (
+        datetime.now() < queue_job.visible_at <= datetime.now() + timedelta(seconds=5)
+    )
+    assert durable_service.active_jobs == set()
+
+
+def test_durable_enqueue_waiting_for_result_runs_in_process(durable_service):
+    """Test that callers waiting on a job's result still get a future."""
+    was_enqueued, future = durable_service.enqueue(
+        BaseQueueJob(delay_seconds=0),
+        wait_for_result=True,
+    )
+
+    assert was_enqueued
+    future.result(timeout=5)
+    durable_service.durable_queue.enqueue.assert_not_called()
+
+
+def test_claimed_durable_jobs_are_finished_even_when_they_fail(durable_service):
+    """Test that a claimed job is removed from the queue after it ran, even if it failed."""
+    claimed = ClaimedQueueJob(
+        id=uuid.uuid4(),
+        job_key="job",
+        payload={"delay_seconds": 0},
+        attempts=1,
+        lease_id=uuid.uuid4(),
+    )
+
+    with patch.object(
+        durable_service,
+        "_execute_job",
+        side_effect=RuntimeError("failed"),
+    ):
+        durable_service._run_durable_job(claimed)
+
+    durable_service.durable_queue.finish.assert_called_once_with(claimed)
+
+    durable_service.shutdown_event.set()
+    durable_service._run_durable_job(claimed)
+    durable_service.durable_queue.release.assert_called_once_with([claimed])
+
+
+def test_durable_jobs_queued_in_a_session_follow_its_transaction():
+    """Test that jobs queued in the caller's session commit or roll back with it."""
+    engine = create_engine("sqlite://")
+    DatabaseQueueJob.__table__.create(engine)
+    queue = DurableJobQueue(
+        "test_queue",
+        capacity=1,
+        dispatch_fn=lambda job: None,
+        lease_seconds=30,
+        poll_interval_seconds=1,
+        max_attempts=3,
+    )
+
+    def queue_job(db_session: Session) -> int:
+        return queue.enqueue(
+            [
+                NewQueueJob(
+                    job_key="job-1",
+                    payload={},
+                    priority=0,
+                    visible_at=datetime.now(),
+                ),
+            ],
+            db_session=db_session,
+        )
+
+    def queued_jobs() -> int:
+        with Session(engine) as db_session:
+            return db_session.scalar(select(func.count()).select_from(DatabaseQueueJob))
+
+    with Session(engine) as db_session:
+        assert queue_job(db_session) == 1
+        db_session.rollback()
+    assert queued_jobs() == 0
+    assert not queue._wakeup.is_set()
+
+    with Session(engine) as db_session:
+        assert queue_job(db_session) == 1
+        db_session.commit()
+    assert queued_jobs() == 1
+    assert queue._wakeup.is_set()
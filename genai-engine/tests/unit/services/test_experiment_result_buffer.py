@@ -0,0 +1,121 @@
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from db_models.prompt_experiment_models import (
+    DatabasePromptExperiment,
+    DatabasePromptExperimentTestCase,
+)
+from schemas.base_experiment_schemas import TestCaseStatus
+from services.experiment_result_buffer import ExperimentResultBuffer
+
+
+def _buffer(
+    max_batch_size: int = 10,
+    flush_interval_seconds: float = 3600,
+) -> ExperimentResultBuffer:
+    return ExperimentResultBuffer(
+        DatabasePromptExperiment,
+        "experiment-1",
+        max_batch_size=max_batch_size,
+        flush_interval_seconds=flush_interval_seconds,
+    )
+
+
+def _loaded_test_case(
+    test_case_id: str,
+) -> tuple[Session, DatabasePromptExperimentTestCase]:
+    """A test case as if loaded by a session, without a database."""
+    session = Session()
+    test_case = DatabasePromptExperimentTestCase(id=test_case_id)
+    make_transient_to_detached(test_case)
+    session.add(test_case)
+    return session, test_case
+
+
+def _written_rows(db_session: MagicMock) -> list[dict]:
+    rows = []
+    for call in db_session.execute.call_args_list:
+        if len(call.args) > 1:
+            rows.extend(call.args[1])
+    return rows
+
+
+@pytest.mark.unit_tests
+def test_stage_takes_changed_columns_and_rolls_back_the_session():
+    buffer = _buffer()
+    session, test_case = _loaded_test_case("test-case-1")
+    test_case.status = TestCaseStatus.RUNNING
+    test_case.total_cost = "0.100000"
+    buffer.stage(session)
+    assert not session.dirty
+
+    session, test_case = _loaded_test_case("test-case-1")
+    test_case.status = TestCaseStatus.COMPLETED
+    buffer.stage(session)
+
+    db_session = MagicMock()
+    buffer.flush(db_session)
+
+    # one row per test case, later values win
+    assert _written_rows(db_session) == [
+        {
+            "id": "test-case-1",
+            "status": TestCaseStatus.COMPLETED,
+            "total_cost": "0.100000",
+        },
+    ]
+    db_session.commit.assert_called_once()
+
+
+@pytest.mark.unit_tests
+def test_flush_is_due_after_a_batch_of_test_cases():
+    buffer = _buffer(max_batch_size=2)
+    assert not buffer.flush_due()
+
+    buffer.stage(MagicMock(dirty=[]))
+    buffer.set_progress(1, 0)
+    assert not buffer.flush_due()
+
+    buffer.stage(MagicMock(dirty=[]))
+    buffer.set_progress(2, 0)
+    assert buffer.flush_due()
+
+    buffer.flush(MagicMock())
+    assert not buffer.flush_due()
+
+
+@pytest.mark.unit_tests
+def test_flush_is_due_after_the_interval():
+    buffer = _buffer(flush_interval_seconds=0)
+    assert not buffer.flush_due()
+
+    buffer.set_progress(0, 1)
+    assert buffer.flush_due()
+
+
+@pytest.mark.unit_tests
+def test_failed_flush_keeps_the_batch():
+    buffer = _buffer()
+    session, test_case = _loaded_test_case("test-case-1")
+    test_case.status = TestCaseStatus.COMPLETED
+    buffer.stage(session)
+    buffer.set_progress(1, 0)
+
+    failing_session = MagicMock()
+    failing_session.commit.side_effect = RuntimeError("connection lost")
+    with pytest.raises(RuntimeError):
+        buffer.flush(failing_session)
+    failing_session.rollback.assert_called_once()
+
+    # progress moved on while the batch waited
+    buffer.set_progress(2, 0)
+    db_session = MagicMock()
+    buffer.flush(db_session)
+
+    assert _written_rows(db_session) == [
+        {"id": "test-case-1", "status": TestCaseStatus.COMPLETED},
+    ]
+    progress_update = db_session.execute.call_args_list[-1].args[0]
+    assert progress_update.compile().params["completed_rows"] == 2
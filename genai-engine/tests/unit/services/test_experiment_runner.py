@@ -0,0 +1,150 @@
+import asyncio
+import threading
+from typing import Generator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services.experiment_executor import BaseExperimentExecutor, ExperimentRun
+from services.experiment_runner import ExperimentRunner
+from utils.llm_concurrency_limiter import LLMConcurrencyLimiter
+
+
+def _runner(
+    max_concurrent_experiments: int = 1,
+    test_case_concurrency: int = 4,
+    model_max_concurrency: int = 1,
+) -> ExperimentRunner:
+    return ExperimentRunner(
+        max_concurrent_experiments=max_concurrent_experiments,
+        test_case_concurrency=test_case_concurrency,
+        max_workers=8,
+        llm_limiter=LLMConcurrencyLimiter(
+            provider_max_concurrency=10,
+            model_max_concurrency=model_max_concurrency,
+        ),
+    )
+
+
+@pytest.fixture
+def runner() -> Generator[ExperimentRunner, None, None]:
+    runner = _runner()
+    yield runner
+    runner.stop(timeout=5)
+
+
+@pytest.mark.unit_tests
+def test_experiments_beyond_the_limit_wait_for_a_slot(runner: ExperimentRunner):
+    release_first = threading.Event()
+    started: list[str] = []
+
+    async def experiment(name: str) -> str:
+        started.append(name)
+        if name == "first":
+            await runner.run_sync(release_first.wait, 5)
+        return name
+
+    first = runner.submit(experiment("first"))
+    second = runner.submit(experiment("second"))
+
+    with pytest.raises(TimeoutError):
+        second.result(timeout=0.2)
+    assert started == ["first"]
+
+    release_first.set()
+    assert first.result(timeout=5) == "first"
+    assert second.result(timeout=5) == "second"
+
+
+@pytest.mark.unit_tests
+def test_llm_call_slot_limits_blocking_calls(runner: ExperimentRunner):
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def call_model() -> None:
+        nonlocal active, max_active
+        with runner.llm_call_slot("openai", "gpt-4o"):
+            with lock:
+                active += 1
+                max_active = max(max_active, active)
+            threading.Event().wait(0.05)
+            with lock:
+                active -= 1
+
+    async def experiment() -> None:
+        await asyncio.gather(*(runner.run_sync(call_model) for _ in range(4)))
+
+    runner.run(experiment())
+    assert max_active == 1
+
+
+class _StubExecutor(BaseExperimentExecutor):
+    """Test cases succeed unless their ID starts with "fail"."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.results = MagicMock()
+        self.results.flush_due.return_value = False
+        self.flushed_before_finish = False
+        self.finished_with_failures: int | None = None
+
+    def _start_experiment(self, experiment_id):
+        return ExperimentRun(
+            test_case_ids=["ok-1", "fail-2", "ok-3", "ok-4", "fail-5", "ok-6"],
+            lookups=MagicMock(),
+            results=self.results,
+        )
+
+    async def _execute_test_case(
+        self,
+        test_case_id,
+        run,
+        request_time_parameters=None,
+    ):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return not test_case_id.startswith("fail")
+
+    def _flush_results(self, results):
+        self.flushed_before_finish = self.finished_with_failures is None
+
+    def _finish_experiment(self, experiment_id, failed_count):
+        self.finished_with_failures = failed_count
+
+    _get_database_experiment = None
+    _get_db_test_cases = None
+    _get_db_test_case = None
+    _execute_experiment_outputs = None
+    _execute_evaluations = None
+    _execute_evaluations_for_result = None
+    _calculate_total_test_case_cost = None
+    _process_experiment_output_variable = None
+    _set_summary_results = None
+
+
+@pytest.mark.unit_tests
+def test_experiment_runs_test_cases_concurrently():
+    runner = _runner(test_case_concurrency=3)
+    executor = _StubExecutor()
+    try:
+        with patch(
+            "services.experiment_executor.get_experiment_runner",
+            return_value=runner,
+        ):
+            executor._execute_experiment("experiment-1")
+    finally:
+        runner.stop(timeout=5)
+
+    assert executor.max_in_flight == 3
+    # one update per finished test case, in the order they finished
+    progress = [call.args for call in executor.results.set_progress.call_args_list]
+    assert [sum(counts) for counts in progress] == [1, 2, 3, 4, 5, 6]
+    assert progress[-1] == (4, 2)
+    # buffered results are written before the summary is computed
+    assert executor.flushed_before_finish
+    assert executor.finished_with_failures == 2
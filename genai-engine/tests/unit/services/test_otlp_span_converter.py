@@ -0,0 +1,186 @@
+"""Unit tests for the protobuf span conversion of trace ingestion."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from google.protobuf.json_format import MessageToDict
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+    ExportTraceServiceRequest,
+)
+from opentelemetry.proto.common.v1.common_pb2 import (
+    AnyValue,
+    ArrayValue,
+    KeyValue,
+    KeyValueList,
+)
+from opentelemetry.proto.resource.v1.resource_pb2 import Resource
+from opentelemetry.proto.trace.v1.trace_pb2 import (
+    ResourceSpans,
+    ScopeSpans,
+    Span,
+    Status,
+)
+
+from services.trace.otlp_span_converter import OtlpSpanConverter
+from services.trace.span_normalization_service import SpanNormalizationService
+from services.trace.trace_ingestion_service import TraceIngestionService
+
+
+def _kv(key: str, **value) -> KeyValue:
+    return KeyValue(key=key, value=AnyValue(**value))
+
+
+LLM_SPAN = Span(
+    trace_id=b"\x01" * 16,
+    span_id=b"\x02" * 8,
+    parent_span_id=b"\x03" * 8,
+    name="llm",
+    kind=Span.SPAN_KIND_CLIENT,
+    start_time_unix_nano=1_700_000_000_000_000_000,
+    end_time_unix_nano=1_700_000_001_000_000_000,
+    attributes=[
+        _kv("openinference.span.kind", string_value="LLM"),
+        _kv("session.id", string_value="session-1"),
+        _kv("llm.token_count.prompt", string_value="12"),
+        _kv("llm.token_count.completion", int_value=5),
+        _kv("llm.input_messages.0.message.role", string_value="user"),
+        _kv("llm.input_messages.0.message.content", string_value="hi"),
+        _kv(
+            "llm.input_messages.0.message.contents.0.message_content.type",
+            string_value="text",
+        ),
+        _kv("llm.invocation_parameters", string_value='{"temperature": 0.1}'),
+        _kv("input.value", string_value='{"question": [1, 2]}'),
+        _kv("input.mime_type", string_value="application/json"),
+        _kv(
+            "llm.output_messages.0.message.tool_calls.0.tool_call.function.arguments",
+            string_value='{"city": "Boston"}',
+        ),
+        _kv("custom.ratio", double_value=1.5),
+        _kv("custom.flag", bool_value=True),
+        _kv("custom.bytes", bytes_value=b"xy"),
+        _kv(
+            "custom.list",
+            array_value=ArrayValue(
+                values=[AnyValue(string_value="a"), AnyValue(int_value=3)],
+            ),
+        ),
+        _kv(
+            "custom.kvlist",
+            kvlist_value=KeyValueList(values=[_kv("inner", string_value="v")]),
+        ),
+        KeyValue(key="custom.unset"),
+    ],
+    events=[
+        Span.Event(
+            time_unix_nano=5,
+            name="exception",
+            attributes=[_kv("exception.type", string_value="ValueError")],
+        ),
+    ],
+    links=[Span.Link(trace_id=b"\x09" * 16, span_id=b"\x08" * 8)],
+    status=Status(code=Status.STATUS_CODE_ERROR, message="failed"),
+    dropped_attributes_count=2,
+    flags=256,
+)
+
+ROOT_SPAN = Span(trace_id=b"\x01" * 16, span_id=b"\x04" * 8, name="root")
+
+
+def _ingestion_service() -> TraceIngestionService:
+    service = TraceIngestionService.__new__(TraceIngestionService)
+    service.span_normalizer = SpanNormalizationService()
+    service.span_converter = OtlpSpanConverter(service.span_normalizer)
+    return service
+
+
+@pytest.mark.unit_tests
+@pytest.mark.parametrize("span", [LLM_SPAN, ROOT_SPAN], ids=["llm", "root"])
+def test_proto_span_matches_dict_span(span):
+    service = _ingestion_service()
+
+    dict_span = service._process_span_data(MessageToDict(span), "task")
+    proto_span = service._process_proto_span(span, "task")
+
+    assert proto_span.raw_data == dict_span.raw_data
+    # stored raw_data keeps the same key order as before
+    assert list(proto_span.raw_data) == list(dict_span.raw_data)
+    for column in [
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "span_kind",
+        "span_name",
+        "start_time",
+        "end_time",
+        "session_id",
+        "status_code",
+        "prompt_token_count",
+        "completion_token_count",
+    ]:
+        assert getattr(proto_span, column) == getattr(dict_span, column), column
+
+
+@pytest.mark.unit_tests
+def test_proto_span_ids_and_status():
+    db_span = _ingestion_service()._process_proto_span(LLM_SPAN, "task")
+
+    assert db_span.trace_id == "01" * 16
+    assert db_span.span_id == "02" * 8
+    assert db_span.parent_span_id == "03" * 8
+    assert db_span.status_code == "Error"
+    assert db_span.span_kind == "LLM"
+
+    root_span = _ingestion_service()._process_proto_span(ROOT_SPAN, "task")
+    assert root_span.parent_span_id is None
+    assert root_span.start_time is None
+    assert root_span.status_code == "Unset"
+
+
+@pytest.mark.unit_tests
+def test_resource_attributes_keep_scalar_values_only():
+    converter = OtlpSpanConverter(SpanNormalizationService())
+    resource = Resource(
+        attributes=[
+            _kv("service.name", string_value="svc"),
+            _kv("process.pid", int_value=42),
+            _kv("sample.rate", double_value=0.5),
+            _kv("debug", bool_value=False),
+            _kv("hosts", array_value=ArrayValue(values=[AnyValue(string_value="a")])),
+        ],
+    )
+
+    assert converter.resource_attributes(resource) == {
+        "service.name": "svc",
+        "process.pid": 42,
+        "sample.rate": 0.5,
+        "debug": False,
+    }
+
+
+@pytest.mark.unit_tests
+def test_process_trace_data_counts_spans_per_resource():
+    service = _ingestion_service()
+    request = ExportTraceServiceRequest(
+        resource_spans=[
+            ResourceSpans(
+                resource=Resource(attributes=[_kv("arthur.task", string_value="t1")]),
+                scope_spans=[ScopeSpans(spans=[LLM_SPAN, ROOT_SPAN])],
+            ),
+        ],
+    )
+
+    with (
+        patch.object(
+            service,
+            "_resolve_resource",
+            return_value=("t1", None, MagicMock()),
+        ) as mock_resolve,
+        patch.object(service, "_store_spans") as mock_store,
+    ):
+        spans, stats = service.process_trace_data(request.SerializeToString())
+
+    assert mock_resolve.call_args.args[0] == "t1"
+    assert [span.task_id for span in spans] == ["t1", "t1"]
+    assert stats == (2, 2, 0, [])
+    mock_store.assert_called_once()
@@ -0,0 +1,80 @@
+"""Unit tests for the PostgreSQL COPY span writer."""
+
+import csv
+import json
+import uuid
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from db_models import DatabaseSpan
+from services.trace import span_copy_writer
+from services.trace.span_copy_writer import (
+    SPAN_COPY_COLUMNS,
+    SpanCopyWriter,
+    use_span_copy_writer,
+)
+
+
+def _span(**overrides) -> DatabaseSpan:
+    values = dict(
+        id=str(uuid.uuid4()),
+        trace_id="trace",
+        span_id="span",
+        parent_span_id=None,
+        span_name="",
+        span_kind="LLM",
+        start_time=datetime(2026, 1, 1, 12, 0, 0, 123456),
+        end_time=datetime(2026, 1, 1, 12, 0, 1),
+        task_id="task",
+        org_id=uuid.UUID(int=1),
+        resource_id=None,
+        session_id=None,
+        user_id='user "quoted", with\nnewline',
+        status_code="Ok",
+        raw_data={"attributes": {"input": {"value": "hi"}}},
+        prompt_token_count=10,
+        completion_token_count=None,
+        total_token_count=10,
+        prompt_token_cost=0.5,
+        completion_token_cost=None,
+        total_token_cost=0.5,
+    )
+    values.update(overrides)
+    return DatabaseSpan(**values)
+
+
+def _session(dialect: str) -> MagicMock:
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = dialect
+    return session
+
+
+@pytest.mark.unit_tests
+def test_copy_writer_is_only_used_for_large_postgres_batches():
+    with patch.object(span_copy_writer, "SPAN_COPY_MIN_BATCH_SIZE", 100):
+        assert use_span_copy_writer(_session("postgresql"), 100)
+        assert not use_span_copy_writer(_session("postgresql"), 99)
+        assert not use_span_copy_writer(_session("sqlite"), 1000)
+
+    with patch.object(span_copy_writer, "SPAN_COPY_MIN_BATCH_SIZE", 0):
+        assert not use_span_copy_writer(_session("postgresql"), 1000)
+
+
+@pytest.mark.unit_tests
+def test_csv_rows_keep_nulls_and_empty_strings_apart():
+    span = _span()
+    buffer = SpanCopyWriter(MagicMock())._to_csv([span])
+
+    raw_line = buffer.getvalue()
+    (row,) = list(csv.reader(buffer))
+    values = dict(zip(SPAN_COPY_COLUMNS, row))
+
+    # COPY reads unquoted empty fields as NULL and quoted ones as empty strings
+    assert raw_line.startswith(f'"{span.id}","trace","span",,"",')
+    assert values["user_id"] == span.user_id
+    assert values["start_time"] == "2026-01-01T12:00:00.123456"
+    assert values["org_id"] == str(uuid.UUID(int=1))
+    assert json.loads(values["raw_data"]) == span.raw_data
+    assert values["prompt_token_cost"] == "0.5"
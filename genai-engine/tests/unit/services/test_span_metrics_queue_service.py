@@ -0,0 +1,219 @@
+"""Unit tests for background span metric computation."""
+
+from types import SimpleNamespace
+from typing import Generator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from repositories.span_repository import SpanRepository
+from services.base_queue_service import USER_REQUESTED_JOB_PRIORITY
+from services.trace.metrics_integration_service import MetricsIntegrationService
+from services.trace.span_metrics_queue_service import (
+    SpanMetricsJob,
+    SpanMetricsQueueService,
+    enqueue_span_metrics_for_new_spans,
+    get_span_ids_awaiting_metrics,
+)
+from tests.clients.base_test_client import override_get_db_session
+from utils import constants
+
+
+def _span(span_id: str, task_id: str | None = "task-a", span_kind: str = "LLM"):
+    return SimpleNamespace(
+        id=span_id,
+        task_id=task_id,
+        span_kind=span_kind,
+        metric_results=[],
+    )
+
+
+@pytest.fixture
+def span_repo() -> Generator[SpanRepository, None, None]:
+    db_session = override_get_db_session()
+    span_repo = SpanRepository(db_session, MagicMock(), MagicMock())
+    span_repo.metrics_integration_service = MagicMock()
+    yield span_repo
+    db_session.close()
+
+
+@pytest.mark.unit_tests
+def test_background_mode_reads_queue_missing_metrics_instead_of_computing(
+    monkeypatch,
+    span_repo: SpanRepository,
+):
+    monkeypatch.setenv(constants.GENAI_ENGINE_SPAN_METRICS_MODE_ENV_VAR, "background")
+    spans = [_span("done"), _span("missing")]
+    metrics_integration_service = span_repo.metrics_integration_service
+    metrics_integration_service.add_metrics_to_spans.return_value = spans
+    metrics_integration_service.get_spans_awaiting_metrics.return_value = [spans[1]]
+
+    with patch("repositories.span_repository.enqueue_span_metrics") as enqueue:
+        assert span_repo._add_metrics_to_spans(spans, compute_new_metrics=True) == spans
+
+    metrics_integration_service.add_metrics_to_spans.assert_called_once_with(
+        spans,
+        compute_new_metrics=False,
+    )
+    enqueue.assert_called_once_with(
+        ["missing"],
+        priority=USER_REQUESTED_JOB_PRIORITY,
+    )
+    assert span_repo.pending_metric_span_ids == {"missing"}
+
+
+@pytest.mark.unit_tests
+def test_on_read_mode_computes_missing_metrics(
+    monkeypatch,
+    span_repo: SpanRepository,
+):
+    monkeypatch.delenv(constants.GENAI_ENGINE_SPAN_METRICS_MODE_ENV_VAR, raising=False)
+    spans = [_span("missing")]
+    metrics_integration_service = span_repo.metrics_integration_service
+    metrics_integration_service.add_metrics_to_spans.return_value = spans
+
+    with patch("repositories.span_repository.enqueue_span_metrics") as enqueue:
+        span_repo._add_metrics_to_spans(spans, compute_new_metrics=True)
+
+    metrics_integration_service.add_metrics_to_spans.assert_called_once_with(
+        spans,
+        True,
+    )
+    enqueue.assert_not_called()
+    assert span_repo.pending_metric_span_ids == set()
+
+
+@pytest.mark.unit_tests
+def test_spans_awaiting_metrics_are_llm_spans_of_tasks_with_metrics():
+    tasks_metrics_repo = MagicMock()
+    tasks_metrics_repo.get_task_metrics_ids_cached.side_effect = lambda task_id: (
+        ["metric-1"] if task_id == "task-a" else []
+    )
+    service = MetricsIntegrationService(MagicMock(), tasks_metrics_repo, MagicMock())
+
+    with_results = _span("with-results")
+    with_results.metric_results = [MagicMock()]
+    spans = [
+        _span("awaiting"),
+        with_results,
+        _span("tool", span_kind="TOOL"),
+        _span("no-task", task_id=None),
+        _span("no-metrics", task_id="task-b"),
+    ]
+
+    assert [span.id for span in service.get_spans_awaiting_metrics(spans)] == [
+        "awaiting",
+    ]
+
+
+@pytest.mark.unit_tests
+def test_ingestion_queues_llm_spans_of_tasks_with_metrics():
+    db_session = MagicMock()
+    db_session.scalars.return_value.all.return_value = ["task-a"]
+    queue_service = MagicMock()
+    queue_service.enqueue_many.side_effect = lambda jobs: len(jobs)
+
+    with patch(
+        "services.trace.span_metrics_queue_service.get_span_metrics_queue_service",
+        return_value=queue_service,
+    ):
+        enqueue_span_metrics_for_new_spans(
+            db_session,
+            [
+                _span("llm-a"),
+                _span("chain-a", span_kind="CHAIN"),
+                _span("llm-b", task_id="task-b"),
+            ],
+        )
+
+    [jobs] = queue_service.enqueue_many.call_args.args
+    assert [job.span_id for job in jobs] == ["llm-a"]
+
+
+@pytest.mark.unit_tests
+def test_ingestion_queues_nothing_unless_metrics_run_in_background():
+    db_session = MagicMock()
+    with patch(
+        "services.trace.span_metrics_queue_service.get_span_metrics_queue_service",
+        return_value=None,
+    ):
+        enqueue_span_metrics_for_new_spans(db_session, [_span("llm-a")])
+
+    db_session.scalars.assert_not_called()
+
+
+@pytest.mark.unit_tests
+@pytest.mark.parametrize("has_results", [True, False])
+def test_job_computes_metrics_of_spans_without_results(has_results: bool):
+    db_session = MagicMock()
+    db_span = MagicMock()
+    db_session.scalars.return_value.first.return_value = db_span
+    db_session.scalar.return_value = "result-id" if has_results else None
+
+    with (
+        patch(
+            "services.trace.span_metrics_queue_service.get_db_session",
+            return_value=iter([db_session]),
+        ),
+        patch(
+            "services.trace.span_metrics_queue_service.MetricsIntegrationService",
+        ) as metrics_integration_service,
+        patch("services.trace.span_metrics_queue_service.Span") as span_model,
+    ):
+        SpanMetricsQueueService()._execute_job(SpanMetricsJob(span_id="span-1"))
+
+    compute = metrics_integration_service.return_value.compute_metrics_for_single_span
+    if has_results:
+        compute.assert_not_called()
+    else:
+        span_model._from_database_model.assert_called_once_with(db_span)
+        compute.assert_called_once_with(span_model._from_database_model.return_value)
+    db_session.close.assert_called_once()
+
+
+@pytest.mark.unit_tests
+def test_spans_computed_without_results_are_no_longer_pending(
+    monkeypatch,
+    span_repo: SpanRepository,
+):
+    monkeypatch.setenv(constants.GENAI_ENGINE_SPAN_METRICS_MODE_ENV_VAR, "background")
+    db_session = MagicMock()
+    db_session.scalar.return_value = None
+    queue_service = SpanMetricsQueueService()
+
+    with (
+        patch(
+            "services.trace.span_metrics_queue_service.get_db_session",
+            return_value=iter([db_session]),
+        ),
+        patch(
+            "services.trace.span_metrics_queue_service.MetricsIntegrationService",
+        ) as metrics_integration_service,
+        patch("services.trace.span_metrics_queue_service.Span"),
+    ):
+        compute = (
+            metrics_integration_service.return_value.compute_metrics_for_single_span
+        )
+        compute.return_value = []
+        queue_service._execute_job(SpanMetricsJob(span_id="no-results"))
+
+    spans = [_span("no-results"), _span("missing")]
+    span_repo.metrics_integration_service.add_metrics_to_spans.return_value = spans
+    span_repo.metrics_integration_service.get_spans_awaiting_metrics.return_value = (
+        spans
+    )
+    with (
+        patch(
+            "services.trace.span_metrics_queue_service.get_span_metrics_queue_service",
+            return_value=queue_service,
+        ),
+        patch("repositories.span_repository.enqueue_span_metrics") as enqueue,
+    ):
+        assert get_span_ids_awaiting_metrics(["no-results", "missing"]) == ["missing"]
+        span_repo._add_metrics_to_spans(spans, compute_new_metrics=True)
+
+    enqueue.assert_called_once_with(
+        ["missing"],
+        priority=USER_REQUESTED_JOB_PRIORITY,
+    )
+    assert span_repo.pending_metric_span_ids == {"missing"}
@@ -0,0 +1,133 @@
+"""Unit tests for SpanNormalizationService."""
+
+import copy
+import json
+
+import pytest
+
+from services.trace.span_normalization_service import SpanNormalizationService
+
+
+def _otel_attribute(key: str, value: str) -> dict:
+    return {"key": key, "value": {"stringValue": value}}
+
+
+@pytest.mark.unit_tests
+def test_normalize_nests_attributes_and_builds_lists():
+    span = {
+        "name": "llm",
+        "attributes": [
+            _otel_attribute("openinference.span.kind", "LLM"),
+            _otel_attribute("llm.input_messages.10.message.role", "user"),
+            _otel_attribute("llm.input_messages.2.message.role", "assistant"),
+            _otel_attribute("llm.input_messages.0.message.role", "system"),
+            _otel_attribute("llm.token_count.prompt", "12"),
+            _otel_attribute("llm.invocation_parameters", '{"temperature": 0.1}'),
+        ],
+    }
+
+    result = SpanNormalizationService().normalize_span_to_nested_dict(span)
+
+    attributes = result["attributes"]
+    assert attributes["openinference"]["span"]["kind"] == "LLM"
+    # numeric keys become lists ordered by index, not by string
+    assert [m["message"]["role"] for m in attributes["llm"]["input_messages"]] == [
+        "system",
+        "assistant",
+        "user",
+    ]
+    assert attributes["llm"]["token_count"]["prompt"] == 12
+    assert attributes["llm"]["invocation_parameters"] == {"temperature": 0.1}
+
+
+@pytest.mark.unit_tests
+def test_normalize_deserializes_convention_json_fields_only():
+    span = {
+        "attributes": {
+            "input.value": '{"question": "hi"}',
+            "input.mime_type": "application/json",
+            "output.value": '{"answer": "hello"}',
+            "metadata": json.dumps({"run": 1, "metadata": '{"inner": true}'}),
+            "llm.output_messages.0.message.contents": json.dumps(
+                [{"message_content.type": "text", "message_content.text": "hi"}],
+            ),
+        },
+    }
+
+    attributes = SpanNormalizationService().normalize_span_to_nested_dict(span)[
+        "attributes"
+    ]
+
+    assert attributes["input"]["value"] == {"question": "hi"}
+    # no mime type, so output.value stays a string
+    assert attributes["output"]["value"] == '{"answer": "hello"}'
+    assert attributes["metadata"] == {"run": 1, "metadata": {"inner": True}}
+    assert attributes["llm"]["output_messages"][0]["message"]["contents"] == [
+        {"message_content": {"type": "text", "text": "hi"}},
+    ]
+
+
+@pytest.mark.unit_tests
+def test_normalize_does_not_modify_input():
+    span = {
+        "name": "retriever",
+        "status": {"code": "STATUS_CODE_OK"},
+        "events": [{"name": "event", "attributes": [_otel_attribute("a", "b")]}],
+        "attributes": {
+            "input.value.query": "SELECT 1",
+            "output.value.results": [{"id": 1}, {"id": 2}],
+            "metadata": '{"a": 1}',
+        },
+    }
+    original = copy.deepcopy(span)
+
+    result = SpanNormalizationService().normalize_span_to_nested_dict(span)
+
+    assert span == original
+    assert result["attributes"]["input"]["value"] == {"query": "SELECT 1"}
+    assert result["attributes"]["output"]["value"]["results"] == [{"id": 1}, {"id": 2}]
+    assert result["attributes"]["metadata"] == {"a": 1}
+    assert result["events"] == original["events"]
+
+
+@pytest.mark.unit_tests
+def test_normalize_merges_prefix_values_deterministically():
+    service = SpanNormalizationService()
+    attributes = {
+        "input.value.context": "ctx",
+        "input.value": '{"query": "q"}',
+        "input.mime_type": "application/json",
+        "tag.name": "scalar",
+        "tag.name.extra": "nested",
+    }
+
+    first = service.normalize_span_to_nested_dict({"attributes": attributes})
+    reordered = service.normalize_span_to_nested_dict(
+        {"attributes": dict(reversed(list(attributes.items())))},
+    )
+
+    assert first == reordered
+    assert first["attributes"]["input"]["value"] == {"query": "q", "context": "ctx"}
+    assert first["attributes"]["tag"]["name"] == {"extra": "nested"}
+
+
+@pytest.mark.unit_tests
+def test_normalize_empty_dicts_become_lists():
+    result = SpanNormalizationService().normalize_span_to_nested_dict(
+        {"name": "root", "status": {}},
+    )
+    assert result["status"] == []
+    assert result["attributes"] == []
+
+
+@pytest.mark.unit_tests
+def test_batch_normalization_matches_single_span_normalization():
+    service = SpanNormalizationService()
+    spans = [
+        {"name": f"span-{i}", "attributes": [_otel_attribute("session.id", str(i))]}
+        for i in range(3)
+    ]
+
+    assert service.normalize_spans_to_nested_dicts(spans) == [
+        service.normalize_span_to_nested_dict(span) for span in spans
+    ]
@@ -0,0 +1,269 @@
+"""Unit tests for the asynchronous trace ingest queue."""
+
+import os
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from google.protobuf.message import DecodeError
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+    ExportTraceServiceRequest,
+)
+from opentelemetry.proto.trace.v1.trace_pb2 import ResourceSpans, ScopeSpans, Span
+
+from services.trace.trace_ingest_queue_service import (
+    MAX_SEGMENT_ATTEMPTS,
+    TraceIngestJob,
+    TraceIngestQueueService,
+    count_spans,
+    initialize_trace_ingest_queue_service,
+)
+from services.trace.trace_ingest_wal import (
+    FAILED_SUFFIX,
+    OPEN_SUFFIX,
+    SEALED_SUFFIX,
+    TraceIngestQueueFullError,
+    TraceIngestWAL,
+)
+
+
+def _trace_payload(span_names: list[str]) -> bytes:
+    request = ExportTraceServiceRequest(
+        resource_spans=[
+            ResourceSpans(
+                scope_spans=[
+                    ScopeSpans(
+                        spans=[
+                            Span(
+                                trace_id=b"\x01" * 16,
+                                span_id=bytes([i + 1]) * 8,
+                                name=name,
+                            )
+                            for i, name in enumerate(span_names)
+                        ],
+                    ),
+                ],
+            ),
+        ],
+    )
+    return request.SerializeToString()
+
+
+def _make_wal(tmp_path, **kwargs) -> TraceIngestWAL:
+    kwargs.setdefault("max_pending_bytes", 1024 * 1024)
+    return TraceIngestWAL(str(tmp_path), **kwargs)
+
+
+@pytest.mark.unit_tests
+def test_wal_seals_full_segments_and_hands_out_payloads(tmp_path):
+    wal = _make_wal(tmp_path, max_segment_records=2)
+    wal.append(b"first")
+    wal.append(b"second")
+    wal.append(b"third")
+
+    assert wal.depth() == 3
+    segments = wal.claim(10)
+    # the third payload is still in the open segment
+    assert len(segments) == 1
+    assert segments[0].read() == [b"first", b"second"]
+
+    wal.complete(segments[0])
+    assert wal.depth() == 1
+
+    wal.max_segment_age_seconds = 0
+    wal.seal_expired()
+    segments = wal.claim(10)
+    assert [segment.read() for segment in segments] == [[b"third"]]
+
+
+@pytest.mark.unit_tests
+def test_wal_segments_are_claimed_once(tmp_path):
+    wal = _make_wal(tmp_path, max_segment_records=1)
+    other_process_wal = _make_wal(tmp_path)
+    wal.append(b"payload")
+
+    segments = wal.claim(10)
+    assert len(segments) == 1
+    assert other_process_wal.claim(10) == []
+    # the claim is locked by a live owner, so it isn't recovered either
+    assert other_process_wal.recover() == 0
+
+
+@pytest.mark.unit_tests
+def test_wal_rejects_appends_over_budget(tmp_path):
+    wal = _make_wal(tmp_path, max_pending_bytes=64, retry_after_seconds=7)
+    wal.append(b"x" * 40)
+
+    with pytest.raises(TraceIngestQueueFullError) as exc_info:
+        wal.append(b"x" * 40)
+    assert exc_info.value.retry_after_seconds == 7
+
+
+@pytest.mark.unit_tests
+def test_wal_accepts_oversized_payload_into_empty_queue(tmp_path):
+    wal = _make_wal(tmp_path, max_pending_bytes=16)
+    wal.append(b"x" * 100)
+    assert wal.depth() == 1
+
+
+@pytest.mark.unit_tests
+def test_wal_recovers_segments_of_dead_processes(tmp_path):
+    src_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "src")
+    script = (
+        "import os, sys\n"
+        f"sys.path.insert(0, {os.path.abspath(src_dir)!r})\n"
+        "from services.trace.trace_ingest_wal import TraceIngestWAL\n"
+        f"wal = TraceIngestWAL({str(tmp_path)!r}, max_pending_bytes=1024)\n"
+        "wal.append(b'one')\n"
+        "wal.append(b'two')\n"
+        "os._exit(0)\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+    wal = _make_wal(tmp_path)
+    assert any(name.endswith(SEALED_SUFFIX) for name in os.listdir(tmp_path))
+    segments = wal.claim(10)
+    assert [segment.read() for segment in segments] == [[b"one", b"two"]]
+
+
+@pytest.mark.unit_tests
+def test_wal_does_not_write_to_a_segment_taken_by_recovery(tmp_path):
+    wal = _make_wal(tmp_path)
+    # another process's recover() locks the new segment before this writer does
+    with patch(
+        "services.trace.trace_ingest_wal._try_lock",
+        side_effect=[False, True],
+    ):
+        wal.append(b"payload")
+
+    open_segments = [
+        name for name in os.listdir(tmp_path) if name.endswith(OPEN_SUFFIX)
+    ]
+    assert len(open_segments) == 2
+    wal.max_segment_age_seconds = 0
+    wal.seal_expired()
+    segments = wal.claim(10)
+    assert [segment.read() for segment in segments] == [[b"payload"]]
+
+
+@pytest.mark.unit_tests
+def test_async_ingestion_requires_a_queue_dir(monkeypatch):
+    monkeypatch.setenv("GENAI_ENGINE_TRACE_INGESTION_MODE", "async")
+    monkeypatch.delenv("GENAI_ENGINE_TRACE_INGEST_QUEUE_DIR", raising=False)
+    with pytest.raises(ValueError):
+        initialize_trace_ingest_queue_service()
+
+
+@pytest.mark.unit_tests
+def test_wal_close_returns_claimed_segments(tmp_path):
+    wal = _make_wal(tmp_path, max_segment_records=1)
+    wal.append(b"payload")
+    wal.claim(10)
+    wal.close()
+
+    segments = _make_wal(tmp_path).claim(10)
+    assert [segment.read() for segment in segments] == [[b"payload"]]
+
+
+@pytest.mark.unit_tests
+def test_count_spans_validates_payload():
+    assert count_spans(_trace_payload(["a", "b"])) == 2
+    with pytest.raises(DecodeError):
+        count_spans(b"\xff\xff\xff")
+
+
+@pytest.mark.unit_tests
+def test_submit_skips_empty_payloads(tmp_path):
+    service = TraceIngestQueueService(_make_wal(tmp_path))
+    assert service.submit(ExportTraceServiceRequest().SerializeToString()) == 0
+    assert service.submit(_trace_payload(["a"])) == 1
+    assert service.wal.depth() == 1
+
+
+@pytest.mark.unit_tests
+@patch("services.trace.trace_ingest_queue_service.db_session_context")
+def test_execute_job_ingests_segment_in_one_batch(mock_db_session_ctx, tmp_path):
+    wal = _make_wal(tmp_path, max_segment_records=2)
+    service = TraceIngestQueueService(wal)
+    first, second = _trace_payload(["a"]), _trace_payload(["b", "c"])
+    wal.append(first)
+    wal.append(second)
+    (segment,) = wal.claim(1)
+
+    with patch.object(service, "_ingest") as mock_ingest:
+        assert service._execute_job(TraceIngestJob(segment)) == 2
+
+    (call,) = mock_ingest.call_args_list
+    # both payloads were ingested together as one merged request
+    assert count_spans(call.args[1]) == 3
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.unit_tests
+@patch("services.trace.trace_ingest_queue_service.db_session_context")
+def test_execute_job_dead_letters_failing_payloads(mock_db_session_ctx, tmp_path):
+    wal = _make_wal(tmp_path, max_segment_records=2)
+    service = TraceIngestQueueService(wal)
+    good, bad = _trace_payload(["good"]), _trace_payload(["bad"])
+    wal.append(good)
+    wal.append(bad)
+    (segment,) = wal.claim(1)
+
+    def ingest(_, trace_data):
+        if trace_data != good:
+            raise ValueError("boom")
+
+    with patch.object(service, "_ingest", side_effect=ingest):
+        assert service._execute_job(TraceIngestJob(segment)) == 1
+
+    (failed_name,) = os.listdir(tmp_path)
+    assert failed_name.endswith(FAILED_SUFFIX)
+
+
+@pytest.mark.unit_tests
+@patch("services.trace.trace_ingest_queue_service.db_session_context")
+def test_execute_job_retries_segment_when_everything_fails(
+    mock_db_session_ctx,
+    tmp_path,
+):
+    wal = _make_wal(tmp_path, max_segment_records=1)
+    service = TraceIngestQueueService(wal)
+    wal.append(_trace_payload(["a"]))
+
+    with patch.object(service, "_ingest", side_effect=ValueError("db down")):
+        for _ in range(MAX_SEGMENT_ATTEMPTS - 1):
+            (segment,) = wal.claim(1)
+            assert service._execute_job(TraceIngestJob(segment)) == 0
+            # released back to the queue for another attempt
+            assert all(name.endswith(SEALED_SUFFIX) for name in os.listdir(tmp_path))
+
+        (segment,) = wal.claim(1)
+        service._execute_job(TraceIngestJob(segment))
+
+    (failed_name,) = os.listdir(tmp_path)
+    assert failed_name.endswith(FAILED_SUFFIX)
+
+
+@pytest.mark.unit_tests
+def test_receive_traces_returns_429_when_queue_is_full(client):
+    service = MagicMock()
+    service.submit.side_effect = TraceIngestQueueFullError(100, 3)
+    with patch(
+        "routers.v1.trace_api_routes.get_trace_ingest_queue_service",
+        return_value=service,
+    ):
+        status_code, _ = client.trace_api_receive_traces(_trace_payload(["a"]))
+    assert status_code == 429
+
+
+@pytest.mark.unit_tests
+def test_receive_traces_returns_202_when_queued(client, tmp_path):
+    service = TraceIngestQueueService(_make_wal(tmp_path))
+    with patch(
+        "routers.v1.trace_api_routes.get_trace_ingest_queue_service",
+        return_value=service,
+    ):
+        status_code, _ = client.trace_api_receive_traces(_trace_payload(["a", "b"]))
+    assert status_code == 202
+    assert service.wal.depth() == 1
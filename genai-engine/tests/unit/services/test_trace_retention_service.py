@@ -6,6 +6,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from repositories.span_partition_repository import SpanPartition, partition_name
 from schemas.internal_schemas import ApplicationConfiguration
 from services.trace_retention_service import (
     CIRCUIT_BREAKER_THRESHOLD,
@@ -538,3 +539,71 @@ def test_interval_falls_back_to_default_on_invalid_env_var(
         "Invalid" in r.getMessage() and "not-a-number" in r.getMessage()
         for r in caplog.records
     ), [r.getMessage() for r in caplog.records]
+
+
+@pytest.mark.unit_tests
+@patch("services.trace_retention_service.delete_trace_metadata_batch")
+@patch("services.trace_retention_service.delete_trace_batch")
+@patch("services.trace_retention_service.get_expired_trace_ids")
+@patch("services.trace_retention_service.delete_default_partition_spans")
+@patch("services.trace_retention_service.drop_span_partition")
+@patch("services.trace_retention_service.list_span_partitions")
+@patch("services.trace_retention_service.ensure_future_span_partitions")
+@patch("services.trace_retention_service.spans_partitioned", return_value=True)
+@patch("services.trace_retention_service.db_session_context")
+@patch("services.trace_retention_service.ConfigurationRepository")
+def test_execute_job_drops_expired_partitions_when_spans_partitioned(
+    mock_config_repo_cls: MagicMock,
+    mock_db_session_ctx: MagicMock,
+    mock_spans_partitioned: MagicMock,
+    mock_ensure_future_span_partitions: MagicMock,
+    mock_list_span_partitions: MagicMock,
+    mock_drop_span_partition: MagicMock,
+    mock_delete_default_partition_spans: MagicMock,
+    mock_get_expired_trace_ids: MagicMock,
+    mock_delete_trace_batch: MagicMock,
+    mock_delete_trace_metadata_batch: MagicMock,
+) -> None:
+    """With partitioned spans, expired partitions are dropped instead of deleting spans by trace."""
+    mock_db = _mock_db_session_ctx(mock_db_session_ctx)
+    _mock_config_repo(mock_config_repo_cls, retention_days=30)
+
+    today = datetime.now(timezone.utc).replace(
+        tzinfo=None,
+        hour=0,
+        minute=0,
+        second=0,
+        microsecond=0,
+    )
+    partitions = [
+        SpanPartition(
+            partition_name(today - timedelta(days=days)),
+            today - timedelta(days=days),
+            today - timedelta(days=days - 1),
+        )
+        for days in (40, 35, 30, 0)
+    ]
+    expired, remaining = partitions[:2], partitions[2:]
+    mock_list_span_partitions.side_effect = [partitions, remaining]
+    mock_get_expired_trace_ids.side_effect = [["trace-1", "trace-2"], []]
+
+    service = _make_service()
+    service.shutdown_event = MagicMock()
+    service.shutdown_event.is_set = MagicMock(return_value=False)
+
+    service._execute_job(TraceRetentionJob())
+
+    mock_ensure_future_span_partitions.assert_called_once()
+    assert [call.args[1] for call in mock_drop_span_partition.call_args_list] == expired
+    # traces are deleted up to the oldest partition that is kept
+    mock_delete_default_partition_spans.assert_called_once_with(
+        mock_db,
+        remaining[0].lower,
+    )
+    assert mock_get_expired_trace_ids.call_args[0][1] == remaining[0].lower
+    mock_delete_trace_metadata_batch.assert_called_once_with(
+        mock_db,
+        ["trace-1", "trace-2"],
+    )
+    mock_delete_trace_batch.assert_not_called()
+    assert service._consecutive_failures == 0
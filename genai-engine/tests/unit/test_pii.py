@@ -3,6 +3,7 @@ from arthur_common.models.enums import PIIEntityTypes, RuleResultEnum, RuleType
 
 from schemas.scorer_schemas import ScoreRequest
 from scorer.checks.pii.classifier import BinaryPIIDataClassifier
+from scorer.checks.pii.pii_utils import remove_overlapping_spans
 
 
 @pytest.fixture(scope="session")
@@ -1010,3 +1011,20 @@ def test_classifier_drops_name_with_digits(classifier):
         assert all(
             not any(ch.isdigit() for ch in span) for span in person_spans
         ), f"PERSON spans containing digits were not filtered: {person_spans}"
+
+
+@pytest.mark.unit_tests
+def test_remove_overlapping_spans_prefers_earliest_then_confident_then_longest():
+    spans = [
+        {"entity": "A", "span": "", "start": 10, "end": 20, "confidence": 0.5},
+        {"entity": "B", "span": "", "start": 0, "end": 5, "confidence": 0.5},
+        {"entity": "C", "span": "", "start": 0, "end": 8, "confidence": 0.9},
+        {"entity": "D", "span": "", "start": 6, "end": 12, "confidence": 0.99},
+        {"entity": "E", "span": "", "start": 20, "end": 25, "confidence": 0.1},
+    ]
+
+    assert [span["entity"] for span in remove_overlapping_spans(spans)] == [
+        "C",
+        "A",
+        "E",
+    ]
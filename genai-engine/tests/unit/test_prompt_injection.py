@@ -2,6 +2,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 from arthur_common.models.enums import RuleResultEnum
+
 from schemas.scorer_schemas import RuleScore
 from scorer.checks.prompt_injection.classifier import (
     BinaryPromptInjectionClassifier,
@@ -68,3 +69,46 @@ def test_score_below_threshold(mock_classifier):
     assert isinstance(score, RuleScore)
     assert score.result is RuleResultEnum.PASS
     assert score.details is None
+
+
+@patch("scorer.checks.prompt_injection.classifier.PROMPT_INJECTION_MODEL_BATCH_SIZE", 2)
+@patch("scorer.checks.prompt_injection.classifier.get_prompt_injection_classifier")
+@pytest.mark.unit_tests
+def test_score_batches_windows_and_stops_at_first_injection(mock_classifier):
+    classifier = BinaryPromptInjectionClassifier(
+        model=PROMPT_INJECTION_MODEL,
+        tokenizer=PROMPT_INJECTION_TOKENIZER,
+    )
+
+    mock_request = Mock()
+    # long enough for several 512 word sliding windows
+    mock_request.user_prompt = " ".join(f"word{i}" for i in range(2000))
+
+    batches = []
+
+    def classify(chunks, batch_size):
+        batches.append(chunks)
+        return [[{"label": "INJECTION", "score": 0.99}] for _ in chunks]
+
+    mock_classifier.return_value.side_effect = classify
+
+    score = classifier.score(mock_request)
+    assert score.result is RuleResultEnum.FAIL
+    # only the first batch of windows was classified, in a single call
+    assert len(batches) == 1
+    assert len(batches[0]) == 2
+    assert len(classifier.chunk_text(mock_request.user_prompt)) > 2
+
+
+@pytest.mark.unit_tests
+def test_contains_injection_uses_top_label_of_each_window():
+    classifier = BinaryPromptInjectionClassifier(
+        model=PROMPT_INJECTION_MODEL,
+        tokenizer=PROMPT_INJECTION_TOKENIZER,
+    )
+    safe = [{"label": "SAFE", "score": 0.9}, {"label": "INJECTION", "score": 0.1}]
+    injection = [{"label": "SAFE", "score": 0.2}, {"label": "INJECTION", "score": 0.8}]
+
+    assert not classifier.contains_injection([])
+    assert not classifier.contains_injection([safe, safe])
+    assert classifier.contains_injection([safe, injection])
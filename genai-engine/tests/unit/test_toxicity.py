@@ -2,10 +2,11 @@ import os
 
 import nltk
 import pytest
+from arthur_common.models.enums import RuleResultEnum, RuleType, ToxicityViolationType
 from nltk.corpus import words
 
-from arthur_common.models.enums import RuleResultEnum, RuleType, ToxicityViolationType
 from schemas.scorer_schemas import ScoreRequest
+from scorer.checks.toxicity import toxicity
 from scorer.checks.toxicity.toxicity import (
     ToxicityScorer,
     get_toxicity_model,
@@ -52,6 +53,38 @@ def test_detect_profanity():
     assert not CLASSIFIER.detect_profanity(["get it"], 0.5)
 
 
+@pytest.mark.unit_tests
+def test_score_stops_after_batch_above_threshold(monkeypatch):
+    scorer = ToxicityScorer(TOXICITY_MODEL, TOXICITY_TOKENIZER, None, None)
+    scored_batches = []
+
+    def fake_score_toxic_text(texts):
+        scored_batches.append(texts)
+        return [0.9] * len(texts)
+
+    monkeypatch.setattr(scorer, "score_toxic_text", fake_score_toxic_text)
+    monkeypatch.setattr(scorer, "classify_profanity", lambda texts, threshold: False)
+    monkeypatch.setattr(toxicity, "TOXICITY_MAX_CHUNK_SIZE", 2)
+    monkeypatch.setattr(toxicity, "TOXICITY_MODEL_BATCH_SIZE", 2)
+
+    result = scorer.score(
+        ScoreRequest(
+            scoring_text="The weather is nice today and we are going for a long walk.",
+            rule_type=RuleType.TOXICITY,
+            toxicity_threshold=0.5,
+        ),
+    )
+
+    assert result.result == RuleResultEnum.FAIL
+    assert result.details.toxicity_score.toxicity_score == 0.9
+    assert (
+        result.details.toxicity_score.toxicity_violation_type
+        == ToxicityViolationType.TOXIC_CONTENT
+    )
+    # the first batch decided the result, the rest of the text was never scored
+    assert len(scored_batches) == 1
+
+
 @pytest.mark.unit_tests
 def test_non_programming_text():
     score_request = ScoreRequest(
@@ -0,0 +1,87 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from arthur_common.models.enums import RuleScope, RuleType
+
+from schemas.enums import RuleDataType, RuleScoringMethod
+from schemas.internal_schemas import Rule
+from schemas.rules_schema_utils import RuleData
+from utils.compiled_rule_cache import CompiledRuleCache
+from utils.keyword_matcher import KeywordMatcher
+
+
+def _rule(
+    rule_type: RuleType,
+    data_type: RuleDataType,
+    data: list[str],
+    updated_at: datetime | None = None,
+    rule_id: str | None = None,
+) -> Rule:
+    now = datetime.now()
+    return Rule(
+        id=rule_id or str(uuid.uuid4()),
+        name="test rule",
+        type=rule_type,
+        prompt_enabled=True,
+        response_enabled=True,
+        scoring_method=RuleScoringMethod.BINARY,
+        created_at=now,
+        updated_at=updated_at or now,
+        rule_data=[
+            RuleData(id=str(uuid.uuid4()), data_type=data_type, data=d) for d in data
+        ],
+        scope=RuleScope.DEFAULT,
+        archived=False,
+    )
+
+
+@pytest.mark.unit_tests
+def test_regex_patterns_are_compiled_once_per_rule_version():
+    cache = CompiledRuleCache(maxsize=8)
+    rule = _rule(RuleType.REGEX, RuleDataType.REGEX, [r"\d{3}", r"foo"])
+
+    patterns = cache.get_regex_patterns(rule)
+    assert [p.pattern for p in patterns] == [r"\d{3}", r"foo"]
+    assert cache.get_regex_patterns(rule) is patterns
+
+    # a newer version of the rule gets recompiled
+    updated = _rule(
+        RuleType.REGEX,
+        RuleDataType.REGEX,
+        [r"bar"],
+        updated_at=rule.updated_at + timedelta(seconds=1),
+        rule_id=rule.id,
+    )
+    assert [p.pattern for p in cache.get_regex_patterns(updated)] == [r"bar"]
+
+
+@pytest.mark.unit_tests
+def test_keyword_matcher_is_reused_and_evicted():
+    cache = CompiledRuleCache(maxsize=1)
+    rule = _rule(RuleType.KEYWORD, RuleDataType.KEYWORD, ["Blocked", "word"])
+
+    matcher = cache.get_keyword_matcher(rule)
+    assert cache.get_keyword_matcher(rule) is matcher
+    assert matcher.find("a blocked Word here") == ["Blocked", "word"]
+
+    other = _rule(RuleType.KEYWORD, RuleDataType.KEYWORD, ["other"])
+    cache.get_keyword_matcher(other)
+    assert cache.get_keyword_matcher(rule) is not matcher
+
+
+@pytest.mark.unit_tests
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("this has a keyword in it", ["keyword"]),
+        ("keywords do not count", []),
+        ("KEYWORD and Another Keyword", ["keyword", "another keyword"]),
+        ("what?! no way", ["?!"]),
+        ("prefix-keyword-suffix", ["keyword"]),
+        ("", []),
+    ],
+)
+def test_keyword_matcher_matches_regex_semantics(text: str, expected: list[str]):
+    matcher = KeywordMatcher(["keyword", "another keyword", "?!"])
+    assert matcher.find(text) == expected
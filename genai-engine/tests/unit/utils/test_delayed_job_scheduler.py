@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from utils.delayed_job_scheduler import DelayedJobScheduler
+
+
+@pytest.mark.unit_tests
+def test_items_are_dispatched_in_due_order():
+    dispatched: list[str] = []
+    all_dispatched = threading.Event()
+
+    def dispatch(item: str) -> None:
+        dispatched.append(item)
+        if len(dispatched) == 3:
+            all_dispatched.set()
+
+    scheduler = DelayedJobScheduler("test-scheduler", dispatch)
+    scheduler.start()
+    try:
+        scheduler.schedule(0.2, "late")
+        scheduler.schedule(0.1, "middle")
+        scheduler.schedule(0, "now")
+
+        assert all_dispatched.wait(timeout=5)
+        assert dispatched == ["now", "middle", "late"]
+    finally:
+        scheduler.stop()
+
+
+@pytest.mark.unit_tests
+def test_stop_returns_undispatched_items():
+    scheduler = DelayedJobScheduler("test-scheduler", lambda item: None)
+    scheduler.start()
+    scheduler.schedule(60, "second")
+    scheduler.schedule(30, "first")
+
+    assert len(scheduler) == 2
+    assert scheduler.stop() == ["first", "second"]
+    with pytest.raises(RuntimeError):
+        scheduler.schedule(0, "after stop")
+
+
+@pytest.mark.unit_tests
+def test_dispatch_errors_do_not_stop_the_scheduler():
+    dispatched = threading.Event()
+
+    def dispatch(item: str) -> None:
+        if item == "bad":
+            raise ValueError(item)
+        dispatched.set()
+
+    scheduler = DelayedJobScheduler("test-scheduler", dispatch)
+    scheduler.start()
+    try:
+        scheduler.schedule(0, "bad")
+        scheduler.schedule(0.05, "good")
+
+        assert dispatched.wait(timeout=5)
+    finally:
+        scheduler.stop()
@@ -0,0 +1,75 @@
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services.trace.trace_ingestion_service import TraceIngestionService
+from utils.ingestion_lookup_cache import IngestionLookupCache, TaskLookup
+
+ORG_ID = uuid.UUID(int=7)
+
+
+@pytest.mark.unit_tests
+def test_invalidate_task_drops_its_service_names():
+    cache = IngestionLookupCache(max_size=100, ttl=60)
+    cache.put_task("task-1", TaskLookup(org_id=ORG_ID, archived=False))
+    cache.put_task_id("service-a", "task-1")
+    cache.put_task_id("service-b", "task-1")
+    cache.put_task_id("service-c", "task-2")
+
+    cache.invalidate_task("task-1")
+
+    assert cache.get_task("task-1") is None
+    assert cache.get_task_id("service-a") is None
+    assert cache.get_task_id("service-b") is None
+    assert cache.get_task_id("service-c") == "task-2"
+
+
+@pytest.mark.unit_tests
+def test_disabled_cache_stores_nothing():
+    cache = IngestionLookupCache(max_size=100, ttl=60, enabled=False)
+    cache.add_resource("resource-1")
+    cache.put_task_id("service-a", "task-1")
+    cache.put_task("task-1", TaskLookup(org_id=ORG_ID, archived=False))
+
+    assert not cache.has_resource("resource-1")
+    assert cache.get_task_id("service-a") is None
+    assert cache.get_task("task-1") is None
+
+
+@pytest.mark.unit_tests
+def test_resolve_resource_reuses_cached_lookups():
+    cache = IngestionLookupCache(max_size=100, ttl=60)
+    db_session = MagicMock()
+    db_session.execute.return_value.one_or_none.return_value = MagicMock(
+        org_id=ORG_ID,
+        archived=False,
+    )
+    db_session.query.return_value.filter.return_value.first.return_value = MagicMock(
+        task_id="task-1",
+    )
+    service = TraceIngestionService.__new__(TraceIngestionService)
+    service.db_session = db_session
+    service.task_repo = MagicMock()
+
+    resource_attributes = {"service.name": "agent"}
+    with (
+        patch("services.trace.trace_ingestion_service.INGESTION_LOOKUP_CACHE", cache),
+        patch(
+            "repositories.resource_metadata_repository.INGESTION_LOOKUP_CACHE",
+            cache,
+        ),
+    ):
+        first = service._resolve_resource(None, resource_attributes)
+        queries = db_session.query.call_count
+        executes = db_session.execute.call_count
+
+        second = service._resolve_resource(None, resource_attributes)
+
+    assert first == second
+    assert first[0] == "task-1"
+    assert first[2] == ORG_ID
+    # the resource row, the service name mapping and the task are not looked up again
+    assert db_session.query.call_count == queries
+    assert db_session.execute.call_count == executes
+    db_session.commit.assert_not_called()
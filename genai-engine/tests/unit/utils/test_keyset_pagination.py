@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import Column, DateTime, MetaData, String, Table, create_engine, select
+
+from utils.keyset_pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+    keyset_order_by,
+    next_page_cursor,
+)
+
+
+@pytest.mark.unit_tests
+def test_cursor_round_trip():
+    key = (datetime(2026, 10, 16, 11, 30, 0, 123456), "trace-1")
+    cursor = encode_cursor(True, key)
+
+    assert decode_cursor(cursor, True, 2) == key
+
+
+@pytest.mark.unit_tests
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        encode_cursor(True, (datetime(2026, 10, 16), "trace-1", "extra")),
+        encode_cursor(False, (datetime(2026, 10, 16), "trace-1")),
+    ],
+)
+def test_invalid_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, True, 2)
+
+
+@pytest.mark.unit_tests
+def test_next_page_cursor_only_for_full_pages():
+    items = [(datetime(2026, 10, 16), "a"), (datetime(2026, 10, 15), "b")]
+
+    assert next_page_cursor(items, 3, True, lambda item: item) is None
+    assert next_page_cursor([], 3, True, lambda item: item) is None
+    cursor = next_page_cursor(items, 2, True, lambda item: item)
+    assert decode_cursor(cursor, True, 2) == items[-1]
+
+
+@pytest.mark.unit_tests
+@pytest.mark.parametrize("descending", [True, False])
+def test_cursor_pages_cover_rows_with_tied_timestamps(descending):
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    rows = Table(
+        "rows",
+        metadata,
+        Column("id", String, primary_key=True),
+        Column("created_at", DateTime, nullable=False),
+    )
+    metadata.create_all(engine)
+    start = datetime(2026, 10, 16)
+    with engine.begin() as conn:
+        conn.execute(
+            rows.insert(),
+            [
+                {"id": f"row-{i:02d}", "created_at": start + timedelta(seconds=i // 3)}
+                for i in range(20)
+            ],
+        )
+
+    key = [rows.c.created_at, rows.c.id]
+    query = select(rows.c.created_at, rows.c.id).order_by(
+        *keyset_order_by(key, descending),
+    )
+    with engine.connect() as conn:
+        expected = [tuple(row) for row in conn.execute(query)]
+
+        paged: list[tuple[datetime, str]] = []
+        cursor = None
+        while True:
+            page_query = query.limit(3)
+            if cursor is not None:
+                page_query = page_query.where(keyset_after(key, cursor, descending))
+            page = [tuple(row) for row in conn.execute(page_query)]
+            paged.extend(page)
+            cursor = next_page_cursor(page, 3, descending, lambda row: row)
+            if cursor is None:
+                break
+
+    assert paged == expected
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from utils.llm_concurrency_limiter import LLMConcurrencyLimiter
+
+
+async def _is_blocked(
+    limiter: LLMConcurrencyLimiter,
+    provider: str,
+    model: str,
+) -> bool:
+    try:
+        slot = await asyncio.wait_for(limiter.acquire(provider, model), timeout=0.05)
+    except asyncio.TimeoutError:
+        return True
+    limiter.release(slot)
+    return False
+
+
+@pytest.mark.unit_tests
+@pytest.mark.asyncio
+async def test_model_limit_does_not_hold_back_other_models():
+    limiter = LLMConcurrencyLimiter(
+        provider_max_concurrency=10,
+        model_max_concurrency=1,
+    )
+
+    slot = await limiter.acquire("openai", "gpt-4o")
+    assert await _is_blocked(limiter, "openai", "gpt-4o")
+    assert not await _is_blocked(limiter, "openai", "gpt-4o-mini")
+    assert not await _is_blocked(limiter, "anthropic", "claude-sonnet-4")
+
+    limiter.release(slot)
+    assert not await _is_blocked(limiter, "openai", "gpt-4o")
+
+
+@pytest.mark.unit_tests
+@pytest.mark.asyncio
+async def test_provider_limit_is_shared_by_its_models():
+    limiter = LLMConcurrencyLimiter(provider_max_concurrency=2, model_max_concurrency=2)
+
+    async with limiter.limit("openai", "gpt-4o"):
+        async with limiter.limit("openai", "gpt-4o-mini"):
+            assert await _is_blocked(limiter, "openai", "o3")
+            assert not await _is_blocked(limiter, "anthropic", "claude-sonnet-4")
+        assert not await _is_blocked(limiter, "openai", "o3")
+
+
+@pytest.mark.unit_tests
+@pytest.mark.asyncio
+async def test_token_budget_is_settled_with_actual_usage():
+    limiter = LLMConcurrencyLimiter(
+        provider_max_concurrency=10,
+        model_max_concurrency=10,
+        model_tokens_per_minute=1000,
+    )
+
+    slot = await limiter.acquire("openai", "gpt-4o", estimated_tokens=1000)
+    # the whole minute's budget is reserved
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            limiter.acquire("openai", "gpt-4o", estimated_tokens=500),
+            timeout=0.05,
+        )
+
+    # the call used fewer tokens than estimated, the rest is available again
+    slot.total_tokens = 200
+    limiter.release(slot)
+    slot = await asyncio.wait_for(
+        limiter.acquire("openai", "gpt-4o", estimated_tokens=500),
+        timeout=0.05,
+    )
+    limiter.release(slot)
+
+
+@pytest.mark.unit_tests
+@pytest.mark.asyncio
+async def test_cancelled_acquire_frees_its_permits():
+    limiter = LLMConcurrencyLimiter(
+        provider_max_concurrency=1,
+        model_max_concurrency=1,
+        model_tokens_per_minute=1000,
+    )
+
+    slot = await limiter.acquire("openai", "gpt-4o", estimated_tokens=1000)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            limiter.acquire("openai", "gpt-4o", estimated_tokens=100),
+            timeout=0.05,
+        )
+    slot.total_tokens = 0
+    limiter.release(slot)
+
+    # neither the model semaphore nor the budget leaked to the cancelled call
+    async with limiter.limit("openai", "gpt-4o", estimated_tokens=1000):
+        pass
@@ -0,0 +1,108 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.micro_batching import MicroBatcher
+
+
+class RecordingBatchFn:
+    def __init__(self) -> None:
+        self.calls: list[tuple[object, list[str]]] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, key: object, items: list[str]) -> list[str]:
+        with self.lock:
+            self.calls.append((key, list(items)))
+        return [f"{key}:{item}" for item in items]
+
+
+@pytest.mark.unit_tests
+def test_disabled_batcher_calls_batch_fn_directly():
+    batch_fn = RecordingBatchFn()
+    batcher = MicroBatcher(
+        "test",
+        batch_fn,
+        max_batch_size=8,
+        max_wait_ms=5,
+        enabled=False,
+    )
+
+    assert batcher.run(["a", "b"], key="k") == ["k:a", "k:b"]
+    assert batch_fn.calls == [("k", ["a", "b"])]
+    assert batcher._scheduler_thread is None
+
+
+@pytest.mark.unit_tests
+def test_empty_input_skips_batch_fn():
+    batch_fn = RecordingBatchFn()
+    batcher = MicroBatcher("test", batch_fn, max_batch_size=8, max_wait_ms=5)
+
+    assert batcher.run([]) == []
+    assert batch_fn.calls == []
+
+
+@pytest.mark.unit_tests
+def test_concurrent_requests_share_forward_pass():
+    batch_fn = RecordingBatchFn()
+    # long wait so all submissions land in the same batch once it is full
+    batcher = MicroBatcher("test", batch_fn, max_batch_size=6, max_wait_ms=2000)
+
+    requests = [[f"{i}-0", f"{i}-1"] for i in range(3)]
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(executor.map(batcher.run, requests))
+
+    # every caller gets back exactly its own outputs, in order
+    for request, result in zip(requests, results):
+        assert result == [f"None:{item}" for item in request]
+    assert len(batch_fn.calls) == 1
+    assert sorted(batch_fn.calls[0][1]) == sorted(
+        item for request in requests for item in request
+    )
+
+
+@pytest.mark.unit_tests
+def test_requests_with_different_keys_are_not_mixed():
+    batch_fn = RecordingBatchFn()
+    batcher = MicroBatcher("test", batch_fn, max_batch_size=64, max_wait_ms=20)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(batcher.run, [f"item-{i}"], "even" if i % 2 == 0 else "odd")
+            for i in range(4)
+        ]
+        results = [future.result() for future in futures]
+
+    assert results == [
+        ["even:item-0"],
+        ["odd:item-1"],
+        ["even:item-2"],
+        ["odd:item-3"],
+    ]
+    for key, items in batch_fn.calls:
+        expected_parity = 0 if key == "even" else 1
+        assert all(int(item.split("-")[1]) % 2 == expected_parity for item in items)
+
+
+@pytest.mark.unit_tests
+def test_batch_failure_is_raised_to_every_caller():
+    def failing_batch_fn(key: object, items: list[str]) -> list[str]:
+        raise RuntimeError("forward pass failed")
+
+    batcher = MicroBatcher("test", failing_batch_fn, max_batch_size=4, max_wait_ms=1)
+
+    with pytest.raises(RuntimeError, match="forward pass failed"):
+        batcher.run(["a"])
+
+
+@pytest.mark.unit_tests
+def test_output_length_mismatch_is_an_error():
+    batcher = MicroBatcher(
+        "test",
+        lambda key, items: items[:1],
+        max_batch_size=4,
+        max_wait_ms=1,
+    )
+
+    with pytest.raises(ValueError, match="returned 1 outputs for 2 inputs"):
+        batcher.run(["a", "b"])
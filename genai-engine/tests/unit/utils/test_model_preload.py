@@ -0,0 +1,57 @@
+import gc
+
+import pytest
+import torch
+
+from utils import model_load, model_preload
+from utils.utils import preload_models_enabled
+
+
+@pytest.mark.unit_tests
+def test_preload_models_enabled(monkeypatch):
+    monkeypatch.delenv("GENAI_ENGINE_PRELOAD_MODELS", raising=False)
+    assert not preload_models_enabled()
+    monkeypatch.setenv("GENAI_ENGINE_PRELOAD_MODELS", "True")
+    assert preload_models_enabled()
+
+
+@pytest.mark.unit_tests
+def test_preload_loads_models_and_restores_threads_in_worker(monkeypatch):
+    loaded: list[str] = []
+    for name in [
+        "download_models",
+        "get_claim_classifier_embedding_model",
+        "get_prompt_injection_model",
+        "get_prompt_injection_tokenizer",
+        "get_toxicity_model",
+        "get_toxicity_tokenizer",
+        "get_profanity_classifier",
+        "get_gliner_tokenizer",
+        "get_gliner_model",
+        "get_date_spacy_pipeline",
+        "get_presidio_analyzer",
+    ]:
+        monkeypatch.setattr(
+            model_load,
+            name,
+            lambda *args, _name=name: loaded.append(_name),
+        )
+    monkeypatch.setattr(model_load, "USE_PII_MODEL_V2", True)
+    monkeypatch.setattr(model_preload, "relevance_models_enabled", lambda: False)
+    monkeypatch.delenv("GENAI_ENGINE_CLASSIFIER_BACKEND", raising=False)
+
+    num_threads = torch.get_num_threads()
+    try:
+        model_preload.preload_models()
+
+        assert loaded[0] == "download_models"
+        assert "get_date_spacy_pipeline" in loaded
+        assert "get_profanity_classifier" in loaded
+        assert torch.get_num_threads() == 1
+        assert gc.get_freeze_count() > 0
+
+        model_preload.init_worker()
+        assert torch.get_num_threads() == num_threads
+    finally:
+        gc.unfreeze()
+        torch.set_num_threads(num_threads)
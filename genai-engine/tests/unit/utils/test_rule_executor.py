@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+from arthur_common.models.enums import RuleType
+
+from utils.rule_executor import (
+    RULE_TYPE_LANES,
+    ExecutorLane,
+    RuleExecutorPool,
+    get_rule_executor_pool,
+)
+
+
+@pytest.mark.unit_tests
+def test_rule_type_lanes():
+    assert RULE_TYPE_LANES[RuleType.MODEL_HALLUCINATION_V2] == ExecutorLane.LLM
+    assert RULE_TYPE_LANES[RuleType.MODEL_SENSITIVE_DATA] == ExecutorLane.LLM
+    assert RULE_TYPE_LANES[RuleType.REGEX] == ExecutorLane.PATTERN
+    assert RULE_TYPE_LANES[RuleType.KEYWORD] == ExecutorLane.PATTERN
+    assert RULE_TYPE_LANES[RuleType.TOXICITY] == ExecutorLane.MODEL
+
+
+@pytest.mark.unit_tests
+def test_slow_lane_does_not_starve_other_lanes():
+    pool = RuleExecutorPool(
+        {ExecutorLane.LLM: 1, ExecutorLane.MODEL: 1, ExecutorLane.PATTERN: 1},
+    )
+    release_llm = threading.Event()
+    try:
+        # saturate the LLM lane with a blocked job plus a queued one
+        blocked = pool.submit(ExecutorLane.LLM, release_llm.wait, 5)
+        queued = pool.submit(ExecutorLane.LLM, lambda: "llm")
+
+        # the pattern lane still runs immediately
+        assert pool.submit(ExecutorLane.PATTERN, lambda: "regex").result(1) == "regex"
+
+        stats = pool.stats()
+        assert stats["llm"]["active"] == 1
+        assert stats["llm"]["queued"] == 1
+        assert stats["pattern"]["completed"] == 1
+
+        release_llm.set()
+        assert blocked.result(1) is True
+        assert queued.result(1) == "llm"
+    finally:
+        release_llm.set()
+        pool.shutdown()
+
+
+@pytest.mark.unit_tests
+def test_failed_jobs_are_counted_and_raised():
+    pool = RuleExecutorPool(
+        {ExecutorLane.LLM: 1, ExecutorLane.MODEL: 1, ExecutorLane.PATTERN: 1},
+    )
+
+    def fail() -> None:
+        raise ValueError("rule failed")
+
+    try:
+        future = pool.submit(ExecutorLane.MODEL, fail)
+        assert isinstance(future.exception(1), ValueError)
+        assert pool.stats()["model"]["failed"] == 1
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.unit_tests
+def test_global_pool_is_reused():
+    assert get_rule_executor_pool() is get_rule_executor_pool()
@@ -0,0 +1,124 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from arthur_common.models.enums import RuleResultEnum, RuleScope, RuleType
+
+from schemas.enums import RuleDataType, RuleScoringMethod
+from schemas.internal_schemas import Rule
+from schemas.rules_schema_utils import RuleData
+from schemas.scorer_schemas import RuleScore, ScorerKeywordSpan, ScorerRuleDetails
+from utils.rule_result_cache import RuleResultCache
+
+
+def _keyword_rule(keywords: list[str], rule_id: str | None = None) -> Rule:
+    now = datetime.now()
+    return Rule(
+        id=rule_id or str(uuid.uuid4()),
+        name="keyword rule",
+        type=RuleType.KEYWORD,
+        prompt_enabled=True,
+        response_enabled=True,
+        scoring_method=RuleScoringMethod.BINARY,
+        created_at=now,
+        updated_at=now,
+        rule_data=[
+            RuleData(id=str(uuid.uuid4()), data_type=RuleDataType.KEYWORD, data=k)
+            for k in keywords
+        ],
+        scope=RuleScope.DEFAULT,
+        archived=False,
+    )
+
+
+def _fail_score() -> RuleScore:
+    return RuleScore(
+        result=RuleResultEnum.FAIL,
+        details=ScorerRuleDetails(keywords=[ScorerKeywordSpan(keyword="bad")]),
+    )
+
+
+@pytest.mark.unit_tests
+def test_hit_returns_a_copy_and_counts():
+    cache = RuleResultCache(max_bytes=1024 * 1024, ttl=60)
+    rule = _keyword_rule(["bad"])
+    key = cache.make_key(rule, "this is bad")
+
+    assert cache.get(key) is None
+    cache.put(key, _fail_score())
+
+    cached = cache.get(key)
+    assert cached == _fail_score()
+    cached.details.keywords.clear()
+    assert cache.get(key) == _fail_score()
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+@pytest.mark.unit_tests
+def test_key_changes_with_config_and_text():
+    rule = _keyword_rule(["bad"])
+    key = RuleResultCache.make_key(rule, "text")
+
+    assert RuleResultCache.make_key(rule, "other text") != key
+    assert RuleResultCache.make_key(_keyword_rule(["worse"], rule.id), "text") != key
+    # rule data ids and order don't affect the config hash
+    assert RuleResultCache.make_key(_keyword_rule(["bad"], rule.id), "text") == key
+
+
+@pytest.mark.unit_tests
+def test_only_deterministic_rules_are_cacheable():
+    rule = _keyword_rule(["bad"])
+    assert RuleResultCache.is_cacheable(rule)
+    rule.type = RuleType.MODEL_HALLUCINATION_V2
+    assert not RuleResultCache.is_cacheable(rule)
+
+
+@pytest.mark.unit_tests
+def test_unavailable_results_are_not_cached():
+    cache = RuleResultCache(max_bytes=1024 * 1024, ttl=60)
+    key = cache.make_key(_keyword_rule(["bad"]), "text")
+
+    cache.put(key, RuleScore(result=RuleResultEnum.UNAVAILABLE))
+    assert cache.get(key) is None
+
+
+@pytest.mark.unit_tests
+def test_model_not_available_results_are_not_cached():
+    cache = RuleResultCache(max_bytes=1024 * 1024, ttl=60)
+    key = cache.make_key(_keyword_rule(["bad"]), "text")
+
+    # returned while the model is still loading
+    cache.put(key, RuleScore(result=RuleResultEnum.MODEL_NOT_AVAILABLE))
+    assert cache.get(key) is None
+
+
+@pytest.mark.unit_tests
+def test_memory_budget_evicts_entries():
+    entry_size = len(_fail_score().model_dump_json())
+    cache = RuleResultCache(max_bytes=entry_size * 2, ttl=60)
+    rule = _keyword_rule(["bad"])
+
+    for i in range(5):
+        cache.put(cache.make_key(rule, f"text {i}"), _fail_score())
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= stats["max_bytes"]
+
+
+@pytest.mark.unit_tests
+def test_invalidate_rule_drops_only_that_rule():
+    cache = RuleResultCache(max_bytes=1024 * 1024, ttl=60)
+    rule, other_rule = _keyword_rule(["bad"]), _keyword_rule(["bad"])
+    key, other_key = cache.make_key(rule, "text"), cache.make_key(other_rule, "text")
+    cache.put(key, _fail_score())
+    cache.put(other_key, _fail_score())
+
+    cache.invalidate_rule(rule.id)
+
+    assert cache.get(key) is None
+    assert cache.get(other_key) is not None
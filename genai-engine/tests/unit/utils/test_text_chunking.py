@@ -1,7 +1,11 @@
 import pytest
 
 from utils.model_load import get_prompt_injection_tokenizer
-from utils.text_chunking import ChunkIterator, SlidingWindowChunkIterator
+from utils.text_chunking import (
+    ChunkIterator,
+    SlidingWindowChunkIterator,
+    chunk_text_by_sizes,
+)
 
 tokenizer = get_prompt_injection_tokenizer()
 
@@ -42,6 +46,18 @@ def test_token_boundaries(text, actual_chunks, chunk_size):
         assert chunk == actual_chunks[i]
 
 
+@pytest.mark.unit_tests
+def test_chunk_text_by_sizes_matches_separate_iterators():
+    text = "Tokennn boundarieees arrre respeccccted. One two three four five six seven."
+    chunk_sizes = [2, 3, 512]
+
+    chunkings = chunk_text_by_sizes(text, tokenizer, chunk_sizes)
+
+    assert chunkings == [
+        list(ChunkIterator(text, tokenizer, chunk_size)) for chunk_size in chunk_sizes
+    ]
+
+
 # test a chunk size large enough to fit the whole text
 @pytest.mark.unit_tests
 def test_single_chunk_exact_fit():